@@ -0,0 +1,176 @@
+"""
+Máquina Virtual Assíncrona (asyncio)
+
+Na VirtualMachine o LEIT chama input() e bloqueia o processo inteiro
+enquanto o programa espera o usuário. Aqui execute() é uma corrotina:
+o LEIT espera (await) uma fonte de entrada assíncrona e o IMPR envia o
+valor para um destino assíncrono, então milhares de sessões podem
+esperar entrada ao mesmo tempo em um único laço de eventos. A cada
+fatia de instruções a VM também devolve a vez ao laço, para que um
+programa que só calcula não trave os outros.
+
+Fontes/destinos prontos:
+    QueueSession   filas asyncio (testes e uso dentro do mesmo processo)
+    serve()        servidor em socket unix: uma sessão por conexão, uma
+                   entrada por linha recebida e uma saída por linha enviada
+"""
+
+import argparse
+import asyncio
+import os
+
+from vm import VirtualMachine, VMRuntimeError, parse_program
+
+
+INPUT_PROMPT = "Digite um valor: "
+SLICE_SIZE = 1000
+# Conexões pendentes aceitas pelo socket (muitas sessões conectam juntas)
+BACKLOG = 1024
+
+
+async def console_input(prompt):
+    """Entrada padrão: input() numa thread, sem bloquear o laço de eventos"""
+    return await asyncio.to_thread(input, prompt)
+
+
+async def console_output(value):
+    print(value)
+
+
+class AsyncVirtualMachine(VirtualMachine):
+
+    def __init__(self, input_source=None, output_sink=None, verbose=False,
+                 slice_size=SLICE_SIZE):
+        super().__init__(verbose=verbose)
+        self.input_source = input_source if input_source is not None else console_input
+        self.output_sink = output_sink if output_sink is not None else console_output
+        self.slice_size = slice_size
+
+    async def execute(self):
+        if self.verbose:
+            print("\nIniciando execução\n")
+
+        try:
+            await self.run_async()
+        except VMRuntimeError:
+            raise
+        except Exception as e:
+            raise self.runtime_error(e) from e
+
+        if self.verbose:
+            print("\nExecução finalizada")
+
+    async def run_async(self):
+        instructions = self.instructions
+        size = len(instructions)
+        executed = 0
+
+        while self.running and self.pc < size:
+            instruction = instructions[self.pc]
+
+            # Só LEIT e IMPR esperam; o resto usa o interpretador normal
+            if instruction.startswith('LEIT'):
+                value = float(await self.input_source(INPUT_PROMPT))
+                self.stack.append(value)
+            elif instruction.startswith('IMPR'):
+                await self.output_sink(self.stack.pop())
+            else:
+                self.execute_instruction(instruction)
+            self.pc += 1
+
+            executed += 1
+            if executed >= self.slice_size:
+                executed = 0
+                await asyncio.sleep(0)
+
+
+class QueueSession:
+    """
+    Sessão ligada por filas: quem está fora coloca entradas em 'inputs'
+    (None = fim das entradas) e lê as saídas de 'outputs'.
+    """
+
+    def __init__(self):
+        self.inputs = asyncio.Queue()
+        self.outputs = asyncio.Queue()
+
+    async def read(self, prompt=''):
+        value = await self.inputs.get()
+        if value is None:
+            raise EOFError("entradas esgotadas")
+        return value
+
+    async def write(self, value):
+        await self.outputs.put(value)
+
+    def vm(self, instructions, **options):
+        vm = AsyncVirtualMachine(input_source=self.read, output_sink=self.write, **options)
+        vm.instructions = instructions
+        return vm
+
+
+async def handle_connection(instructions, reader, writer):
+    """Uma sessão por conexão: linhas recebidas alimentam o LEIT"""
+
+    async def read(prompt=''):
+        line = await reader.readline()
+        if not line:
+            raise EOFError("conexão encerrada antes da entrada")
+        return line.decode('utf-8').strip()
+
+    async def write(value):
+        writer.write(f"{value}\n".encode('utf-8'))
+        await writer.drain()
+
+    vm = AsyncVirtualMachine(input_source=read, output_sink=write)
+    vm.instructions = instructions
+    try:
+        await vm.execute()
+    except Exception as e:
+        writer.write(f"ERRO: {e}\n".encode('utf-8'))
+    finally:
+        try:
+            await writer.drain()
+            writer.close()
+            await writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+async def serve(instructions, path):
+    """Servidor em socket unix (Linux/macOS) que atende sessões concorrentes"""
+    if os.path.exists(path):
+        os.unlink(path)
+    server = await asyncio.start_unix_server(
+        lambda reader, writer: handle_connection(instructions, reader, writer), path,
+        backlog=BACKLOG)
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    """Função principal"""
+    arg_parser = argparse.ArgumentParser(description="Executa um programa .asm na VM assíncrona")
+    arg_parser.add_argument('programa', help="arquivo .asm gerado pelo compilador")
+    arg_parser.add_argument('--socket', metavar='CAMINHO', default=None,
+                            help="atende sessões num socket unix em vez do terminal")
+    args = arg_parser.parse_args()
+
+    with open(args.programa, 'r', encoding='utf-8') as f:
+        instructions = parse_program(f.readlines())
+
+    if args.socket:
+        print(f"Atendendo sessões em {args.socket}")
+        try:
+            asyncio.run(serve(instructions, args.socket))
+        except KeyboardInterrupt:
+            pass
+        return
+
+    vm = AsyncVirtualMachine(verbose=True)
+    vm.instructions = instructions
+    asyncio.run(vm.execute())
+
+
+if __name__ == "__main__":
+    main()
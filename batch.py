@@ -0,0 +1,239 @@
+"""
+Compilação em Lote
+
+Compila muitos arquivos .php de uma vez, distribuindo os arquivos entre
+processos. Aceita arquivos, diretórios (percorridos recursivamente) e
+padrões glob. Cada arquivo passa pelo pipeline em memória (pipeline.py)
+e o programa gerado é gravado ao lado do fonte ou em --saida.
+
+A VM só executa com --executar (sem entradas: programas que usam o
+LEIT terminam com "entradas esgotadas"), e cada execução tem um
+orçamento de instruções (--orcamento): um laço sem fim vira erro daquele
+arquivo em vez de travar o lote. Os resultados e diagnósticos
+saem sempre na ordem dos arquivos, qualquer que seja o processo que os
+compilou.
+
+Com --cache, cada processo consulta o cache de compilação (cache.py)
+antes de compilar: fontes que não mudaram custam um hash e uma leitura.
+
+Um fonte com include é compilado como em main.py: cada unidade à parte
+(linker.py) e o ligador monta o programa.
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from farm import (DEFAULT_BUDGET, BudgetExceededError, RunResult, format_result, input_feeder,
+                  run_once, run_with_budget)
+from linker import build_program, has_includes
+from pipeline import BACKENDS, Diagnostic, compile_source, decode_source, output_filename
+from vm import parse_program
+
+
+class BatchResult:
+    """Resultado de um arquivo: saída gerada, diagnósticos e execução"""
+
+    def __init__(self, source, output=None, instructions=0, diagnostics=None,
+                 elapsed=0.0, run=None, cached=None):
+        self.source = source
+        self.output = output
+        self.instructions = instructions
+        self.diagnostics = diagnostics or []
+        self.elapsed = elapsed
+        self.run = run  # farm.RunResult quando executado
+        self.cached = cached  # True/False com --cache: resultado veio do cache?
+
+    @property
+    def ok(self):
+        return not self.diagnostics
+
+    @property
+    def failed(self):
+        """Erro de compilação ou execução que esgotou o orçamento (laço sem fim)"""
+        return not self.ok or (self.run is not None and self.run.timed_out)
+
+    def __repr__(self):
+        return f"BatchResult({self.source!r}, ok={self.ok}, instructions={self.instructions})"
+
+
+def expand_sources(patterns):
+    """Arquivos .php de uma lista de arquivos, diretórios e globs, sem repetir, em ordem"""
+    sources = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            for root, _, files in os.walk(pattern):
+                sources.update(os.path.join(root, name) for name in files if name.endswith('.php'))
+        elif os.path.isfile(pattern):
+            sources.add(pattern)
+        else:
+            sources.update(path for path in glob.glob(pattern, recursive=True)
+                           if os.path.isfile(path))
+    return sorted(os.path.normpath(path) for path in sources)
+
+
+def batch_output(source, backend, output_dir=None, base_dir=None):
+    """Onde gravar o programa de 'source' (espelha a árvore em output_dir)"""
+    output = output_filename(source, backend)
+    if output_dir is None:
+        return output
+    relative = os.path.relpath(output, base_dir) if base_dir else os.path.basename(output)
+    return os.path.join(output_dir, relative)
+
+
+# Um cache por diretório em cada processo, para os contadores e o tamanho total
+_caches = {}
+
+
+def open_cache(directory):
+    if directory not in _caches:
+        from cache import CompileCache
+        _caches[directory] = CompileCache(directory)
+    return _caches[directory]
+
+
+def compile_one(source, backend='pilha', output=None, execute=False, cache_dir=None,
+                budget=DEFAULT_BUDGET):
+    """Compila (e, se pedido, executa) um arquivo; nunca levanta exceção"""
+    start = time.perf_counter()
+    try:
+        with open(source, 'rb') as f:
+            data = f.read()
+    except OSError as e:
+        return BatchResult(source, diagnostics=[Diagnostic('leitura', str(e))])
+
+    try:
+        code = decode_source(data)
+    except UnicodeDecodeError as e:
+        return BatchResult(source, diagnostics=[Diagnostic('leitura', str(e))])
+
+    cached = None
+    cache = open_cache(cache_dir) if cache_dir else None
+    if has_includes(code):
+        # Cada unidade é compilada à parte (e guardada no cache) e o ligador monta o programa
+        result, build = build_program(source, backend, cache=cache)
+        if cache is not None:
+            cached = build.cached == len(build.objects)
+    elif cache is not None:
+        hits = cache.hits
+        result = cache.compile(data, backend)
+        cached = cache.hits > hits
+    else:
+        result = compile_source(code, backend)
+
+    if not result.ok:
+        return BatchResult(source, diagnostics=result.diagnostics,
+                           elapsed=time.perf_counter() - start, cached=cached)
+
+    output = output or output_filename(source, backend)
+    directory = os.path.dirname(output)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    result.save(output)
+
+    run = None
+    if execute:
+        run = run_compiled(result.instructions, backend, budget)
+
+    return BatchResult(source, output, len(result.instructions),
+                       elapsed=time.perf_counter() - start, run=run, cached=cached)
+
+
+def run_compiled(instructions, backend, budget=DEFAULT_BUDGET):
+    # Mesmo programa que a VM leria do arquivo (sem comentários)
+    instructions = parse_program(instructions)
+    if backend == 'pilha':
+        return run_once(instructions, [], budget)
+
+    from register_vm import RegisterVirtualMachine
+    outputs = []
+    vm = RegisterVirtualMachine(input_func=input_feeder([]), output_func=outputs.append,
+                                verbose=False)
+    try:
+        vm.load_instructions(instructions)
+        run_with_budget(vm, budget)
+    except Exception as e:
+        return RunResult(outputs, f"{type(e).__name__}: {e}", isinstance(e, BudgetExceededError))
+    return RunResult(outputs)
+
+
+def _compile_job(job):
+    return compile_one(*job)
+
+
+def compile_batch(sources, backend='pilha', output_dir=None, execute=False, workers=None,
+                  cache_dir=None, budget=DEFAULT_BUDGET):
+    """Compila os arquivos em paralelo; resultados na mesma ordem de 'sources'"""
+    base_dir = os.path.commonpath([os.path.dirname(os.path.abspath(source)) or '.'
+                                   for source in sources]) if sources else None
+    jobs = [(source, backend, batch_output(os.path.abspath(source), backend, output_dir, base_dir)
+             if output_dir else None, execute, cache_dir, budget) for source in sources]
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(jobs) <= 1:
+        return [_compile_job(job) for job in jobs]
+
+    chunksize = max(1, len(jobs) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_compile_job, jobs, chunksize=chunksize))
+
+
+def format_batch_result(result):
+    if not result.ok:
+        return "\n".join(f"ERRO {result.source}: {diagnostic}" for diagnostic in result.diagnostics)
+
+    line = f"ok   {result.source} -> {result.output} ({result.instructions} instruções)"
+    if result.run is not None:
+        line += f"\n     saída: {format_result(result.run)}"
+    return line
+
+
+def main():
+    """Função principal"""
+    arg_parser = argparse.ArgumentParser(
+        description="Compila muitos arquivos .php em paralelo",
+        epilog="Exemplos: python batch.py exemplos/ | python batch.py 'src/**/*.php' -o build -j 8")
+    arg_parser.add_argument('entradas', nargs='+', help="arquivos, diretórios ou padrões glob")
+    arg_parser.add_argument('-o', '--saida', default=None,
+                            help="diretório dos programas gerados (padrão: ao lado de cada fonte)")
+    arg_parser.add_argument('--backend', choices=sorted(BACKENDS), default='pilha',
+                            help="máquina alvo: pilha (padrão) ou registradores")
+    arg_parser.add_argument('-j', '--workers', type=int, default=None,
+                            help="número de processos (padrão: número de CPUs)")
+    arg_parser.add_argument('--cache', metavar='DIRETORIO', default=None,
+                            help="reaproveita compilações de fontes iguais guardadas em DIRETORIO")
+    arg_parser.add_argument('--executar', action='store_true',
+                            help="executa cada programa compilado (sem entradas)")
+    arg_parser.add_argument('--orcamento', type=int, default=DEFAULT_BUDGET,
+                            help=f"máximo de instruções por execução com --executar "
+                                 f"(padrão: {DEFAULT_BUDGET}; 0 = sem limite)")
+    args = arg_parser.parse_args()
+
+    sources = expand_sources(args.entradas)
+    if not sources:
+        print("Nenhum arquivo .php encontrado")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    results = compile_batch(sources, args.backend, args.saida, args.executar, args.workers,
+                            args.cache, args.orcamento or None)
+    elapsed = time.perf_counter() - start
+
+    for result in results:
+        print(format_batch_result(result))
+
+    failures = sum(1 for result in results if result.failed)
+    print(f"{len(results)} arquivos em {elapsed:.3f}s "
+          f"({len(results) / max(elapsed, 1e-9):.1f} arquivos/s, {failures} com erro)",
+          file=sys.stderr)
+    if args.cache:
+        hits = sum(1 for result in results if result.cached)
+        print(f"cache: {hits} acertos, {len(results) - hits} faltas", file=sys.stderr)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Compara os backends de pilha e de registradores nos mesmos fontes
+
+Uso: python benchmarks/bench_backends.py programa.php [programa2.php ...]
+         [--entradas 10,5,3] [--repeticoes 5]
+
+Cada fonte é compilado em memória pelos dois geradores e executado nas
+duas máquinas com as mesmas entradas. Mostra instruções geradas, melhor
+tempo de execução e se as saídas conferem.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lexer import Lexer
+from parser import Parser
+from semantic_analyzer import SemanticAnalyzer
+from code_generator import VMCodeGenerator, RegisterCodeGenerator
+from vm import VirtualMachine, parse_program
+from register_vm import RegisterVirtualMachine
+
+
+def compile_source(code, generator_class):
+    ast = Parser(Lexer(code).tokenize()).parse()
+    SemanticAnalyzer().analyze(ast)
+    return parse_program(generator_class().generate(ast))
+
+
+def run(vm_class, instructions, inputs):
+    feed = iter(inputs)
+    outputs = []
+    vm = vm_class(input_func=lambda prompt='': next(feed),
+                  output_func=outputs.append, verbose=False)
+    if isinstance(vm, RegisterVirtualMachine):
+        vm.load_instructions(instructions)
+    else:
+        vm.instructions = instructions
+
+    start = time.perf_counter()
+    try:
+        vm.execute()
+    except Exception as e:
+        outputs.append(f"{type(e).__name__}: {e}")
+    return time.perf_counter() - start, outputs
+
+
+def benchmark(filename, inputs, repeats):
+    with open(filename, 'r', encoding='utf-8') as f:
+        code = f.read()
+
+    results = {}
+    for name, generator_class, vm_class in (
+            ('pilha', VMCodeGenerator, VirtualMachine),
+            ('registradores', RegisterCodeGenerator, RegisterVirtualMachine)):
+        instructions = compile_source(code, generator_class)
+        times = []
+        for _ in range(repeats):
+            elapsed, outputs = run(vm_class, instructions, inputs)
+            times.append(elapsed)
+        results[name] = (len(instructions), min(times), outputs)
+
+    return results
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Compara os backends de pilha e de registradores")
+    arg_parser.add_argument('fontes', nargs='+', help="arquivos .php")
+    arg_parser.add_argument('--entradas', default='',
+                            help="valores lidos por readline(), separados por vírgula")
+    arg_parser.add_argument('--repeticoes', type=int, default=5)
+    args = arg_parser.parse_args()
+
+    inputs = [value for value in args.entradas.split(',') if value]
+
+    print(f"{'fonte':30} {'backend':14} {'instr':>6} {'tempo (ms)':>11} {'ganho':>7}")
+    for filename in args.fontes:
+        results = benchmark(filename, inputs, args.repeticoes)
+        stack_time = results['pilha'][1]
+        for name, (count, elapsed, outputs) in results.items():
+            speedup = stack_time / elapsed if elapsed > 0 else 0.0
+            print(f"{os.path.basename(filename):30} {name:14} {count:6d} "
+                  f"{elapsed * 1000:11.3f} {speedup:6.2f}x")
+        if results['pilha'][2] != results['registradores'][2]:
+            print(f"  AVISO: saídas diferentes em {filename}")
+
+
+if __name__ == "__main__":
+    main()
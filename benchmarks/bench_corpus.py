@@ -0,0 +1,211 @@
+"""
+Corpus de Programas com Linha de Base
+
+Uso: python benchmarks/bench_corpus.py [programa.php ...] [--repeticoes 5]
+         [--tolerancia 0.25] [--minimo-ms 5.0] [--remedicoes 2]
+         [--linha-base arquivo.json] [--atualizar]
+
+Mede programas LALG-PHP realistas (benchmarks/corpus/ por padrão):
+tempo de compilação, instruções geradas, instruções executadas e tempo
+de execução na VirtualMachine. As entradas do readline() vêm da gravação
+ao lado do fonte (programa.rec, feita com main.py --gravar), e as saídas
+são conferidas com as gravadas.
+
+Cada medição é comparada com a linha de base (corpus/linha_base.json).
+Acusa regressão quando uma contagem de instruções aumenta ou quando um
+tempo passa da linha de base mais a tolerância (e mais o mínimo em ms,
+para não acusar ruído em tempos muito curtos), e então sai com código 1.
+Um programa com tempo acima do aceito é medido de novo (--remedicoes
+vezes, guardando o menor tempo) antes de ser acusado: uma medição ruim
+num tempo de poucos ms não reprova o corpus.
+Os tempos da linha de base valem para a máquina em que foram medidos:
+rode com --atualizar na máquina de referência depois de uma mudança
+aceita.
+"""
+
+import argparse
+import glob
+import json
+import os
+import platform
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pipeline import compile_source, decode_source
+from replay import Player, Recording, replay
+from vm import VirtualMachine, parse_program
+from bench_scaling import best_time
+
+
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'corpus')
+BASELINE = os.path.join(CORPUS_DIR, 'linha_base.json')
+
+COUNTS = ('instrucoes_geradas', 'instrucoes_executadas')
+TIMES = ('compilacao_s', 'execucao_s')
+
+
+def recording_for(filename):
+    """Gravação ao lado do fonte; None se o programa não tiver uma"""
+    recording_file = os.path.splitext(filename)[0] + '.rec'
+    if os.path.exists(recording_file):
+        return Recording.load(recording_file)
+    return None
+
+
+def count_executed(instructions, recording):
+    vm = VirtualMachine(input_func=Player(recording).read, output_func=lambda value: None,
+                        verbose=False)
+    vm.instructions = instructions
+    return vm.run_slice(float('inf'))
+
+
+def measure(filename, repeats):
+    """Medições do programa; 'erro' ou 'diferencas' quando algo não confere"""
+    with open(filename, 'rb') as f:
+        code = decode_source(f.read())
+
+    compile_time, result = best_time(lambda: compile_source(code, 'pilha'), repeats)
+    if not result.ok:
+        return {'erro': "; ".join(str(diagnostic) for diagnostic in result.diagnostics)}
+
+    instructions = parse_program(result.instructions)
+    recording = recording_for(filename)
+    played = recording if recording is not None else Recording()
+    try:
+        executed = count_executed(instructions, played)
+        run_time, player = best_time(lambda: replay(instructions, played), repeats)
+    except Exception as e:
+        return {'erro': f"{type(e).__name__}: {e}"}
+
+    return {
+        'compilacao_s': round(compile_time, 6),
+        'instrucoes_geradas': len(instructions),
+        'instrucoes_executadas': executed,
+        'execucao_s': round(run_time, 6),
+        'diferencas': player.differences() if recording is not None else [],
+    }
+
+
+def regressions(current, baseline, tolerance, minimum, counts=True):
+    """Mensagens com o que piorou em relação à linha de base (só tempos se not counts)"""
+    problems = []
+    for key in COUNTS if counts else ():
+        if current[key] > baseline[key]:
+            problems.append(f"{key}: {baseline[key]} -> {current[key]}")
+    for key in TIMES:
+        old, new = baseline[key], current[key]
+        if new > old * (1 + tolerance) and new - old > minimum:
+            problems.append(f"{key}: {old * 1000:.2f} ms -> {new * 1000:.2f} ms "
+                            f"({(new / old - 1) * 100:+.0f}%)")
+    return problems
+
+
+def remeasure(filename, current, repeats):
+    """Mede de novo e fica com o menor de cada tempo"""
+    again = measure(filename, repeats)
+    if 'erro' not in again:
+        for key in TIMES:
+            current[key] = min(current[key], again[key])
+    return current
+
+
+def load_baseline(filename):
+    if not os.path.exists(filename):
+        return {}
+    with open(filename, 'r', encoding='utf-8') as f:
+        return json.load(f).get('programas', {})
+
+
+def save_baseline(filename, programs):
+    report = {'python': platform.python_version(), 'programas': programs}
+    with open(filename, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=1, ensure_ascii=False, sort_keys=True)
+        f.write("\n")
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(
+        description="Mede o corpus de programas e compara com a linha de base",
+        epilog="Exemplos: python benchmarks/bench_corpus.py | "
+               "python benchmarks/bench_corpus.py --atualizar | "
+               "python benchmarks/bench_corpus.py programa.php --tolerancia 0.5")
+    arg_parser.add_argument('programas', nargs='*',
+                            help="arquivos .php (padrão: benchmarks/corpus/*.php)")
+    arg_parser.add_argument('--repeticoes', type=int, default=5)
+    arg_parser.add_argument('--tolerancia', type=float, default=0.25,
+                            help="aumento relativo de tempo aceito (0.25 = 25%%)")
+    arg_parser.add_argument('--minimo-ms', type=float, default=5.0,
+                            help="aumento absoluto de tempo ignorado, em ms")
+    arg_parser.add_argument('--remedicoes', type=int, default=2,
+                            help="vezes que um programa com tempo pior é medido de novo antes de falhar")
+    arg_parser.add_argument('--linha-base', default=BASELINE, help="arquivo JSON da linha de base")
+    arg_parser.add_argument('--atualizar', action='store_true',
+                            help="grava as medições como a nova linha de base")
+    args = arg_parser.parse_args()
+
+    programs = args.programas or sorted(glob.glob(os.path.join(CORPUS_DIR, '*.php')))
+    if not programs:
+        arg_parser.error("nenhum programa para medir")
+
+    baseline = load_baseline(args.linha_base)
+    measured = {}
+    broken = []
+    failures = []
+
+    print(f"{'programa':16} {'compilação':>11} {'geradas':>8} {'executadas':>11} "
+          f"{'execução':>10} {'vs base':>8}  situação")
+    for filename in programs:
+        name = os.path.splitext(os.path.basename(filename))[0]
+        current = measure(filename, args.repeticoes)
+        if 'erro' in current:
+            print(f"{name:16} ERRO: {current['erro']}")
+            broken.append(f"{name}: {current['erro']}")
+            continue
+
+        old = baseline.get(name)
+        if current['diferencas']:
+            status = "SAÍDA DIFERENTE"
+            broken.extend(f"{name}: {difference}" for difference in current['diferencas'])
+        elif old is None:
+            status = "sem linha de base"
+        else:
+            minimum = args.minimo_ms / 1000
+            for _ in range(args.remedicoes):
+                if not regressions(current, old, args.tolerancia, minimum, counts=False):
+                    break
+                current = remeasure(filename, current, args.repeticoes)
+            problems = regressions(current, old, args.tolerancia, minimum)
+            status = "REGRESSÃO" if problems else "ok"
+            failures.extend(f"{name}: {problem}" for problem in problems)
+
+        change = ""
+        if old is not None and old['execucao_s'] > 0:
+            change = f"{(current['execucao_s'] / old['execucao_s'] - 1) * 100:+.0f}%"
+        print(f"{name:16} {current['compilacao_s'] * 1000:8.2f} ms {current['instrucoes_geradas']:8d} "
+              f"{current['instrucoes_executadas']:11d} {current['execucao_s'] * 1000:7.2f} ms "
+              f"{change:>8}  {status}")
+
+        del current['diferencas']
+        measured[name] = current
+
+    # Erros e saídas diferentes das gravadas nunca entram na linha de base
+    if broken:
+        print("ERROS:")
+        for problem in broken:
+            print(f"  {problem}")
+        sys.exit(1)
+
+    if args.atualizar:
+        baseline.update(measured)
+        save_baseline(args.linha_base, baseline)
+        print(f"Linha de base atualizada: {args.linha_base}")
+    elif failures:
+        print("REGRESSÕES:")
+        for failure in failures:
+            print(f"  {failure}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""
+Escalabilidade das Fases do Compilador
+
+Uso: python benchmarks/bench_scaling.py [--variar funcoes,comandos,profundidade]
+         [--pontos 5] [--repeticoes 3] [--limite 1.3] [--remedicoes 2]
+         [--json resultado.json]
+
+Para cada parâmetro do gerador sintético (program_generator.py) gera
+programas cada vez maiores, mede cada fase (léxico, sintático,
+semântico e geração de código nos dois backends) pelo melhor de N
+repetições e ajusta o expoente de crescimento: a inclinação da reta de
+mínimos quadrados de log(tempo) por log(tokens). Fase linear dá perto de
+1; quadrática, perto de 2. Sai com código 1 se alguma fase passar do
+limite (a folga acima de 1 absorve o ruído de cache e alocação dos
+programas maiores).
+
+Com poucos pontos um único tempo ruim basta para inclinar a reta: o
+ajuste exige pelo menos MIN_POINTS tamanhos, e uma fase acima do limite
+é medida de novo (--remedicoes vezes, guardando o menor tempo de cada
+tamanho) antes de ser acusada.
+"""
+
+import argparse
+import gc
+import json
+import math
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lexer import Lexer
+from parser import Parser
+from semantic_analyzer import SemanticAnalyzer
+from code_generator import VMCodeGenerator, RegisterCodeGenerator
+from program_generator import generate_program
+
+
+PHASES = ('lexico', 'sintatico', 'semantico', 'pilha', 'registradores')
+
+# Parâmetro variado -> (parâmetros fixos, valor inicial, próximo valor); um parâmetro
+# fixo pode ser uma função do valor variado
+SWEEPS = {
+    'funcoes': ({'statements': 20}, 10, lambda value: value * 2),
+    'comandos': ({'functions': 2}, 50, lambda value: value * 2),
+    'profundidade': ({'functions': 20, 'statements': 20}, 2, lambda value: value + 1),
+    'aninhamento': ({'functions': 20, 'statements': 40}, 1, lambda value: value + 1),
+    # Mais variáveis só aparecem no programa se houver comandos para usá-las
+    'variaveis': ({'functions': 2, 'statements': lambda value: value * 2}, 10,
+                  lambda value: value * 2),
+}
+PARAMETERS = {
+    'funcoes': 'functions',
+    'comandos': 'statements',
+    'profundidade': 'depth',
+    'aninhamento': 'nesting',
+    'variaveis': 'variables',
+}
+# Menos pontos que isso e o expoente fica à mercê de uma medição ruim
+MIN_POINTS = 4
+
+
+def best_time(function, repeats):
+    """Melhor tempo com o coletor de lixo desligado (como o timeit): as
+    coletas crescem com o número de objetos vivos e distorcem o expoente"""
+    best = None
+    result = None
+    for _ in range(repeats):
+        result = None
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            result = function()
+            elapsed = time.perf_counter() - start
+        finally:
+            gc.enable()
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def measure(code, repeats):
+    """Tokens e melhor tempo (s) de cada fase para o programa 'code'"""
+    times = {}
+    times['lexico'], tokens = best_time(lambda: Lexer(code).tokenize(), repeats)
+    times['sintatico'], ast = best_time(lambda: Parser(list(tokens)).parse(), repeats)
+    times['semantico'], _ = best_time(lambda: SemanticAnalyzer().analyze(ast), repeats)
+    times['pilha'], _ = best_time(lambda: VMCodeGenerator().generate(ast), repeats)
+    times['registradores'], _ = best_time(lambda: RegisterCodeGenerator().generate(ast), repeats)
+    return len(tokens), times
+
+
+def growth_exponent(sizes, times):
+    """Inclinação de log(tempo) x log(tamanho) por mínimos quadrados"""
+    xs = [math.log(size) for size in sizes]
+    ys = [math.log(max(elapsed, 1e-9)) for elapsed in times]
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(ys) / len(ys)
+    variance = sum((x - mean_x) ** 2 for x in xs)
+    if variance == 0:
+        return 0.0
+    return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / variance
+
+
+def sweep_program(name, value):
+    """Programa gerado com o parâmetro 'name' valendo 'value'"""
+    fixed = SWEEPS[name][0]
+    params = {key: fixed_value(value) if callable(fixed_value) else fixed_value
+              for key, fixed_value in fixed.items()}
+    params[PARAMETERS[name]] = value
+    return generate_program(**params)
+
+
+def exponents_of(rows):
+    sizes = [row['tokens'] for row in rows]
+    return {phase: growth_exponent(sizes, [row['tempos_s'][phase] for row in rows])
+            for phase in PHASES}
+
+
+def sweep(name, points, repeats):
+    """Mede as fases com o parâmetro 'name' crescendo; devolve as linhas e os expoentes"""
+    _, value, step = SWEEPS[name]
+    rows = []
+    for _ in range(points):
+        tokens, times = measure(sweep_program(name, value), repeats)
+        rows.append({'valor': value, 'tokens': tokens,
+                     'tempos_s': {phase: round(times[phase], 6) for phase in PHASES}})
+        value = step(value)
+    return rows, exponents_of(rows)
+
+
+def remeasure(name, rows, repeats):
+    """Mede de novo cada tamanho e fica com o menor tempo; devolve os novos expoentes"""
+    for row in rows:
+        _, times = measure(sweep_program(name, row['valor']), repeats)
+        for phase in PHASES:
+            row['tempos_s'][phase] = round(min(row['tempos_s'][phase], times[phase]), 6)
+    return exponents_of(rows)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Mede como cada fase do compilador cresce com o programa")
+    arg_parser.add_argument('--variar', default=','.join(SWEEPS),
+                            help=f"parâmetros a variar, separados por vírgula (padrão: todos, "
+                                 f"{', '.join(SWEEPS)})")
+    arg_parser.add_argument('--pontos', type=int, default=5,
+                            help=f"tamanhos medidos por parâmetro (mínimo: {MIN_POINTS})")
+    arg_parser.add_argument('--repeticoes', type=int, default=3)
+    arg_parser.add_argument('--limite', type=float, default=1.3,
+                            help="maior expoente aceito antes de acusar crescimento superlinear")
+    arg_parser.add_argument('--remedicoes', type=int, default=2,
+                            help="vezes que uma fase acima do limite é medida de novo antes de falhar")
+    arg_parser.add_argument('--json', metavar='ARQUIVO', default=None, help="grava as medições em JSON")
+    args = arg_parser.parse_args()
+
+    if args.pontos < MIN_POINTS:
+        arg_parser.error(f"--pontos precisa ser pelo menos {MIN_POINTS}")
+    names = [name for name in args.variar.split(',') if name]
+    for name in names:
+        if name not in SWEEPS:
+            arg_parser.error(f"parâmetro desconhecido: {name}")
+
+    report = {}
+    failures = []
+    for name in names:
+        rows, exponents = sweep(name, args.pontos, args.repeticoes)
+        for _ in range(args.remedicoes):
+            if all(value <= args.limite for value in exponents.values()):
+                break
+            exponents = remeasure(name, rows, args.repeticoes)
+        report[name] = {'medicoes': rows, 'expoentes': {phase: round(value, 3)
+                                                        for phase, value in exponents.items()}}
+
+        print(f"variando {name}:")
+        print(f"  {'valor':>6} {'tokens':>8} " + " ".join(f"{phase:>13}" for phase in PHASES))
+        for row in rows:
+            print(f"  {row['valor']:6d} {row['tokens']:8d} " +
+                  " ".join(f"{row['tempos_s'][phase] * 1000:10.2f} ms" for phase in PHASES))
+        print(f"  {'expoente':>15} " + " ".join(f"{exponents[phase]:13.2f}" for phase in PHASES))
+        for phase in PHASES:
+            if exponents[phase] > args.limite:
+                failures.append(f"{phase} cresce com expoente {exponents[phase]:.2f} variando {name}")
+        print()
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=1, ensure_ascii=False)
+
+    if failures:
+        print("SUPERLINEAR:")
+        for failure in failures:
+            print(f"  {failure}")
+        sys.exit(1)
+    print(f"Todas as fases com expoente até {args.limite}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,344 @@
+"""
+Microbenchmarks da Máquina Virtual por Família de Instruções
+
+Uso: python benchmarks/bench_vm.py [--kernels aritmetica,eco]
+         [--motores interpretador,verificado,aot,jit] [--escala 1.0]
+         [--repeticoes 3] [--json resultado.json] [--comparar anterior.json]
+
+Dois tipos de kernel:
+- micro: um laço montado à mão em .asm cujo corpo (repetido UNROLL
+  vezes) usa uma só família de instruções: cargas e armazenamentos,
+  aritmética, comparações, desvios e chamada/retorno;
+- macro: programas LALG-PHP compilados pelo VMCodeGenerator, como laços
+  aninhados, árvore de chamadas e eco com muita entrada e saída.
+
+Cada kernel roda em todos os motores da máquina de pilha sobre o mesmo
+programa: interpretador (VirtualMachine.run), verificado (laço rápido
+de run_verified), aot (translator.py) e jit (jit.py). As instruções
+executadas são contadas uma vez no interpretador, então instruções por
+segundo é comparável entre motores. Verificação e tradução ficam fora do
+tempo medido; os traços do JIT são gravados e compilados dentro dele.
+
+Com --json as medições são gravadas; com --comparar mostra a variação
+em relação a um JSON anterior, para ver regressões entre versões.
+"""
+
+import argparse
+import gc
+import itertools
+import json
+import os
+import platform
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pipeline import compile_source
+from vm import VirtualMachine, parse_program
+from jit import JITVirtualMachine
+from translator import translate
+
+
+ENGINES = ('interpretador', 'verificado', 'aot', 'jit')
+
+# Cópias do corpo de um microbenchmark por volta do laço
+UNROLL = 10
+MICRO_ITERATIONS = 2000
+MACRO_ITERATIONS = 200
+INPUTS = ('3', '7.5', '-2', '10')
+
+
+def assemble(lines):
+    """
+    Monta um programa .asm com rótulos: 'nome:' marca a próxima
+    instrução e o operando ':nome' vira o número da linha dela
+    """
+    labels = {}
+    instructions = []
+    for line in lines:
+        if line.endswith(':'):
+            labels[line[:-1]] = len(instructions) + 1
+        else:
+            instructions.append(line)
+
+    program = []
+    for instruction in instructions:
+        parts = instruction.split()
+        if len(parts) == 2 and parts[1].startswith(':'):
+            instruction = f"{parts[0]} {labels[parts[1][1:]]}"
+        program.append(instruction)
+    return program
+
+
+def micro_program(body, iterations, functions=()):
+    """
+    Laço de 'iterations' voltas com body(k) repetido UNROLL vezes.
+    Memória: 0 é o contador e 1 a 3 ficam livres para o corpo. No fim
+    as quatro posições são impressas, para a saída de cada motor poder
+    ser conferida com a do interpretador.
+    """
+    lines = ['INPP', 'ALME 4', 'CRCT 1', 'ARMZ 1', 'CRCT 0', 'ARMZ 0',
+             'laco:', 'CRVL 0', f'CRCT {iterations}', 'CPME', 'DSVF :fim']
+    for k in range(UNROLL):
+        lines.extend(body(k))
+    lines.extend(['CRVL 0', 'CRCT 1', 'SOMA', 'ARMZ 0', 'DSVI :laco', 'fim:'])
+    for address in range(4):
+        lines.extend([f'CRVL {address}', 'IMPR'])
+    lines.append('PARA')
+    lines.extend(functions)
+    return assemble(lines)
+
+
+def loads_stores(k):
+    return ['CRVL 1', 'ARMZ 2', 'CRVL 2', 'ARMZ 3', 'CRCT 5', 'ARMZ 1']
+
+
+def arithmetic(k):
+    # x = ((x + 2) * 3 - 2) / 4 converge para 4, sem estourar
+    return ['CRVL 1', 'CRCT 2', 'SOMA', 'CRCT 3', 'MULT', 'CRCT 2', 'SUBT',
+            'CRCT 4', 'DIVI', 'ARMZ 1']
+
+
+def comparisons(k):
+    return ['CRVL 1', 'CRCT 2', 'CMAI', 'CRCT 1', 'CMIG', 'CRCT 0', 'CMDG',
+            'CRCT 2', 'CPME', 'CRCT 0', 'CMAG', 'CRCT 1', 'CPMI', 'ARMZ 2']
+
+
+def branches(k):
+    # DSVF não tomado, DSVF tomado e DSVI, todos para logo adiante
+    return ['CRCT 1', f'DSVF :b{k}', 'CRCT 0', f'DSVF :a{k}',
+            f'a{k}:', f'DSVI :b{k}', f'b{k}:']
+
+
+def calls(k):
+    return [f'PUSHER :r{k}', 'CRVL 1', 'CHPR :proc', f'r{k}:']
+
+
+CALLED_PROCEDURE = ['proc:', 'ALME 1', 'CRVL 8', 'ARMZ 2', 'RTPR']
+
+
+NESTED_LOOPS = """<?php
+$total = 1;
+$i = 1;
+while ($i <= {n}) {{
+    $j = 1;
+    while ($j <= 20) {{
+        $total = $total + $i * $j - ($j / 2);
+        $j = $j + 1;
+    }}
+    $i = $i + 1;
+}}
+echo $total;
+?>
+"""
+
+# Árvore de chamadas: cada volta faz 2 + 4 + 8 chamadas abaixo de no3
+CALL_TREE = """<?php
+function folha($a) {{
+    $b = $a * 2 + 1;
+}}
+function no1($a) {{
+    folha($a);
+    folha($a + 1);
+}}
+function no2($a) {{
+    no1($a);
+    no1($a + 2);
+}}
+function no3($a) {{
+    no2($a);
+    no2($a + 4);
+}}
+$i = 1;
+while ($i <= {n}) {{
+    no3($i);
+    $i = $i + 1;
+}}
+echo $i;
+?>
+"""
+
+ECHO = """<?php
+$i = 1;
+while ($i <= {n}) {{
+    $x = floatval(readline());
+    echo $x;
+    echo $x * 2;
+    echo $i;
+    $i = $i + 1;
+}}
+?>
+"""
+
+
+def macro_program(source, iterations):
+    result = compile_source(source.format(n=iterations), 'pilha')
+    if not result.ok:
+        raise ValueError("; ".join(str(diagnostic) for diagnostic in result.diagnostics))
+    return parse_program(result.instructions)
+
+
+# Nome -> (tipo, família, construtor do programa com o número de voltas, voltas padrão)
+KERNELS = {
+    'carga_armazenamento': ('micro', 'CRVL/ARMZ/CRCT',
+                            lambda n: micro_program(loads_stores, n), MICRO_ITERATIONS),
+    'aritmetica': ('micro', 'SOMA/SUBT/MULT/DIVI',
+                   lambda n: micro_program(arithmetic, n), MICRO_ITERATIONS),
+    'comparacao': ('micro', 'CMAI/CPMI/CMAG/CPME/CMIG/CMDG',
+                   lambda n: micro_program(comparisons, n), MICRO_ITERATIONS),
+    'desvio': ('micro', 'DSVF/DSVI',
+               lambda n: micro_program(branches, n), MICRO_ITERATIONS),
+    'chamada': ('micro', 'PUSHER/CHPR/ALME/RTPR',
+                lambda n: micro_program(calls, n, CALLED_PROCEDURE), MICRO_ITERATIONS),
+    'lacos_aninhados': ('macro', 'laços aninhados',
+                        lambda n: macro_program(NESTED_LOOPS, n), MACRO_ITERATIONS),
+    'arvore_chamadas': ('macro', 'chamadas em árvore',
+                        lambda n: macro_program(CALL_TREE, n), MACRO_ITERATIONS),
+    'eco': ('macro', 'LEIT/IMPR',
+            lambda n: macro_program(ECHO, n), MACRO_ITERATIONS * 10),
+}
+
+
+def new_vm(vm_class, instructions, outputs):
+    feed = itertools.cycle(INPUTS)
+    vm = vm_class(input_func=lambda prompt='': next(feed),
+                  output_func=outputs.append, verbose=False)
+    vm.instructions = instructions
+    return vm
+
+
+def count_executed(instructions):
+    """Instruções executadas pelo interpretador e a saída produzida"""
+    outputs = []
+    vm = new_vm(VirtualMachine, instructions, outputs)
+    return vm.run_slice(float('inf')), outputs
+
+
+def prepare(engine, instructions):
+    """Função que executa o programa uma vez no motor e devolve a saída"""
+    if engine == 'verificado':
+        verified = new_vm(VirtualMachine, instructions, []).verify()
+    elif engine == 'aot':
+        program = translate(instructions)
+
+    def run():
+        outputs = []
+        vm = new_vm(JITVirtualMachine if engine == 'jit' else VirtualMachine,
+                    instructions, outputs)
+        if engine == 'verificado':
+            vm.verified = verified
+            vm.execute()
+        elif engine == 'aot':
+            program.run(vm)
+        else:
+            vm.execute()
+        return outputs
+
+    return run
+
+
+def best_time(function, repeats):
+    """Melhor tempo com o coletor de lixo desligado (como o timeit)"""
+    best = None
+    result = None
+    for _ in range(repeats):
+        result = None
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            result = function()
+            elapsed = time.perf_counter() - start
+        finally:
+            gc.enable()
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def benchmark(name, engines, scale, repeats):
+    kind, family, build, iterations = KERNELS[name]
+    instructions = build(max(1, int(iterations * scale)))
+    executed, expected = count_executed(instructions)
+
+    results = {}
+    for engine in engines:
+        elapsed, outputs = best_time(prepare(engine, instructions), repeats)
+        results[engine] = {
+            'tempo_s': round(elapsed, 6),
+            'instrucoes_por_s': round(executed / elapsed) if elapsed > 0 else 0,
+            'saida_confere': outputs == expected,
+        }
+    return {'tipo': kind, 'familia': family, 'instrucoes': len(instructions),
+            'executadas': executed, 'motores': results}
+
+
+def load_previous(filename):
+    with open(filename, 'r', encoding='utf-8') as f:
+        return json.load(f).get('kernels', {})
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(
+        description="Mede instruções por segundo da VM por família de instruções e por motor")
+    arg_parser.add_argument('--kernels', default=','.join(KERNELS),
+                            help=f"kernels separados por vírgula ({', '.join(KERNELS)})")
+    arg_parser.add_argument('--motores', default=','.join(ENGINES),
+                            help=f"motores separados por vírgula ({', '.join(ENGINES)})")
+    arg_parser.add_argument('--escala', type=float, default=1.0,
+                            help="multiplica o número de voltas de cada kernel")
+    arg_parser.add_argument('--repeticoes', type=int, default=3)
+    arg_parser.add_argument('--json', metavar='ARQUIVO', default=None, help="grava as medições em JSON")
+    arg_parser.add_argument('--comparar', metavar='ARQUIVO', default=None,
+                            help="JSON de uma execução anterior para comparar")
+    args = arg_parser.parse_args()
+
+    names = [name for name in args.kernels.split(',') if name]
+    engines = [engine for engine in args.motores.split(',') if engine]
+    for name in names:
+        if name not in KERNELS:
+            arg_parser.error(f"kernel desconhecido: {name}")
+    for engine in engines:
+        if engine not in ENGINES:
+            arg_parser.error(f"motor desconhecido: {engine}")
+
+    previous = load_previous(args.comparar) if args.comparar else {}
+
+    kernels = {}
+    mismatches = []
+    print(f"{'kernel':20} {'motor':13} {'executadas':>10} {'tempo (ms)':>11} "
+          f"{'instr/s':>12} {'ganho':>7}" + (f" {'vs anterior':>12}" if previous else ""))
+    for name in names:
+        result = benchmark(name, engines, args.escala, args.repeticoes)
+        kernels[name] = result
+        base = result['motores'][engines[0]]['tempo_s']
+        for engine, measures in result['motores'].items():
+            elapsed = measures['tempo_s']
+            speedup = base / elapsed if elapsed > 0 else 0.0
+            line = (f"{name:20} {engine:13} {result['executadas']:10d} {elapsed * 1000:11.2f} "
+                    f"{measures['instrucoes_por_s']:12d} {speedup:6.2f}x")
+            old = previous.get(name, {}).get('motores', {}).get(engine)
+            if old and old.get('instrucoes_por_s'):
+                change = measures['instrucoes_por_s'] / old['instrucoes_por_s'] - 1
+                line += f" {change * 100:+11.1f}%"
+            print(line)
+            if not measures['saida_confere']:
+                mismatches.append(f"{name} ({engine})")
+
+    if args.json:
+        report = {
+            'python': platform.python_version(),
+            'data': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'escala': args.escala,
+            'kernels': kernels,
+        }
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=1, ensure_ascii=False)
+
+    if mismatches:
+        print(f"AVISO: saída diferente do interpretador em {', '.join(mismatches)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
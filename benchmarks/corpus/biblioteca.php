@@ -0,0 +1,125 @@
+<?php
+/* Biblioteca de funcoes de calculo usada por um programa principal */
+$base = 0.0;
+$altura = 0.0;
+$taxa = 0.0;
+$rodada = 0.0;
+
+function areaRetangulo($b, $h) {
+    $area = $b * $h;
+    echo $area . PHP_EOL;
+}
+
+function areaTriangulo($b, $h) {
+    $area = $b * $h / 2;
+    echo $area . PHP_EOL;
+}
+
+function areaCirculo($r) {
+    $area = 3.14159 * $r * $r;
+    echo $area . PHP_EOL;
+}
+
+function perimetro($b, $h) {
+    $p = 2 * $b + 2 * $h;
+    echo $p . PHP_EOL;
+}
+
+function media($a, $b, $c) {
+    $m = ($a + $b + $c) / 3;
+    echo $m . PHP_EOL;
+}
+
+function imc($peso, $centimetros) {
+    $indice = $peso * 10000 / ($centimetros * $centimetros);
+    if ($indice >= 25) {
+        echo 1 . PHP_EOL;
+    } else {
+        echo 0 . PHP_EOL;
+    }
+}
+
+function fahrenheit($celsius) {
+    $f = $celsius * 9 / 5 + 32;
+    echo $f . PHP_EOL;
+}
+
+function desconto($preco, $taxa) {
+    $final = $preco - $preco * $taxa / 100;
+    echo $final . PHP_EOL;
+}
+
+function jurosSimples($capital, $taxa, $meses) {
+    $juros = $capital * $taxa / 100 * $meses;
+    echo $juros . PHP_EOL;
+}
+
+function potencia($base, $expoente) {
+    $resultado = 1.0;
+    $i = 1.0;
+    while ($i <= $expoente) {
+        $resultado = $resultado * $base;
+        $i = $i + 1;
+    }
+    echo $resultado . PHP_EOL;
+}
+
+function fatorial($n) {
+    $resultado = 1.0;
+    $i = 2.0;
+    while ($i <= $n) {
+        $resultado = $resultado * $i;
+        $i = $i + 1;
+    }
+    echo $resultado . PHP_EOL;
+}
+
+function somaPA($primeiro, $razao, $pares) {
+    $soma = $primeiro;
+    $termo = $primeiro + $razao;
+    $i = 2.0;
+    $limite = $pares * 2;
+    while ($i <= $limite) {
+        $soma = $soma + $termo;
+        $termo = $termo + $razao;
+        $i = $i + 1;
+    }
+    echo $soma . PHP_EOL;
+}
+
+function classificar($nota) {
+    if ($nota >= 7) {
+        echo 3 . PHP_EOL;
+    } else {
+        if ($nota >= 5) {
+            echo 2 . PHP_EOL;
+        } else {
+            echo 1 . PHP_EOL;
+        }
+    }
+}
+
+/* Corpo principal */
+
+$base = floatval(readline());
+$altura = floatval(readline());
+$taxa = floatval(readline());
+
+$rodada = 1;
+while ($rodada <= 25) {
+    areaRetangulo($base, $altura);
+    areaTriangulo($base, $altura);
+    areaCirculo($rodada);
+    perimetro($base + $rodada, $altura);
+    media($base, $altura, $rodada);
+    imc($base * 10, $altura);
+    fahrenheit($rodada * 4);
+    desconto($base * 100, $taxa);
+    jurosSimples($base * 1000, $taxa, $rodada);
+    potencia(2, $rodada);
+    fatorial($rodada);
+    somaPA($base, $taxa, $rodada);
+    classificar($rodada / 3);
+    $rodada = $rodada + 1;
+}
+?>
@@ -0,0 +1,39 @@
+<?php
+/* Caixa de mercado: cada cliente informa seus itens */
+$clientes = 0.0;
+$cliente = 0.0;
+$itens = 0.0;
+$desconto = 0.0;
+
+/* Le 'quantidade' precos, mostra o subtotal e o total com desconto */
+function atender($quantidade, $desconto) {
+    $preco = 0.0;
+    $total = 0.0;
+    $item = 0.0;
+
+    $item = 1;
+    while ($item <= $quantidade) {
+        $preco = floatval(readline());
+        $total = $total + $preco;
+        echo $total . PHP_EOL;
+        $item = $item + 1;
+    }
+
+    if ($total >= 100) {
+        $total = $total - $total * $desconto / 100;
+    }
+    echo $total . PHP_EOL;
+}
+
+/* Corpo principal */
+
+$clientes = floatval(readline());
+$desconto = floatval(readline());
+
+$cliente = 1;
+while ($cliente <= $clientes) {
+    $itens = floatval(readline());
+    atender($itens, $desconto);
+    $cliente = $cliente + 1;
+}
+?>
@@ -0,0 +1,38 @@
+<?php
+/* Le as notas de uma turma e mostra estatisticas */
+$alunos = 0.0;
+$nota = 0.0;
+$soma = 0.0;
+$maior = 0.0;
+$menor = 0.0;
+$aprovados = 0.0;
+$i = 0.0;
+
+$alunos = floatval(readline());
+
+$maior = 0 - 1;
+$menor = 11;
+$i = 1;
+while ($i <= $alunos) {
+    $nota = floatval(readline());
+    $soma = $soma + $nota;
+    if ($nota > $maior) {
+        $maior = $nota;
+    }
+    if ($nota < $menor) {
+        $menor = $nota;
+    }
+    if ($nota >= 6) {
+        $aprovados = $aprovados + 1;
+        echo 1 . PHP_EOL;
+    } else {
+        echo 0 . PHP_EOL;
+    }
+    $i = $i + 1;
+}
+
+echo $soma / $alunos . PHP_EOL;
+echo $maior . PHP_EOL;
+echo $menor . PHP_EOL;
+echo $aprovados . PHP_EOL;
+?>
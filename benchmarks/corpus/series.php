@@ -0,0 +1,41 @@
+<?php
+/* Series numericas sem entrada: laços longos de aritmetica */
+
+/* Aproximacao de pi pela serie de Leibniz */
+$soma = 0.0;
+$termo = 1;
+$sinal = 1;
+$k = 1;
+while ($k <= 3000) {
+    $soma = $soma + $sinal * (4 / $termo);
+    $termo = $termo + 2;
+    $sinal = 0 - $sinal;
+    $k = $k + 1;
+}
+echo $soma . PHP_EOL;
+
+/* Raiz quadrada de 1 a 40 pelo metodo de Newton */
+$x = 1;
+while ($x <= 40) {
+    $r = $x;
+    $passo = 1;
+    while ($passo <= 12) {
+        $r = ($r + $x / $r) / 2;
+        $passo = $passo + 1;
+    }
+    echo $r . PHP_EOL;
+    $x = $x + 1;
+}
+
+/* Sequencia de Fibonacci */
+$a = 1;
+$b = 1;
+$i = 3;
+while ($i <= 70) {
+    $c = $a + $b;
+    $a = $b;
+    $b = $c;
+    $i = $i + 1;
+}
+echo $b . PHP_EOL;
+?>
@@ -0,0 +1,45 @@
+<?php
+/* Laços aninhados: tabuada completa e somas de produtos */
+
+$i = 1;
+while ($i <= 12) {
+    $j = 1;
+    while ($j <= 12) {
+        echo $i * $j . PHP_EOL;
+        $j = $j + 1;
+    }
+    $i = $i + 1;
+}
+
+/* Soma de i * j * k para i, j, k de 1 a 15 */
+$total = 0.0;
+$i = 1;
+while ($i <= 15) {
+    $j = 1;
+    while ($j <= 15) {
+        $k = 1;
+        while ($k <= 15) {
+            $total = $total + $i * $j * $k;
+            $k = $k + 1;
+        }
+        $j = $j + 1;
+    }
+    $i = $i + 1;
+}
+echo $total . PHP_EOL;
+
+/* Quantos pares (i, j) com i < j somam mais que 20 */
+$pares = 0.0;
+$i = 1;
+while ($i <= 30) {
+    $j = $i + 1;
+    while ($j <= 30) {
+        if (($i + $j) > 20) {
+            $pares = $pares + 1;
+        }
+        $j = $j + 1;
+    }
+    $i = $i + 1;
+}
+echo $pares . PHP_EOL;
+?>
@@ -0,0 +1,167 @@
+"""
+Gerador de Programas LALG-PHP Sintéticos
+
+Uso: python benchmarks/program_generator.py [--funcoes 10] [--comandos 20]
+         [--profundidade 3] [--aninhamento 2] [--variaveis 8] [--leituras 0]
+         [--semente 0] [-o programa.php]
+
+Gera programas válidos (passam pelas análises léxica, sintática e
+semântica) com o tamanho controlado por parâmetros:
+
+- funcoes: funções declaradas; cada uma só chama funções anteriores;
+- comandos: comandos do corpo de cada função e do programa principal
+  (blocos aninhados têm NESTED_STATEMENTS);
+- profundidade: profundidade das expressões aritméticas;
+- aninhamento: if/while aninhados dentro de um bloco;
+- variaveis: variáveis globais e locais de cada função;
+- leituras: floatval(readline()) no início do programa principal.
+
+Toda variável é atribuída antes de ser lida, os laços contam até um
+limite pequeno e as divisões são só por constantes diferentes de zero.
+Os programas servem para medir o compilador: executá-los só é seguro com
+poucas variáveis, porque a VM tem 100 posições de memória e as locais de
+toda função começam no endereço 8. A mesma semente gera sempre o mesmo
+programa.
+"""
+
+import argparse
+import random
+
+
+LOOP_LIMIT = 3
+# Comandos de um bloco aninhado (if/else/while): fixo, para o tamanho crescer linearmente
+NESTED_STATEMENTS = 4
+
+
+class ProgramGenerator:
+
+    def __init__(self, functions=10, statements=20, depth=3, nesting=2, variables=8,
+                 reads=0, seed=0):
+        self.functions = functions
+        self.statements = statements
+        self.depth = depth
+        self.nesting = nesting
+        self.variables = max(variables, 1)
+        self.reads = reads
+        self.random = random.Random(seed)
+        self.lines = []
+        self.loops = 0
+
+    def generate(self):
+        """Texto do programa"""
+        self.lines = ["<?php"]
+        declared = []
+        for index in range(self.functions):
+            name = f"f{index}"
+            params = [f"$p{i}" for i in range(self.random.randint(0, 3))]
+            self.emit(0, f"function {name}({', '.join(params)}) {{")
+            local = [f"$l{i}" for i in range(self.variables)]
+            self.block(1, list(params), local, declared, self.statements)
+            self.emit(0, "}")
+            declared.append((name, len(params)))
+
+        names = [f"$g{i}" for i in range(self.variables)]
+        known = []
+        for name in names[:self.reads]:
+            self.emit(0, f"{name} = floatval(readline());")
+            known.append(name)
+        self.block(0, known, names, declared, self.statements)
+        self.lines.append("?>")
+        return "\n".join(self.lines) + "\n"
+
+    def emit(self, level, text):
+        self.lines.append("    " * level + text)
+
+    def block(self, level, known, names, functions, count, nesting=0):
+        """'count' comandos; 'known' são as variáveis já atribuídas (alterada no lugar)"""
+        # Começa atribuindo uma variável para sempre haver o que ler
+        if not known:
+            self.assign(level, known, names)
+            count -= 1
+
+        for _ in range(count):
+            choice = self.random.random()
+            if choice < 0.15 and nesting < self.nesting:
+                self.emit(level, f"if ({self.condition(known)}) {{")
+                self.block(level + 1, list(known), names, functions,
+                           NESTED_STATEMENTS, nesting + 1)
+                self.emit(level, "} else {")
+                self.block(level + 1, list(known), names, functions,
+                           NESTED_STATEMENTS, nesting + 1)
+                self.emit(level, "}")
+            elif choice < 0.25 and nesting < self.nesting:
+                self.loop(level, known, names, functions, nesting)
+            elif choice < 0.4 and functions:
+                name, params = self.random.choice(functions)
+                arguments = ", ".join(self.expression(known, 1) for _ in range(params))
+                self.emit(level, f"{name}({arguments});")
+            elif choice < 0.5:
+                self.emit(level, f"echo {self.expression(known, self.depth)};")
+            else:
+                self.assign(level, known, names)
+
+    def assign(self, level, known, names):
+        name = self.random.choice(names)
+        value = self.expression(known, self.depth) if known else str(self.random.randint(1, 9))
+        self.emit(level, f"{name} = {value};")
+        if name not in known:
+            known.append(name)
+
+    def loop(self, level, known, names, functions, nesting):
+        counter = f"$c{self.loops}"
+        self.loops += 1
+        self.emit(level, f"{counter} = 1;")
+        known.append(counter)
+        self.emit(level, f"while ({counter} <= {LOOP_LIMIT}) {{")
+        self.block(level + 1, list(known), names, functions, NESTED_STATEMENTS, nesting + 1)
+        self.emit(level + 1, f"{counter} = {counter} + 1;")
+        self.emit(level, "}")
+
+    def condition(self, known):
+        operator = self.random.choice(('<', '>', '<=', '>=', '==', '!='))
+        return f"{self.expression(known, 1)} {operator} {self.expression(known, 1)}"
+
+    def expression(self, known, depth):
+        if depth <= 0 or self.random.random() < 0.2:
+            if known and self.random.random() < 0.7:
+                return self.random.choice(known)
+            return str(self.random.randint(1, 9))
+
+        operator = self.random.choice('+-*/')
+        left = self.expression(known, depth - 1)
+        if operator == '/':
+            return f"({left} / {self.random.randint(1, 9)})"
+        return f"({left} {operator} {self.expression(known, depth - 1)})"
+
+
+def generate_program(functions=10, statements=20, depth=3, nesting=2, variables=8,
+                     reads=0, seed=0):
+    return ProgramGenerator(functions, statements, depth, nesting, variables, reads,
+                            seed).generate()
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Gera um programa LALG-PHP válido e sintético")
+    arg_parser.add_argument('--funcoes', type=int, default=10)
+    arg_parser.add_argument('--comandos', type=int, default=20,
+                            help="comandos por função e no programa principal")
+    arg_parser.add_argument('--profundidade', type=int, default=3, help="profundidade das expressões")
+    arg_parser.add_argument('--aninhamento', type=int, default=2, help="if/while aninhados")
+    arg_parser.add_argument('--variaveis', type=int, default=8)
+    arg_parser.add_argument('--leituras', type=int, default=0,
+                            help="variáveis globais lidas com readline()")
+    arg_parser.add_argument('--semente', type=int, default=0)
+    arg_parser.add_argument('-o', '--saida', default=None, help="arquivo .php (padrão: saída padrão)")
+    args = arg_parser.parse_args()
+
+    code = generate_program(args.funcoes, args.comandos, args.profundidade, args.aninhamento,
+                            args.variaveis, args.leituras, args.semente)
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as f:
+            f.write(code)
+    else:
+        print(code, end="")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,264 @@
+"""
+Cache de Compilação Endereçado por Conteúdo
+
+A chave de cada entrada é o SHA-256 dos bytes do fonte, da versão do
+compilador e das opções (backend e conteúdo do perfil PGO). A entrada
+guarda o programa gerado, a tabela instrução -> linha e os diagnósticos:
+um arquivo que não mudou custa um hash e uma leitura. Erros de
+compilação também ficam no cache. Os arquivos objeto da compilação
+separada (linker.py) ficam no mesmo cache, com chaves do tipo 'objeto'.
+
+A versão do compilador é o hash dos fontes dos próprios módulos do
+compilador, então qualquer mudança no léxico, no parser ou nos geradores
+invalida as entradas antigas sem depender de alguém trocar um número.
+
+Cada entrada é um arquivo JSON em diretorio/ab/cdef....json, gravado num
+arquivo temporário e renomeado (os.replace): quem lê nunca vê uma
+entrada pela metade, mesmo com vários processos compilando juntos. O
+tamanho total é limitado; quando passa do limite, as entradas usadas há
+mais tempo (mtime, renovado a cada acerto) são apagadas até o total cair
+para 80% do limite.
+
+    cache = CompileCache('.lalg-cache')
+    result = cache.compile(open('programa.php', 'rb').read())
+    print(cache.summary())
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import tempfile
+from functools import lru_cache
+
+from pipeline import CompileResult, Diagnostic, compile_source, decode_source
+
+
+DEFAULT_DIRECTORY = '.lalg-cache'
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+LOW_WATER = 0.8
+FORMAT_VERSION = 1
+
+# Módulos cujo código decide o programa gerado
+COMPILER_MODULES = ('tokens', 'lexer', 'ast_nodes', 'parser', 'semantic_analyzer',
+                    'code_generator', 'source_map', 'pgo', 'pipeline', 'incremental', 'linker')
+
+
+@lru_cache(maxsize=None)
+def compiler_version():
+    """Hash dos fontes dos módulos do compilador (calculado uma vez por processo)"""
+    digest = hashlib.sha256()
+    directory = os.path.dirname(os.path.abspath(__file__))
+    for name in COMPILER_MODULES:
+        with open(os.path.join(directory, name + '.py'), 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+def cache_key(source, backend='pilha', profile_data=b'', kind='programa'):
+    """Chave de 'source' (bytes) compilado com estas opções ('kind': programa ou objeto)"""
+    options = {
+        'formato': FORMAT_VERSION,
+        'tipo': kind,
+        'compilador': compiler_version(),
+        'backend': backend,
+        'pgo': hashlib.sha256(profile_data).hexdigest() if profile_data else None,
+    }
+    digest = hashlib.sha256(json.dumps(options, sort_keys=True).encode('utf-8'))
+    digest.update(b'\0')
+    digest.update(source)
+    return digest.hexdigest()
+
+
+def encode_result(result):
+    return json.dumps({
+        'instrucoes': result.instructions,
+        'linhas': result.line_table,
+        'diagnosticos': [[d.kind, d.message, d.line] for d in result.diagnostics],
+        'decisoes': result.decisions,
+    }, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def decode_result(data):
+    entry = json.loads(data)
+    diagnostics = [Diagnostic(kind, message, line) for kind, message, line in entry['diagnosticos']]
+    return CompileResult(entry['instrucoes'], entry['linhas'], diagnostics, entry['decisoes'])
+
+
+class CompileCache:
+
+    def __init__(self, directory=DEFAULT_DIRECTORY, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        self._total = None  # tamanho total, calculado na primeira gravação
+
+    def path(self, key):
+        return os.path.join(self.directory, key[:2], key[2:] + '.json')
+
+    def key(self, source, backend='pilha', profile_file=None):
+        profile_data = b''
+        if profile_file:
+            with open(profile_file, 'rb') as f:
+                profile_data = f.read()
+        return cache_key(source, backend, profile_data)
+
+    def get(self, key, decode=decode_result):
+        """CompileResult (ou o que 'decode' devolver) guardado em 'key', ou None"""
+        path = self.path(key)
+        try:
+            with open(path, 'rb') as f:
+                result = decode(f.read())
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, ValueError, KeyError, TypeError):
+            # Entrada corrompida: trata como falta e deixa ser regravada
+            self.misses += 1
+            self._remove(path)
+            return None
+
+        try:
+            os.utime(path)  # marca como usada recentemente
+        except OSError:
+            pass
+        self.hits += 1
+        return result
+
+    def put(self, key, result, encode=encode_result):
+        data = encode(result)
+        path = self.path(key)
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+
+        fd, temporary = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(temporary, path)
+        except BaseException:
+            self._remove(temporary)
+            raise
+        self.writes += 1
+
+        if self._total is None:
+            self._total = self.size()
+        else:
+            self._total += len(data)
+        if self._total > self.max_bytes:
+            self.evict()
+
+    def compile(self, source, backend='pilha', profile_file=None):
+        """Compila 'source' (bytes) ou reaproveita o resultado guardado"""
+        key = self.key(source, backend, profile_file)
+        result = self.get(key)
+        if result is not None:
+            return result
+
+        profile = None
+        if profile_file:
+            from pgo import PGOProfile
+            profile = PGOProfile.load(profile_file)
+        try:
+            result = compile_source(decode_source(source), backend, profile)
+        except UnicodeDecodeError as e:
+            return CompileResult(diagnostics=[Diagnostic('leitura', str(e))])
+
+        # Erros internos podem ser passageiros; só erros do programa ficam guardados
+        if all(diagnostic.kind != 'interno' for diagnostic in result.diagnostics):
+            self.put(key, result)
+        return result
+
+    def entries(self):
+        """(mtime, tamanho, caminho) de cada entrada"""
+        try:
+            shards = [entry for entry in os.scandir(self.directory)
+                      if entry.is_dir() and len(entry.name) == 2]
+        except FileNotFoundError:
+            return []
+
+        entries = []
+        for shard in shards:
+            for entry in os.scandir(shard.path):
+                if entry.name.endswith('.json'):
+                    try:
+                        info = entry.stat()
+                    except FileNotFoundError:
+                        continue  # removida por outro processo
+                    entries.append((info.st_mtime, info.st_size, entry.path))
+        return entries
+
+    def size(self):
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self, target=None):
+        """Apaga as entradas menos usadas até o total ficar em 'target' bytes"""
+        if target is None:
+            target = int(self.max_bytes * LOW_WATER)
+        entries = sorted(self.entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= target:
+                break
+            if self._remove(path):
+                self.evictions += 1
+            total -= size
+        self._total = total
+
+    def clear(self):
+        self.evict(0)
+
+    def _remove(self, path):
+        try:
+            os.unlink(path)
+            return True
+        except OSError:
+            return False
+
+    def stats(self):
+        return {
+            'acertos': self.hits,
+            'faltas': self.misses,
+            'gravacoes': self.writes,
+            'remocoes': self.evictions,
+        }
+
+    def summary(self):
+        lookups = self.hits + self.misses
+        rate = 100.0 * self.hits / lookups if lookups else 0.0
+        return (f"cache: {self.hits} acertos, {self.misses} faltas ({rate:.1f}% de acerto), "
+                f"{self.evictions} removidas")
+
+
+def main():
+    """Função principal"""
+    arg_parser = argparse.ArgumentParser(
+        description="Mostra ou limpa o cache de compilação",
+        epilog="Exemplos: python cache.py | python cache.py --limpar | "
+               "python cache.py --limite 16")
+    arg_parser.add_argument('--diretorio', default=DEFAULT_DIRECTORY,
+                            help=f"diretório do cache (padrão: {DEFAULT_DIRECTORY})")
+    arg_parser.add_argument('--limpar', action='store_true', help="apaga todas as entradas")
+    arg_parser.add_argument('--limite', metavar='MB', type=float, default=None,
+                            help="remove as entradas menos usadas até o cache caber em MB")
+    args = arg_parser.parse_args()
+
+    cache = CompileCache(args.diretorio)
+    if args.limpar:
+        cache.clear()
+    elif args.limite is not None:
+        cache.evict(int(args.limite * 1024 * 1024))
+
+    entries = cache.entries()
+    print(f"Cache em {args.diretorio}: {len(entries)} entradas, "
+          f"{sum(size for _, size, _ in entries) / 1024:.1f} KiB "
+          f"(compilador {compiler_version()})")
+    if cache.evictions:
+        print(f"{cache.evictions} entradas removidas")
+
+
+if __name__ == "__main__":
+    main()
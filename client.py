@@ -0,0 +1,77 @@
+"""
+Cliente do Servidor de Compilação
+
+Repassa os argumentos de main.py ao servidor (server.py) junto com a
+entrada, a saída e a saída de erro deste processo (descritores enviados
+pelo socket unix), espera o compilador terminar e sai com o mesmo código
+de retorno. Só importa a biblioteca padrão, para iniciar rápido; sem
+servidor no ar, executa o main.py normalmente.
+
+    python server.py &
+    python client.py correto.php -q
+"""
+
+import json
+import os
+import signal
+import socket
+import sys
+import tempfile
+
+
+DEFAULT_SOCKET = os.path.join(tempfile.gettempdir(), f"lalg-php-{os.getuid()}.sock")
+# Variável de ambiente que troca o caminho do socket
+SOCKET_VARIABLE = 'LALG_SOCKET'
+# Resposta do servidor a um pedido que ele não consegue atender
+ERROR_PREFIX = b'erro: '
+
+
+class ServerError(Exception):
+    pass
+
+
+def socket_path():
+    return os.environ.get(SOCKET_VARIABLE, DEFAULT_SOCKET)
+
+
+def request(argv, path=None):
+    """Executa main.py com 'argv' no servidor e devolve o código de saída"""
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    with connection:
+        connection.connect(path or socket_path())
+        message = json.dumps({'argv': argv, 'cwd': os.getcwd()}).encode('utf-8') + b'\n'
+        socket.send_fds(connection, [message], [0, 1, 2])
+
+        replies = connection.makefile('rb')
+        reply = replies.readline()
+        if reply.startswith(ERROR_PREFIX):
+            raise ServerError(reply[len(ERROR_PREFIX):].decode('utf-8', 'replace').strip())
+        if not reply.strip():
+            raise ServerError("o servidor fechou a conexão sem responder")
+        pid = int(reply)
+        try:
+            status = replies.readline()
+        except KeyboardInterrupt:
+            # Ctrl+C interrompe o compilador no servidor, não só o cliente
+            os.kill(pid, signal.SIGINT)
+            status = replies.readline()
+    return int(status) if status.strip() else 1
+
+
+def main():
+    """Função principal"""
+    argv = sys.argv[1:]
+    try:
+        status = request(argv)
+    except (FileNotFoundError, ConnectionRefusedError):
+        # Sem servidor: roda o compilador neste processo
+        main_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'main.py')
+        os.execv(sys.executable, [sys.executable, main_file] + argv)
+    except ServerError as e:
+        print(f"Erro no servidor de compilação: {e}", file=sys.stderr)
+        status = 1
+    sys.exit(status)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+"""
+Compilação Direta da AST em Closures
+
+Caminho rápido para compilar e executar sem o arquivo .asm: a AST já
+verificada pelo SemanticAnalyzer vira funções Python aninhadas (uma por
+AssignmentNode, WhileNode, etc.) que executam imediatamente, sem E/S de
+arquivo nem decodificação de texto.
+
+Os endereços de memória e a ordem de avaliação são os mesmos do
+VMCodeGenerator, então a saída é a mesma da máquina de pilha.
+"""
+
+from ast_nodes import *
+from tokens import TokenType
+from code_generator import VMCodeGenerator
+
+
+INPUT_PROMPT = "Digite um valor: "
+
+
+class Runtime:
+    """Estado compartilhado pelas closures: memória e entrada/saída"""
+
+    def __init__(self):
+        self.memory = [0.0] * 100
+        self.read = input
+        self.write = print
+
+
+class ClosureProgram:
+
+    def __init__(self, runtime, body):
+        self.runtime = runtime
+        self.body = body
+
+    def run(self, input_func=None, output_func=None):
+        runtime = self.runtime
+        runtime.memory[:] = [0.0] * len(runtime.memory)
+        runtime.read = input_func if input_func is not None else input
+        runtime.write = output_func if output_func is not None else print
+        self.body()
+        return runtime.memory
+
+
+class ClosureCompiler(VMCodeGenerator):
+    """
+    Reaproveita a alocação de variáveis do VMCodeGenerator (globais a
+    partir de 0, parâmetros e locais de funções a partir de 8), mas em vez
+    de emitir instruções devolve closures.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.runtime = Runtime()
+        self.functions = {}
+
+    def compile(self, ast):
+        for stmt in ast.statements:
+            if isinstance(stmt, AssignmentNode):
+                self.allocate_var(stmt.variable.name)
+
+        for stmt in ast.statements:
+            if isinstance(stmt, FunctionDeclNode):
+                self.compile_function(stmt)
+
+        main = self.compile_block([stmt for stmt in ast.statements
+                                   if not isinstance(stmt, FunctionDeclNode)])
+        return ClosureProgram(self.runtime, main)
+
+    def compile_function(self, node):
+        saved_vars = dict(self.var_map)
+        saved_addr = self.next_addr
+
+        self.next_addr = 8
+        self.var_map = {}
+
+        for param in node.params:
+            self.allocate_var(param.name)
+
+        for stmt in node.body:
+            if isinstance(stmt, AssignmentNode):
+                self.allocate_var(stmt.variable.name)
+
+        self.functions[node.name] = self.compile_block(node.body)
+
+        self.var_map = saved_vars
+        self.next_addr = saved_addr
+
+    def compile_block(self, statements):
+        compiled = tuple(fn for fn in (self.compile_stmt(stmt) for stmt in statements)
+                         if fn is not None)
+
+        if len(compiled) == 1:
+            return compiled[0]
+
+        def block():
+            for stmt in compiled:
+                stmt()
+        return block
+
+    def compile_stmt(self, stmt):
+        if isinstance(stmt, AssignmentNode):
+            return self.compile_assignment(stmt)
+        elif isinstance(stmt, IfNode):
+            return self.compile_if(stmt)
+        elif isinstance(stmt, WhileNode):
+            return self.compile_while(stmt)
+        elif isinstance(stmt, EchoNode):
+            return self.compile_echo(stmt)
+        elif isinstance(stmt, FunctionCallNode):
+            return self.compile_call(stmt)
+        return None
+
+    def compile_assignment(self, stmt):
+        # Pula inicializações com zero (como o gerador de código)
+        if isinstance(stmt.expression, NumberNode):
+            if stmt.expression.value == 0 or stmt.expression.value == 0.0:
+                return None
+
+        expr = self.compile_expr(stmt.expression)
+        addr = self.allocate_var(stmt.variable.name)
+        mem = self.runtime.memory
+
+        def assignment():
+            mem[addr] = expr()
+        return assignment
+
+    def compile_if(self, stmt):
+        cond = self.compile_cond(stmt.condition)
+        then_body = self.compile_block(stmt.then_body)
+
+        if not stmt.else_body:
+            def if_then():
+                if cond() != 0:
+                    then_body()
+            return if_then
+
+        else_body = self.compile_block(stmt.else_body)
+
+        def if_else():
+            if cond() != 0:
+                then_body()
+            else:
+                else_body()
+        return if_else
+
+    def compile_while(self, stmt):
+        cond = self.compile_cond(stmt.condition)
+        body = self.compile_block(stmt.body)
+
+        def while_loop():
+            while cond() != 0:
+                body()
+        return while_loop
+
+    def compile_echo(self, stmt):
+        if isinstance(stmt.expression, ConcatenationNode):
+            expr = self.compile_expr(stmt.expression.left)
+        else:
+            expr = self.compile_expr(stmt.expression)
+        runtime = self.runtime
+
+        def echo():
+            runtime.write(expr())
+        return echo
+
+    def compile_call(self, stmt):
+        args = tuple(self.compile_expr(arg) for arg in stmt.arguments)
+        functions = self.functions
+        name = stmt.name
+        mem = self.runtime.memory
+        end = 8 + len(args)
+
+        # Parâmetros ocupam os endereços 8, 9, ... na ordem dos argumentos
+        def call():
+            mem[8:end] = [arg() for arg in args]
+            functions[name]()
+        return call
+
+    def compile_cond(self, node):
+        if isinstance(node, BinaryOpNode) and node.operator in COMPARISONS:
+            left = self.compile_expr(node.left)
+            right = self.compile_expr(node.right)
+            compare = COMPARISONS[node.operator]
+
+            def cond():
+                return 1 if compare(left(), right()) else 0
+            return cond
+        return self.compile_expr(node)
+
+    def compile_expr(self, node):
+        if isinstance(node, NumberNode):
+            value = node.value
+            return lambda: value
+
+        elif isinstance(node, VariableNode):
+            addr = self.var_map.get(node.name, 0)
+            mem = self.runtime.memory
+            return lambda: mem[addr]
+
+        elif isinstance(node, BinaryOpNode):
+            if node.operator in COMPARISONS:
+                return self.compile_cond(node)
+
+            # Mesma ordem da máquina de pilha: +/- calculam right OP left
+            if node.operator in (TokenType.PLUS, TokenType.MINUS):
+                a = self.compile_expr(node.right)
+                b = self.compile_expr(node.left)
+            else:
+                a = self.compile_expr(node.left)
+                b = self.compile_expr(node.right)
+
+            if node.operator == TokenType.PLUS:
+                return lambda: a() + b()
+            elif node.operator == TokenType.MINUS:
+                return lambda: a() - b()
+            elif node.operator == TokenType.MULTIPLY:
+                return lambda: a() * b()
+            return lambda: a() / b()
+
+        elif isinstance(node, UnaryOpNode):
+            operand = self.compile_expr(node.operand)
+            return lambda: -operand()
+
+        elif isinstance(node, ReadlineNode):
+            runtime = self.runtime
+            return lambda: float(runtime.read(INPUT_PROMPT))
+
+        elif isinstance(node, ConcatenationNode):
+            return self.compile_expr(node.left)
+
+        return lambda: 0.0
+
+
+COMPARISONS = {
+    TokenType.GREATER_EQUAL: lambda a, b: a >= b,
+    TokenType.LESS_EQUAL: lambda a, b: a <= b,
+    TokenType.GREATER: lambda a, b: a > b,
+    TokenType.LESS: lambda a, b: a < b,
+    TokenType.EQUAL: lambda a, b: a == b,
+    TokenType.NOT_EQUAL: lambda a, b: a != b,
+}
+
+
+def compile_ast(ast):
+    """Compila uma AST já analisada em um ClosureProgram"""
+    return ClosureCompiler().compile(ast)
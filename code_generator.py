@@ -1,275 +1,608 @@
-"""
-Gerador de Código VM
-"""
-
-from ast_nodes import *
-from tokens import TokenType
-
-
-class VMCodeGenerator:
-
-    def __init__(self):
-        self.code = []
-        self.var_map = {}
-        self.next_addr = 0
-        self.func_lines = {}
-        self.func_names = []
-        self.line = 1
-        self.in_function = False
-        self.current_func = None
-
-    def emit(self, instr):
-        self.code.append(instr)
-        self.line += 1
-        return self.line - 1
-
-    def allocate_var(self, var_name):
-        if var_name not in self.var_map:
-            self.var_map[var_name] = self.next_addr
-            self.next_addr += 1
-        return self.var_map[var_name]
-
-    def generate(self, ast):
-        self.emit("INPP")
-
-        # Aloca variáveis globais
-        global_vars = []
-        for stmt in ast.statements:
-            if isinstance(stmt, AssignmentNode) and not self.in_function:
-                var_name = stmt.variable.name
-                if var_name not in global_vars:
-                    global_vars.append(var_name)
-                    self.allocate_var(var_name)
-                    self.emit("ALME 1")
-
-        # Coleta nomes das funções
-        for stmt in ast.statements:
-            if isinstance(stmt, FunctionDeclNode):
-                self.func_names.append(stmt.name)
-
-        # DSVI para pular funções (com comentário da primeira função)
-        dsvi_idx = len(self.code)
-        first_func = self.func_names[0] if self.func_names else ""
-        self.emit(f"DSVI ??? #funcao {first_func}")
-
-        # Gera funções
-        func_count = 0
-        for stmt in ast.statements:
-            if isinstance(stmt, FunctionDeclNode):
-                self.generate_function(stmt)
-                func_count += 1
-                # Adiciona DSVI após cada função (exceto a última)
-                if func_count < len(self.func_names):
-                    next_func = self.func_names[func_count] if func_count < len(self.func_names) else ""
-                    self.emit(f"DSVI ??? #funcao {next_func}")
-
-        main_line = self.line
-        # Atualiza todos os DSVIs para apontar para main
-        for i, instr in enumerate(self.code):
-            if instr.startswith("DSVI ???"):
-                comment = instr.replace("DSVI ???", "").strip()
-                self.code[i] = f"DSVI {main_line} {comment}"
-
-        # Gera código principal
-        for stmt in ast.statements:
-            if not isinstance(stmt, FunctionDeclNode):
-                self.generate_stmt(stmt)
-
-        self.emit("PARA")
-
-        return self.code
-
-    def generate_function(self, node):
-        self.in_function = True
-        self.current_func = node.name
-        self.func_lines[node.name] = self.line
-
-        saved_vars = dict(self.var_map)
-        saved_addr = self.next_addr
-
-        self.next_addr = 8
-        self.var_map = {}
-
-        # Aloca parâmetros
-        for param in node.params:
-            self.allocate_var(param.name)
-            self.emit("ALME 1")
-
-        # Coleta variáveis locais
-        local_vars = []
-        for stmt in node.body:
-            if isinstance(stmt, AssignmentNode):
-                var_name = stmt.variable.name
-                if var_name not in self.var_map and var_name not in local_vars:
-                    local_vars.append(var_name)
-                    self.allocate_var(var_name)
-
-        # Gera corpo
-        for stmt in node.body:
-            self.generate_stmt(stmt)
-
-        # DESM para desalocar variáveis
-        num_locals = self.next_addr - 8
-        if num_locals > 0:
-            self.emit(f"DESM {num_locals}")
-
-        self.emit("RTPR")
-
-        self.var_map = saved_vars
-        self.next_addr = saved_addr
-        self.in_function = False
-        self.current_func = None
-
-    def generate_stmt(self, stmt):
-        if isinstance(stmt, AssignmentNode):
-            self.generate_assignment(stmt)
-        elif isinstance(stmt, IfNode):
-            self.generate_if(stmt)
-        elif isinstance(stmt, WhileNode):
-            self.generate_while(stmt)
-        elif isinstance(stmt, EchoNode):
-            self.generate_echo(stmt)
-        elif isinstance(stmt, FunctionCallNode):
-            self.generate_call(stmt)
-
-    def generate_assignment(self, stmt):
-        # Pula inicializações com zero
-        if isinstance(stmt.expression, NumberNode):
-            if stmt.expression.value == 0 or stmt.expression.value == 0.0:
-                return
-
-        if isinstance(stmt.expression, ReadlineNode):
-            self.emit("LEIT")
-        else:
-            self.generate_expr(stmt.expression)
-
-        addr = self.allocate_var(stmt.variable.name)
-        self.emit(f"ARMZ {addr}")
-
-    def generate_if(self, stmt):
-        self.generate_cond(stmt.condition)
-
-        dsvf_idx = len(self.code)
-        self.emit("DSVF ???")
-
-        for s in stmt.then_body:
-            self.generate_stmt(s)
-
-        if stmt.else_body:
-            dsvi_idx = len(self.code)
-            self.emit("DSVI ???")
-
-            else_line = self.line
-            self.code[dsvf_idx] = f"DSVF {else_line}"
-
-            for s in stmt.else_body:
-                self.generate_stmt(s)
-
-            end_line = self.line
-            self.code[dsvi_idx] = f"DSVI {end_line}"
-        else:
-            end_line = self.line
-            self.code[dsvf_idx] = f"DSVF {end_line}"
-
-    def generate_while(self, stmt):
-        start = self.line
-
-        self.generate_cond(stmt.condition)
-
-        dsvf_idx = len(self.code)
-        self.emit("DSVF ???")
-
-        for s in stmt.body:
-            self.generate_stmt(s)
-
-        self.emit(f"DSVI {start}")
-
-        end_line = self.line
-        self.code[dsvf_idx] = f"DSVF {end_line}"
-
-    def generate_echo(self, stmt):
-        if isinstance(stmt.expression, ConcatenationNode):
-            self.generate_expr(stmt.expression.left)
-        else:
-            self.generate_expr(stmt.expression)
-        self.emit("IMPR")
-
-    def generate_call(self, stmt):
-        ret_line = self.line + 1 + len(stmt.arguments) + 1
-
-        if ret_line < 100:
-            self.emit(f"PUSHER {ret_line}")
-        else:
-            self.emit("PUSHER DEPOIS")
-
-        # Empilhar os valores dos argumentos na pilha
-        for arg in stmt.arguments:
-            self.generate_expr(arg)
-
-        func_line = self.func_lines.get(stmt.name, 0)
-        self.emit(f"CHPR {func_line}")
-
-    def generate_cond(self, node):
-        if isinstance(node, BinaryOpNode):
-            # Ordem: left primeiro, depois right (para comparação correta)
-            self.generate_expr(node.left)
-            self.generate_expr(node.right)
-
-            if node.operator == TokenType.GREATER_EQUAL:
-                self.emit("CMAI")
-            elif node.operator == TokenType.LESS_EQUAL:
-                self.emit("CPMI")
-            elif node.operator == TokenType.GREATER:
-                self.emit("CMAG")
-            elif node.operator == TokenType.LESS:
-                self.emit("CPME")
-            elif node.operator == TokenType.EQUAL:
-                self.emit("CMIG")
-            elif node.operator == TokenType.NOT_EQUAL:
-                self.emit("CMDG")
-
-    def generate_expr(self, node):
-        if isinstance(node, NumberNode):
-            val = int(node.value) if node.value == int(node.value) else node.value
-            self.emit(f"CRCT {val}")
-
-        elif isinstance(node, VariableNode):
-            addr = self.var_map.get(node.name, 0)
-            self.emit(f"CRVL {addr}")
-
-        elif isinstance(node, BinaryOpNode):
-            # Para +/- gera right primeiro (subexpressão), depois left
-            # Para */÷ gera left primeiro, depois right
-            if node.operator in [TokenType.PLUS, TokenType.MINUS]:
-                self.generate_expr(node.right)
-                self.generate_expr(node.left)
-            else:
-                self.generate_expr(node.left)
-                self.generate_expr(node.right)
-
-            if node.operator == TokenType.PLUS:
-                self.emit("SOMA")
-            elif node.operator == TokenType.MINUS:
-                self.emit("SUBT")
-            elif node.operator == TokenType.MULTIPLY:
-                self.emit("MULT")
-            elif node.operator == TokenType.DIVIDE:
-                self.emit("DIVI")
-
-        elif isinstance(node, ReadlineNode):
-            self.emit("LEIT")
-
-        elif isinstance(node, ConcatenationNode):
-            self.generate_expr(node.left)
-
-    def save_to_file(self, filename):
-        with open(filename, 'w', encoding='utf-8') as f:
-            for instr in self.code:
-                f.write(instr + '\n')
-
-    def print_code(self):
-        for i, instr in enumerate(self.code, 1):
-            print(f"{i:3d}: {instr}")
-
-
-CodeGenerator = VMCodeGenerator
+"""
+Gerador de Código VM
+"""
+
+from ast_nodes import *
+from tokens import TokenType
+from source_map import SourceMap, map_filename
+
+
+# Limites da otimização guiada por perfil (PGO)
+INLINE_MIN_CALLS = 10
+INLINE_MAX_STATEMENTS = 12
+UNROLL_MIN_ITERATIONS = 100
+UNROLL_MAX_STATEMENTS = 8
+
+
+def count_statements(statements):
+    """Comandos de um bloco, incluindo os aninhados em if/while"""
+    total = 0
+    for stmt in statements:
+        total += 1
+        if isinstance(stmt, IfNode):
+            total += count_statements(stmt.then_body) + count_statements(stmt.else_body or [])
+        elif isinstance(stmt, WhileNode):
+            total += count_statements(stmt.body)
+    return total
+
+
+def contains_call(statements):
+    for stmt in statements:
+        if isinstance(stmt, FunctionCallNode):
+            return True
+        if isinstance(stmt, IfNode):
+            if contains_call(stmt.then_body) or contains_call(stmt.else_body or []):
+                return True
+        elif isinstance(stmt, WhileNode) and contains_call(stmt.body):
+            return True
+    return False
+
+
+class VMCodeGenerator:
+
+    def __init__(self, profile=None):
+        self.code = []
+        self.var_map = {}
+        self.next_addr = 0
+        self.func_lines = {}
+        self.func_names = []
+        self.line = 1
+        self.in_function = False
+        self.current_func = None
+        # Linha do fonte de cada instrução emitida (mapa de fonte)
+        self.source_line = 0
+        self.line_table = []
+        # Perfil de execução (pgo.PGOProfile) e o que foi decidido com ele
+        self.profile = profile
+        self.pgo_decisions = []
+        self.func_decls = {}
+        self.func_var_maps = {}
+
+    def emit(self, instr):
+        self.code.append(instr)
+        self.line_table.append(self.source_line)
+        self.line += 1
+        return self.line - 1
+
+    def allocate_var(self, var_name):
+        if var_name not in self.var_map:
+            self.var_map[var_name] = self.next_addr
+            self.next_addr += 1
+        return self.var_map[var_name]
+
+    def generate(self, ast):
+        self.emit("INPP")
+
+        # Aloca variáveis globais
+        global_vars = []
+        for stmt in ast.statements:
+            if isinstance(stmt, AssignmentNode) and not self.in_function:
+                var_name = stmt.variable.name
+                if var_name not in global_vars:
+                    global_vars.append(var_name)
+                    self.allocate_var(var_name)
+                    self.source_line = stmt.line
+                    self.emit("ALME 1")
+
+        # Coleta nomes das funções
+        func_decls = []
+        for stmt in ast.statements:
+            if isinstance(stmt, FunctionDeclNode):
+                self.func_names.append(stmt.name)
+                func_decls.append(stmt)
+
+        # DSVI para pular funções (com comentário da primeira função)
+        skip_jumps = [len(self.code)]
+        first_func = self.func_names[0] if self.func_names else ""
+        self.source_line = func_decls[0].line if func_decls else 0
+        self.emit(f"DSVI ??? #funcao {first_func}")
+
+        # Gera funções
+        func_count = 0
+        for stmt in ast.statements:
+            if isinstance(stmt, FunctionDeclNode):
+                self.generate_function(stmt)
+                func_count += 1
+                # Adiciona DSVI após cada função (exceto a última)
+                if func_count < len(self.func_names):
+                    next_func = self.func_names[func_count] if func_count < len(self.func_names) else ""
+                    self.source_line = func_decls[func_count].line
+                    skip_jumps.append(len(self.code))
+                    self.emit(f"DSVI ??? #funcao {next_func}")
+
+        main_line = self.line
+        # Atualiza os DSVIs de pulo de função para apontar para main
+        # (só os anotados acima, sem varrer o código das funções)
+        for i in skip_jumps:
+            comment = self.code[i].replace("DSVI ???", "").strip()
+            self.code[i] = f"DSVI {main_line} {comment}"
+
+        # Gera código principal
+        for stmt in ast.statements:
+            if not isinstance(stmt, FunctionDeclNode):
+                self.generate_stmt(stmt)
+
+        self.source_line = 0
+        self.emit("PARA")
+
+        if self.profile is not None:
+            self.thread_jumps()
+
+        return self.code
+
+    def generate_function(self, node):
+        self.in_function = True
+        self.current_func = node.name
+        self.func_lines[node.name] = self.line
+        self.source_line = node.line
+
+        saved_vars = dict(self.var_map)
+        saved_addr = self.next_addr
+
+        self.next_addr = 8
+        self.var_map = {}
+
+        # Aloca parâmetros
+        for param in node.params:
+            self.allocate_var(param.name)
+            self.emit("ALME 1")
+
+        # Coleta variáveis locais
+        local_vars = []
+        for stmt in node.body:
+            if isinstance(stmt, AssignmentNode):
+                var_name = stmt.variable.name
+                if var_name not in self.var_map and var_name not in local_vars:
+                    local_vars.append(var_name)
+                    self.allocate_var(var_name)
+
+        # Gera corpo
+        for stmt in node.body:
+            self.generate_stmt(stmt)
+
+        # Guarda o endereçamento da função para expansão em linha (PGO)
+        self.func_decls[node.name] = node
+        self.func_var_maps[node.name] = (dict(self.var_map), self.next_addr)
+
+        # DESM para desalocar variáveis
+        self.source_line = node.line
+        num_locals = self.next_addr - 8
+        if num_locals > 0:
+            self.emit(f"DESM {num_locals}")
+
+        self.emit("RTPR")
+
+        self.var_map = saved_vars
+        self.next_addr = saved_addr
+        self.in_function = False
+        self.current_func = None
+
+    def generate_stmt(self, stmt):
+        saved_line = self.source_line
+        self.source_line = stmt.line or saved_line
+
+        if isinstance(stmt, AssignmentNode):
+            self.generate_assignment(stmt)
+        elif isinstance(stmt, IfNode):
+            self.generate_if(stmt)
+        elif isinstance(stmt, WhileNode):
+            self.generate_while(stmt)
+        elif isinstance(stmt, EchoNode):
+            self.generate_echo(stmt)
+        elif isinstance(stmt, FunctionCallNode):
+            self.generate_call(stmt)
+
+        self.source_line = saved_line
+
+    def generate_assignment(self, stmt):
+        # Pula inicializações com zero
+        if isinstance(stmt.expression, NumberNode):
+            if stmt.expression.value == 0 or stmt.expression.value == 0.0:
+                return
+
+        if isinstance(stmt.expression, ReadlineNode):
+            self.emit("LEIT")
+        else:
+            self.generate_expr(stmt.expression)
+
+        addr = self.allocate_var(stmt.variable.name)
+        self.emit(f"ARMZ {addr}")
+
+    def generate_if(self, stmt):
+        self.generate_cond(stmt.condition)
+
+        dsvf_idx = len(self.code)
+        self.emit("DSVF ???")
+
+        for s in stmt.then_body:
+            self.generate_stmt(s)
+
+        if stmt.else_body:
+            dsvi_idx = len(self.code)
+            self.emit("DSVI ???")
+
+            else_line = self.line
+            self.code[dsvf_idx] = f"DSVF {else_line}"
+
+            for s in stmt.else_body:
+                self.generate_stmt(s)
+
+            end_line = self.line
+            self.code[dsvi_idx] = f"DSVI {end_line}"
+        else:
+            end_line = self.line
+            self.code[dsvf_idx] = f"DSVF {end_line}"
+
+    def generate_while(self, stmt):
+        start = self.line
+
+        # Laço quente: repete teste + corpo antes do DSVI de volta
+        dsvf_idxs = []
+        for _ in range(self.unroll_factor(stmt)):
+            self.generate_cond(stmt.condition)
+
+            dsvf_idxs.append(len(self.code))
+            self.emit("DSVF ???")
+
+            for s in stmt.body:
+                self.generate_stmt(s)
+
+        self.emit(f"DSVI {start}")
+
+        end_line = self.line
+        for dsvf_idx in dsvf_idxs:
+            self.code[dsvf_idx] = f"DSVF {end_line}"
+
+    def unroll_factor(self, stmt):
+        if self.profile is None:
+            return 1
+
+        iterations, exits = self.profile.loop_iterations(stmt.line)
+        if iterations < UNROLL_MIN_ITERATIONS or count_statements(stmt.body) > UNROLL_MAX_STATEMENTS:
+            return 1
+
+        average = iterations / max(exits, 1)
+        factor = 4 if average >= 8 else 2 if average >= 2 else 1
+        if factor > 1:
+            self.pgo_decisions.append(
+                f"laço da linha {stmt.line} desenrolado {factor}x ({iterations} iterações)")
+        return factor
+
+    def generate_echo(self, stmt):
+        if isinstance(stmt.expression, ConcatenationNode):
+            self.generate_expr(stmt.expression.left)
+        else:
+            self.generate_expr(stmt.expression)
+        self.emit("IMPR")
+
+    def generate_call(self, stmt):
+        if self.should_inline(stmt):
+            self.generate_inline_call(stmt)
+            return
+
+        pusher_idx = len(self.code)
+        self.emit("PUSHER ???")
+
+        # Empilhar os valores dos argumentos na pilha
+        for arg in stmt.arguments:
+            self.generate_expr(arg)
+
+        func_line = self.func_lines.get(stmt.name, 0)
+        self.emit(f"CHPR {func_line}")
+
+        # Retorno para a linha seguinte ao CHPR
+        self.code[pusher_idx] = f"PUSHER {self.line}"
+
+    def should_inline(self, stmt):
+        """Chamada quente para função folha já gerada e pequena"""
+        if self.profile is None or stmt.name not in self.func_decls:
+            return False
+        if self.profile.call_count(stmt.line) < INLINE_MIN_CALLS:
+            return False
+
+        body = self.func_decls[stmt.name].body
+        return not contains_call(body) and count_statements(body) <= INLINE_MAX_STATEMENTS
+
+    def generate_inline_call(self, stmt):
+        """
+        Expande a função no lugar da chamada. Os argumentos são empilhados
+        como antes e guardados nos parâmetros (8, 9, ...) do último para o
+        primeiro, o mesmo efeito do ALME na entrada da função.
+        """
+        func = self.func_decls[stmt.name]
+        decision = (f"chamada a {stmt.name} na linha {stmt.line} expandida em linha "
+                    f"({self.profile.call_count(stmt.line)} chamadas)")
+        if decision not in self.pgo_decisions:
+            self.pgo_decisions.append(decision)
+
+        for arg in stmt.arguments:
+            self.generate_expr(arg)
+
+        saved_vars = self.var_map
+        saved_addr = self.next_addr
+        func_vars, func_next_addr = self.func_var_maps[stmt.name]
+        self.var_map = dict(func_vars)
+        self.next_addr = func_next_addr
+
+        for param in reversed(func.params):
+            self.emit(f"ARMZ {self.var_map[param.name]}")
+
+        for s in func.body:
+            self.generate_stmt(s)
+
+        self.var_map = saved_vars
+        self.next_addr = saved_addr
+
+    def thread_jumps(self):
+        """Desvio para um DSVI vai direto ao destino final do DSVI"""
+        for i, instr in enumerate(self.code):
+            parts = instr.split()
+            if parts[0] not in ('DSVI', 'DSVF'):
+                continue
+
+            target = int(parts[1])
+            seen = set()
+            while 0 < target <= len(self.code) and target not in seen:
+                seen.add(target)
+                final = self.code[target - 1].split()
+                if final[0] != 'DSVI':
+                    break
+                target = int(final[1])
+
+            if target != int(parts[1]):
+                parts[1] = str(target)
+                self.code[i] = " ".join(parts)
+
+    def generate_cond(self, node):
+        if isinstance(node, BinaryOpNode):
+            # Ordem: left primeiro, depois right (para comparação correta)
+            self.generate_expr(node.left)
+            self.generate_expr(node.right)
+
+            if node.operator == TokenType.GREATER_EQUAL:
+                self.emit("CMAI")
+            elif node.operator == TokenType.LESS_EQUAL:
+                self.emit("CPMI")
+            elif node.operator == TokenType.GREATER:
+                self.emit("CMAG")
+            elif node.operator == TokenType.LESS:
+                self.emit("CPME")
+            elif node.operator == TokenType.EQUAL:
+                self.emit("CMIG")
+            elif node.operator == TokenType.NOT_EQUAL:
+                self.emit("CMDG")
+
+    def generate_expr(self, node):
+        if isinstance(node, NumberNode):
+            val = int(node.value) if node.value == int(node.value) else node.value
+            self.emit(f"CRCT {val}")
+
+        elif isinstance(node, VariableNode):
+            addr = self.var_map.get(node.name, 0)
+            self.emit(f"CRVL {addr}")
+
+        elif isinstance(node, BinaryOpNode):
+            # Para +/- gera right primeiro (subexpressão), depois left
+            # Para */÷ gera left primeiro, depois right
+            if node.operator in [TokenType.PLUS, TokenType.MINUS]:
+                self.generate_expr(node.right)
+                self.generate_expr(node.left)
+            else:
+                self.generate_expr(node.left)
+                self.generate_expr(node.right)
+
+            if node.operator == TokenType.PLUS:
+                self.emit("SOMA")
+            elif node.operator == TokenType.MINUS:
+                self.emit("SUBT")
+            elif node.operator == TokenType.MULTIPLY:
+                self.emit("MULT")
+            elif node.operator == TokenType.DIVIDE:
+                self.emit("DIVI")
+
+        elif isinstance(node, UnaryOpNode):
+            # -x vira 0 - x (SUBT faz penúltimo - topo)
+            self.emit("CRCT 0")
+            self.generate_expr(node.operand)
+            self.emit("SUBT")
+
+        elif isinstance(node, ReadlineNode):
+            self.emit("LEIT")
+
+        elif isinstance(node, ConcatenationNode):
+            self.generate_expr(node.left)
+
+    def source_map(self):
+        return SourceMap.from_lines(self.line_table)
+
+    def save_to_file(self, filename):
+        with open(filename, 'w', encoding='utf-8') as f:
+            for instr in self.code:
+                f.write(instr + '\n')
+
+        # Mapa de fonte salvo ao lado do programa
+        self.source_map().save(map_filename(filename))
+
+    def print_code(self):
+        for i, instr in enumerate(self.code, 1):
+            print(f"{i:3d}: {instr}")
+
+
+class RegisterCodeGenerator(VMCodeGenerator):
+    """
+    Gera código de três endereços para a máquina de registradores.
+    Usa os mesmos mnemônicos da máquina de pilha, com operandos explícitos:
+    @n (memória), rN (temporário) ou uma constante numérica.
+    Ex.: CRVL a; CRVL b; SOMA; ARMZ c  ->  SOMA @c, @a, @b
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.next_temp = 0
+
+    def new_temp(self):
+        temp = f"r{self.next_temp}"
+        self.next_temp += 1
+        return temp
+
+    def generate_stmt(self, stmt):
+        # Temporários só vivem dentro de um comando
+        self.next_temp = 0
+        super().generate_stmt(stmt)
+
+    def generate_assignment(self, stmt):
+        # Pula inicializações com zero
+        if isinstance(stmt.expression, NumberNode):
+            if stmt.expression.value == 0 or stmt.expression.value == 0.0:
+                return
+
+        if isinstance(stmt.expression, ReadlineNode):
+            addr = self.allocate_var(stmt.variable.name)
+            self.emit(f"LEIT @{addr}")
+            return
+
+        # O destino é resolvido depois da expressão, como na máquina de pilha
+        if isinstance(stmt.expression, BinaryOpNode):
+            value = self.generate_binary(stmt.expression, None)
+            addr = self.allocate_var(stmt.variable.name)
+            self.retarget(value, f"@{addr}")
+        else:
+            value = self.generate_expr(stmt.expression)
+            addr = self.allocate_var(stmt.variable.name)
+            self.emit(f"ARMZ @{addr}, {value}")
+
+    def retarget(self, temp, dest):
+        """Troca o destino da última instrução (temp) por dest"""
+        opcode, operands = self.code[-1].split(None, 1)
+        operands = operands.split(', ')
+        if operands[0] == temp:
+            operands[0] = dest
+            self.code[-1] = f"{opcode} {', '.join(operands)}"
+        else:
+            self.emit(f"ARMZ {dest}, {temp}")
+
+    def generate_if(self, stmt):
+        cond = self.generate_cond(stmt.condition)
+
+        dsvf_idx = len(self.code)
+        self.emit("DSVF ???")
+
+        for s in stmt.then_body:
+            self.generate_stmt(s)
+
+        if stmt.else_body:
+            dsvi_idx = len(self.code)
+            self.emit("DSVI ???")
+
+            else_line = self.line
+            self.code[dsvf_idx] = f"DSVF {cond}, {else_line}"
+
+            for s in stmt.else_body:
+                self.generate_stmt(s)
+
+            end_line = self.line
+            self.code[dsvi_idx] = f"DSVI {end_line}"
+        else:
+            end_line = self.line
+            self.code[dsvf_idx] = f"DSVF {cond}, {end_line}"
+
+    def generate_while(self, stmt):
+        start = self.line
+
+        cond = self.generate_cond(stmt.condition)
+
+        dsvf_idx = len(self.code)
+        self.emit("DSVF ???")
+
+        for s in stmt.body:
+            self.generate_stmt(s)
+
+        self.emit(f"DSVI {start}")
+
+        end_line = self.line
+        self.code[dsvf_idx] = f"DSVF {cond}, {end_line}"
+
+    def generate_echo(self, stmt):
+        if isinstance(stmt.expression, ConcatenationNode):
+            value = self.generate_expr(stmt.expression.left)
+        else:
+            value = self.generate_expr(stmt.expression)
+        self.emit(f"IMPR {value}")
+
+    def generate_call(self, stmt):
+        pusher_idx = len(self.code)
+        self.emit("PUSHER ???")
+
+        for arg in stmt.arguments:
+            value = self.generate_expr(arg)
+            self.emit(f"PARAM {value}")
+
+        func_line = self.func_lines.get(stmt.name, 0)
+        self.emit(f"CHPR {func_line}")
+
+        self.code[pusher_idx] = f"PUSHER {self.line}"
+
+    def generate_cond(self, node):
+        if isinstance(node, BinaryOpNode):
+            return self.generate_binary(node, None)
+        return self.generate_expr(node)
+
+    def generate_binary(self, node, dest):
+        # Mesma ordem de avaliação e de operandos da máquina de pilha:
+        # +/- calculam right OP left, */÷ e comparações left OP right
+        if node.operator in [TokenType.PLUS, TokenType.MINUS]:
+            a = self.generate_expr(node.right)
+            b = self.generate_expr(node.left)
+        else:
+            a = self.generate_expr(node.left)
+            b = self.generate_expr(node.right)
+
+        dest = dest or self.new_temp()
+        opcode = REGISTER_OPCODES[node.operator]
+        self.emit(f"{opcode} {dest}, {a}, {b}")
+        return dest
+
+    def generate_expr(self, node):
+        if isinstance(node, NumberNode):
+            val = int(node.value) if node.value == int(node.value) else node.value
+            return f"{val}"
+
+        elif isinstance(node, VariableNode):
+            addr = self.var_map.get(node.name, 0)
+            return f"@{addr}"
+
+        elif isinstance(node, BinaryOpNode):
+            return self.generate_binary(node, None)
+
+        elif isinstance(node, UnaryOpNode):
+            value = self.generate_expr(node.operand)
+            temp = self.new_temp()
+            self.emit(f"SUBT {temp}, 0, {value}")
+            return temp
+
+        elif isinstance(node, ReadlineNode):
+            temp = self.new_temp()
+            self.emit(f"LEIT {temp}")
+            return temp
+
+        elif isinstance(node, ConcatenationNode):
+            return self.generate_expr(node.left)
+
+        return "0"
+
+
+REGISTER_OPCODES = {
+    TokenType.PLUS: 'SOMA',
+    TokenType.MINUS: 'SUBT',
+    TokenType.MULTIPLY: 'MULT',
+    TokenType.DIVIDE: 'DIVI',
+    TokenType.GREATER_EQUAL: 'CMAI',
+    TokenType.LESS_EQUAL: 'CPMI',
+    TokenType.GREATER: 'CMAG',
+    TokenType.LESS: 'CPME',
+    TokenType.EQUAL: 'CMIG',
+    TokenType.NOT_EQUAL: 'CMDG',
+}
+
+
+CodeGenerator = VMCodeGenerator
@@ -0,0 +1,200 @@
+"""
+Fazenda de Máquinas Virtuais
+
+Executa o mesmo programa .asm muitas vezes, cada uma com um conjunto
+diferente de entradas, distribuindo as execuções entre processos.
+O programa é carregado uma única vez e enviado aos workers na criação
+do pool; cada execução usa uma VirtualMachine nova.
+
+Arquivo de entradas: uma execução por linha, valores separados por
+espaço ou vírgula. Linhas vazias e comentários (#) são ignorados.
+
+Cada execução tem um orçamento de instruções (--orcamento): um programa
+que não termina vira uma execução com erro em vez de prender o worker.
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from vm import VirtualMachine, VMRuntimeError, parse_program
+
+
+# Instruções por execução antes de considerá-la presa em um laço sem fim
+DEFAULT_BUDGET = 10_000_000
+
+# Programa e orçamento compartilhados pelo worker (definidos por _init_worker)
+_program = None
+_budget = None
+
+
+class BudgetExceededError(Exception):
+    pass
+
+
+class RunResult:
+    """Resultado de uma execução: saídas do IMPR e erro, se houver"""
+
+    def __init__(self, outputs, error=None, timed_out=False):
+        self.outputs = outputs
+        self.error = error
+        self.timed_out = timed_out  # parou por esgotar o orçamento de instruções
+
+    def __repr__(self):
+        if self.error:
+            return f"RunResult(outputs={self.outputs}, error='{self.error}')"
+        return f"RunResult(outputs={self.outputs})"
+
+
+def input_feeder(inputs):
+    """Função de entrada para o LEIT que devolve 'inputs' um por vez"""
+    feed = iter(inputs)
+
+    def read_input(prompt=''):
+        try:
+            return next(feed)
+        except StopIteration:
+            raise EOFError("entradas esgotadas") from None
+    return read_input
+
+
+def run_with_budget(vm, budget):
+    """Executa até o fim ou até 'budget' instruções (BudgetExceededError)"""
+    if budget is None:
+        vm.execute()
+        return
+
+    try:
+        vm.run_slice(budget)
+    except VMRuntimeError:
+        raise
+    except Exception as e:
+        raise vm.runtime_error(e) from e
+    if not vm.finished:
+        raise BudgetExceededError(f"orçamento de {budget} instruções esgotado "
+                                  f"(instrução {vm.pc + 1})")
+
+
+def run_once(instructions, inputs, budget=DEFAULT_BUDGET):
+    """Executa o programa em uma VM nova alimentando LEIT com 'inputs'"""
+    outputs = []
+    vm = VirtualMachine(input_func=input_feeder(inputs), output_func=outputs.append,
+                        verbose=False)
+    vm.instructions = instructions
+
+    try:
+        run_with_budget(vm, budget)
+    except Exception as e:
+        return RunResult(outputs, f"{type(e).__name__}: {e}", isinstance(e, BudgetExceededError))
+
+    return RunResult(outputs)
+
+
+def _init_worker(instructions, budget):
+    global _program, _budget
+    _program = instructions
+    _budget = budget
+
+
+def _run_in_worker(inputs):
+    return run_once(_program, inputs, _budget)
+
+
+class VMFarm:
+    """Pool de processos que executa um programa carregado uma única vez"""
+
+    def __init__(self, instructions, workers=None, chunksize=None, budget=DEFAULT_BUDGET):
+        self.instructions = list(instructions)
+        self.workers = workers or os.cpu_count() or 1
+        self.chunksize = chunksize
+        self.budget = budget
+        self.elapsed = 0.0
+
+    @classmethod
+    def from_file(cls, filename, workers=None, chunksize=None, budget=DEFAULT_BUDGET):
+        with open(filename, 'r', encoding='utf-8') as f:
+            instructions = parse_program(f.readlines())
+        return cls(instructions, workers, chunksize, budget)
+
+    def run(self, input_sets):
+        """Executa uma vez por conjunto de entradas; resultados na mesma ordem"""
+        input_sets = [list(inputs) for inputs in input_sets]
+        chunksize = self.chunksize or max(1, len(input_sets) // (self.workers * 4))
+
+        start = time.perf_counter()
+        if self.workers == 1:
+            results = [run_once(self.instructions, inputs, self.budget) for inputs in input_sets]
+        else:
+            with ProcessPoolExecutor(max_workers=self.workers,
+                                     initializer=_init_worker,
+                                     initargs=(self.instructions, self.budget)) as executor:
+                results = list(executor.map(_run_in_worker, input_sets, chunksize=chunksize))
+        self.elapsed = time.perf_counter() - start
+
+        return results
+
+    def runs_per_second(self, runs):
+        if self.elapsed <= 0:
+            return 0.0
+        return runs / self.elapsed
+
+
+def read_input_sets(filename):
+    """Lê o arquivo de entradas: uma execução por linha"""
+    input_sets = []
+    with open(filename, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.split('#')[0].strip()
+            if not line:
+                continue
+            input_sets.append(line.replace(',', ' ').split())
+    return input_sets
+
+
+def format_result(result):
+    line = " ".join(str(value) for value in result.outputs)
+    if result.error:
+        line = f"{line} ERRO: {result.error}".strip()
+    return line
+
+
+def main():
+    """Função principal"""
+    arg_parser = argparse.ArgumentParser(
+        description="Executa um programa .asm para muitos conjuntos de entradas em paralelo")
+    arg_parser.add_argument('programa', help="arquivo .asm gerado pelo compilador")
+    arg_parser.add_argument('entradas', help="arquivo com uma execução por linha")
+    arg_parser.add_argument('-j', '--workers', type=int, default=None,
+                            help="número de processos (padrão: número de CPUs)")
+    arg_parser.add_argument('--chunksize', type=int, default=None,
+                            help="execuções enviadas por vez a cada processo")
+    arg_parser.add_argument('-o', '--saida', default=None,
+                            help="arquivo para as saídas (padrão: stdout)")
+    arg_parser.add_argument('--orcamento', type=int, default=DEFAULT_BUDGET,
+                            help=f"máximo de instruções por execução (padrão: {DEFAULT_BUDGET}; "
+                                 f"0 = sem limite)")
+    args = arg_parser.parse_args()
+
+    farm = VMFarm.from_file(args.programa, args.workers, args.chunksize, args.orcamento or None)
+    input_sets = read_input_sets(args.entradas)
+    results = farm.run(input_sets)
+
+    out = open(args.saida, 'w', encoding='utf-8') if args.saida else sys.stdout
+    try:
+        for result in results:
+            out.write(format_result(result) + '\n')
+    finally:
+        if args.saida:
+            out.close()
+
+    failures = sum(1 for result in results if result.error)
+    print(f"{len(results)} execuções em {farm.elapsed:.3f}s "
+          f"({farm.runs_per_second(len(results)):.1f} execuções/s, "
+          f"{farm.workers} processos, {failures} com erro)", file=sys.stderr)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,364 @@
+"""
+Recompilação Incremental por Função
+
+Numa recompilação, cada função de nível superior e a lista de comandos
+globais ganham uma impressão digital: o hash do texto das linhas que o
+comando ocupa (da sua linha até a linha do comando seguinte, inclusive)
+e da coluna onde ele começa. Texto igual dá a mesma subárvore com as
+mesmas linhas relativas, e o hash do texto custa bem menos que percorrer
+a árvore. Sem o texto (compile_ast sozinho), o hash é feito sobre a
+própria subárvore. Uma função com a mesma impressão digital reaproveita:
+
+- o resultado semântico: os nomes que ela buscou no escopo global e o
+  que encontrou; se o escopo global ainda responde o mesmo, ela não é
+  analisada de novo;
+- o segmento de código: gerado uma vez a partir da linha 1, com a lista
+  dos operandos que dependem da posição (DSVI, DSVF, PUSHER e CHPR).
+
+O ligador monta o programa a partir dos segmentos: INPP, os ALME das
+globais, um DSVI de salto antes de cada função, as funções, o código
+principal e PARA, e reescreve os desvios para a posição final de cada
+segmento e os CHPR para o início da função chamada. O resultado é
+idêntico ao de VMCodeGenerator.generate.
+
+Chamadas a funções declaradas mais abaixo no arquivo saem como CHPR 0,
+igual ao gerador completo; o segmento guarda quais chamadas estavam
+resolvidas e é gerado de novo se a ordem das funções mudar isso.
+Sem suporte a perfil PGO (a expansão em linha copia o corpo de outras
+funções para dentro do segmento).
+
+    compiler = IncrementalCompiler()
+    result = compiler.compile(code)      # compila tudo
+    result = compiler.compile(new_code)  # só refaz as funções alteradas
+    print(compiler.last_build)
+"""
+
+import hashlib
+
+from ast_nodes import ASTNode, AssignmentNode, FunctionCallNode, FunctionDeclNode, walk
+from lexer import Lexer
+from parser import Parser
+from pipeline import BACKENDS, CompileResult, Diagnostic
+from semantic_analyzer import SemanticAnalyzer, Symbol, SymbolTable
+
+
+# Instruções cujo último operando é uma linha do programa
+RELOCATED_OPCODES = ('DSVI', 'DSVF', 'PUSHER', 'CHPR')
+
+
+def fingerprint(node, base_line=0):
+    """Hash da subárvore; linhas relativas a 'base_line' e colunas ignoradas"""
+    digest = hashlib.sha1()
+    pending = [node]
+    while pending:
+        current = pending.pop()
+        if isinstance(current, list):
+            digest.update(f"[{len(current)}".encode())
+            pending.extend(reversed(current))
+        elif isinstance(current, ASTNode):
+            fields = []
+            children = []
+            for name, value in vars(current).items():
+                if name == 'column':
+                    continue
+                if name == 'line':
+                    value = value - base_line if value else None
+                if isinstance(value, (ASTNode, list)):
+                    children.append(value)
+                else:
+                    fields.append(f"{name}={value!r}")
+            digest.update(f"{type(current).__name__}({','.join(fields)};{len(children)}".encode())
+            pending.extend(reversed(children))
+    return digest.hexdigest()
+
+
+def statement_keys(code, statements):
+    """Impressão digital de cada comando de nível superior pelo texto que ele ocupa"""
+    lines = code.split('\n')
+    keys = []
+    for index, stmt in enumerate(statements):
+        end = statements[index + 1].line if index + 1 < len(statements) else len(lines)
+        text = '\n'.join(lines[stmt.line - 1:end])
+        keys.append(hashlib.sha1(f"{stmt.column}:{text}".encode()).hexdigest())
+    return keys
+
+
+def function_marker(name):
+    # Operando provisório do CHPR, trocado pelo endereço da função no ligador
+    return f"<{name}>"
+
+
+def find_relocations(code):
+    """(índice, prefixo, deslocamento local ou nome da função) de cada operando a relocar"""
+    relocations = []
+    for index, instruction in enumerate(code):
+        if instruction.split(None, 1)[0] not in RELOCATED_OPCODES:
+            continue
+        prefix, _, target = instruction.rpartition(' ')
+        if target.startswith('<'):
+            relocations.append((index, prefix + ' ', target[1:-1]))
+        elif target != '0':  # CHPR 0: função declarada depois (como no gerador)
+            relocations.append((index, prefix + ' ', int(target) - 1))
+    return relocations
+
+
+class Segment:
+    """Código relocável: instruções, operandos a relocar e linhas relativas"""
+
+    def __init__(self, code, line_table, base_line=0, relocations=None):
+        self.code = list(code)
+        if relocations is None:
+            relocations = find_relocations(self.code)
+        self.relocations = [tuple(relocation) for relocation in relocations]
+        self.lines = [line - base_line if line else None for line in line_table]
+        self.calls = sorted({target for _, _, target in self.relocations if isinstance(target, str)})
+        self.linked = None  # (posição, linha base, endereços chamados) -> código e linhas prontos
+
+    def __len__(self):
+        return len(self.code)
+
+    def link(self, start, addresses, base_line, code, line_table):
+        """Acrescenta o segmento em 'code' começando na linha 'start'"""
+        placement = (start, base_line, [addresses[name] for name in self.calls])
+        if self.linked is None or self.linked[0] != placement:
+            linked = list(self.code)
+            for index, prefix, target in self.relocations:
+                address = addresses[target] if isinstance(target, str) else start + target
+                linked[index] = f"{prefix}{address}"
+            lines = [base_line + line if line is not None else 0 for line in self.lines]
+            self.linked = (placement, linked, lines)
+        code.extend(self.linked[1])
+        line_table.extend(self.linked[2])
+
+
+class FunctionUnit:
+    """O que se guarda de uma função entre compilações"""
+
+    def __init__(self, node, key):
+        self.name = node.name
+        self.key = key
+        self.externals = None   # nome -> (tipo, parâmetros) buscado no escopo global
+        self.resolved = None    # função chamada -> já declarada quando esta foi gerada?
+        self.segment = None
+
+
+class GlobalUnit:
+    """Comandos globais: variáveis declaradas por comando e o código principal"""
+
+    def __init__(self):
+        self.signatures = None
+        self.declared = None    # por comando: [(nome, linha relativa)]
+        self.allocations = []   # (índice do comando) de cada ALME 1 do prólogo
+        self.segment = None
+        self.statement_lines = []  # (índice do comando, linha relativa) por instrução
+
+
+class RecordingSymbolTable(SymbolTable):
+    """Tabela de símbolos que anota o que foi buscado no escopo global"""
+
+    def __init__(self, global_scope):
+        super().__init__()
+        self.scopes[0] = global_scope
+        self.externals = {}
+
+    def lookup(self, name):
+        for scope in reversed(self.scopes[1:]):
+            if name in scope:
+                return scope[name]
+        symbol = self.scopes[0].get(name)
+        self.externals[name] = describe(symbol)
+        return symbol
+
+
+def describe(symbol):
+    if symbol is None:
+        return None
+    return (symbol.symbol_type, symbol.params_count)
+
+
+class IncrementalCompiler:
+
+    def __init__(self, backend='pilha'):
+        self.backend = backend
+        self.generator_class = BACKENDS[backend][0]
+        self.functions = {}     # impressão digital -> FunctionUnit
+        self.globals = {}
+        self.last_build = {}
+
+    def compile(self, code):
+        """Compila 'code'; erros viram diagnósticos, como pipeline.compile_source"""
+        try:
+            ast = Parser(Lexer(code).tokenize()).parse()
+            return self.compile_ast(ast, statement_keys(code, ast.statements))
+        except Exception as e:
+            return CompileResult(diagnostics=[Diagnostic.from_exception(e)])
+
+    def compile_ast(self, ast, keys=None, prepare=None):
+        """
+        'keys': impressões digitais dos comandos (statement_keys); 'prepare'
+        é chamado com cada comando antes de ele ser percorrido (ver
+        IncrementalParser.materialize)
+        """
+        self.prepare = prepare or (lambda statement: None)
+        statements = ast.statements
+        if keys is None:
+            keys = [fingerprint(stmt, stmt.line) for stmt in statements]
+        keys = {id(stmt): key for stmt, key in zip(statements, keys)}
+        functions = [stmt for stmt in statements if isinstance(stmt, FunctionDeclNode)]
+        global_statements = [stmt for stmt in statements if not isinstance(stmt, FunctionDeclNode)]
+        build = {'funcoes_reaproveitadas': 0, 'funcoes_analisadas': 0, 'funcoes_geradas': 0,
+                 'globais_reaproveitadas': False}
+
+        units = {}
+        for node in functions:
+            key = keys[id(node)]
+            units[id(node)] = self.functions.get(key) or FunctionUnit(node, key)
+
+        global_key = hashlib.sha1("".join(keys[id(stmt)] for stmt in global_statements)
+                                  .encode()).hexdigest()
+        global_unit = self.globals.get(global_key) or GlobalUnit()
+
+        self.analyze(statements, functions, units, global_unit, build)
+        self.generate(functions, global_statements, units, global_unit, build)
+        instructions, line_table = self.link(functions, global_statements, units, global_unit)
+
+        # Só as unidades desta compilação ficam guardadas
+        self.functions = {unit.key: unit for unit in units.values()}
+        self.globals = {global_key: global_unit}
+        self.last_build = build
+        return CompileResult(instructions, line_table)
+
+    def analyze(self, statements, functions, units, global_unit, build):
+        """Mesma ordem de SemanticAnalyzer.visit_program, pulando o que não mudou"""
+        analyzer = SemanticAnalyzer()
+        for node in functions:
+            analyzer.declare_function(node)
+        global_scope = analyzer.symbol_table.scopes[0]
+
+        signatures = tuple((node.name, len(node.params)) for node in functions)
+        reuse_globals = global_unit.signatures == signatures
+        build['globais_reaproveitadas'] = reuse_globals
+        if not reuse_globals:
+            global_unit.signatures = None  # só vale de novo se a análise chegar ao fim
+            global_unit.declared = []
+
+        index = 0
+        for stmt in statements:
+            if isinstance(stmt, FunctionDeclNode):
+                unit = units[id(stmt)]
+                if unit.externals is not None and all(
+                        describe(global_scope.get(name)) == found
+                        for name, found in unit.externals.items()):
+                    build['funcoes_reaproveitadas'] += 1
+                    continue
+
+                unit.externals = None
+                self.prepare(stmt)
+                function_analyzer = SemanticAnalyzer()
+                function_analyzer.symbol_table = RecordingSymbolTable(global_scope)
+                function_analyzer.visit_function_decl(stmt)
+                unit.externals = function_analyzer.symbol_table.externals
+                build['funcoes_analisadas'] += 1
+                continue
+
+            if reuse_globals:
+                for name, line in global_unit.declared[index]:
+                    global_scope[name] = Symbol(name, 'variable', 'global', stmt.line + line)
+            else:
+                before = set(global_scope)
+                self.prepare(stmt)
+                analyzer.visit_statement(stmt)
+                global_unit.declared.append([(name, global_scope[name].line - stmt.line)
+                                             for name in global_scope if name not in before])
+            index += 1
+
+        global_unit.signatures = signatures
+
+    def generate(self, functions, global_statements, units, global_unit, build):
+        declared = set()
+        for node in functions:
+            unit = units[id(node)]
+            declared.add(node.name)
+            if unit.segment is not None and all(
+                    (name in declared) == resolved for name, resolved in unit.resolved.items()):
+                continue
+
+            self.prepare(node)
+            generator = self.generator_class()
+            generator.func_lines = {name: function_marker(name) for name in declared
+                                    if name != node.name}
+            generator.generate_function(node)
+            unit.segment = Segment(generator.code, generator.line_table, node.line)
+            unit.resolved = {call.name: call.name in declared
+                             for call in calls_in(node.body)}
+            build['funcoes_geradas'] += 1
+
+        if global_unit.segment is None:
+            self.generate_globals(functions, global_statements, global_unit)
+
+    def generate_globals(self, functions, global_statements, global_unit):
+        generator = self.generator_class()
+
+        # Prólogo: uma posição de memória por variável global atribuída no nível superior
+        global_unit.allocations = []
+        for index, stmt in enumerate(global_statements):
+            if isinstance(stmt, AssignmentNode) and stmt.variable.name not in generator.var_map:
+                generator.allocate_var(stmt.variable.name)
+                global_unit.allocations.append(index)
+
+        generator.func_lines = {node.name: function_marker(node.name) for node in functions}
+        statement_lines = []
+        for index, stmt in enumerate(global_statements):
+            start = len(generator.code)
+            self.prepare(stmt)
+            generator.generate_stmt(stmt)
+            statement_lines.extend((index, line - stmt.line if line else None)
+                                   for line in generator.line_table[start:])
+
+        global_unit.segment = Segment(generator.code, [0] * len(generator.code))
+        global_unit.statement_lines = statement_lines
+
+    def link(self, functions, global_statements, units, global_unit):
+        """Monta o programa como VMCodeGenerator.generate"""
+        code = ["INPP"]
+        line_table = [0]
+        for index in global_unit.allocations:
+            code.append("ALME 1")
+            line_table.append(global_statements[index].line)
+
+        # Endereço de cada função: depois do DSVI de salto que a precede
+        addresses = {}
+        position = len(code) + 1
+        skips = max(len(functions), 1)
+        for node in functions:
+            position += 1
+            addresses[node.name] = position
+            position += len(units[id(node)].segment)
+        if not functions:
+            position += skips
+        main_line = position
+
+        for index in range(skips):
+            node = functions[index] if functions else None
+            code.append(f"DSVI {main_line} #funcao {node.name}" if node else
+                        f"DSVI {main_line} #funcao")
+            line_table.append(node.line if node else 0)
+            if node is not None:
+                units[id(node)].segment.link(addresses[node.name], addresses, node.line,
+                                             code, line_table)
+
+        segment = global_unit.segment
+        start = len(code)
+        segment.link(main_line, addresses, 0, code, line_table)
+        for offset, (index, line) in enumerate(global_unit.statement_lines):
+            base = global_statements[index].line
+            line_table[start + offset] = base + line if line is not None else 0
+
+        code.append("PARA")
+        line_table.append(0)
+        return code, line_table
+
+
+def calls_in(statements):
+    """Chamadas de função num bloco, incluindo as de expressões e blocos aninhados"""
+    return [node for node in walk(statements) if isinstance(node, FunctionCallNode)]
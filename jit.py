@@ -0,0 +1,181 @@
+"""
+JIT de Traços para a Máquina Virtual
+
+A VM interpreta normalmente e conta os desvios DSVI para trás. Quando o
+cabeçalho de um laço passa do limite, a próxima iteração é gravada
+(sequência de instruções executadas e o resultado de cada DSVF) e
+compilada em uma função Python especializada. Nas iterações seguintes a
+função roda no lugar do interpretador; se um DSVF tomar o caminho
+diferente do gravado (guarda falhou), a execução volta ao interpretador
+no ponto correspondente.
+"""
+
+import argparse
+
+from vm import VirtualMachine, decode_instruction
+from translator import BlockEmitter
+
+
+# Instruções que podem aparecer em um traço
+TRACEABLE = {'INPP', 'CRCT', 'CRVL', 'PARAM', 'ARMZ', 'SOMA', 'SUBT', 'MULT', 'DIVI',
+             'CMAI', 'CPMI', 'CMAG', 'CPME', 'CMIG', 'CMDG', 'LEIT', 'IMPR', 'DSVI', 'DSVF'}
+
+HOT_THRESHOLD = 50
+MAX_TRACE_LENGTH = 1000
+
+
+class TraceCompiler:
+    """Gera a função de um traço gravado a partir do cabeçalho do laço"""
+
+    def __init__(self, header, steps):
+        self.header = header
+        self.steps = steps  # (índice, opcode, operando, próximo índice)
+
+    def generate(self):
+        emitter = BlockEmitter(2)
+
+        for index, opcode, arg, next_pc in self.steps:
+            if opcode == 'DSVI':
+                continue
+
+            if opcode == 'DSVF':
+                condition = emitter.pop()
+                emitter.flush()
+                if next_pc == index + 1:
+                    # Gravado sem desviar: sai se a condição for falsa
+                    emitter.line(f"if {condition} == 0:")
+                    emitter.line(f"    vm.pc = {arg - 1}")
+                else:
+                    emitter.line(f"if {condition} != 0:")
+                    emitter.line(f"    vm.pc = {index + 1}")
+                emitter.line("    return")
+                continue
+
+            emitter.emit(index, opcode, arg)
+
+        emitter.flush()
+
+        lines = [
+            "def _traco(vm):",
+            "    stack = vm.stack",
+            "    mem = vm.memory",
+            "    read = vm.input_func",
+            "    write = vm.output_func",
+            f"    vm.pc = {self.header}",
+            "    while True:",
+        ]
+        lines += emitter.lines or ["        pass"]
+        return "\n".join(lines) + "\n"
+
+    def compile(self):
+        source = self.generate()
+        namespace = {}
+        exec(compile(source, f'<lalg-jit:{self.header}>', 'exec'), namespace)
+        return namespace['_traco'], source
+
+
+class JITVirtualMachine(VirtualMachine):
+
+    def __init__(self, input_func=None, output_func=None, verbose=True,
+                 hot_threshold=HOT_THRESHOLD):
+        super().__init__(input_func, output_func, verbose)
+        self.hot_threshold = hot_threshold
+        self.backedge_counts = {}
+        self.traces = {}
+        self.trace_sources = {}
+        self.blacklist = set()
+        self.recording = None
+        self.recording_header = None
+        self.trace_entries = 0
+
+    def execute(self):
+        if self.verbose:
+            print("\nIniciando execução\n")
+
+        instructions = self.instructions
+        traces = self.traces
+
+        while self.running and self.pc < len(instructions):
+            trace = traces.get(self.pc)
+            if trace is not None:
+                self.trace_entries += 1
+                trace(self)
+                continue
+
+            pc = self.pc
+            instruction = instructions[pc]
+            self.execute_instruction(instruction)
+            self.pc += 1
+
+            if self.recording is not None:
+                self.record(pc, instruction)
+            elif self.pc <= pc and instruction.startswith('DSVI'):
+                self.count_backedge(self.pc)
+
+        if self.verbose:
+            print("\nExecução finalizada")
+
+    def count_backedge(self, header):
+        if header in self.blacklist:
+            return
+        count = self.backedge_counts.get(header, 0) + 1
+        self.backedge_counts[header] = count
+        if count >= self.hot_threshold:
+            self.recording = []
+            self.recording_header = header
+
+    def record(self, pc, instruction):
+        opcode, arg = decode_instruction(instruction)
+
+        if (opcode not in TRACEABLE or self.pc in self.traces or
+                len(self.recording) >= MAX_TRACE_LENGTH):
+            self.abort_recording()
+            return
+
+        self.recording.append((pc, opcode, arg, self.pc))
+
+        if self.pc == self.recording_header:
+            if opcode == 'DSVI':
+                self.finish_recording()
+            else:
+                # Voltou ao cabeçalho por outro caminho (DSVF para trás)
+                self.abort_recording()
+
+    def finish_recording(self):
+        header = self.recording_header
+        function, source = TraceCompiler(header, self.recording).compile()
+        self.traces[header] = function
+        self.trace_sources[header] = source
+        self.recording = None
+        self.recording_header = None
+
+    def abort_recording(self):
+        self.blacklist.add(self.recording_header)
+        self.recording = None
+        self.recording_header = None
+
+
+def main():
+    """Função principal"""
+    arg_parser = argparse.ArgumentParser(
+        description="Executa um programa .asm com JIT de traços para laços quentes")
+    arg_parser.add_argument('programa', help="arquivo .asm gerado pelo compilador")
+    arg_parser.add_argument('--limite', type=int, default=HOT_THRESHOLD,
+                            help="desvios para trás até compilar o laço")
+    arg_parser.add_argument('--tracos', action='store_true',
+                            help="mostra o código Python dos traços compilados")
+    args = arg_parser.parse_args()
+
+    vm = JITVirtualMachine(hot_threshold=args.limite)
+    vm.load_program(args.programa)
+    vm.execute()
+
+    print(f"Traços compilados: {len(vm.traces)} (entradas: {vm.trace_entries})")
+    if args.tracos:
+        for header, source in sorted(vm.trace_sources.items()):
+            print(f"\n# Laço na linha {header + 1}")
+            print(source)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,275 +1,409 @@
-"""
-Analisador Léxico (Lexer) para LALG-PHP
-Compilador LALG-PHP
-"""
-
-from tokens import Token, TokenType, is_keyword
-
-
-class LexerError(Exception):
-    pass
-
-
-class Lexer:
-
-    def __init__(self, source_code):
-
-        self.source_code = source_code
-        self.position = 0
-        self.line = 1
-        self.column = 1
-        self.current_char = self.source_code[0] if source_code else None
-
-    def advance(self):
-        if self.current_char == '\n':
-            self.line += 1
-            self.column = 1
-        else:
-            self.column += 1
-
-        self.position += 1
-        if self.position < len(self.source_code):
-            self.current_char = self.source_code[self.position]
-        else:
-            self.current_char = None
-
-    def peek(self, offset=1):
-        peek_pos = self.position + offset
-        if peek_pos < len(self.source_code):
-            return self.source_code[peek_pos]
-        return None
-
-    def skip_whitespace(self):
-        while self.current_char and self.current_char in ' \t\n\r':
-            self.advance()
-
-    def skip_comment(self): # This function handles block comments /* ... */
-        self.advance() # Consume '/'
-        self.advance() # Consume '*'
-
-        while self.current_char:
-            if self.current_char == '*' and self.peek() == '/':
-                self.advance() # Consume '*'
-                self.advance() # Consume '/'
-                return
-            self.advance()
-
-        raise LexerError(f"Comentário não fechado na linha {self.line}")
-
-    def skip_line_comment(self):
-        while self.current_char and self.current_char != '\n':
-            self.advance()
-        if self.current_char == '\n':
-            self.advance()
-
-    def read_number(self):
-        num_str = ''
-        has_dot = False
-
-        while self.current_char and (self.current_char.isdigit() or self.current_char == '.'):
-            if self.current_char == '.':
-                if has_dot:
-                    raise LexerError(f"Número com múltiplos pontos na linha {self.line}, coluna {self.column}")
-                has_dot = True
-            num_str += self.current_char
-            self.advance()
-
-        return num_str
-
-    def read_identifier(self):
-        ident_str = ''
-
-        while self.current_char and (self.current_char.isalnum() or self.current_char == '_'):
-            ident_str += self.current_char
-            self.advance()
-
-        return ident_str
-
-    def read_variable(self):
-        var_str = '$'
-        self.advance()
-
-        if not self.current_char or not (self.current_char.isalpha() or self.current_char == '_'):
-            raise LexerError(f"Variável inválida na linha {self.line}, coluna {self.column}")
-
-        while self.current_char and (self.current_char.isalnum() or self.current_char == '_'):
-            var_str += self.current_char
-            self.advance()
-
-        return var_str
-
-    def get_next_token(self):
-        while self.current_char:
-            # Pula espaços em branco
-            if self.current_char in ' \t\n\r':
-                self.skip_whitespace()
-                continue
-
-            # Comentário de bloco /* ... */
-            if self.current_char == '/' and self.peek() == '*':
-                self.skip_comment()
-                continue
-
-            # Comentário de linha // ...
-            if self.current_char == '/' and self.peek() == '/':
-                self.skip_line_comment()
-                continue
-
-            token_line = self.line
-            token_column = self.column
-
-            # Números (inteiros e decimais)
-            if self.current_char.isdigit():
-                number = self.read_number()
-                return Token(TokenType.NUMBER, float(number), self.line, self.column - len(number))
-
-            # Variáveis $nome
-            if self.current_char == '$':
-                var = self.read_variable()
-                return Token(TokenType.VARIABLE, var, self.line, self.column - len(var))
-
-            # Identificadores e palavras-chave
-            if self.current_char.isalpha() or self.current_char == '_':
-                ident = self.read_identifier()
-
-                keyword_type = is_keyword(ident)
-                if keyword_type:
-                    return Token(keyword_type, ident, self.line, self.column - len(ident))
-                else:
-                    return Token(TokenType.IDENTIFIER, ident, self.line, self.column - len(ident))
-
-            # Tag de abertura <?php
-            if self.current_char == '<':
-                if self.peek() == '?':
-                    if (self.peek(2) == 'p' and self.peek(3) == 'h' and
-                        self.peek(4) == 'p' and
-                        (self.peek(5) is None or not self.peek(5).isalnum())):
-                        value = '<?php'
-                        for _ in range(5):
-                            self.advance()
-                        return Token(TokenType.PHP_OPEN, value, token_line, token_column)
-                # Operador menor ou igual <=
-                if self.peek() == '=':
-                    self.advance()
-                    self.advance()
-                    return Token(TokenType.LESS_EQUAL, '<=', token_line, token_column)
-                # Operador menor <
-                char = self.current_char
-                self.advance()
-                return Token(TokenType.LESS, char, token_line, token_column)
-
-            # Operador maior ou igual >=
-            if self.current_char == '>':
-                if self.peek() == '=':
-                    self.advance()
-                    self.advance()
-                    return Token(TokenType.GREATER_EQUAL, '>=', token_line, token_column)
-                # Operador maior >
-                char = self.current_char
-                self.advance()
-                return Token(TokenType.GREATER, char, token_line, token_column)
-
-            # Operador de atribuição = ou Operador de igualdade ==
-            if self.current_char == '=':
-                if self.peek() == '=':
-                    self.advance()
-                    self.advance()
-                    return Token(TokenType.EQUAL, '==', token_line, token_column)
-                char = self.current_char
-                self.advance()
-                return Token(TokenType.ASSIGN, char, token_line, token_column)
-
-            # Operador diferente !=
-            if self.current_char == '!':
-                if self.peek() == '=':
-                    self.advance()
-                    self.advance()
-                    return Token(TokenType.NOT_EQUAL, '!=', token_line, token_column)
-                raise LexerError(f"Caractere inesperado '!' na linha {self.line}, coluna {self.column}")
-
-            # Tag de fechamento ?>
-            if self.current_char == '?':
-                if self.peek() == '>':
-                    self.advance()
-                    self.advance()
-                    return Token(TokenType.PHP_CLOSE, '?>', self.line, self.column - 2)
-                raise LexerError(f"Caractere inesperado '?' na linha {self.line}, coluna {self.column}")
-
-            # Operador de adição +
-            if self.current_char == '+':
-                char = self.current_char
-                self.advance()
-                return Token(TokenType.PLUS, char, token_line, token_column)
-
-            # Operador de subtração -
-            if self.current_char == '-':
-                char = self.current_char
-                self.advance()
-                return Token(TokenType.MINUS, char, token_line, token_column)
-
-            # Operador de multiplicação *
-            if self.current_char == '*':
-                char = self.current_char
-                self.advance()
-                return Token(TokenType.MULTIPLY, char, token_line, token_column)
-
-            # Operador de divisão /
-            if self.current_char == '/':
-                char = self.current_char
-                self.advance()
-                return Token(TokenType.DIVIDE, char, token_line, token_column)
-
-            # Parêntese esquerdo (
-            if self.current_char == '(':
-                char = self.current_char
-                self.advance()
-                return Token(TokenType.LPAREN, char, token_line, token_column)
-
-            # Parêntese direito )
-            if self.current_char == ')':
-                char = self.current_char
-                self.advance()
-                return Token(TokenType.RPAREN, char, token_line, token_column)
-
-            # Chave esquerda {
-            if self.current_char == '{':
-                char = self.current_char
-                self.advance()
-                return Token(TokenType.LBRACE, char, token_line, token_column)
-
-            # Chave direita }
-            if self.current_char == '}':
-                char = self.current_char
-                self.advance()
-                return Token(TokenType.RBRACE, char, token_line, token_column)
-
-            # Ponto e vírgula ;
-            if self.current_char == ';':
-                char = self.current_char
-                self.advance()
-                return Token(TokenType.SEMICOLON, char, token_line, token_column)
-
-            # Vírgula ,
-            if self.current_char == ',':
-                char = self.current_char
-                self.advance()
-                return Token(TokenType.COMMA, char, token_line, token_column)
-
-            # Operador de concatenação .
-            if self.current_char == '.':
-                char = self.current_char
-                self.advance()
-                return Token(TokenType.DOT, char, token_line, token_column)
-
-            raise LexerError(f"Caractere inválido '{self.current_char}' na linha {self.line}, coluna {self.column}")
-
-        return Token(TokenType.EOF, '', self.line, self.column)
-
-    def tokenize(self):
-        tokens = []
-        while True:
-            token = self.get_next_token()
-            tokens.append(token)
-            if token.type == TokenType.EOF:
-                break
-        return tokens
+"""
+Analisador Léxico (Lexer) para LALG-PHP
+Compilador LALG-PHP
+"""
+
+import bisect
+
+from tokens import Token, TokenType, is_keyword
+
+
+class LexerError(Exception):
+    pass
+
+
+class Lexer:
+
+    def __init__(self, source_code):
+
+        self.source_code = source_code
+        self.position = 0
+        self.line = 1
+        self.column = 1
+        self.current_char = self.source_code[0] if source_code else None
+
+    def advance(self):
+        if self.current_char == '\n':
+            self.line += 1
+            self.column = 1
+        else:
+            self.column += 1
+
+        self.position += 1
+        if self.position < len(self.source_code):
+            self.current_char = self.source_code[self.position]
+        else:
+            self.current_char = None
+
+    def peek(self, offset=1):
+        peek_pos = self.position + offset
+        if peek_pos < len(self.source_code):
+            return self.source_code[peek_pos]
+        return None
+
+    def skip_whitespace(self):
+        while self.current_char and self.current_char in ' \t\n\r':
+            self.advance()
+
+    def skip_comment(self): # This function handles block comments /* ... */
+        self.advance() # Consume '/'
+        self.advance() # Consume '*'
+
+        while self.current_char:
+            if self.current_char == '*' and self.peek() == '/':
+                self.advance() # Consume '*'
+                self.advance() # Consume '/'
+                return
+            self.advance()
+
+        raise LexerError(f"Comentário não fechado na linha {self.line}")
+
+    def skip_line_comment(self):
+        while self.current_char and self.current_char != '\n':
+            self.advance()
+        if self.current_char == '\n':
+            self.advance()
+
+    def read_number(self):
+        num_str = ''
+        has_dot = False
+
+        while self.current_char and (self.current_char.isdigit() or self.current_char == '.'):
+            if self.current_char == '.':
+                if has_dot:
+                    raise LexerError(f"Número com múltiplos pontos na linha {self.line}, coluna {self.column}")
+                has_dot = True
+            num_str += self.current_char
+            self.advance()
+
+        return num_str
+
+    def read_string(self):
+        quote = self.current_char
+        line, column = self.line, self.column
+        self.advance()
+
+        string = ''
+        while self.current_char and self.current_char not in (quote, '\n'):
+            string += self.current_char
+            self.advance()
+
+        if self.current_char != quote:
+            raise LexerError(f"String não fechada na linha {line}, coluna {column}")
+        self.advance()
+        return string
+
+    def read_identifier(self):
+        ident_str = ''
+
+        while self.current_char and (self.current_char.isalnum() or self.current_char == '_'):
+            ident_str += self.current_char
+            self.advance()
+
+        return ident_str
+
+    def read_variable(self):
+        var_str = '$'
+        self.advance()
+
+        if not self.current_char or not (self.current_char.isalpha() or self.current_char == '_'):
+            raise LexerError(f"Variável inválida na linha {self.line}, coluna {self.column}")
+
+        while self.current_char and (self.current_char.isalnum() or self.current_char == '_'):
+            var_str += self.current_char
+            self.advance()
+
+        return var_str
+
+    def get_next_token(self):
+        while self.current_char:
+            # Pula espaços em branco
+            if self.current_char in ' \t\n\r':
+                self.skip_whitespace()
+                continue
+
+            # Comentário de bloco /* ... */
+            if self.current_char == '/' and self.peek() == '*':
+                self.skip_comment()
+                continue
+
+            # Comentário de linha // ...
+            if self.current_char == '/' and self.peek() == '/':
+                self.skip_line_comment()
+                continue
+
+            token_line = self.line
+            token_column = self.column
+
+            # Números (inteiros e decimais)
+            if self.current_char.isdigit():
+                number = self.read_number()
+                return Token(TokenType.NUMBER, float(number), self.line, self.column - len(number))
+
+            # Variáveis $nome
+            if self.current_char == '$':
+                var = self.read_variable()
+                return Token(TokenType.VARIABLE, var, self.line, self.column - len(var))
+
+            # Strings '...' ou "..." (caminho do include)
+            if self.current_char in '\'"':
+                string = self.read_string()
+                return Token(TokenType.STRING, string, token_line, token_column)
+
+            # Identificadores e palavras-chave
+            if self.current_char.isalpha() or self.current_char == '_':
+                ident = self.read_identifier()
+
+                keyword_type = is_keyword(ident)
+                if keyword_type:
+                    return Token(keyword_type, ident, self.line, self.column - len(ident))
+                else:
+                    return Token(TokenType.IDENTIFIER, ident, self.line, self.column - len(ident))
+
+            # Tag de abertura <?php
+            if self.current_char == '<':
+                if self.peek() == '?':
+                    if (self.peek(2) == 'p' and self.peek(3) == 'h' and
+                        self.peek(4) == 'p' and
+                        (self.peek(5) is None or not self.peek(5).isalnum())):
+                        value = '<?php'
+                        for _ in range(5):
+                            self.advance()
+                        return Token(TokenType.PHP_OPEN, value, token_line, token_column)
+                # Operador menor ou igual <=
+                if self.peek() == '=':
+                    self.advance()
+                    self.advance()
+                    return Token(TokenType.LESS_EQUAL, '<=', token_line, token_column)
+                # Operador menor <
+                char = self.current_char
+                self.advance()
+                return Token(TokenType.LESS, char, token_line, token_column)
+
+            # Operador maior ou igual >=
+            if self.current_char == '>':
+                if self.peek() == '=':
+                    self.advance()
+                    self.advance()
+                    return Token(TokenType.GREATER_EQUAL, '>=', token_line, token_column)
+                # Operador maior >
+                char = self.current_char
+                self.advance()
+                return Token(TokenType.GREATER, char, token_line, token_column)
+
+            # Operador de atribuição = ou Operador de igualdade ==
+            if self.current_char == '=':
+                if self.peek() == '=':
+                    self.advance()
+                    self.advance()
+                    return Token(TokenType.EQUAL, '==', token_line, token_column)
+                char = self.current_char
+                self.advance()
+                return Token(TokenType.ASSIGN, char, token_line, token_column)
+
+            # Operador diferente !=
+            if self.current_char == '!':
+                if self.peek() == '=':
+                    self.advance()
+                    self.advance()
+                    return Token(TokenType.NOT_EQUAL, '!=', token_line, token_column)
+                raise LexerError(f"Caractere inesperado '!' na linha {self.line}, coluna {self.column}")
+
+            # Tag de fechamento ?>
+            if self.current_char == '?':
+                if self.peek() == '>':
+                    self.advance()
+                    self.advance()
+                    return Token(TokenType.PHP_CLOSE, '?>', self.line, self.column - 2)
+                raise LexerError(f"Caractere inesperado '?' na linha {self.line}, coluna {self.column}")
+
+            # Operador de adição +
+            if self.current_char == '+':
+                char = self.current_char
+                self.advance()
+                return Token(TokenType.PLUS, char, token_line, token_column)
+
+            # Operador de subtração -
+            if self.current_char == '-':
+                char = self.current_char
+                self.advance()
+                return Token(TokenType.MINUS, char, token_line, token_column)
+
+            # Operador de multiplicação *
+            if self.current_char == '*':
+                char = self.current_char
+                self.advance()
+                return Token(TokenType.MULTIPLY, char, token_line, token_column)
+
+            # Operador de divisão /
+            if self.current_char == '/':
+                char = self.current_char
+                self.advance()
+                return Token(TokenType.DIVIDE, char, token_line, token_column)
+
+            # Parêntese esquerdo (
+            if self.current_char == '(':
+                char = self.current_char
+                self.advance()
+                return Token(TokenType.LPAREN, char, token_line, token_column)
+
+            # Parêntese direito )
+            if self.current_char == ')':
+                char = self.current_char
+                self.advance()
+                return Token(TokenType.RPAREN, char, token_line, token_column)
+
+            # Chave esquerda {
+            if self.current_char == '{':
+                char = self.current_char
+                self.advance()
+                return Token(TokenType.LBRACE, char, token_line, token_column)
+
+            # Chave direita }
+            if self.current_char == '}':
+                char = self.current_char
+                self.advance()
+                return Token(TokenType.RBRACE, char, token_line, token_column)
+
+            # Ponto e vírgula ;
+            if self.current_char == ';':
+                char = self.current_char
+                self.advance()
+                return Token(TokenType.SEMICOLON, char, token_line, token_column)
+
+            # Vírgula ,
+            if self.current_char == ',':
+                char = self.current_char
+                self.advance()
+                return Token(TokenType.COMMA, char, token_line, token_column)
+
+            # Operador de concatenação .
+            if self.current_char == '.':
+                char = self.current_char
+                self.advance()
+                return Token(TokenType.DOT, char, token_line, token_column)
+
+            raise LexerError(f"Caractere inválido '{self.current_char}' na linha {self.line}, coluna {self.column}")
+
+        return Token(TokenType.EOF, '', self.line, self.column)
+
+    def tokenize(self):
+        tokens = []
+        while True:
+            token = self.get_next_token()
+            tokens.append(token)
+            if token.type == TokenType.EOF:
+                break
+        return tokens
+
+
+class IncrementalLexer:
+    """
+    Tokens de um texto que muda aos poucos (modo --watch). A cada versão
+    nova, update() relexa só a partir do token anterior ao trecho editado
+    e para no primeiro token, depois do trecho, que começa na mesma
+    posição (deslocada) e tem o mesmo tipo e valor de um token antigo: daí
+    em diante o texto é igual e os tokens antigos são reaproveitados, só
+    com linha e coluna ajustadas. A lista self.tokens é alterada no lugar.
+    """
+
+    def __init__(self, source_code):
+        self.source_code = source_code
+        self.tokens = []
+        self.offsets = []   # posição no texto do início de cada token
+        lexer = Lexer(source_code)
+        while True:
+            token = self.next_token(lexer)
+            if token.type == TokenType.EOF:
+                break
+
+        # Deslocamento da última edição: (linha antiga, delta de linhas, delta de colunas)
+        self.last_shift = (0, 0, 0)
+
+    def next_token(self, lexer, tokens=None, offsets=None):
+        token = lexer.get_next_token()
+        # Nenhum token ocupa mais de uma linha: o início está 'column' posições atrás
+        offset = lexer.position - (lexer.column - token.column)
+        (self.tokens if tokens is None else tokens).append(token)
+        (self.offsets if offsets is None else offsets).append(offset)
+        return token
+
+    def update(self, source_code):
+        """
+        Troca o texto; devolve (first, old_stop, new_stop): os tokens
+        antigos [first:old_stop] viraram os novos [first:new_stop].
+        """
+        old = self.source_code
+        prefix = common_prefix(old, source_code)
+        suffix = common_prefix(old[prefix:][::-1], source_code[prefix:][::-1])
+        delta = len(source_code) - len(old)
+        edit_end = len(source_code) - suffix
+
+        # Recomeça no token anterior ao que começa antes da edição
+        first = max(bisect.bisect_left(self.offsets, prefix) - 2, 0)
+        restart = self.tokens[first]
+        lexer = Lexer(source_code)
+        lexer.position = self.offsets[first]
+        lexer.line = restart.line
+        lexer.column = restart.column
+        lexer.current_char = source_code[lexer.position] if lexer.position < len(source_code) else None
+
+        tokens = []
+        offsets = []
+        old_stop = len(self.tokens)
+        search = first
+        while True:
+            token = self.next_token(lexer, tokens, offsets)
+            if token.type == TokenType.EOF:
+                break
+            if offsets[-1] < edit_end:
+                continue
+            # Depois da edição: procura um token antigo na mesma posição
+            search = bisect.bisect_left(self.offsets, offsets[-1] - delta, search)
+            if search < len(self.tokens) and self.offsets[search] == offsets[-1] - delta:
+                previous = self.tokens[search]
+                if previous.type == token.type and previous.value == token.value:
+                    tokens.pop()
+                    offsets.pop()
+                    old_stop = search
+                    break
+
+        self.source_code = source_code
+        self.splice(first, old_stop, tokens, offsets, delta, token)
+        return first, old_stop, first + len(tokens)
+
+    def splice(self, first, old_stop, tokens, offsets, delta, resync):
+        line_delta = column_delta = 0
+        old_line = 0
+        if old_stop < len(self.tokens):
+            previous = self.tokens[old_stop]
+            old_line = previous.line
+            line_delta = resync.line - previous.line
+            column_delta = resync.column - previous.column
+
+        self.tokens[first:old_stop] = tokens
+        self.offsets[first:old_stop] = offsets
+        start = first + len(tokens)
+        if delta:
+            self.offsets[start:] = [offset + delta for offset in self.offsets[start:]]
+        for index in range(start, len(self.tokens)):
+            token = self.tokens[index]
+            if token.line != old_line:
+                if not line_delta:
+                    break
+            else:
+                token.column += column_delta
+            token.line += line_delta
+        self.last_shift = (old_line, line_delta, column_delta)
+
+
+def common_prefix(a, b):
+    """Tamanho do maior prefixo comum (busca binária com comparações de fatias)"""
+    low, high = 0, min(len(a), len(b))
+    while low < high:
+        middle = (low + high + 1) // 2
+        if a[:middle] == b[:middle]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
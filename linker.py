@@ -0,0 +1,573 @@
+"""
+Compilação Separada e Ligador
+
+Um programa pode ser dividido em vários arquivos com
+
+    include 'biblioteca.php';   (também include_once, require e require_once)
+
+no nível superior. Cada arquivo é uma unidade de compilação, compilada
+sozinha para um arquivo objeto (ObjectFile), sem olhar as unidades que
+inclui. O arquivo objeto guarda:
+
+- código relocável: um segmento por função e um com os comandos globais,
+  com os desvios relativos ao início do segmento (incremental.Segment),
+  as chamadas como CHPR <nome> e as variáveis globais como [$nome];
+- símbolos exportados: as funções da unidade e quantos parâmetros têm;
+- importações: funções chamadas que não estão na unidade, com o número
+  de argumentos, a linha e a coluna de cada chamada;
+- variáveis globais: as que a unidade cria (as do prólogo ALME primeiro)
+  e as que ela lê sem ter atribuído antes, que outra unidade precisa
+  fornecer.
+
+Como nenhuma unidade depende da compilação de outra, elas compilam em
+paralelo (-j) e cada uma fica no cache de compilação (cache.py) pela
+chave do próprio texto: alterar uma biblioteca recompila só ela.
+
+O ligador junta as unidades na ordem de inicialização (cada unidade
+incluída vem antes de quem a inclui, uma vez só, como include_once),
+confere funções duplicadas, não declaradas ou chamadas com o número
+errado de argumentos e variáveis que nenhuma unidade anterior atribuiu,
+dá o endereço final de cada global e monta o programa como
+VMCodeGenerator.generate: INPP, os ALME das globais, um DSVI antes de
+cada função, as funções de todas as unidades, os comandos globais de
+cada unidade e PARA. Um programa de uma unidade só sai idêntico ao da
+compilação normal.
+
+Os comandos globais de uma unidade incluída rodam antes dos da unidade
+que a inclui, e não no ponto do include. O mapa de fonte traz as linhas
+do arquivo principal; instruções de outras unidades ficam com linha 0.
+Sem suporte a perfil PGO.
+
+    python linker.py programa.php -j 4 --cache .lalg-cache
+    python linker.py -c biblioteca.php programa.php      # só gera os .lo
+    python linker.py biblioteca.lo programa.lo -o programa.asm
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from ast_nodes import AssignmentNode, FunctionDeclNode, IfNode, IncludeNode, NumberNode, WhileNode
+from incremental import Segment, function_marker
+from lexer import Lexer
+from parser import Parser
+from pipeline import BACKENDS, CompileResult, Diagnostic, decode_source, output_filename
+from semantic_analyzer import SemanticAnalyzer, SemanticError
+
+
+OBJECT_MAGIC = 'lalg-objeto'
+OBJECT_VERSION = 1
+OBJECT_EXTENSION = '.lo'
+
+# Operando provisório de variável global: [$nome]
+GLOBAL_MARKER = re.compile(r'\[(\$\w+)\]')
+# Detecção rápida (sem análise léxica) de fontes que incluem outras unidades
+INCLUDE_PATTERN = re.compile(r'\b(?:include|require)(?:_once)?\s*[\'"]')
+
+
+class ObjectFileError(ValueError):
+    pass
+
+
+def global_marker(name):
+    return f"[{name}]"
+
+
+def has_includes(code):
+    return INCLUDE_PATTERN.search(code) is not None
+
+
+def assigned_names(statements):
+    """Variáveis de um bloco na ordem em que o gerador as aloca (atribuições de zero não alocam)"""
+    names = []
+    for stmt in statements:
+        if isinstance(stmt, AssignmentNode):
+            if not (isinstance(stmt.expression, NumberNode) and stmt.expression.value == 0):
+                names.append(stmt.variable.name)
+        elif isinstance(stmt, IfNode):
+            names += assigned_names(stmt.then_body) + assigned_names(stmt.else_body or [])
+        elif isinstance(stmt, WhileNode):
+            names += assigned_names(stmt.body)
+    return names
+
+
+class UnitAnalyzer(SemanticAnalyzer):
+    """Análise semântica de uma unidade: o que não está nela vira importação"""
+
+    def __init__(self):
+        super().__init__()
+        self.imports = {}    # função -> [(argumentos, linha, coluna)]
+        self.requires = {}   # variável -> (linha, coluna) do primeiro uso
+
+    def visit_include(self, node):
+        pass
+
+    def visit_function_call(self, node):
+        if self.symbol_table.lookup(node.name) is not None:
+            super().visit_function_call(node)
+            return
+
+        self.imports.setdefault(node.name, []).append((len(node.arguments), node.line, node.column))
+        for arg in node.arguments:
+            self.visit_expression(arg)
+
+    def visit_variable(self, node):
+        if self.symbol_table.lookup(node.name) is None:
+            self.requires.setdefault(node.name, (node.line, node.column))
+
+
+class FunctionSymbol:
+    """Função exportada: nome, parâmetros, posição da declaração e código"""
+
+    def __init__(self, name, params, line, column, segment):
+        self.name = name
+        self.params = params
+        self.line = line
+        self.column = column
+        self.segment = segment
+
+
+class ObjectFile:
+
+    def __init__(self, backend='pilha'):
+        self.backend = backend
+        self.includes = []      # (caminho como escrito, linha, coluna)
+        self.functions = []     # FunctionSymbol, na ordem do arquivo
+        self.imports = {}       # função -> [(argumentos, linha, coluna)]
+        self.allocations = []   # (variável, linha) de cada ALME do prólogo
+        self.definitions = []   # demais variáveis globais atribuídas, na ordem de alocação
+        self.requires = {}      # variável -> (linha, coluna) do primeiro uso sem atribuição
+        self.main = None        # segmento dos comandos globais
+
+    def encode(self):
+        def segment(seg):
+            return {
+                'codigo': seg.code,
+                'linhas': [line or 0 for line in seg.lines],
+                'relocacoes': [list(relocation) for relocation in seg.relocations],
+            }
+
+        return json.dumps({
+            'formato': OBJECT_MAGIC,
+            'versao': OBJECT_VERSION,
+            'backend': self.backend,
+            'inclui': self.includes,
+            'exporta': [{'nome': fn.name, 'parametros': fn.params, 'linha': fn.line,
+                         'coluna': fn.column, 'segmento': segment(fn.segment)}
+                        for fn in self.functions],
+            'importa': self.imports,
+            'aloca': self.allocations,
+            'define': self.definitions,
+            'requer': self.requires,
+            'principal': segment(self.main),
+        }, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    @classmethod
+    def decode(cls, data):
+        entry = json.loads(data)
+        if entry.get('formato') != OBJECT_MAGIC or entry.get('versao') != OBJECT_VERSION:
+            raise ObjectFileError("não é um arquivo objeto LALG-PHP desta versão")
+
+        def segment(data):
+            return Segment(data['codigo'], data['linhas'], relocations=data['relocacoes'])
+
+        obj = cls(entry['backend'])
+        obj.includes = [tuple(include) for include in entry['inclui']]
+        obj.functions = [FunctionSymbol(fn['nome'], fn['parametros'], fn['linha'], fn['coluna'],
+                                        segment(fn['segmento'])) for fn in entry['exporta']]
+        obj.imports = {name: [tuple(call) for call in calls]
+                       for name, calls in entry['importa'].items()}
+        obj.allocations = [tuple(allocation) for allocation in entry['aloca']]
+        obj.definitions = entry['define']
+        obj.requires = {name: tuple(use) for name, use in entry['requer'].items()}
+        obj.main = segment(entry['principal'])
+        return obj
+
+    def save(self, filename):
+        with open(filename, 'wb') as f:
+            f.write(self.encode())
+
+    @classmethod
+    def load(cls, filename):
+        with open(filename, 'rb') as f:
+            try:
+                return cls.decode(f.read())
+            except (ValueError, KeyError, TypeError) as e:
+                raise ObjectFileError(f"{filename}: arquivo objeto inválido ({e})") from e
+
+
+def compile_unit(code, backend='pilha'):
+    """Compila o texto de uma unidade para um ObjectFile (erros sobem como exceções)"""
+    generator_class = BACKENDS[backend][0]
+    ast = Parser(Lexer(code).tokenize()).parse()
+    analyzer = UnitAnalyzer()
+    analyzer.analyze(ast)
+
+    obj = ObjectFile(backend)
+    obj.imports = analyzer.imports
+    obj.requires = analyzer.requires
+    obj.includes = [(stmt.path, stmt.line, stmt.column) for stmt in ast.statements
+                    if isinstance(stmt, IncludeNode)]
+    functions = [stmt for stmt in ast.statements if isinstance(stmt, FunctionDeclNode)]
+    global_statements = [stmt for stmt in ast.statements
+                         if not isinstance(stmt, (FunctionDeclNode, IncludeNode))]
+
+    # Funções: chamadas às importadas e às já declaradas viram CHPR <nome>;
+    # às declaradas mais abaixo, CHPR 0, como no gerador
+    imported = {name: function_marker(name) for name in obj.imports}
+    declared = {}
+    for node in functions:
+        generator = generator_class()
+        generator.func_lines = dict(imported, **declared)
+        generator.generate_function(node)
+        obj.functions.append(FunctionSymbol(node.name, len(node.params), node.line, node.column,
+                                            Segment(generator.code, generator.line_table)))
+        declared[node.name] = function_marker(node.name)
+
+    # Globais: as do prólogo na ordem do gerador, depois as atribuídas dentro de blocos
+    for stmt in global_statements:
+        if isinstance(stmt, AssignmentNode) and all(
+                stmt.variable.name != name for name, _ in obj.allocations):
+            obj.allocations.append((stmt.variable.name, stmt.line))
+    allocated = {name for name, _ in obj.allocations}
+    for name in assigned_names(global_statements):
+        if name not in allocated:
+            allocated.add(name)
+            obj.definitions.append(name)
+
+    generator = generator_class()
+    generator.var_map = {name: global_marker(name) for name in list(allocated) + list(obj.requires)}
+    generator.func_lines = dict(imported, **declared)
+    for stmt in global_statements:
+        generator.generate_stmt(stmt)
+    obj.main = Segment(generator.code, generator.line_table)
+    return obj
+
+
+def unit_diagnostic(name, error):
+    """Diagnóstico de 'error' com o nome da unidade na mensagem"""
+    diagnostic = Diagnostic.from_exception(error)
+    diagnostic.message = f"{name}: {diagnostic.message}"
+    return diagnostic
+
+
+def link(units):
+    """
+    Liga [(nome, ObjectFile)] em ordem de inicialização (o programa
+    principal por último) e devolve um CompileResult
+    """
+    diagnostics = []
+
+    def error(name, message, line=0, column=0):
+        diagnostics.append(unit_diagnostic(name, SemanticError(message, line, column)))
+
+    backends = {obj.backend for _, obj in units}
+    if len(backends) > 1:
+        error(units[-1][0], f"unidades geradas para backends diferentes: {', '.join(sorted(backends))}")
+        return CompileResult(diagnostics=diagnostics)
+
+    # Símbolos exportados
+    symbols = {}
+    for name, obj in units:
+        for function in obj.functions:
+            if function.name in symbols:
+                owner, existing = symbols[function.name]
+                error(name, f"'{function.name}' já foi declarado(a) anteriormente "
+                            f"(linha {existing.line} de {owner})", function.line, function.column)
+            else:
+                symbols[function.name] = (name, function)
+
+    # Importações
+    for name, obj in units:
+        for function_name, calls in obj.imports.items():
+            for arguments, line, column in calls:
+                if function_name not in symbols:
+                    error(name, f"Função '{function_name}' não foi declarada", line, column)
+                    break
+                expected = symbols[function_name][1].params
+                if arguments != expected:
+                    error(name, f"Função '{function_name}' espera {expected} argumento(s), "
+                                f"mas recebeu {arguments}", line, column)
+
+    # Endereços das globais: prólogos de todas as unidades, depois as demais
+    variables = {}
+    for _, obj in units:
+        for variable, _ in obj.allocations:
+            variables.setdefault(variable, len(variables))
+    allocations = len(variables)
+    defined = set()
+    for name, obj in units:
+        for variable, (line, column) in obj.requires.items():
+            if variable not in defined:
+                error(name, f"Variável '{variable}' não foi declarada "
+                            f"(não foi atribuída antes do uso)", line, column)
+        for variable in obj.definitions:
+            variables.setdefault(variable, len(variables))
+        defined.update(variable for variable, _ in obj.allocations)
+        defined.update(obj.definitions)
+
+    if diagnostics:
+        return CompileResult(diagnostics=diagnostics)
+
+    # Montagem, com as linhas do fonte só da unidade principal
+    main_unit = units[-1][1]
+    code = ["INPP"]
+    line_table = [0]
+    allocation_lines = {variable: line for variable, line in main_unit.allocations}
+    for variable in list(variables)[:allocations]:
+        code.append("ALME 1")
+        line_table.append(allocation_lines.get(variable, 0))
+
+    functions = [(obj, function) for _, obj in units for function in obj.functions]
+    addresses = {}
+    position = len(code) + 1
+    for _, function in functions:
+        position += 1
+        addresses[function.name] = position
+        position += len(function.segment)
+    if not functions:
+        position += 1
+    main_line = position
+
+    if not functions:
+        code.append(f"DSVI {main_line} #funcao")
+        line_table.append(0)
+    for obj, function in functions:
+        is_main = obj is main_unit
+        code.append(f"DSVI {main_line} #funcao {function.name}")
+        line_table.append(function.line if is_main else 0)
+        start = len(code)
+        function.segment.link(addresses[function.name], addresses, 0, code, line_table)
+        if not is_main:
+            line_table[start:] = [0] * (len(code) - start)
+
+    for _, obj in units:
+        start = len(code)
+        obj.main.link(start + 1, addresses, 0, code, line_table)
+        for index in range(start, len(code)):
+            if '[' in code[index]:
+                code[index] = GLOBAL_MARKER.sub(lambda match: str(variables[match.group(1)]),
+                                                code[index])
+        if obj is not main_unit:
+            line_table[start:] = [0] * (len(code) - start)
+
+    code.append("PARA")
+    line_table.append(0)
+    return CompileResult(code, line_table)
+
+
+def compile_path(path, backend='pilha', cache=None):
+    """(ObjectFile ou None, diagnósticos, veio do cache?) do arquivo 'path'"""
+    try:
+        with open(path, 'rb') as f:
+            source = f.read()
+    except OSError as e:
+        return None, [Diagnostic('leitura', f"{path}: {e}")], False
+
+    key = None
+    if cache is not None:
+        from cache import cache_key
+        key = cache_key(source, backend, kind='objeto')
+        obj = cache.get(key, decode=ObjectFile.decode)
+        if obj is not None:
+            return obj, [], True
+
+    try:
+        obj = compile_unit(decode_source(source), backend)
+    except Exception as e:
+        return None, [unit_diagnostic(path, e)], False
+
+    if cache is not None:
+        cache.put(key, obj, encode=ObjectFile.encode)
+    return obj, [], False
+
+
+def compile_worker(path, backend, cache_dir):
+    """compile_path num processo do pool (o cache é aberto uma vez por processo)"""
+    cache = None
+    if cache_dir:
+        from batch import open_cache
+        cache = open_cache(cache_dir)
+    return compile_path(path, backend, cache)
+
+
+class Build:
+    """Unidades de um programa: compiladas a partir do principal, seguindo os includes"""
+
+    def __init__(self, backend='pilha', workers=1, cache=None):
+        self.backend = backend
+        self.workers = workers
+        self.cache = cache          # cache.CompileCache ou None
+        self.objects = {}           # caminho -> ObjectFile
+        self.includes = {}          # caminho -> caminhos incluídos
+        self.diagnostics = []
+        self.cached = 0
+
+    def compile(self, entry):
+        """Compila 'entry' e tudo o que ele inclui; devolve o CompileResult ligado"""
+        entry = os.path.normpath(entry)
+        seen = {entry}
+        queue = [entry]
+        executor = ProcessPoolExecutor(self.workers) if self.workers > 1 else None
+        cache_dir = self.cache.directory if self.cache is not None else None
+        running = {}
+        try:
+            while queue or running:
+                if executor is None:
+                    path = queue.pop(0)
+                    found = self.add(path, compile_path(path, self.backend, self.cache))
+                else:
+                    # Cada unidade nova vai para o pool assim que aparece num include
+                    for path in queue:
+                        running[executor.submit(compile_worker, path, self.backend, cache_dir)] = path
+                    queue = []
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    found = []
+                    for future in done:
+                        found += self.add(running.pop(future), future.result())
+                for path in found:
+                    if path not in seen:
+                        seen.add(path)
+                        queue.append(path)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        if self.diagnostics:
+            return CompileResult(diagnostics=self.diagnostics)
+        return link([(path, self.objects[path]) for path in self.order(entry)])
+
+    def add(self, path, outcome):
+        """Guarda o objeto de 'path' e devolve os caminhos que ele inclui"""
+        obj, diagnostics, cached = outcome
+        self.diagnostics.extend(diagnostics)
+        self.cached += cached
+        if obj is None:
+            return []
+
+        self.objects[path] = obj
+        found = []
+        for include, line, column in obj.includes:
+            target = os.path.normpath(os.path.join(os.path.dirname(path), include))
+            if os.path.isfile(target):
+                found.append(target)
+            else:
+                self.diagnostics.append(unit_diagnostic(path, SemanticError(
+                    f"Arquivo incluído '{include}' não encontrado", line, column)))
+        self.includes[path] = found
+        return found
+
+    def order(self, entry):
+        """Ordem de inicialização: cada unidade depois das que ela inclui"""
+        order = []
+        visited = {entry}
+        stack = [(entry, iter(self.includes[entry]))]
+        while stack:
+            path, pending = stack[-1]
+            for include in pending:
+                if include not in visited:
+                    visited.add(include)
+                    stack.append((include, iter(self.includes[include])))
+                    break
+            else:
+                stack.pop()
+                order.append(path)
+        return order
+
+
+def build_program(entry, backend='pilha', workers=1, cache=None):
+    """Compila e liga o programa 'entry'; devolve (CompileResult, Build)"""
+    build = Build(backend, workers, cache)
+    return build.compile(entry), build
+
+
+def compile_objects(sources, backend='pilha', workers=1, cache=None, output=None):
+    """Gera o .lo de cada fonte (sem seguir os includes); devolve os diagnósticos"""
+    diagnostics = []
+    if workers > 1 and len(sources) > 1:
+        cache_dir = cache.directory if cache is not None else None
+        with ProcessPoolExecutor(workers) as executor:
+            outcomes = list(executor.map(compile_worker, sources, [backend] * len(sources),
+                                         [cache_dir] * len(sources)))
+    else:
+        outcomes = [compile_path(source, backend, cache) for source in sources]
+
+    for source, (obj, errors, _) in zip(sources, outcomes):
+        diagnostics.extend(errors)
+        if obj is not None:
+            obj.save(output or os.path.splitext(source)[0] + OBJECT_EXTENSION)
+    return diagnostics
+
+
+def main():
+    """Função principal"""
+    arg_parser = argparse.ArgumentParser(
+        description="Compilação separada: gera arquivos objeto e liga as unidades de um programa",
+        epilog="Exemplos: python linker.py programa.php -j 4 | "
+               "python linker.py -c biblioteca.php | "
+               "python linker.py biblioteca.lo programa.lo -o programa.asm")
+    arg_parser.add_argument('entradas', nargs='+',
+                            help="programa principal .php, fontes com -c ou arquivos .lo a ligar")
+    arg_parser.add_argument('-o', '--saida', default=None,
+                            help="arquivo gerado (padrão: o principal com .asm/.rasm ou .lo)")
+    arg_parser.add_argument('-c', '--objeto', action='store_true',
+                            help="só compila cada fonte para .lo, sem ligar")
+    arg_parser.add_argument('--backend', choices=sorted(BACKENDS), default='pilha',
+                            help="máquina alvo: pilha (padrão) ou registradores")
+    arg_parser.add_argument('-j', '--workers', type=int, default=None,
+                            help="processos compilando unidades em paralelo (padrão: número de CPUs)")
+    arg_parser.add_argument('--cache', metavar='DIRETORIO', default=None,
+                            help="guarda e reaproveita os arquivos objeto em DIRETORIO")
+    args = arg_parser.parse_args()
+
+    if args.objeto and args.saida and len(args.entradas) > 1:
+        arg_parser.error("-o com -c só vale para um fonte")
+
+    workers = args.workers or os.cpu_count() or 1
+    cache = None
+    if args.cache:
+        from cache import CompileCache
+        cache = CompileCache(args.cache)
+
+    start = time.perf_counter()
+    if args.objeto:
+        diagnostics = compile_objects(args.entradas, args.backend, workers, cache, args.saida)
+        for diagnostic in diagnostics:
+            print(diagnostic)
+        print(f"{len(args.entradas) - len(diagnostics)} arquivos objeto gerados em "
+              f"{time.perf_counter() - start:.2f}s")
+        sys.exit(1 if diagnostics else 0)
+
+    if all(entrada.endswith(OBJECT_EXTENSION) for entrada in args.entradas):
+        try:
+            units = [(entrada, ObjectFile.load(entrada)) for entrada in args.entradas]
+        except (OSError, ObjectFileError) as e:
+            print(f"ERRO: {e}")
+            sys.exit(1)
+        result = link(units)
+        backend = units[-1][1].backend
+        summary = f"{len(units)} unidades"
+    elif len(args.entradas) == 1:
+        result, build = build_program(args.entradas[0], args.backend, workers, cache)
+        backend = args.backend
+        summary = f"{len(build.objects)} unidades ({build.cached} do cache)"
+    else:
+        arg_parser.error("ligue só arquivos .lo ou um programa principal .php (as unidades vêm dos includes)")
+
+    if not result.ok:
+        for diagnostic in result.diagnostics:
+            print(diagnostic)
+        sys.exit(1)
+
+    output = args.saida or output_filename(args.entradas[-1], backend)
+    result.save(output)
+    print(f"{output}: {len(result.instructions)} instruções, {summary}, "
+          f"{time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
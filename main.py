@@ -1,115 +1,424 @@
-"""
-Compilador LALG-PHP - Programa Principal
-"""
-
-import sys
-from lexer import Lexer
-from parser import Parser
-from semantic_analyzer import SemanticAnalyzer, SemanticError
-from code_generator import CodeGenerator
-
-
-def compile_file(input_file, output_file=None):
-    if output_file is None:
-        output_file = input_file.replace('.php', '.asm')
-
-    print("=" * 70)
-    print("COMPILADOR LALG-PHP")
-    print("=" * 70)
-    print(f"Arquivo de entrada: {input_file}")
-    print(f"Arquivo de saída: {output_file}")
-    print()
-
-    try:
-        with open(input_file, 'r', encoding='utf-8') as f:
-            code = f.read()
-
-        print("CÓDIGO FONTE:")
-        print("-" * 70)
-        print(code)
-        print("-" * 70)
-        print()
-
-        print("Análise Léxica...", end=" ")
-        lexer = Lexer(code)
-        tokens = lexer.tokenize()
-        print(f"({len(tokens)} tokens)")
-
-        print("Análise Sintática...", end=" ")
-        parser = Parser(tokens)
-        ast = parser.parse()
-        print(f"({len(ast.statements)} declarações)")
-
-        print("Análise Semântica...", end=" ")
-        analyzer = SemanticAnalyzer()
-        analyzer.analyze(ast)
-
-        print("Geração de Código...", end=" ")
-        generator = CodeGenerator()
-        instructions = generator.generate(ast)
-        print(f"({len(instructions)} instruções)")
-
-        generator.save_to_file(output_file)
-
-        print()
-        print("=" * 70)
-        print("COMPILAÇÃO BEM-SUCEDIDA!")
-        print("=" * 70)
-        print()
-        print("CÓDIGO GERADO:")
-        print("-" * 70)
-        generator.print_code()
-        print("-" * 70)
-        print()
-        print(f"Código salvo em: {output_file}")
-        print()
-
-        print("=" * 70)
-        print("EXECUTANDO NA MÁQUINA VIRTUAL")
-        print("=" * 70)
-        print()
-
-        try:
-            from vm import VirtualMachine
-            vm = VirtualMachine()
-            vm.load_program(output_file)
-            vm.execute()
-        except Exception as e:
-            print(f"Erro ao executar na VM: {e}")
-
-        return True
-
-    except FileNotFoundError:
-        print(f"ERRO: Arquivo '{input_file}' não encontrado")
-        return False
-
-    except SemanticError as e:
-        print(f"ERRO SEMÂNTICO: {e}")
-        return False
-
-    except Exception as e:
-        print(f"ERRO: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
-
-
-def main():
-    """Função principal"""
-    if len(sys.argv) < 2:
-        print("Uso: python main.py <arquivo.php> [arquivo.asm]")
-        print()
-        print("Exemplos:")
-        print("python main.py programa.php")
-        print("python main.py programa.php saida.asm")
-        sys.exit(1)
-
-    input_file = sys.argv[1]
-    output_file = sys.argv[2] if len(sys.argv) > 2 else None
-
-    success = compile_file(input_file, output_file)
-    sys.exit(0 if success else 1)
-
-
-if __name__ == "__main__":
-    main()
+"""
+Compilador LALG-PHP - Programa Principal
+"""
+
+import argparse
+import os
+import sys
+from lexer import Lexer, LexerError
+from parser import Parser, ParserError
+from semantic_analyzer import SemanticAnalyzer, SemanticError
+from ast_nodes import walk
+from pipeline import BACKENDS, CompileResult, Diagnostic, decode_source, output_filename
+from timing import PhaseTimer
+
+
+# Opção da linha de comando de cada atributo de args, para as mensagens de erro
+OPTIONS = {
+    'saida': 'saida', 'backend': '--backend', 'perfil': '--perfil',
+    'gravar_pgo': '--gravar-pgo', 'pgo': '--pgo', 'verificar': '--verificar',
+    'gravar': '--gravar', 'reproduzir': '--reproduzir', 'rastro': '--rastro',
+    'cobertura': '--cobertura', 'quiet': '--quiet', 'stats': '--stats', 'cache': '--cache',
+    'watch': '--watch', 'direto': '--direto',
+}
+
+# Opções que só a máquina de pilha e o seu gerador atendem
+STACK_ONLY = ('perfil', 'gravar_pgo', 'pgo', 'verificar', 'rastro', 'cobertura')
+
+# Cada execução usa um só laço da VM: profiler, tracer, cobertura ou o laço
+# rápido do programa verificado (os laços instrumentados têm prioridade sobre ele)
+INSTRUMENTED_LOOPS = (('perfil', 'gravar_pgo'), ('rastro',), ('cobertura',), ('verificar',))
+
+
+def load_vm_class(path):
+    module_name, class_name = path.split('.')
+    module = __import__(module_name)
+    return getattr(module, class_name)
+
+
+def compile_phases(code, generator_class, pgo_profile, output_file, timer, say):
+    """Léxico, sintático, semântico e geração de código; grava o programa gerado"""
+    say("Análise Léxica...", end=" ")
+    with timer.phase('lexico') as phase:
+        lexer = Lexer(code)
+        tokens = lexer.tokenize()
+        phase.count('tokens', len(tokens))
+    say(f"({len(tokens)} tokens)")
+
+    say("Análise Sintática...", end=" ")
+    with timer.phase('sintatico') as phase:
+        parser = Parser(tokens)
+        ast = parser.parse()
+        phase.count('nos', sum(1 for _ in walk(ast)))
+    say(f"({len(ast.statements)} declarações)")
+
+    say("Análise Semântica...", end=" ")
+    with timer.phase('semantico') as phase:
+        analyzer = SemanticAnalyzer()
+        analyzer.analyze(ast)
+        phase.count('simbolos_globais', len(analyzer.symbol_table.scopes[0]))
+
+    say("Geração de Código...", end=" ")
+    with timer.phase('codigo') as phase:
+        if pgo_profile:
+            from pgo import PGOProfile
+            generator = generator_class(PGOProfile.load(pgo_profile))
+        else:
+            generator = generator_class()
+        instructions = generator.generate(ast)
+        generator.save_to_file(output_file)
+        phase.count('instrucoes', len(instructions))
+    say(f"({len(instructions)} instruções)")
+    return generator
+
+
+def compile_file(input_file, output_file=None, backend='pilha', profile_file=None,
+                 pgo_record=None, pgo_profile=None, verify=False, record_file=None,
+                 replay_file=None, trace_size=None, coverage_file=None, quiet=False,
+                 stats=None, cache_dir=None):
+    generator_class, vm_path, _ = BACKENDS[backend]
+
+    if output_file is None:
+        output_file = output_filename(input_file, backend)
+
+    # Em modo silencioso só aparecem a saída do programa e os erros
+    say = (lambda *args, **kwargs: None) if quiet else print
+    timer = PhaseTimer(track_memory=stats is not None)
+
+    cache = None
+    if cache_dir:
+        from cache import CompileCache
+        cache = CompileCache(cache_dir)
+
+    say("=" * 70)
+    say("COMPILADOR LALG-PHP")
+    say("=" * 70)
+    say(f"Arquivo de entrada: {input_file}")
+    say(f"Arquivo de saída: {output_file}")
+    say(f"Backend: {backend}")
+    say()
+
+    try:
+        with open(input_file, 'rb') as f:
+            source = f.read()
+        code = decode_source(source)
+
+        say("CÓDIGO FONTE:")
+        say("-" * 70)
+        say(code)
+        say("-" * 70)
+        say()
+
+        # Com include, cada unidade é compilada à parte e o ligador monta o programa
+        from linker import has_includes
+        units = None
+        if has_includes(code):
+            if pgo_profile:
+                print("ERRO: --pgo não é suportado em programas com include")
+                return False
+            from linker import build_program
+            with timer.phase('ligacao') as phase:
+                ready, build = build_program(input_file, backend, cache=cache)
+                units = len(build.objects)
+                phase.count('unidades', units)
+                phase.count('do_cache', build.cached)
+        else:
+            ready = None
+            if cache is not None:
+                with timer.phase('cache') as phase:
+                    cache_key = cache.key(source, backend, pgo_profile)
+                    ready = cache.get(cache_key)
+                    phase.count('acerto', int(ready is not None))
+
+        if ready is not None:
+            if not ready.ok:
+                for diagnostic in ready.diagnostics:
+                    if diagnostic.kind == 'semântico':
+                        print(f"ERRO SEMÂNTICO: {diagnostic.message}")
+                    else:
+                        print(f"ERRO: {diagnostic.message}")
+                return False
+            ready.save(output_file)
+            instructions, decisions = ready.instructions, ready.decisions
+            if units is not None:
+                say(f"Programa ligado a partir de {units} unidades ({len(instructions)} instruções)")
+            else:
+                say(f"Compilação reaproveitada do cache ({len(instructions)} instruções)")
+        else:
+            try:
+                generator = compile_phases(code, generator_class, pgo_profile, output_file,
+                                           timer, say)
+            except (LexerError, ParserError, SemanticError) as e:
+                if cache is not None:
+                    cache.put(cache_key, CompileResult(diagnostics=[Diagnostic.from_exception(e)]))
+                raise
+
+            instructions, decisions = generator.code, generator.pgo_decisions
+            if cache is not None:
+                cache.put(cache_key, CompileResult(instructions, list(generator.line_table),
+                                                   decisions=decisions))
+
+        for decision in decisions:
+            say(f"  PGO: {decision}")
+
+        if not quiet:
+            print()
+            print("=" * 70)
+            print("COMPILAÇÃO BEM-SUCEDIDA!")
+            print("=" * 70)
+            print()
+            print("CÓDIGO GERADO:")
+            print("-" * 70)
+            for i, instruction in enumerate(instructions, 1):
+                print(f"{i:3d}: {instruction}")
+            print("-" * 70)
+            print()
+            print(f"Código salvo em: {output_file}")
+            print()
+
+        say("=" * 70)
+        say("EXECUTANDO NA MÁQUINA VIRTUAL")
+        say("=" * 70)
+        say()
+
+        try:
+            VirtualMachine = load_vm_class(vm_path)
+            options = {'verbose': not quiet}
+            profiler = coverage = None
+            if profile_file or pgo_record:
+                from profiler import Profiler
+                profiler = Profiler()
+                options['profiler'] = profiler
+            elif trace_size:
+                from tracer import Tracer
+                options['tracer'] = Tracer(trace_size)
+            elif coverage_file:
+                from vm_coverage import Coverage
+                coverage = Coverage()
+                options['coverage'] = coverage
+
+            recorder = player = None
+            if record_file:
+                from replay import Recorder
+                recorder = Recorder()
+                options.update(input_func=recorder.read, output_func=recorder.write)
+            elif replay_file:
+                from replay import Player, Recording
+                player = Player(Recording.load(replay_file), print)
+                options.update(input_func=player.read, output_func=player.write)
+
+            with timer.phase('vm') as phase:
+                vm = VirtualMachine(**options)
+                vm.load_program(output_file)
+                phase.count('instrucoes', len(vm.instructions))
+                if verify:
+                    program = vm.verify()
+                    say(f"Bytecode verificado: pilha máxima {program.max_depth}")
+                    say()
+                vm.execute()
+
+            if profile_file:
+                profiler.write_report(profile_file)
+                say(f"Relatório de perfil salvo em: {profile_file}")
+
+            if pgo_record:
+                from pgo import PGOProfile
+                PGOProfile.from_profiler(profiler).save(pgo_record)
+                say(f"Perfil PGO salvo em: {pgo_record}")
+
+            if coverage_file:
+                if os.path.exists(coverage_file):
+                    coverage.load_into(coverage_file)
+                coverage.save(coverage_file)
+                say(coverage.report(vm.source_map), end="")
+                say(f"Cobertura somada em: {coverage_file}")
+
+            if recorder is not None:
+                recorder.recording.save(record_file)
+                say(f"Entradas e saídas gravadas em: {record_file}")
+
+            if player is not None:
+                differences = player.differences()
+                if differences:
+                    print("Saídas diferentes da gravação:")
+                    for difference in differences:
+                        print(f"  {difference}")
+                    return False
+                say("Saídas iguais às gravadas")
+        except Exception as e:
+            print(f"Erro ao executar na VM: {e}")
+            return False
+
+        return True
+
+    except FileNotFoundError:
+        print(f"ERRO: Arquivo '{input_file}' não encontrado")
+        return False
+
+    except SemanticError as e:
+        print(f"ERRO SEMÂNTICO: {e}")
+        return False
+
+    except Exception as e:
+        print(f"ERRO: {e}")
+        if not quiet:
+            import traceback
+            traceback.print_exc()
+        return False
+
+    finally:
+        timer.close()
+        if cache is not None:
+            say(cache.summary())
+        if stats == 'json':
+            print(timer.to_json(), file=sys.stderr)
+        elif stats == 'texto':
+            print(timer.report(), end="", file=sys.stderr)
+
+
+def run_direct(input_file):
+    """Compila a AST em closures e executa em memória, sem gerar o .asm"""
+    try:
+        with open(input_file, 'r', encoding='utf-8') as f:
+            code = f.read()
+
+        tokens = Lexer(code).tokenize()
+        ast = Parser(tokens).parse()
+        SemanticAnalyzer().analyze(ast)
+
+        from closure_compiler import compile_ast
+        program = compile_ast(ast)
+
+    except FileNotFoundError:
+        print(f"ERRO: Arquivo '{input_file}' não encontrado")
+        return False
+
+    except SemanticError as e:
+        print(f"ERRO SEMÂNTICO: {e}")
+        return False
+
+    except Exception as e:
+        print(f"ERRO: {e}")
+        return False
+
+    try:
+        program.run()
+    except Exception as e:
+        print(f"Erro ao executar: {e}")
+        return False
+
+    return True
+
+
+def source_has_includes(input_file):
+    """O fonte inclui outras unidades? (falso se não puder ser lido: o erro sai depois)"""
+    from linker import has_includes
+    try:
+        with open(input_file, 'rb') as f:
+            return has_includes(decode_source(f.read()))
+    except (OSError, UnicodeDecodeError):
+        return False
+
+
+def used_options(arg_parser, args, names):
+    """Opções de 'names' usadas na linha de comando (diferentes do padrão)"""
+    return [OPTIONS[name] for name in names if getattr(args, name) != arg_parser.get_default(name)]
+
+
+def check_options(arg_parser, args):
+    """Recusa combinações de opções que a execução não consegue atender"""
+    if args.direto:
+        # Sem arquivo gerado e sem máquina virtual: só a saída do programa
+        unsupported = used_options(arg_parser, args, [name for name in OPTIONS
+                                                      if name not in ('direto', 'quiet')])
+        if unsupported:
+            arg_parser.error(f"--direto não aceita {', '.join(unsupported)}")
+        # As closures saem da AST de um arquivo só; o ligador trabalha com o .asm
+        if source_has_includes(args.entrada):
+            arg_parser.error("--direto não suporta programas com include; "
+                             "compile sem --direto para ligar as unidades")
+
+    if args.watch:
+        # O modo de observação só compila: não executa a VM nem usa o cache
+        unsupported = used_options(arg_parser, args, [name for name in OPTIONS
+                                                      if name not in ('watch', 'saida', 'backend')])
+        if unsupported:
+            arg_parser.error(f"--watch não aceita {', '.join(unsupported)}")
+
+    if args.gravar and args.reproduzir:
+        arg_parser.error("--gravar e --reproduzir não podem ser usadas juntas")
+
+    loops = [options for options in (used_options(arg_parser, args, names)
+                                     for names in INSTRUMENTED_LOOPS) if options]
+    if len(loops) > 1:
+        arg_parser.error(f"{' e '.join(options[0] for options in loops)} usam laços "
+                         f"diferentes da VM e não podem ser usadas juntas")
+
+    if args.backend != 'pilha':
+        unsupported = used_options(arg_parser, args, STACK_ONLY)
+        if unsupported:
+            arg_parser.error(f"{', '.join(unsupported)} só funciona com --backend pilha")
+
+
+def main():
+    """Função principal"""
+    arg_parser = argparse.ArgumentParser(
+        description="Compilador LALG-PHP",
+        epilog="Exemplos: python main.py programa.php | "
+               "python main.py programa.php saida.asm | "
+               "python main.py programa.php --backend registradores")
+    arg_parser.add_argument('entrada', help="arquivo .php de entrada")
+    arg_parser.add_argument('saida', nargs='?', default=None,
+                            help="arquivo de código gerado (padrão: entrada com .asm/.rasm)")
+    arg_parser.add_argument('--backend', choices=sorted(BACKENDS), default='pilha',
+                            help="máquina alvo: pilha (padrão) ou registradores")
+    arg_parser.add_argument('--perfil', metavar='ARQUIVO', default=None,
+                            help="executa com profiling e salva o relatório em ARQUIVO")
+    arg_parser.add_argument('--gravar-pgo', metavar='ARQUIVO', default=None,
+                            help="executa e grava desvios e chamadas para otimização guiada por perfil")
+    arg_parser.add_argument('--pgo', metavar='ARQUIVO', default=None,
+                            help="compila usando um perfil gravado com --gravar-pgo")
+    arg_parser.add_argument('--verificar', action='store_true',
+                            help="verifica o bytecode e executa no laço rápido sem checagens")
+    arg_parser.add_argument('--gravar', metavar='ARQUIVO', default=None,
+                            help="grava as entradas lidas e as saídas da execução em ARQUIVO")
+    arg_parser.add_argument('--reproduzir', metavar='ARQUIVO', default=None,
+                            help="usa as entradas gravadas em ARQUIVO e compara as saídas")
+    arg_parser.add_argument('--rastro', metavar='N', type=int, default=None,
+                            help="guarda as últimas N instruções e mostra o rastro se a execução falhar")
+    arg_parser.add_argument('--cobertura', metavar='ARQUIVO', default=None,
+                            help="marca as instruções executadas e soma a cobertura em ARQUIVO")
+    arg_parser.add_argument('-q', '--quiet', action='store_true',
+                            help="mostra só a saída do programa e os erros")
+    arg_parser.add_argument('--stats', choices=['json', 'texto'], default=None,
+                            help="tempo, pico de memória e contagens por fase na saída de erro")
+    arg_parser.add_argument('--cache', metavar='DIRETORIO', default=None,
+                            help="reaproveita compilações de fontes iguais guardadas em DIRETORIO")
+    arg_parser.add_argument('--watch', action='store_true',
+                            help="recompila a cada alteração do arquivo, refazendo só o que mudou")
+    arg_parser.add_argument('--direto', action='store_true',
+                            help="compila para closures e executa em memória, sem gerar arquivo")
+    args = arg_parser.parse_intermixed_args()
+    check_options(arg_parser, args)
+
+    if args.watch:
+        from watch import watch
+        try:
+            watch(args.entrada, args.saida, args.backend)
+        except KeyboardInterrupt:
+            pass
+        success = True
+    elif args.direto:
+        success = run_direct(args.entrada)
+    else:
+        success = compile_file(args.entrada, args.saida, backend=args.backend,
+                               profile_file=args.perfil, pgo_record=args.gravar_pgo,
+                               pgo_profile=args.pgo, verify=args.verificar,
+                               record_file=args.gravar, replay_file=args.reproduzir,
+                               trace_size=args.rastro, coverage_file=args.cobertura,
+                               quiet=args.quiet, stats=args.stats, cache_dir=args.cache)
+    sys.exit(0 if success else 1)
+
+
+if __name__ == "__main__":
+    main()
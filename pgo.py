@@ -0,0 +1,97 @@
+"""
+Otimização Guiada por Perfil (PGO)
+
+Liga a execução à compilação: depois de rodar com o Profiler, o perfil
+guarda, por linha do fonte, quantas vezes cada DSVF executou e desviou
+e quantas vezes cada chamada (CHPR) aconteceu. O VMCodeGenerator usa
+esse perfil para desenrolar laços quentes e expandir em linha chamadas
+quentes. A linha do fonte (e não o índice da instrução) é a chave,
+porque o código gerado muda de uma compilação para outra.
+
+Formato (JSON):
+    {"versao": 1,
+     "desvios": {"23": [execucoes, desviou]},
+     "chamadas": {"60": chamadas}}
+"""
+
+import json
+
+
+PROFILE_VERSION = 1
+
+
+class PGOProfile:
+
+    def __init__(self, branches=None, calls=None):
+        self.branches = branches or {}  # linha -> [execuções, desvios]
+        self.calls = calls or {}        # linha da chamada -> chamadas
+
+    @classmethod
+    def from_profiler(cls, profiler):
+        """Extrai o perfil de um Profiler que já executou um programa"""
+        vm = profiler.vm
+        if vm is None or vm.source_map is None:
+            raise ValueError("perfil PGO precisa do mapa de fonte do programa")
+
+        profile = cls()
+        for index, instruction in enumerate(profiler.instructions):
+            executions = profiler.pc_counts[index]
+            if not executions:
+                continue
+
+            opcode = instruction.split()[0]
+            line = vm.source_line(index)
+            if not line:
+                continue
+
+            if opcode == 'DSVF':
+                counts = profile.branches.setdefault(line, [0, 0])
+                counts[0] += executions
+                counts[1] += profiler.pc_taken[index]
+            elif opcode == 'CHPR':
+                profile.calls[line] = profile.calls.get(line, 0) + executions
+
+        return profile
+
+    def merge(self, other):
+        for line, (executions, taken) in other.branches.items():
+            counts = self.branches.setdefault(line, [0, 0])
+            counts[0] += executions
+            counts[1] += taken
+        for line, count in other.calls.items():
+            self.calls[line] = self.calls.get(line, 0) + count
+
+    def branch(self, line):
+        """(execuções, desvios) do DSVF da linha, ou (0, 0)"""
+        executions, taken = self.branches.get(line, (0, 0))
+        return executions, taken
+
+    def loop_iterations(self, line):
+        """Iterações de um while: DSVF que não desviou continua no laço"""
+        executions, taken = self.branch(line)
+        return executions - taken, taken
+
+    def call_count(self, line):
+        return self.calls.get(line, 0)
+
+    def save(self, filename):
+        data = {
+            'versao': PROFILE_VERSION,
+            'desvios': {str(line): counts for line, counts in sorted(self.branches.items())},
+            'chamadas': {str(line): count for line, count in sorted(self.calls.items())},
+        }
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=1)
+
+    @classmethod
+    def load(cls, filename):
+        with open(filename, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('versao') != PROFILE_VERSION:
+            raise ValueError(f"versão de perfil PGO não suportada em '{filename}'")
+        branches = {int(line): list(counts) for line, counts in data.get('desvios', {}).items()}
+        calls = {int(line): count for line, count in data.get('chamadas', {}).items()}
+        return cls(branches, calls)
+
+    def __repr__(self):
+        return f"PGOProfile(desvios={len(self.branches)}, chamadas={len(self.calls)})"
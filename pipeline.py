@@ -0,0 +1,99 @@
+"""
+Pipeline de Compilação em Memória
+
+Lexer -> Parser -> SemanticAnalyzer -> gerador de código, sem imprimir
+nada: devolve o programa gerado, a tabela instrução -> linha do fonte e
+os diagnósticos. É usado pela compilação em lote e pelo cache de
+compilação; main.compile_file continua com a saída detalhada.
+"""
+
+import os
+
+from lexer import Lexer, LexerError
+from parser import Parser, ParserError
+from semantic_analyzer import SemanticAnalyzer, SemanticError
+from code_generator import CodeGenerator, RegisterCodeGenerator
+from source_map import SourceMap, map_filename
+
+
+# Backends: gerador de código, máquina virtual e extensão do arquivo gerado
+BACKENDS = {
+    'pilha': (CodeGenerator, 'vm.VirtualMachine', '.asm'),
+    'registradores': (RegisterCodeGenerator, 'register_vm.RegisterVirtualMachine', '.rasm'),
+}
+
+# Fase de cada tipo de erro de compilação
+ERROR_KINDS = (
+    (LexerError, 'léxico'),
+    (ParserError, 'sintático'),
+    (SemanticError, 'semântico'),
+)
+
+
+class Diagnostic:
+
+    def __init__(self, kind, message, line=0):
+        self.kind = kind
+        self.message = message
+        self.line = line
+
+    @classmethod
+    def from_exception(cls, error):
+        for error_class, kind in ERROR_KINDS:
+            if isinstance(error, error_class):
+                return cls(kind, str(error), getattr(error, 'line', 0) or 0)
+        return cls('interno', f"{type(error).__name__}: {error}")
+
+    def __str__(self):
+        return f"erro {self.kind}: {self.message}"
+
+    def __repr__(self):
+        return f"Diagnostic({self.kind!r}, {self.message!r})"
+
+
+class CompileResult:
+
+    def __init__(self, instructions=None, line_table=None, diagnostics=None, decisions=None):
+        self.instructions = instructions or []
+        self.line_table = line_table or []
+        self.diagnostics = diagnostics or []
+        self.decisions = decisions or []  # decisões do PGO, se houver perfil
+
+    @property
+    def ok(self):
+        return not self.diagnostics
+
+    def source_map(self):
+        return SourceMap.from_lines(self.line_table)
+
+    def save(self, filename):
+        """Grava o programa e o mapa de fonte, como VMCodeGenerator.save_to_file"""
+        with open(filename, 'w', encoding='utf-8') as f:
+            for instruction in self.instructions:
+                f.write(instruction + '\n')
+        self.source_map().save(map_filename(filename))
+
+
+def compile_source(code, backend='pilha', profile=None):
+    """Compila o texto de um programa LALG-PHP; erros viram diagnósticos"""
+    generator_class = BACKENDS[backend][0]
+    try:
+        tokens = Lexer(code).tokenize()
+        ast = Parser(tokens).parse()
+        SemanticAnalyzer().analyze(ast)
+        generator = generator_class(profile) if profile is not None else generator_class()
+        instructions = generator.generate(ast)
+    except Exception as e:
+        return CompileResult(diagnostics=[Diagnostic.from_exception(e)])
+
+    return CompileResult(instructions, list(generator.line_table), decisions=generator.pgo_decisions)
+
+
+def decode_source(data):
+    """Bytes do fonte -> texto, com as mesmas quebras de linha de open(arquivo, 'r')"""
+    return data.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+
+
+def output_filename(input_file, backend='pilha'):
+    """Arquivo gerado padrão: a entrada com a extensão do backend"""
+    return os.path.splitext(input_file)[0] + BACKENDS[backend][2]
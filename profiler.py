@@ -0,0 +1,187 @@
+"""
+Profiler da Máquina Virtual
+
+Conta quantas vezes cada opcode e cada instrução (índice) foram
+executados e mede o tempo gasto por classe de opcode. É ligado passando
+um Profiler para a VirtualMachine, que então usa o laço instrumentado
+daqui; sem profiler o laço normal não tem custo extra.
+"""
+
+import argparse
+import time
+
+from vm import VirtualMachine
+
+
+OPCODE_CLASSES = {
+    'CRCT': 'carga/armazenamento',
+    'CRVL': 'carga/armazenamento',
+    'ARMZ': 'carga/armazenamento',
+    'PARAM': 'carga/armazenamento',
+    'SOMA': 'aritmética',
+    'SUBT': 'aritmética',
+    'MULT': 'aritmética',
+    'DIVI': 'aritmética',
+    'CMAI': 'comparação',
+    'CPMI': 'comparação',
+    'CMAG': 'comparação',
+    'CPME': 'comparação',
+    'CMIG': 'comparação',
+    'CMDG': 'comparação',
+    'DSVI': 'desvio',
+    'DSVF': 'desvio',
+    'PUSHER': 'chamada',
+    'CHPR': 'chamada',
+    'RTPR': 'chamada',
+    'ALME': 'chamada',
+    'DESM': 'chamada',
+    'LEIT': 'entrada/saída',
+    'IMPR': 'entrada/saída',
+    'INPP': 'controle',
+    'PARA': 'controle',
+}
+
+
+def opcode_class(opcode):
+    return OPCODE_CLASSES.get(opcode, 'outros')
+
+
+class Profiler:
+
+    def __init__(self):
+        self.instructions = []
+        self.pc_counts = []
+        self.pc_times = []
+        self.pc_taken = []  # vezes em que a instrução desviou (DSVF, DSVI, CHPR...)
+        self.total_time = 0.0
+        self.vm = None
+
+    def run(self, vm):
+        """Laço de execução instrumentado (substitui VirtualMachine.run)"""
+        self.vm = vm
+        instructions = vm.instructions
+        size = len(instructions)
+        self.instructions = instructions
+        if len(self.pc_counts) != size:
+            self.pc_counts = [0] * size
+            self.pc_times = [0.0] * size
+            self.pc_taken = [0] * size
+
+        counts = self.pc_counts
+        times = self.pc_times
+        taken = self.pc_taken
+        clock = time.perf_counter
+        execute_instruction = vm.execute_instruction
+
+        started = clock()
+        while vm.running and vm.pc < size:
+            pc = vm.pc
+            start = clock()
+            execute_instruction(instructions[pc])
+            times[pc] += clock() - start
+            counts[pc] += 1
+            if vm.pc != pc:
+                taken[pc] += 1
+            vm.pc += 1
+        self.total_time += clock() - started
+
+    def opcode_of(self, index):
+        return self.instructions[index].split()[0]
+
+    def opcode_counts(self):
+        counts = {}
+        for index, count in enumerate(self.pc_counts):
+            if count:
+                opcode = self.opcode_of(index)
+                counts[opcode] = counts.get(opcode, 0) + count
+        return counts
+
+    def class_times(self):
+        times = {}
+        for index, elapsed in enumerate(self.pc_times):
+            if self.pc_counts[index]:
+                name = opcode_class(self.opcode_of(index))
+                times[name] = times.get(name, 0.0) + elapsed
+        return times
+
+    def hot_instructions(self, limit=20):
+        """Índices mais executados, do mais quente para o mais frio"""
+        executed = [index for index, count in enumerate(self.pc_counts) if count]
+        executed.sort(key=lambda index: (-self.pc_counts[index], index))
+        return executed[:limit]
+
+    def report(self, limit=20):
+        total = sum(self.pc_counts)
+        lines = [
+            "PERFIL DE EXECUÇÃO",
+            "=" * 70,
+            f"Instruções executadas: {total}",
+            f"Tempo total: {self.total_time * 1000:.3f} ms",
+            "",
+            "Por opcode:",
+        ]
+
+        for opcode, count in sorted(self.opcode_counts().items(), key=lambda item: -item[1]):
+            lines.append(f"  {opcode:8} {count:10d}  {count * 100.0 / max(total, 1):6.2f}%")
+
+        lines += ["", "Tempo por classe de opcode:"]
+        for name, elapsed in sorted(self.class_times().items(), key=lambda item: -item[1]):
+            lines.append(f"  {name:22} {elapsed * 1000:10.3f} ms")
+
+        lines += ["", f"Instruções mais executadas (top {limit}):",
+                  f"  {'linha':>5}  {'fonte':>5}  {'execuções':>10}  {'tempo (ms)':>10}  instrução"]
+        for index in self.hot_instructions(limit):
+            source_line = self.vm.source_line(index) if self.vm is not None else 0
+            source = str(source_line) if source_line else "-"
+            lines.append(f"  {index + 1:5d}  {source:>5}  {self.pc_counts[index]:10d}  "
+                         f"{self.pc_times[index] * 1000:10.3f}  {self.instructions[index]}")
+
+        lines += self.source_line_report()
+
+        return "\n".join(lines) + "\n"
+
+    def source_line_report(self):
+        """Execuções e tempo somados por linha do fonte"""
+        if self.vm is None or self.vm.source_map is None:
+            return []
+
+        per_line = {}
+        for index, count in enumerate(self.pc_counts):
+            line = self.vm.source_line(index)
+            if count and line:
+                total_count, total_time = per_line.get(line, (0, 0.0))
+                per_line[line] = (total_count + count, total_time + self.pc_times[index])
+
+        lines = ["", "Linhas do fonte mais executadas:",
+                 f"  {'fonte':>5}  {'execuções':>10}  {'tempo (ms)':>10}"]
+        for line, (count, elapsed) in sorted(per_line.items(), key=lambda item: -item[1][1]):
+            lines.append(f"  {line:5d}  {count:10d}  {elapsed * 1000:10.3f}")
+        return lines
+
+    def write_report(self, filename, limit=20):
+        with open(filename, 'w', encoding='utf-8') as f:
+            f.write(self.report(limit))
+
+
+def main():
+    """Função principal"""
+    arg_parser = argparse.ArgumentParser(description="Executa um programa .asm com profiling")
+    arg_parser.add_argument('programa', help="arquivo .asm gerado pelo compilador")
+    arg_parser.add_argument('-o', '--relatorio', default=None,
+                            help="arquivo do relatório (padrão: programa + .perfil.txt)")
+    arg_parser.add_argument('--top', type=int, default=20,
+                            help="quantidade de instruções quentes no relatório")
+    args = arg_parser.parse_args()
+
+    profiler = Profiler()
+    vm = VirtualMachine(profiler=profiler)
+    vm.load_program(args.programa)
+    vm.execute()
+
+    output = args.relatorio or args.programa + '.perfil.txt'
+    profiler.write_report(output, args.top)
+    print(f"Relatório de perfil salvo em: {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+"""
+Máquina Virtual de Registradores
+
+Executa o código de três endereços gerado por RegisterCodeGenerator.
+Os operandos são @n (memória), rN (temporário) ou uma constante, e são
+decodificados uma única vez ao carregar o programa.
+
+Instruções:
+- SOMA/SUBT/MULT/DIVI dst, a, b     dst = a OP b
+- CMAI/CPMI/CMAG/CPME/CMIG/CMDG dst, a, b   dst = 1 se a OP b, senão 0
+- ARMZ dst, src                     dst = src
+- LEIT dst / IMPR src               entrada e saída
+- DSVF src, n                       desvia para a linha n se src for zero
+- PARAM src                         empilha um argumento para o ALME
+- INPP, PARA, ALME, DESM, DSVI, PUSHER, CHPR, RTPR como na máquina de pilha
+"""
+
+from vm import VirtualMachine, parse_program
+
+
+MEMORY = 0
+REGISTER = 1
+CONSTANT = 2
+
+ARITHMETIC = {'SOMA', 'SUBT', 'MULT', 'DIVI'}
+COMPARISONS = {'CMAI', 'CPMI', 'CMAG', 'CPME', 'CMIG', 'CMDG'}
+
+
+class RegisterVMError(Exception):
+    pass
+
+
+def decode_operand(text):
+    if text.startswith('@'):
+        return MEMORY, int(text[1:])
+    if text.startswith('r'):
+        return REGISTER, int(text[1:])
+    return CONSTANT, float(text)
+
+
+def decode_register_instruction(instruction):
+    """Separa 'OPCODE a, b, c' em (opcode, operandos decodificados)"""
+    parts = instruction.split(None, 1)
+    opcode = parts[0]
+    texts = [text.strip() for text in parts[1].split(',')] if len(parts) > 1 else []
+
+    if opcode in ARITHMETIC or opcode in COMPARISONS or opcode in ('ARMZ', 'LEIT', 'IMPR', 'PARAM'):
+        return opcode, tuple(decode_operand(text) for text in texts)
+    if opcode == 'DSVF':
+        return opcode, (decode_operand(texts[0]), int(texts[1]))
+    if opcode == 'PUSHER' and texts and not texts[0].isdigit():
+        return opcode, ()
+    return opcode, tuple(int(text) for text in texts)
+
+
+class RegisterVirtualMachine(VirtualMachine):
+
+    def __init__(self, input_func=None, output_func=None, verbose=True):
+        super().__init__(input_func, output_func, verbose)
+        self.registers = []
+        self.code = []
+
+    def load_program(self, filename):
+        with open(filename, 'r', encoding='utf-8') as f:
+            self.load_instructions(parse_program(f.readlines()))
+
+        if self.verbose:
+            print(f"Programa carregado: {len(self.instructions)} instruções")
+
+    def load_instructions(self, instructions):
+        self.instructions = list(instructions)
+        self.code = []
+        register_count = 0
+
+        for number, instruction in enumerate(self.instructions, 1):
+            try:
+                opcode, operands = decode_register_instruction(instruction)
+            except (IndexError, ValueError):
+                raise RegisterVMError(f"Instrução inválida na linha {number}: '{instruction}'")
+            for operand in operands:
+                if isinstance(operand, tuple) and operand[0] == REGISTER:
+                    register_count = max(register_count, operand[1] + 1)
+            self.code.append((opcode, operands))
+
+        self.registers = [0.0] * register_count
+
+    def execute(self):
+        if self.verbose:
+            print("\nIniciando execução\n")
+
+        self.run_slice(float('inf'))
+
+        if self.verbose:
+            print("\nExecução finalizada")
+
+    def run_slice(self, budget):
+        """Executa no máximo 'budget' instruções e devolve quantas executou"""
+        code = self.code
+        memory = self.memory
+        registers = self.registers
+        stack = self.stack
+        size = len(code)
+
+        def value(operand):
+            kind, v = operand
+            if kind == MEMORY:
+                return memory[v]
+            if kind == REGISTER:
+                return registers[v]
+            return v
+
+        def store(operand, result):
+            if operand[0] == MEMORY:
+                memory[operand[1]] = result
+            else:
+                registers[operand[1]] = result
+
+        executed = 0
+        while executed < budget and self.running and self.pc < size:
+            opcode, operands = code[self.pc]
+
+            if opcode == 'SOMA':
+                store(operands[0], value(operands[1]) + value(operands[2]))
+            elif opcode == 'SUBT':
+                store(operands[0], value(operands[1]) - value(operands[2]))
+            elif opcode == 'MULT':
+                store(operands[0], value(operands[1]) * value(operands[2]))
+            elif opcode == 'DIVI':
+                store(operands[0], value(operands[1]) / value(operands[2]))
+            elif opcode == 'ARMZ':
+                store(operands[0], value(operands[1]))
+            elif opcode == 'DSVF':
+                if value(operands[0]) == 0:
+                    self.pc = operands[1] - 2
+            elif opcode == 'DSVI':
+                self.pc = operands[0] - 2
+            elif opcode == 'CMAI':
+                store(operands[0], 1 if value(operands[1]) >= value(operands[2]) else 0)
+            elif opcode == 'CPMI':
+                store(operands[0], 1 if value(operands[1]) <= value(operands[2]) else 0)
+            elif opcode == 'CMAG':
+                store(operands[0], 1 if value(operands[1]) > value(operands[2]) else 0)
+            elif opcode == 'CPME':
+                store(operands[0], 1 if value(operands[1]) < value(operands[2]) else 0)
+            elif opcode == 'CMIG':
+                store(operands[0], 1 if value(operands[1]) == value(operands[2]) else 0)
+            elif opcode == 'CMDG':
+                store(operands[0], 1 if value(operands[1]) != value(operands[2]) else 0)
+            elif opcode == 'LEIT':
+                store(operands[0], float(self.input_func("Digite um valor: ")))
+            elif opcode == 'IMPR':
+                self.output_func(value(operands[0]))
+            elif opcode == 'PARAM':
+                stack.append(value(operands[0]))
+            elif opcode == 'PUSHER':
+                self.call_stack.append(operands[0] if operands else self.pc + 2)
+            elif opcode == 'CHPR':
+                self.memory_pointer = 8
+                self.pc = operands[0] - 2
+            elif opcode == 'RTPR':
+                if self.call_stack:
+                    self.pc = self.call_stack.pop() - 2
+                else:
+                    self.running = False
+            elif opcode == 'ALME':
+                for _ in range(operands[0]):
+                    if stack:
+                        memory[self.memory_pointer] = stack.pop(0)
+                    self.memory_pointer += 1
+            elif opcode == 'DESM':
+                for _ in range(operands[0]):
+                    if stack:
+                        stack.pop()
+            elif opcode == 'PARA':
+                self.running = False
+            elif opcode == 'INPP':
+                pass
+            else:
+                print(f"Instrução não implementada: {opcode}")
+
+            self.pc += 1
+            executed += 1
+
+        return executed
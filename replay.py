@@ -0,0 +1,193 @@
+"""
+Gravação e Reprodução de Entradas da Máquina Virtual
+
+Programas com floatval(readline()) precisam de alguém digitando a cada
+execução. No modo de gravação cada valor lido pelo LEIT e cada valor
+escrito pelo IMPR vão para um arquivo compacto; no modo de reprodução
+as entradas gravadas alimentam o LEIT sem esperar ninguém e as saídas
+podem ser comparadas com as gravadas. Assim medições de desempenho e
+conferências de otimizações (PGO, backends) ficam reproduzíveis.
+
+Formato (little-endian):
+    cabeçalho  'LVMR', versão, quantidade de entradas, quantidade de saídas
+    entradas   para cada uma: tamanho (uint16) + texto UTF-8 como digitado
+    saídas     tipos (um byte por valor: 'd' float, 'q' inteiro) + valores
+"""
+
+import argparse
+import struct
+import sys
+import time
+
+from farm import input_feeder
+from snapshot import decode_values, encode_values
+from vm import VirtualMachine
+
+
+MAGIC = b'LVMR'
+RECORDING_VERSION = 1
+HEADER = struct.Struct('<4sHII')
+LENGTH = struct.Struct('<H')
+
+
+class RecordingError(Exception):
+    pass
+
+
+class Recording:
+    """Entradas consumidas pelo LEIT e saídas do IMPR de uma execução"""
+
+    def __init__(self, inputs=None, outputs=None):
+        self.inputs = inputs or []
+        self.outputs = outputs or []
+
+    def encode(self):
+        parts = [HEADER.pack(MAGIC, RECORDING_VERSION, len(self.inputs), len(self.outputs))]
+        for text in self.inputs:
+            data = text.encode('utf-8')
+            parts.append(LENGTH.pack(len(data)))
+            parts.append(data)
+        parts.append(encode_values(self.outputs))
+        return b''.join(parts)
+
+    @classmethod
+    def decode(cls, data):
+        if len(data) < HEADER.size:
+            raise RecordingError("gravação truncada")
+        magic, version, input_count, output_count = HEADER.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise RecordingError("não é uma gravação da VM")
+        if version != RECORDING_VERSION:
+            raise RecordingError(f"versão de gravação não suportada: {version}")
+
+        try:
+            offset = HEADER.size
+            inputs = []
+            for _ in range(input_count):
+                (length,) = LENGTH.unpack_from(data, offset)
+                offset += LENGTH.size
+                inputs.append(data[offset:offset + length].decode('utf-8'))
+                offset += length
+            outputs, offset = decode_values(data, offset, output_count)
+        except (struct.error, UnicodeDecodeError) as e:
+            raise RecordingError(f"gravação corrompida: {e}") from e
+        return cls(inputs, outputs)
+
+    def save(self, filename):
+        with open(filename, 'wb') as f:
+            f.write(self.encode())
+
+    @classmethod
+    def load(cls, filename):
+        with open(filename, 'rb') as f:
+            return cls.decode(f.read())
+
+    def __repr__(self):
+        return f"Recording(inputs={len(self.inputs)}, outputs={len(self.outputs)})"
+
+
+class Recorder:
+    """Entrada/saída da VM que repassa para o terminal e grava tudo"""
+
+    def __init__(self, input_func=None, output_func=None):
+        self.input_func = input_func if input_func is not None else input
+        self.output_func = output_func if output_func is not None else print
+        self.recording = Recording()
+
+    def read(self, prompt=''):
+        text = self.input_func(prompt)
+        self.recording.inputs.append(str(text).strip())
+        return text
+
+    def write(self, value):
+        self.recording.outputs.append(value)
+        self.output_func(value)
+
+
+class Player:
+    """Entrada/saída da VM que reproduz as entradas de uma gravação"""
+
+    def __init__(self, recording, output_func=None):
+        self.recording = recording
+        self.read = input_feeder(recording.inputs)
+        self.output_func = output_func
+        self.outputs = []
+
+    def write(self, value):
+        self.outputs.append(value)
+        if self.output_func is not None:
+            self.output_func(value)
+
+    def differences(self):
+        return diff_outputs(self.recording.outputs, self.outputs)
+
+
+def diff_outputs(expected, actual):
+    """Mensagens descrevendo onde as saídas diferem (lista vazia = iguais)"""
+    differences = []
+    for index, (want, got) in enumerate(zip(expected, actual)):
+        if want != got or type(want) is not type(got):
+            differences.append(f"saída {index + 1}: gravado {want!r}, obtido {got!r}")
+    if len(expected) != len(actual):
+        differences.append(f"{len(expected)} saídas gravadas, {len(actual)} obtidas")
+    return differences
+
+
+def replay(instructions, recording):
+    """Executa o programa com as entradas gravadas; devolve o Player"""
+    player = Player(recording)
+    vm = VirtualMachine(input_func=player.read, output_func=player.write, verbose=False)
+    vm.instructions = instructions
+    vm.execute()
+    return player
+
+
+def main():
+    """Função principal"""
+    arg_parser = argparse.ArgumentParser(
+        description="Reproduz as entradas gravadas de uma execução e compara as saídas",
+        epilog="Gravação: python main.py programa.php --gravar execucao.rec")
+    arg_parser.add_argument('programa', help="arquivo .asm gerado pelo compilador")
+    arg_parser.add_argument('gravacao', help="arquivo gravado com --gravar")
+    arg_parser.add_argument('--repeticoes', type=int, default=1,
+                            help="reproduz N vezes e mostra o melhor tempo")
+    arg_parser.add_argument('--sem-comparar', action='store_true',
+                            help="não compara as saídas com as gravadas")
+    args = arg_parser.parse_args()
+
+    try:
+        recording = Recording.load(args.gravacao)
+    except RecordingError as e:
+        print(f"ERRO: {e}")
+        sys.exit(1)
+
+    vm = VirtualMachine(verbose=False)
+    vm.load_program(args.programa)
+
+    best = None
+    for _ in range(max(1, args.repeticoes)):
+        start = time.perf_counter()
+        try:
+            player = replay(vm.instructions, recording)
+        except Exception as e:
+            print(f"Erro ao reproduzir: {e}")
+            sys.exit(1)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    print(f"{len(recording.inputs)} entradas reproduzidas, {len(player.outputs)} saídas, "
+          f"melhor tempo {best * 1000:.3f} ms")
+
+    if args.sem_comparar:
+        return
+    differences = player.differences()
+    if differences:
+        print("Saídas diferentes da gravação:")
+        for difference in differences:
+            print(f"  {difference}")
+        sys.exit(1)
+    print("Saídas iguais às gravadas")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+"""
+Escalonador Cooperativo de Máquinas Virtuais
+
+Multiplexa muitas VirtualMachine em um único processo, sem uma thread
+por programa: cada VM executa uma fatia de no máximo N instruções
+(VirtualMachine.run_slice) e devolve a vez ao escalonador.
+
+Políticas:
+    rodizio     todas as VMs recebem fatias em ordem circular
+    prioridade  escalonamento por passos (stride): uma VM de prioridade
+                2 recebe o dobro de fatias de uma de prioridade 1
+
+Cada VM pode ter um orçamento total de instruções; quem passa do
+orçamento (por exemplo, um laço infinito) é encerrado sem afetar as
+outras.
+"""
+
+import argparse
+import heapq
+import sys
+import time
+from collections import deque
+
+from farm import input_feeder, read_input_sets
+from vm import VirtualMachine, VMRuntimeError, parse_program
+
+
+SLICE_SIZE = 1000
+# Numerador do passo da política de prioridade (passo = STRIDE / prioridade)
+STRIDE = 1 << 20
+
+
+class Task:
+    """Uma VM sob o escalonador"""
+
+    READY = 'pronta'
+    DONE = 'terminada'
+    KILLED = 'encerrada'
+    FAILED = 'erro'
+
+    def __init__(self, vm, name, priority=1, budget=None):
+        if priority <= 0:
+            raise ValueError("a prioridade deve ser positiva")
+        self.vm = vm
+        self.name = name
+        self.priority = priority
+        self.budget = budget      # None = sem limite de instruções
+        self.executed = 0
+        self.slices = 0
+        self.status = Task.READY
+        self.error = None
+        self.pass_value = 0       # posição na política de prioridade
+
+    @property
+    def active(self):
+        return self.status == Task.READY
+
+    def run_slice(self, slice_size):
+        """Executa uma fatia e atualiza o estado; devolve instruções executadas"""
+        vm = self.vm
+        budget = slice_size
+        if self.budget is not None:
+            budget = min(budget, self.budget - self.executed)
+
+        try:
+            executed = vm.run_slice(budget)
+        except VMRuntimeError as e:
+            self.fail(e)
+            return 0
+        except Exception as e:
+            self.fail(vm.runtime_error(e))
+            return 0
+
+        self.executed += executed
+        self.slices += 1
+        if vm.finished:
+            self.status = Task.DONE
+        elif self.budget is not None and self.executed >= self.budget:
+            self.status = Task.KILLED
+            self.error = f"orçamento de {self.budget} instruções esgotado (instrução {vm.pc + 1})"
+        return executed
+
+    def fail(self, error):
+        self.status = Task.FAILED
+        self.error = str(error)
+
+    def __repr__(self):
+        return (f"Task({self.name!r}, status={self.status}, executed={self.executed}, "
+                f"slices={self.slices})")
+
+
+class Scheduler:
+
+    POLICIES = ('rodizio', 'prioridade')
+
+    def __init__(self, slice_size=SLICE_SIZE, policy='rodizio'):
+        if policy not in Scheduler.POLICIES:
+            raise ValueError(f"política desconhecida: {policy}")
+        self.slice_size = slice_size
+        self.policy = policy
+        self.tasks = []
+        self.elapsed = 0.0
+
+    def add(self, vm, name=None, priority=1, budget=None):
+        task = Task(vm, name if name is not None else f"vm{len(self.tasks)}", priority, budget)
+        self.tasks.append(task)
+        return task
+
+    def run(self):
+        """Executa até todas as VMs terminarem, serem encerradas ou falharem"""
+        start = time.perf_counter()
+        if self.policy == 'rodizio':
+            self.run_round_robin()
+        else:
+            self.run_by_priority()
+        self.elapsed += time.perf_counter() - start
+        return self.tasks
+
+    def run_round_robin(self):
+        ready = deque(task for task in self.tasks if task.active)
+        while ready:
+            task = ready.popleft()
+            task.run_slice(self.slice_size)
+            if task.active:
+                ready.append(task)
+
+    def run_by_priority(self):
+        # Heap por (passo acumulado, ordem de chegada): a menor posição executa
+        ready = [(task.pass_value, order, task) for order, task in enumerate(self.tasks)
+                 if task.active]
+        heapq.heapify(ready)
+        while ready:
+            _, order, task = heapq.heappop(ready)
+            task.run_slice(self.slice_size)
+            if task.active:
+                task.pass_value += STRIDE // task.priority
+                heapq.heappush(ready, (task.pass_value, order, task))
+
+    def instructions_executed(self):
+        return sum(task.executed for task in self.tasks)
+
+    def summary(self):
+        counts = {}
+        for task in self.tasks:
+            counts[task.status] = counts.get(task.status, 0) + 1
+        return counts
+
+
+def main():
+    """Função principal"""
+    arg_parser = argparse.ArgumentParser(
+        description="Executa muitas instâncias de um programa .asm em um processo, por fatias")
+    arg_parser.add_argument('programa', help="arquivo .asm gerado pelo compilador")
+    arg_parser.add_argument('entradas', help="arquivo com uma instância por linha (entradas do LEIT)")
+    arg_parser.add_argument('--fatia', type=int, default=SLICE_SIZE,
+                            help=f"instruções por fatia (padrão: {SLICE_SIZE})")
+    arg_parser.add_argument('--orcamento', type=int, default=None,
+                            help="máximo de instruções por instância (encerra laços sem fim)")
+    arg_parser.add_argument('--politica', choices=Scheduler.POLICIES, default='rodizio',
+                            help="ordem das fatias (padrão: rodizio)")
+    args = arg_parser.parse_args()
+
+    with open(args.programa, 'r', encoding='utf-8') as f:
+        instructions = parse_program(f.readlines())
+
+    scheduler = Scheduler(args.fatia, args.politica)
+    outputs = []
+    for inputs in read_input_sets(args.entradas):
+        collected = []
+        vm = VirtualMachine(input_func=input_feeder(inputs), output_func=collected.append,
+                            verbose=False)
+        vm.instructions = instructions
+        scheduler.add(vm, budget=args.orcamento)
+        outputs.append(collected)
+
+    scheduler.run()
+
+    for task, collected in zip(scheduler.tasks, outputs):
+        line = " ".join(str(value) for value in collected)
+        if task.error:
+            line = f"{line} ERRO: {task.error}".strip()
+        print(line)
+
+    summary = ", ".join(f"{count} {status}" for status, count in sorted(scheduler.summary().items()))
+    print(f"{len(scheduler.tasks)} instâncias, {scheduler.instructions_executed()} instruções "
+          f"em {scheduler.elapsed:.3f}s ({summary})", file=sys.stderr)
+    sys.exit(0 if all(task.status == Task.DONE for task in scheduler.tasks) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+"""
+Servidor de Compilação
+
+Cada `python main.py programa.php` paga a inicialização do Python e a
+importação de todos os módulos do compilador. O servidor é um processo
+de longa duração que importa tudo uma vez e atende pedidos num socket
+unix; client.py é o cliente que repassa os argumentos.
+
+Cada pedido é atendido num processo filho criado com fork: o filho herda
+os módulos já carregados, assume a entrada, a saída e a saída de erro do
+cliente (descritores recebidos pelo socket, SCM_RIGHTS), entra no
+diretório do cliente e executa main.main() como `python main.py argv`.
+A saída chega ao cliente linha a linha, o LEIT lê do terminal do cliente
+e o estado de um pedido não passa para o seguinte.
+
+Protocolo (uma conexão por pedido):
+    cliente  -> {"argv": [...], "cwd": "..."}\\n + descritores 0, 1, 2
+    servidor -> pid do filho\\n ... código de saída\\n
+                ou "erro: mensagem\\n" se o pedido não puder ser atendido
+    {"parar": true} encerra o servidor.
+
+Requer fork e socket unix (Linux/macOS).
+"""
+
+import argparse
+import json
+import os
+import signal
+import socket
+import sys
+import time
+import traceback
+
+import main as compiler
+from client import ERROR_PREFIX, socket_path
+
+
+# Módulos que main.py importa sob demanda; carregados antes para os filhos herdarem
+PRELOAD = ('vm', 'register_vm', 'pgo', 'profiler', 'tracer', 'vm_coverage', 'replay',
+           'verifier', 'closure_compiler', 'cache', 'linker')
+BACKLOG = 128
+MAX_REQUEST = 1 << 16
+# Segundos que um cliente tem para enviar o pedido; o laço de accept espera por ele
+REQUEST_TIMEOUT = 5.0
+
+
+def preload():
+    for name in PRELOAD:
+        __import__(name)
+
+
+def receive_request(connection, timeout=REQUEST_TIMEOUT):
+    """Pedido JSON e descritores enviados pelo cliente (TimeoutError se demorar)"""
+    deadline = time.monotonic() + timeout
+    connection.settimeout(timeout)
+    message, fds, _, _ = socket.recv_fds(connection, MAX_REQUEST, 3)
+    try:
+        while message and not message.endswith(b'\n'):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError("timed out")
+            if len(message) > MAX_REQUEST:
+                raise ValueError("pedido grande demais")
+            connection.settimeout(remaining)
+            chunk = connection.recv(MAX_REQUEST)
+            if not chunk:
+                break
+            message += chunk
+        request = json.loads(message)
+        if not isinstance(request, dict):
+            raise ValueError("o pedido não é um objeto JSON")
+    except (OSError, ValueError):
+        for fd in fds:
+            os.close(fd)
+        raise
+    connection.settimeout(None)
+    return request, fds
+
+
+def reply_error(connection, message):
+    """Avisa o cliente de que o pedido não será atendido"""
+    try:
+        connection.sendall(ERROR_PREFIX + message.encode('utf-8') + b'\n')
+    except OSError:
+        pass
+
+
+def run_compiler(request):
+    """Executa main.py como `python main.py argv` e devolve o código de saída"""
+    try:
+        os.chdir(request['cwd'])
+        sys.argv = ['main.py'] + list(request['argv'])
+        compiler.main()
+    except SystemExit as e:
+        return e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+    except KeyboardInterrupt:
+        return 130
+    except BaseException:
+        traceback.print_exc()
+        return 1
+    return 0
+
+
+def run_request(connection, request, fds):
+    """
+    No processo filho: assume o terminal do cliente e executa main.py.
+    Nunca retorna: qualquer erro (inclusive o cliente ter desconectado)
+    termina o filho, que não pode voltar ao laço do servidor.
+    """
+    status = 1
+    try:
+        signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+        for target, fd in enumerate(fds):
+            os.dup2(fd, target)
+            os.close(fd)
+        sys.stdout.reconfigure(line_buffering=True)
+        connection.sendall(f"{os.getpid()}\n".encode())
+
+        status = run_compiler(request)
+        sys.stdout.flush()
+        sys.stderr.flush()
+        connection.sendall(f"{status}\n".encode())
+    finally:
+        os._exit(status)
+
+
+def serve(path, timeout=REQUEST_TIMEOUT):
+    """Atende pedidos em 'path' até receber {"parar": true}"""
+    preload()
+    server_pid = os.getpid()
+    if os.path.exists(path):
+        os.unlink(path)
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)  # o sistema recolhe os filhos
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    umask = os.umask(0o177)  # socket só para o próprio usuário
+    try:
+        server.bind(path)
+    finally:
+        os.umask(umask)
+
+    try:
+        server.listen(BACKLOG)
+        while True:
+            connection, _ = server.accept()
+            try:
+                request, fds = receive_request(connection, timeout)
+            except TimeoutError:
+                reply_error(connection, f"o pedido não chegou em {timeout:g} s")
+                connection.close()
+                continue
+            except (OSError, ValueError) as e:
+                reply_error(connection, f"pedido inválido: {e}")
+                connection.close()
+                continue
+
+            if request.get('parar'):
+                connection.sendall(b"0\n")
+                connection.close()
+                break
+
+            if len(fds) != 3:
+                reply_error(connection, f"o pedido precisa dos descritores de entrada, saída e "
+                                        f"erro; chegaram {len(fds)}")
+            else:
+                try:
+                    child = os.fork()
+                except OSError as e:
+                    reply_error(connection, f"não foi possível criar o processo: {e}")
+                    child = None
+                if child == 0:
+                    server.close()
+                    run_request(connection, request, fds)
+            for fd in fds:
+                os.close(fd)
+            connection.close()
+    finally:
+        # Só o processo do servidor remove o socket, nunca um filho
+        if os.getpid() == server_pid:
+            server.close()
+            if os.path.exists(path):
+                os.unlink(path)
+
+
+def stop(path):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        connection.connect(path)
+        connection.sendall(json.dumps({'parar': True}).encode('utf-8') + b'\n')
+        connection.recv(16)
+
+
+def main():
+    """Função principal"""
+    arg_parser = argparse.ArgumentParser(
+        description="Servidor de compilação: mantém o compilador carregado entre execuções",
+        epilog="Exemplos: python server.py & python client.py correto.php -q | "
+               "python server.py --parar")
+    arg_parser.add_argument('--socket', metavar='CAMINHO', default=None,
+                            help="caminho do socket unix (padrão: $LALG_SOCKET ou o diretório temporário)")
+    arg_parser.add_argument('--parar', action='store_true', help="encerra o servidor em execução")
+    arg_parser.add_argument('--espera', metavar='SEGUNDOS', type=float, default=REQUEST_TIMEOUT,
+                            help=f"tempo para o cliente enviar o pedido (padrão: {REQUEST_TIMEOUT:g})")
+    args = arg_parser.parse_args()
+
+    path = args.socket or socket_path()
+    if args.parar:
+        try:
+            stop(path)
+        except OSError as e:
+            print(f"Nenhum servidor em {path}: {e}")
+            sys.exit(1)
+        print(f"Servidor em {path} encerrado")
+        return
+
+    print(f"Servidor de compilação em {path}", flush=True)
+    try:
+        serve(path, args.espera)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""
+Snapshot do Estado da Máquina Virtual
+
+Salva uma VirtualMachine pausada (pc, pilha, memória, pilha de chamadas
+e memory_pointer) em um binário compacto e restaura a partir dele. Com
+isso dá para parar num marcador (uma instrução ou uma linha do fonte),
+guardar o estado e recomeçar muitos experimentos dali sem executar de
+novo o prefixo do programa (por exemplo, a leitura das entradas).
+
+Formato (little-endian):
+    cabeçalho  'LVMS', versão, SHA-1 do programa, pc, memory_pointer,
+               running, tamanho da memória, itens na pilha, itens na
+               pilha de chamadas, células vivas
+    pilha      tipos (um byte por valor: 'd' float, 'q' inteiro) + valores
+    chamadas   endereços de retorno (int64)
+    memória    índices (uint32) + tipos + valores, só das células vivas
+
+Células com 0.0 (o valor inicial) não são gravadas, então o snapshot e a
+restauração crescem com a memória em uso, não com o histórico da execução.
+"""
+
+import argparse
+import hashlib
+import math
+import struct
+import sys
+from array import array
+
+from vm import VirtualMachine
+
+
+MAGIC = b'LVMS'
+SNAPSHOT_VERSION = 1
+HEADER = struct.Struct('<4sH20sqIBIIII')
+
+
+class SnapshotError(Exception):
+    pass
+
+
+def program_hash(instructions):
+    """Identifica o programa: um snapshot só vale para o mesmo código"""
+    return hashlib.sha1("\n".join(instructions).encode('utf-8')).digest()
+
+
+def is_live(value):
+    """Célula diferente do valor inicial 0.0 (inteiro 0 e -0.0 contam)"""
+    return not (type(value) is float and value == 0.0 and math.copysign(1.0, value) > 0)
+
+
+def encode_values(values):
+    tags = ''.join('q' if type(value) is int else 'd' for value in values)
+    try:
+        return tags.encode('ascii') + struct.pack('<' + tags, *values)
+    except struct.error as e:
+        raise SnapshotError(f"valor não representável no snapshot: {e}") from e
+
+
+def decode_values(data, offset, count):
+    tags = data[offset:offset + count].decode('ascii')
+    offset += count
+    values = struct.unpack_from('<' + tags, data, offset)
+    return list(values), offset + struct.calcsize('<' + tags)
+
+
+def take_snapshot(vm):
+    """Serializa o estado atual da VM"""
+    live = [index for index, value in enumerate(vm.memory) if is_live(value)]
+    header = HEADER.pack(MAGIC, SNAPSHOT_VERSION, program_hash(vm.instructions),
+                         vm.pc, vm.memory_pointer, 1 if vm.running else 0,
+                         len(vm.memory), len(vm.stack), len(vm.call_stack), len(live))
+
+    parts = [header, encode_values(vm.stack), array('q', vm.call_stack).tobytes(),
+             array('I', live).tobytes(), encode_values([vm.memory[index] for index in live])]
+    return b''.join(parts)
+
+
+def restore_snapshot(vm, data):
+    """Restaura na VM (já com o programa carregado) o estado de um snapshot"""
+    if len(data) < HEADER.size:
+        raise SnapshotError("snapshot truncado")
+
+    (magic, version, digest, pc, memory_pointer, running,
+     memory_size, stack_size, calls, live) = HEADER.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise SnapshotError("não é um snapshot da VM")
+    if version != SNAPSHOT_VERSION:
+        raise SnapshotError(f"versão de snapshot não suportada: {version}")
+    if digest != program_hash(vm.instructions):
+        raise SnapshotError("snapshot foi gravado com outro programa")
+
+    try:
+        offset = HEADER.size
+        stack, offset = decode_values(data, offset, stack_size)
+
+        call_stack = array('q')
+        call_stack.frombytes(data[offset:offset + calls * 8])
+        offset += calls * 8
+
+        indices = array('I')
+        indices.frombytes(data[offset:offset + live * 4])
+        offset += live * 4
+        values, offset = decode_values(data, offset, live)
+        if len(call_stack) != calls or len(indices) != live:
+            raise ValueError("dados truncados")
+
+        memory = [0.0] * memory_size
+        for index, value in zip(indices, values):
+            memory[index] = value
+    except (struct.error, ValueError, IndexError, UnicodeDecodeError) as e:
+        raise SnapshotError(f"snapshot corrompido: {e}") from e
+
+    vm.pc = pc
+    vm.memory_pointer = memory_pointer
+    vm.running = bool(running)
+    vm.stack[:] = stack
+    vm.call_stack[:] = call_stack.tolist()
+    vm.memory[:] = memory
+
+
+def save_snapshot(vm, filename):
+    with open(filename, 'wb') as f:
+        f.write(take_snapshot(vm))
+
+
+def load_snapshot(vm, filename):
+    with open(filename, 'rb') as f:
+        restore_snapshot(vm, f.read())
+
+
+def checkpoint(vm, stop_pc):
+    """
+    Executa a VM até a instrução stop_pc e devolve o snapshot desse ponto
+    (None se o programa terminou antes de chegar lá).
+    """
+    if not vm.run_until(stop_pc):
+        return None
+    return take_snapshot(vm)
+
+
+def first_instruction_of_line(vm, line):
+    """Primeira instrução gerada pela linha do fonte (None se não houver)"""
+    source_map = vm.source_map
+    if source_map is None:
+        raise SnapshotError("marcador por linha do fonte precisa do mapa de fonte (.map)")
+    for index, source_line in enumerate(source_map.lines()):
+        if source_line == line:
+            return index
+    return None
+
+
+def main():
+    """Função principal"""
+    arg_parser = argparse.ArgumentParser(
+        description="Salva ou restaura o estado da VM",
+        epilog="Exemplos: python snapshot.py programa.asm --linha 20 -o estado.snap | "
+               "python snapshot.py programa.asm --restaurar estado.snap")
+    arg_parser.add_argument('programa', help="arquivo .asm gerado pelo compilador")
+    marker = arg_parser.add_mutually_exclusive_group(required=True)
+    marker.add_argument('--linha', type=int, help="para na primeira instrução desta linha do fonte")
+    marker.add_argument('--instrucao', type=int, help="para nesta instrução do .asm (1, 2, ...)")
+    marker.add_argument('--restaurar', metavar='SNAPSHOT', help="continua a execução de um snapshot")
+    arg_parser.add_argument('-o', '--saida', default=None,
+                            help="arquivo do snapshot (padrão: programa + .snap)")
+    args = arg_parser.parse_args()
+
+    vm = VirtualMachine(verbose=False)
+    vm.load_program(args.programa)
+
+    try:
+        if args.restaurar:
+            load_snapshot(vm, args.restaurar)
+            vm.execute()
+            return
+
+        if args.linha is not None:
+            stop_pc = first_instruction_of_line(vm, args.linha)
+            if stop_pc is None:
+                print(f"A linha {args.linha} do fonte não gerou instruções")
+                sys.exit(1)
+        else:
+            stop_pc = args.instrucao - 1
+
+        data = checkpoint(vm, stop_pc)
+        if data is None:
+            print("O programa terminou antes de chegar ao marcador")
+            sys.exit(1)
+
+        output = args.saida or args.programa + '.snap'
+        with open(output, 'wb') as f:
+            f.write(data)
+        print(f"Snapshot salvo em: {output} ({len(data)} bytes, instrução {stop_pc + 1})")
+    except SnapshotError as e:
+        print(f"ERRO: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Mapa de Fonte: instruções da VM -> linhas do programa LALG-PHP
+
+O gerador registra a linha do fonte de cada instrução emitida. A tabela
+é guardada compactada por carreiras (run-length): cada par linha*N diz
+que as próximas N instruções vieram da mesma linha. A linha 0 indica
+instrução sem linha de origem (ex.: PARA).
+
+Formato do arquivo (programa.asm.map):
+    # lalg-php source map v1
+    0*1 3*1 4*1 13*4 14*2 ...
+"""
+
+import bisect
+import os
+
+
+HEADER = "# lalg-php source map v1"
+
+
+def map_filename(program_file):
+    return program_file + '.map'
+
+
+class SourceMap:
+
+    def __init__(self, runs=None):
+        self.runs = runs or []  # lista de [linha, quantidade]
+        self.starts = []
+        total = 0
+        for line, count in self.runs:
+            self.starts.append(total)
+            total += count
+        self.size = total
+
+    @classmethod
+    def from_lines(cls, lines):
+        runs = []
+        for line in lines:
+            if runs and runs[-1][0] == line:
+                runs[-1][1] += 1
+            else:
+                runs.append([line, 1])
+        return cls(runs)
+
+    def line_for(self, index):
+        """Linha do fonte da instrução 'index' (0 = desconhecida)"""
+        if index < 0 or index >= self.size:
+            return 0
+        position = bisect.bisect_right(self.starts, index) - 1
+        return self.runs[position][0]
+
+    def lines(self):
+        result = []
+        for line, count in self.runs:
+            result.extend([line] * count)
+        return result
+
+    def encode(self):
+        body = " ".join(f"{line}*{count}" for line, count in self.runs)
+        return f"{HEADER}\n{body}\n"
+
+    @classmethod
+    def decode(cls, text):
+        runs = []
+        for part in text.split():
+            if '*' not in part:
+                continue
+            line, count = part.split('*')
+            runs.append([int(line), int(count)])
+        return cls(runs)
+
+    def save(self, filename):
+        with open(filename, 'w', encoding='utf-8') as f:
+            f.write(self.encode())
+
+    @classmethod
+    def load(cls, filename):
+        with open(filename, 'r', encoding='utf-8') as f:
+            lines = f.read().splitlines()
+        if not lines or lines[0].strip() != HEADER:
+            raise ValueError(f"'{filename}' não é um mapa de fonte")
+        return cls.decode("\n".join(lines[1:]))
+
+    @classmethod
+    def load_for(cls, program_file, size=None):
+        """
+        Mapa salvo ao lado do programa, ou None se não existir, estiver
+        corrompido ou não tiver 'size' instruções (mapa de outra compilação)
+        """
+        filename = map_filename(program_file)
+        if not os.path.exists(filename):
+            return None
+        try:
+            source_map = cls.load(filename)
+        except (OSError, ValueError):
+            return None
+        if size is not None and source_map.size != size:
+            return None
+        return source_map
+
+    def __repr__(self):
+        return f"SourceMap(instructions={self.size}, runs={len(self.runs)})"
@@ -1,625 +1,625 @@
-TABELA_ACTION = {
-    (0, 'PHP_OPEN'): 's2',
-    (1, '$'): 'acc',
-    (2, 'ECHO'): 'r5',
-    (2, 'FUNCTION'): 's10',
-    (2, 'IF'): 'r5',
-    (2, 'VAR'): 's7',
-    (2, 'WHILE'): 'r5',
-    (3, 'ECHO'): 's24',
-    (3, 'FECHA_C'): 'r24',
-    (3, 'FUNCTION'): 's10',
-    (3, 'IDENT'): 's112',
-    (3, 'IF'): 's25',
-    (3, 'PHP_CLOSE'): 'r24',
-    (3, 'VAR'): 's27',
-    (3, 'WHILE'): 's26',
-    (4, 'ECHO'): 'r5',
-    (4, 'FUNCTION'): 's10',
-    (4, 'IF'): 'r5',
-    (4, 'VAR'): 's7',
-    (4, 'WHILE'): 'r5',
-    (5, 'ECHO'): 'r4',
-    (5, 'FUNCTION'): 'r4',
-    (5, 'IF'): 'r4',
-    (5, 'VAR'): 'r4',
-    (5, 'WHILE'): 'r4',
-    (6, 'ECHO'): 'r6',
-    (6, 'FUNCTION'): 'r6',
-    (6, 'IF'): 'r6',
-    (6, 'VAR'): 'r6',
-    (6, 'WHILE'): 'r6',
-    (7, 'ATRIB'): 's8',
-    (7, 'PV'): 's9',
-    (8, 'ABRE_P'): 'r48',
-    (8, 'FLOATVAL'): 's38',
-    (8, 'NUMERO_REAL'): 'r48',
-    (8, 'SUB'): 's40',
-    (8, 'VAR'): 'r48',
-    (9, 'ECHO'): 'r10',
-    (9, 'FUNCTION'): 'r10',
-    (9, 'IF'): 'r10',
-    (9, 'VAR'): 'r10',
-    (9, 'WHILE'): 'r10',
-    (10, 'IDENT'): 's56',
-    (11, 'VAR'): 's13',
-    (12, 'FECHA_P'): 's58',
-    (12, 'VAR'): 's13',
-    (13, 'FECHA_P'): 'r16',
-    (13, 'VIRG'): 's14',
-    (14, 'VAR'): 's60',
-    (15, 'ECHO'): 's24',
-    (15, 'FECHA_C'): 'r24',
-    (15, 'IDENT'): 's112',
-    (15, 'IF'): 's25',
-    (15, 'VAR'): 's27',
-    (15, 'WHILE'): 's26',
-    (16, 'ECHO'): 'r19',
-    (16, 'IF'): 'r19',
-    (16, 'VAR'): 's7',
-    (16, 'WHILE'): 'r19',
-    (17, 'ECHO'): 'r20',
-    (17, 'IF'): 'r20',
-    (17, 'VAR'): 'r20',
-    (17, 'WHILE'): 'r20',
-    (18, 'ABRE_P'): 'r48',
-    (18, 'FLOATVAL'): 's38',
-    (18, 'NUMERO_REAL'): 'r48',
-    (18, 'SUB'): 's40',
-    (18, 'VAR'): 'r48',
-    (19, 'FECHA_P'): 's58',
-    (20, 'FECHA_P'): 'r60',
-    (20, 'VIRG'): 's21',
-    (21, 'ABRE_P'): 'r48',
-    (21, 'FLOATVAL'): 's38',
-    (21, 'NUMERO_REAL'): 'r48',
-    (21, 'SUB'): 's40',
-    (21, 'VAR'): 'r48',
-    (22, 'ECHO'): 's24',
-    (22, 'FECHA_C'): 'r24',
-    (22, 'IDENT'): 's112',
-    (22, 'IF'): 's25',
-    (22, 'PHP_CLOSE'): 'r24',
-    (22, 'VAR'): 's27',
-    (22, 'WHILE'): 's26',
-    (23, 'FECHA_C'): 'r23',
-    (23, 'PHP_CLOSE'): 'r23',
-    (24, 'VAR'): 's67',
-    (25, 'ABRE_P'): 's68',
-    (26, 'ABRE_P'): 's69',
-    (27, 'ABRE_P'): 's12',
-    (27, 'ATRIB'): 's28',
-    (28, 'ABRE_P'): 'r48',
-    (28, 'FLOATVAL'): 's38',
-    (28, 'NUMERO_REAL'): 'r48',
-    (28, 'SUB'): 's40',
-    (28, 'VAR'): 'r48',
-    (29, 'PV'): 'r30',
-    (30, 'DIFERENTE'): 's32',
-    (30, 'IGUAL'): 's31',
-    (30, 'MAIOR'): 's35',
-    (30, 'MAIOR_IGUAL'): 's33',
-    (30, 'MENOR'): 's36',
-    (30, 'MENOR_IGUAL'): 's34',
-    (31, 'ABRE_P'): 'r48',
-    (31, 'FLOATVAL'): 's38',
-    (31, 'NUMERO_REAL'): 'r48',
-    (31, 'SUB'): 's40',
-    (31, 'VAR'): 'r48',
-    (32, 'ABRE_P'): 'r48',
-    (32, 'FLOATVAL'): 's38',
-    (32, 'NUMERO_REAL'): 'r48',
-    (32, 'SUB'): 's40',
-    (32, 'VAR'): 'r48',
-    (33, 'ABRE_P'): 'r48',
-    (33, 'FLOATVAL'): 's38',
-    (33, 'NUMERO_REAL'): 'r48',
-    (33, 'SUB'): 's40',
-    (33, 'VAR'): 'r48',
-    (34, 'ABRE_P'): 'r48',
-    (34, 'FLOATVAL'): 's38',
-    (34, 'NUMERO_REAL'): 'r48',
-    (34, 'SUB'): 's40',
-    (34, 'VAR'): 'r48',
-    (35, 'ABRE_P'): 'r48',
-    (35, 'FLOATVAL'): 's38',
-    (35, 'NUMERO_REAL'): 'r48',
-    (35, 'SUB'): 's40',
-    (35, 'VAR'): 'r48',
-    (36, 'ABRE_P'): 'r48',
-    (36, 'FLOATVAL'): 's38',
-    (36, 'NUMERO_REAL'): 'r48',
-    (36, 'SUB'): 's40',
-    (36, 'VAR'): 'r48',
-    (37, 'DIFERENTE'): 'r43',
-    (37, 'FECHA_P'): 'r43',
-    (37, 'IGUAL'): 'r43',
-    (37, 'MAIOR'): 'r43',
-    (37, 'MAIOR_IGUAL'): 'r43',
-    (37, 'MENOR'): 'r43',
-    (37, 'MENOR_IGUAL'): 'r43',
-    (37, 'PV'): 'r43',
-    (37, 'SOMA'): 's45',
-    (37, 'SUB'): 's46',
-    (37, 'VIRG'): 'r43',
-    (38, 'DIFERENTE'): 'r61',
-    (38, 'FECHA_P'): 'r61',
-    (38, 'IGUAL'): 'r61',
-    (38, 'MAIOR'): 'r61',
-    (38, 'MAIOR_IGUAL'): 'r61',
-    (38, 'MENOR'): 'r61',
-    (38, 'MENOR_IGUAL'): 'r61',
-    (38, 'PV'): 'r61',
-    (38, 'VIRG'): 'r61',
-    (39, 'ABRE_P'): 's43',
-    (39, 'NUMERO_REAL'): 's42',
-    (39, 'VAR'): 's41',
-    (40, 'ABRE_P'): 'r47',
-    (40, 'NUMERO_REAL'): 'r47',
-    (40, 'VAR'): 'r47',
-    (41, 'DIFERENTE'): 'r53',
-    (41, 'DIV'): 'r53',
-    (41, 'FECHA_P'): 'r53',
-    (41, 'IGUAL'): 'r53',
-    (41, 'MAIOR'): 'r53',
-    (41, 'MAIOR_IGUAL'): 'r53',
-    (41, 'MENOR'): 'r53',
-    (41, 'MENOR_IGUAL'): 'r53',
-    (41, 'MULT'): 'r53',
-    (41, 'PV'): 'r53',
-    (41, 'SOMA'): 'r53',
-    (41, 'SUB'): 'r53',
-    (41, 'VIRG'): 'r53',
-    (42, 'DIFERENTE'): 'r54',
-    (42, 'DIV'): 'r54',
-    (42, 'FECHA_P'): 'r54',
-    (42, 'IGUAL'): 'r54',
-    (42, 'MAIOR'): 'r54',
-    (42, 'MAIOR_IGUAL'): 'r54',
-    (42, 'MENOR'): 'r54',
-    (42, 'MENOR_IGUAL'): 'r54',
-    (42, 'MULT'): 'r54',
-    (42, 'PV'): 'r54',
-    (42, 'SOMA'): 'r54',
-    (42, 'SUB'): 'r54',
-    (42, 'VIRG'): 'r54',
-    (43, 'ABRE_P'): 'r48',
-    (43, 'FLOATVAL'): 's38',
-    (43, 'NUMERO_REAL'): 'r48',
-    (43, 'SUB'): 's40',
-    (43, 'VAR'): 'r48',
-    (44, 'ABRE_P'): 'r48',
-    (44, 'NUMERO_REAL'): 'r48',
-    (44, 'SUB'): 's40',
-    (44, 'VAR'): 'r48',
-    (45, 'ABRE_P'): 'r44',
-    (45, 'NUMERO_REAL'): 'r44',
-    (45, 'SUB'): 'r44',
-    (45, 'VAR'): 'r44',
-    (46, 'ABRE_P'): 'r45',
-    (46, 'NUMERO_REAL'): 'r45',
-    (46, 'SUB'): 'r45',
-    (46, 'VAR'): 'r45',
-    (47, 'ABRE_P'): 's43',
-    (47, 'NUMERO_REAL'): 's42',
-    (47, 'VAR'): 's41',
-    (48, 'ABRE_P'): 'r51',
-    (48, 'NUMERO_REAL'): 'r51',
-    (48, 'VAR'): 'r51',
-    (49, 'ABRE_P'): 'r52',
-    (49, 'NUMERO_REAL'): 'r52',
-    (49, 'VAR'): 'r52',
-    (50, 'ABRE_C'): 's78',
-    (51, 'PHP_CLOSE'): 's79',
-    (52, 'PHP_CLOSE'): 'r2',
-    (53, 'ECHO'): 'r3',
-    (53, 'FUNCTION'): 'r3',
-    (53, 'IF'): 'r3',
-    (53, 'VAR'): 'r3',
-    (53, 'WHILE'): 'r3',
-    (54, 'ECHO'): 'r8',
-    (54, 'FUNCTION'): 'r8',
-    (54, 'IF'): 'r8',
-    (54, 'VAR'): 'r8',
-    (54, 'WHILE'): 'r8',
-    (55, 'PV'): 's80',
-    (56, 'ABRE_P'): 's12',
-    (57, 'FECHA_P'): 's82',
-    (58, 'ABRE_C'): 'r13',
-    (59, 'FECHA_P'): 'r14',
-    (60, 'FECHA_P'): 'r16',
-    (60, 'VIRG'): 's14',
-    (61, 'FECHA_C'): 'r17',
-    (62, 'ECHO'): 'r18',
-    (62, 'IF'): 'r18',
-    (62, 'VAR'): 'r18',
-    (62, 'WHILE'): 'r18',
-    (63, 'FECHA_P'): 's84',
-    (64, 'FECHA_P'): 'r58',
-    (65, 'FECHA_P'): 'r60',
-    (65, 'VIRG'): 's21',
-    (66, 'FECHA_C'): 'r22',
-    (66, 'PHP_CLOSE'): 'r22',
-    (67, 'PONTO'): 's86',
-    (68, 'ABRE_P'): 'r48',
-    (68, 'FLOATVAL'): 's38',
-    (68, 'NUMERO_REAL'): 'r48',
-    (68, 'SUB'): 's40',
-    (68, 'VAR'): 'r48',
-    (69, 'ABRE_P'): 'r48',
-    (69, 'FLOATVAL'): 's38',
-    (69, 'NUMERO_REAL'): 'r48',
-    (69, 'SUB'): 's40',
-    (69, 'VAR'): 'r48',
-    (70, 'PV'): 's89',
-    (71, 'PV'): 'r29',
-    (72, 'ABRE_P'): 'r48',
-    (72, 'FLOATVAL'): 's38',
-    (72, 'NUMERO_REAL'): 'r48',
-    (72, 'SUB'): 's40',
-    (72, 'VAR'): 'r48',
-    (73, 'DIFERENTE'): 'r41',
-    (73, 'FECHA_P'): 'r41',
-    (73, 'IGUAL'): 'r41',
-    (73, 'MAIOR'): 'r41',
-    (73, 'MAIOR_IGUAL'): 'r41',
-    (73, 'MENOR'): 'r41',
-    (73, 'MENOR_IGUAL'): 'r41',
-    (73, 'PV'): 'r41',
-    (73, 'VIRG'): 'r41',
-    (74, 'DIFERENTE'): 'r50',
-    (74, 'DIV'): 's49',
-    (74, 'FECHA_P'): 'r50',
-    (74, 'IGUAL'): 'r50',
-    (74, 'MAIOR'): 'r50',
-    (74, 'MAIOR_IGUAL'): 'r50',
-    (74, 'MENOR'): 'r50',
-    (74, 'MENOR_IGUAL'): 'r50',
-    (74, 'MULT'): 's48',
-    (74, 'PV'): 'r50',
-    (74, 'SOMA'): 'r50',
-    (74, 'SUB'): 'r50',
-    (74, 'VIRG'): 'r50',
-    (75, 'FECHA_P'): 's92',
-    (76, 'DIFERENTE'): 'r43',
-    (76, 'FECHA_P'): 'r43',
-    (76, 'IGUAL'): 'r43',
-    (76, 'MAIOR'): 'r43',
-    (76, 'MAIOR_IGUAL'): 'r43',
-    (76, 'MENOR'): 'r43',
-    (76, 'MENOR_IGUAL'): 'r43',
-    (76, 'PV'): 'r43',
-    (76, 'SOMA'): 's45',
-    (76, 'SUB'): 's46',
-    (76, 'VIRG'): 'r43',
-    (77, 'DIFERENTE'): 'r50',
-    (77, 'DIV'): 's49',
-    (77, 'FECHA_P'): 'r50',
-    (77, 'IGUAL'): 'r50',
-    (77, 'MAIOR'): 'r50',
-    (77, 'MAIOR_IGUAL'): 'r50',
-    (77, 'MENOR'): 'r50',
-    (77, 'MENOR_IGUAL'): 'r50',
-    (77, 'MULT'): 's48',
-    (77, 'PV'): 'r50',
-    (77, 'SOMA'): 'r50',
-    (77, 'SUB'): 'r50',
-    (77, 'VIRG'): 'r50',
-    (78, 'ECHO'): 's24',
-    (78, 'FECHA_C'): 'r24',
-    (78, 'IDENT'): 's112',
-    (78, 'IF'): 's25',
-    (78, 'VAR'): 's27',
-    (78, 'WHILE'): 's26',
-    (79, '$'): 'r1',
-    (80, 'ECHO'): 'r9',
-    (80, 'FUNCTION'): 'r9',
-    (80, 'IF'): 'r9',
-    (80, 'VAR'): 'r9',
-    (80, 'WHILE'): 'r9',
-    (81, 'ABRE_C'): 's96',
-    (82, 'ABRE_C'): 'r12',
-    (83, 'FECHA_P'): 'r15',
-    (84, 'PV'): 'r56',
-    (85, 'FECHA_P'): 'r59',
-    (86, 'PHP_EOL'): 's110',
-    (87, 'FECHA_P'): 's98',
-    (88, 'FECHA_P'): 's99',
-    (89, 'ECHO'): 'r28',
-    (89, 'FECHA_C'): 'r28',
-    (89, 'IDENT'): 'r28',
-    (89, 'IF'): 'r28',
-    (89, 'PHP_CLOSE'): 'r28',
-    (89, 'VAR'): 'r28',
-    (89, 'WHILE'): 'r28',
-    (90, 'FECHA_P'): 'r33',
-    (91, 'DIFERENTE'): 'r46',
-    (91, 'FECHA_P'): 'r46',
-    (91, 'IGUAL'): 'r46',
-    (91, 'MAIOR'): 'r46',
-    (91, 'MAIOR_IGUAL'): 'r46',
-    (91, 'MENOR'): 'r46',
-    (91, 'MENOR_IGUAL'): 'r46',
-    (91, 'PV'): 'r46',
-    (91, 'SOMA'): 'r46',
-    (91, 'SUB'): 'r46',
-    (91, 'VIRG'): 'r46',
-    (92, 'DIFERENTE'): 'r55',
-    (92, 'DIV'): 'r55',
-    (92, 'FECHA_P'): 'r55',
-    (92, 'IGUAL'): 'r55',
-    (92, 'MAIOR'): 'r55',
-    (92, 'MAIOR_IGUAL'): 'r55',
-    (92, 'MENOR'): 'r55',
-    (92, 'MENOR_IGUAL'): 'r55',
-    (92, 'MULT'): 'r55',
-    (92, 'PV'): 'r55',
-    (92, 'SOMA'): 'r55',
-    (92, 'SUB'): 'r55',
-    (92, 'VIRG'): 'r55',
-    (93, 'DIFERENTE'): 'r42',
-    (93, 'FECHA_P'): 'r42',
-    (93, 'IGUAL'): 'r42',
-    (93, 'MAIOR'): 'r42',
-    (93, 'MAIOR_IGUAL'): 'r42',
-    (93, 'MENOR'): 'r42',
-    (93, 'MENOR_IGUAL'): 'r42',
-    (93, 'PV'): 'r42',
-    (93, 'VIRG'): 'r42',
-    (94, 'DIFERENTE'): 'r49',
-    (94, 'FECHA_P'): 'r49',
-    (94, 'IGUAL'): 'r49',
-    (94, 'MAIOR'): 'r49',
-    (94, 'MAIOR_IGUAL'): 'r49',
-    (94, 'MENOR'): 'r49',
-    (94, 'MENOR_IGUAL'): 'r49',
-    (94, 'PV'): 'r49',
-    (94, 'SOMA'): 'r49',
-    (94, 'SUB'): 'r49',
-    (94, 'VIRG'): 'r49',
-    (95, 'FECHA_C'): 's100',
-    (96, 'ECHO'): 'r19',
-    (96, 'IF'): 'r19',
-    (96, 'VAR'): 's7',
-    (96, 'WHILE'): 'r19',
-    (97, 'ECHO'): 'r25',
-    (97, 'FECHA_C'): 'r25',
-    (97, 'IF'): 'r25',
-    (97, 'PHP_CLOSE'): 'r25',
-    (97, 'VAR'): 'r25',
-    (97, 'WHILE'): 'r25',
-    (98, 'ABRE_C'): 's102',
-    (99, 'ABRE_C'): 's103',
-    (100, 'ECHO'): 'r31',
-    (100, 'FECHA_C'): 'r31',
-    (100, 'IF'): 'r31',
-    (100, 'PHP_CLOSE'): 'r31',
-    (100, 'VAR'): 'r31',
-    (100, 'WHILE'): 'r31',
-    (101, 'FECHA_C'): 's104',
-    (102, 'ECHO'): 's24',
-    (102, 'FECHA_C'): 'r24',
-    (102, 'IDENT'): 's112',
-    (102, 'IF'): 's25',
-    (102, 'VAR'): 's27',
-    (102, 'WHILE'): 's26',
-    (103, 'ECHO'): 's24',
-    (103, 'FECHA_C'): 'r24',
-    (103, 'IDENT'): 's112',
-    (103, 'IF'): 's25',
-    (103, 'VAR'): 's27',
-    (103, 'WHILE'): 's26',
-    (104, 'ECHO'): 'r11',
-    (104, 'FUNCTION'): 'r11',
-    (104, 'IF'): 'r11',
-    (104, 'VAR'): 'r11',
-    (104, 'WHILE'): 'r11',
-    (105, 'FECHA_C'): 's107',
-    (106, 'FECHA_C'): 's108',
-    (107, 'ECHO'): 'r32',
-    (107, 'ELSE'): 's50',
-    (107, 'FECHA_C'): 'r32',
-    (107, 'IF'): 'r32',
-    (107, 'PHP_CLOSE'): 'r32',
-    (107, 'VAR'): 'r32',
-    (107, 'WHILE'): 'r32',
-    (108, 'ECHO'): 'r27',
-    (108, 'FECHA_C'): 'r27',
-    (108, 'IF'): 'r27',
-    (108, 'PHP_CLOSE'): 'r27',
-    (108, 'VAR'): 'r27',
-    (108, 'WHILE'): 'r27',
-    (109, 'ECHO'): 'r26',
-    (109, 'FECHA_C'): 'r26',
-    (109, 'IF'): 'r26',
-    (109, 'PHP_CLOSE'): 'r26',
-    (109, 'VAR'): 'r26',
-    (109, 'WHILE'): 'r26',
-    (110, 'PV'): 's111',
-    (111, 'ECHO'): 'r25',
-    (111, 'FECHA_C'): 'r25',
-    (111, 'IF'): 'r25',
-    (111, 'PHP_CLOSE'): 'r25',
-    (111, 'VAR'): 'r25',
-    (111, 'WHILE'): 'r25',
-    (112, 'ABRE_P'): 's18',
-    (113, 'PV'): 's114',
-    (114, 'ECHO'): 'r62',
-    (114, 'FECHA_C'): 'r62',
-    (114, 'IDENT'): 'r62',
-    (114, 'IF'): 'r62',
-    (114, 'PHP_CLOSE'): 'r62',
-    (114, 'VAR'): 'r62',
-    (114, 'WHILE'): 'r62',
-}
-
-TABELA_GOTO = {
-    (0, 'programa'): 1,
-    (2, 'corpo'): 51,
-    (2, 'dc'): 3,
-    (2, 'dc_f'): 5,
-    (2, 'dc_v'): 4,
-    (3, 'comando'): 22,
-    (3, 'comandos'): 52,
-    (3, 'dc'): 6,
-    (3, 'dc_f'): 5,
-    (3, 'dc_v'): 4,
-    (3, 'mais_dc'): 53,
-    (4, 'dc'): 6,
-    (4, 'dc_f'): 5,
-    (4, 'dc_v'): 4,
-    (4, 'mais_dc'): 53,
-    (7, 'atribuicao_opcional'): 54,
-    (8, 'expressao'): 55,
-    (8, 'op_un'): 39,
-    (8, 'termo'): 37,
-    (11, 'lista_par'): 57,
-    (12, 'lista_par'): 57,
-    (13, 'mais_par'): 59,
-    (15, 'comando'): 22,
-    (15, 'comandos'): 61,
-    (16, 'dc_loc'): 17,
-    (16, 'dc_v'): 16,
-    (16, 'mais_dcloc'): 62,
-    (18, 'argumentos'): 63,
-    (18, 'expressao'): 20,
-    (18, 'op_un'): 39,
-    (18, 'termo'): 37,
-    (20, 'mais_ident'): 64,
-    (21, 'expressao'): 65,
-    (21, 'op_un'): 39,
-    (21, 'termo'): 37,
-    (22, 'comando'): 22,
-    (22, 'comandos'): 23,
-    (22, 'mais_comandos'): 66,
-    (27, 'lista_arg'): 29,
-    (27, 'restoIdent'): 70,
-    (28, 'expressao'): 71,
-    (28, 'op_un'): 39,
-    (28, 'termo'): 37,
-    (30, 'relacao'): 72,
-    (31, 'expressao'): 90,
-    (31, 'op_un'): 39,
-    (31, 'termo'): 37,
-    (32, 'expressao'): 90,
-    (32, 'op_un'): 39,
-    (32, 'termo'): 37,
-    (33, 'expressao'): 90,
-    (33, 'op_un'): 39,
-    (33, 'termo'): 37,
-    (34, 'expressao'): 90,
-    (34, 'op_un'): 39,
-    (34, 'termo'): 37,
-    (35, 'expressao'): 90,
-    (35, 'op_un'): 39,
-    (35, 'termo'): 37,
-    (36, 'expressao'): 90,
-    (36, 'op_un'): 39,
-    (36, 'termo'): 37,
-    (37, 'op_ad'): 44,
-    (37, 'outros_termos'): 73,
-    (39, 'fator'): 74,
-    (43, 'expressao'): 75,
-    (43, 'op_un'): 39,
-    (43, 'termo'): 37,
-    (44, 'op_un'): 39,
-    (44, 'termo'): 76,
-    (47, 'fator'): 77,
-    (56, 'parametros'): 81,
-    (60, 'mais_par'): 83,
-    (65, 'mais_ident'): 85,
-    (68, 'condicao'): 87,
-    (68, 'expressao'): 30,
-    (68, 'op_un'): 39,
-    (68, 'termo'): 37,
-    (69, 'condicao'): 88,
-    (69, 'expressao'): 30,
-    (69, 'op_un'): 39,
-    (69, 'termo'): 37,
-    (72, 'expressao'): 90,
-    (72, 'op_un'): 39,
-    (72, 'termo'): 37,
-    (74, 'mais_fatores'): 91,
-    (74, 'op_mul'): 47,
-    (76, 'op_ad'): 44,
-    (76, 'outros_termos'): 93,
-    (77, 'mais_fatores'): 94,
-    (77, 'op_mul'): 47,
-    (78, 'comando'): 22,
-    (78, 'comandos'): 95,
-    (96, 'corpo_f'): 101,
-    (96, 'dc_loc'): 15,
-    (96, 'dc_v'): 16,
-    (102, 'comando'): 22,
-    (102, 'comandos'): 105,
-    (103, 'comando'): 22,
-    (103, 'comandos'): 106,
-    (107, 'pfalsa'): 109,
-    (112, 'lista_arg'): 113,
-}
-
-REGRAS_GRAMATICA = {
-    'r0': ("S'", 1),
-    'r1': ('programa', 3),
-    'r2': ('corpo', 2),
-    'r3': ('dc', 2),
-    'r4': ('dc', 1),
-    'r5': ('dc', 0),
-    'r6': ('mais_dc', 1),
-    'r7': ('mais_dc', 0),
-    'r8': ('dc_v', 2),
-    'r9': ('atribuicao_opcional', 3),
-    'r10': ('atribuicao_opcional', 1),
-    'r11': ('dc_f', 6),
-    'r12': ('parametros', 3),
-    'r13': ('parametros', 2),
-    'r14': ('lista_par', 2),
-    'r15': ('mais_par', 3),
-    'r16': ('mais_par', 0),
-    'r17': ('corpo_f', 2),
-    'r18': ('dc_loc', 2),
-    'r19': ('dc_loc', 0),
-    'r20': ('mais_dcloc', 1),
-    'r21': ('mais_dcloc', 0),
-    'r22': ('comandos', 2),
-    'r23': ('mais_comandos', 1),
-    'r24': ('mais_comandos', 0),
-    'r25': ('comando', 5),
-    'r26': ('comando', 8),
-    'r27': ('comando', 7),
-    'r28': ('comando', 3),
-    'r29': ('restoIdent', 2),
-    'r30': ('restoIdent', 1),
-    'r31': ('pfalsa', 4),
-    'r32': ('pfalsa', 0),
-    'r33': ('condicao', 3),
-    'r34': ('relacao', 1),
-    'r35': ('relacao', 1),
-    'r36': ('relacao', 1),
-    'r37': ('relacao', 1),
-    'r38': ('relacao', 1),
-    'r39': ('relacao', 1),
-    'r40': ('expressao', 6),
-    'r41': ('expressao', 2),
-    'r42': ('outros_termos', 3),
-    'r43': ('outros_termos', 0),
-    'r44': ('op_ad', 1),
-    'r45': ('op_ad', 1),
-    'r46': ('termo', 3),
-    'r47': ('op_un', 1),
-    'r48': ('op_un', 0),
-    'r49': ('mais_fatores', 3),
-    'r50': ('mais_fatores', 0),
-    'r51': ('op_mul', 1),
-    'r52': ('op_mul', 1),
-    'r53': ('fator', 1),
-    'r54': ('fator', 1),
-    'r55': ('fator', 3),
-    'r56': ('lista_arg', 3),
-    'r57': ('lista_arg', 2),
-    'r58': ('argumentos', 2),
-    'r59': ('mais_ident', 3),
-    'r60': ('mais_ident', 0),
-    'r61': ('expressao', 1),
-    'r62': ('comando', 3),
-}
+TABELA_ACTION = {
+    (0, 'PHP_OPEN'): 's2',
+    (1, '$'): 'acc',
+    (2, 'ECHO'): 'r5',
+    (2, 'FUNCTION'): 's10',
+    (2, 'IF'): 'r5',
+    (2, 'VAR'): 's7',
+    (2, 'WHILE'): 'r5',
+    (3, 'ECHO'): 's24',
+    (3, 'FECHA_C'): 'r24',
+    (3, 'FUNCTION'): 's10',
+    (3, 'IDENT'): 's112',
+    (3, 'IF'): 's25',
+    (3, 'PHP_CLOSE'): 'r24',
+    (3, 'VAR'): 's27',
+    (3, 'WHILE'): 's26',
+    (4, 'ECHO'): 'r5',
+    (4, 'FUNCTION'): 's10',
+    (4, 'IF'): 'r5',
+    (4, 'VAR'): 's7',
+    (4, 'WHILE'): 'r5',
+    (5, 'ECHO'): 'r4',
+    (5, 'FUNCTION'): 'r4',
+    (5, 'IF'): 'r4',
+    (5, 'VAR'): 'r4',
+    (5, 'WHILE'): 'r4',
+    (6, 'ECHO'): 'r6',
+    (6, 'FUNCTION'): 'r6',
+    (6, 'IF'): 'r6',
+    (6, 'VAR'): 'r6',
+    (6, 'WHILE'): 'r6',
+    (7, 'ATRIB'): 's8',
+    (7, 'PV'): 's9',
+    (8, 'ABRE_P'): 'r48',
+    (8, 'FLOATVAL'): 's38',
+    (8, 'NUMERO_REAL'): 'r48',
+    (8, 'SUB'): 's40',
+    (8, 'VAR'): 'r48',
+    (9, 'ECHO'): 'r10',
+    (9, 'FUNCTION'): 'r10',
+    (9, 'IF'): 'r10',
+    (9, 'VAR'): 'r10',
+    (9, 'WHILE'): 'r10',
+    (10, 'IDENT'): 's56',
+    (11, 'VAR'): 's13',
+    (12, 'FECHA_P'): 's58',
+    (12, 'VAR'): 's13',
+    (13, 'FECHA_P'): 'r16',
+    (13, 'VIRG'): 's14',
+    (14, 'VAR'): 's60',
+    (15, 'ECHO'): 's24',
+    (15, 'FECHA_C'): 'r24',
+    (15, 'IDENT'): 's112',
+    (15, 'IF'): 's25',
+    (15, 'VAR'): 's27',
+    (15, 'WHILE'): 's26',
+    (16, 'ECHO'): 'r19',
+    (16, 'IF'): 'r19',
+    (16, 'VAR'): 's7',
+    (16, 'WHILE'): 'r19',
+    (17, 'ECHO'): 'r20',
+    (17, 'IF'): 'r20',
+    (17, 'VAR'): 'r20',
+    (17, 'WHILE'): 'r20',
+    (18, 'ABRE_P'): 'r48',
+    (18, 'FLOATVAL'): 's38',
+    (18, 'NUMERO_REAL'): 'r48',
+    (18, 'SUB'): 's40',
+    (18, 'VAR'): 'r48',
+    (19, 'FECHA_P'): 's58',
+    (20, 'FECHA_P'): 'r60',
+    (20, 'VIRG'): 's21',
+    (21, 'ABRE_P'): 'r48',
+    (21, 'FLOATVAL'): 's38',
+    (21, 'NUMERO_REAL'): 'r48',
+    (21, 'SUB'): 's40',
+    (21, 'VAR'): 'r48',
+    (22, 'ECHO'): 's24',
+    (22, 'FECHA_C'): 'r24',
+    (22, 'IDENT'): 's112',
+    (22, 'IF'): 's25',
+    (22, 'PHP_CLOSE'): 'r24',
+    (22, 'VAR'): 's27',
+    (22, 'WHILE'): 's26',
+    (23, 'FECHA_C'): 'r23',
+    (23, 'PHP_CLOSE'): 'r23',
+    (24, 'VAR'): 's67',
+    (25, 'ABRE_P'): 's68',
+    (26, 'ABRE_P'): 's69',
+    (27, 'ABRE_P'): 's12',
+    (27, 'ATRIB'): 's28',
+    (28, 'ABRE_P'): 'r48',
+    (28, 'FLOATVAL'): 's38',
+    (28, 'NUMERO_REAL'): 'r48',
+    (28, 'SUB'): 's40',
+    (28, 'VAR'): 'r48',
+    (29, 'PV'): 'r30',
+    (30, 'DIFERENTE'): 's32',
+    (30, 'IGUAL'): 's31',
+    (30, 'MAIOR'): 's35',
+    (30, 'MAIOR_IGUAL'): 's33',
+    (30, 'MENOR'): 's36',
+    (30, 'MENOR_IGUAL'): 's34',
+    (31, 'ABRE_P'): 'r48',
+    (31, 'FLOATVAL'): 's38',
+    (31, 'NUMERO_REAL'): 'r48',
+    (31, 'SUB'): 's40',
+    (31, 'VAR'): 'r48',
+    (32, 'ABRE_P'): 'r48',
+    (32, 'FLOATVAL'): 's38',
+    (32, 'NUMERO_REAL'): 'r48',
+    (32, 'SUB'): 's40',
+    (32, 'VAR'): 'r48',
+    (33, 'ABRE_P'): 'r48',
+    (33, 'FLOATVAL'): 's38',
+    (33, 'NUMERO_REAL'): 'r48',
+    (33, 'SUB'): 's40',
+    (33, 'VAR'): 'r48',
+    (34, 'ABRE_P'): 'r48',
+    (34, 'FLOATVAL'): 's38',
+    (34, 'NUMERO_REAL'): 'r48',
+    (34, 'SUB'): 's40',
+    (34, 'VAR'): 'r48',
+    (35, 'ABRE_P'): 'r48',
+    (35, 'FLOATVAL'): 's38',
+    (35, 'NUMERO_REAL'): 'r48',
+    (35, 'SUB'): 's40',
+    (35, 'VAR'): 'r48',
+    (36, 'ABRE_P'): 'r48',
+    (36, 'FLOATVAL'): 's38',
+    (36, 'NUMERO_REAL'): 'r48',
+    (36, 'SUB'): 's40',
+    (36, 'VAR'): 'r48',
+    (37, 'DIFERENTE'): 'r43',
+    (37, 'FECHA_P'): 'r43',
+    (37, 'IGUAL'): 'r43',
+    (37, 'MAIOR'): 'r43',
+    (37, 'MAIOR_IGUAL'): 'r43',
+    (37, 'MENOR'): 'r43',
+    (37, 'MENOR_IGUAL'): 'r43',
+    (37, 'PV'): 'r43',
+    (37, 'SOMA'): 's45',
+    (37, 'SUB'): 's46',
+    (37, 'VIRG'): 'r43',
+    (38, 'DIFERENTE'): 'r61',
+    (38, 'FECHA_P'): 'r61',
+    (38, 'IGUAL'): 'r61',
+    (38, 'MAIOR'): 'r61',
+    (38, 'MAIOR_IGUAL'): 'r61',
+    (38, 'MENOR'): 'r61',
+    (38, 'MENOR_IGUAL'): 'r61',
+    (38, 'PV'): 'r61',
+    (38, 'VIRG'): 'r61',
+    (39, 'ABRE_P'): 's43',
+    (39, 'NUMERO_REAL'): 's42',
+    (39, 'VAR'): 's41',
+    (40, 'ABRE_P'): 'r47',
+    (40, 'NUMERO_REAL'): 'r47',
+    (40, 'VAR'): 'r47',
+    (41, 'DIFERENTE'): 'r53',
+    (41, 'DIV'): 'r53',
+    (41, 'FECHA_P'): 'r53',
+    (41, 'IGUAL'): 'r53',
+    (41, 'MAIOR'): 'r53',
+    (41, 'MAIOR_IGUAL'): 'r53',
+    (41, 'MENOR'): 'r53',
+    (41, 'MENOR_IGUAL'): 'r53',
+    (41, 'MULT'): 'r53',
+    (41, 'PV'): 'r53',
+    (41, 'SOMA'): 'r53',
+    (41, 'SUB'): 'r53',
+    (41, 'VIRG'): 'r53',
+    (42, 'DIFERENTE'): 'r54',
+    (42, 'DIV'): 'r54',
+    (42, 'FECHA_P'): 'r54',
+    (42, 'IGUAL'): 'r54',
+    (42, 'MAIOR'): 'r54',
+    (42, 'MAIOR_IGUAL'): 'r54',
+    (42, 'MENOR'): 'r54',
+    (42, 'MENOR_IGUAL'): 'r54',
+    (42, 'MULT'): 'r54',
+    (42, 'PV'): 'r54',
+    (42, 'SOMA'): 'r54',
+    (42, 'SUB'): 'r54',
+    (42, 'VIRG'): 'r54',
+    (43, 'ABRE_P'): 'r48',
+    (43, 'FLOATVAL'): 's38',
+    (43, 'NUMERO_REAL'): 'r48',
+    (43, 'SUB'): 's40',
+    (43, 'VAR'): 'r48',
+    (44, 'ABRE_P'): 'r48',
+    (44, 'NUMERO_REAL'): 'r48',
+    (44, 'SUB'): 's40',
+    (44, 'VAR'): 'r48',
+    (45, 'ABRE_P'): 'r44',
+    (45, 'NUMERO_REAL'): 'r44',
+    (45, 'SUB'): 'r44',
+    (45, 'VAR'): 'r44',
+    (46, 'ABRE_P'): 'r45',
+    (46, 'NUMERO_REAL'): 'r45',
+    (46, 'SUB'): 'r45',
+    (46, 'VAR'): 'r45',
+    (47, 'ABRE_P'): 's43',
+    (47, 'NUMERO_REAL'): 's42',
+    (47, 'VAR'): 's41',
+    (48, 'ABRE_P'): 'r51',
+    (48, 'NUMERO_REAL'): 'r51',
+    (48, 'VAR'): 'r51',
+    (49, 'ABRE_P'): 'r52',
+    (49, 'NUMERO_REAL'): 'r52',
+    (49, 'VAR'): 'r52',
+    (50, 'ABRE_C'): 's78',
+    (51, 'PHP_CLOSE'): 's79',
+    (52, 'PHP_CLOSE'): 'r2',
+    (53, 'ECHO'): 'r3',
+    (53, 'FUNCTION'): 'r3',
+    (53, 'IF'): 'r3',
+    (53, 'VAR'): 'r3',
+    (53, 'WHILE'): 'r3',
+    (54, 'ECHO'): 'r8',
+    (54, 'FUNCTION'): 'r8',
+    (54, 'IF'): 'r8',
+    (54, 'VAR'): 'r8',
+    (54, 'WHILE'): 'r8',
+    (55, 'PV'): 's80',
+    (56, 'ABRE_P'): 's12',
+    (57, 'FECHA_P'): 's82',
+    (58, 'ABRE_C'): 'r13',
+    (59, 'FECHA_P'): 'r14',
+    (60, 'FECHA_P'): 'r16',
+    (60, 'VIRG'): 's14',
+    (61, 'FECHA_C'): 'r17',
+    (62, 'ECHO'): 'r18',
+    (62, 'IF'): 'r18',
+    (62, 'VAR'): 'r18',
+    (62, 'WHILE'): 'r18',
+    (63, 'FECHA_P'): 's84',
+    (64, 'FECHA_P'): 'r58',
+    (65, 'FECHA_P'): 'r60',
+    (65, 'VIRG'): 's21',
+    (66, 'FECHA_C'): 'r22',
+    (66, 'PHP_CLOSE'): 'r22',
+    (67, 'PONTO'): 's86',
+    (68, 'ABRE_P'): 'r48',
+    (68, 'FLOATVAL'): 's38',
+    (68, 'NUMERO_REAL'): 'r48',
+    (68, 'SUB'): 's40',
+    (68, 'VAR'): 'r48',
+    (69, 'ABRE_P'): 'r48',
+    (69, 'FLOATVAL'): 's38',
+    (69, 'NUMERO_REAL'): 'r48',
+    (69, 'SUB'): 's40',
+    (69, 'VAR'): 'r48',
+    (70, 'PV'): 's89',
+    (71, 'PV'): 'r29',
+    (72, 'ABRE_P'): 'r48',
+    (72, 'FLOATVAL'): 's38',
+    (72, 'NUMERO_REAL'): 'r48',
+    (72, 'SUB'): 's40',
+    (72, 'VAR'): 'r48',
+    (73, 'DIFERENTE'): 'r41',
+    (73, 'FECHA_P'): 'r41',
+    (73, 'IGUAL'): 'r41',
+    (73, 'MAIOR'): 'r41',
+    (73, 'MAIOR_IGUAL'): 'r41',
+    (73, 'MENOR'): 'r41',
+    (73, 'MENOR_IGUAL'): 'r41',
+    (73, 'PV'): 'r41',
+    (73, 'VIRG'): 'r41',
+    (74, 'DIFERENTE'): 'r50',
+    (74, 'DIV'): 's49',
+    (74, 'FECHA_P'): 'r50',
+    (74, 'IGUAL'): 'r50',
+    (74, 'MAIOR'): 'r50',
+    (74, 'MAIOR_IGUAL'): 'r50',
+    (74, 'MENOR'): 'r50',
+    (74, 'MENOR_IGUAL'): 'r50',
+    (74, 'MULT'): 's48',
+    (74, 'PV'): 'r50',
+    (74, 'SOMA'): 'r50',
+    (74, 'SUB'): 'r50',
+    (74, 'VIRG'): 'r50',
+    (75, 'FECHA_P'): 's92',
+    (76, 'DIFERENTE'): 'r43',
+    (76, 'FECHA_P'): 'r43',
+    (76, 'IGUAL'): 'r43',
+    (76, 'MAIOR'): 'r43',
+    (76, 'MAIOR_IGUAL'): 'r43',
+    (76, 'MENOR'): 'r43',
+    (76, 'MENOR_IGUAL'): 'r43',
+    (76, 'PV'): 'r43',
+    (76, 'SOMA'): 's45',
+    (76, 'SUB'): 's46',
+    (76, 'VIRG'): 'r43',
+    (77, 'DIFERENTE'): 'r50',
+    (77, 'DIV'): 's49',
+    (77, 'FECHA_P'): 'r50',
+    (77, 'IGUAL'): 'r50',
+    (77, 'MAIOR'): 'r50',
+    (77, 'MAIOR_IGUAL'): 'r50',
+    (77, 'MENOR'): 'r50',
+    (77, 'MENOR_IGUAL'): 'r50',
+    (77, 'MULT'): 's48',
+    (77, 'PV'): 'r50',
+    (77, 'SOMA'): 'r50',
+    (77, 'SUB'): 'r50',
+    (77, 'VIRG'): 'r50',
+    (78, 'ECHO'): 's24',
+    (78, 'FECHA_C'): 'r24',
+    (78, 'IDENT'): 's112',
+    (78, 'IF'): 's25',
+    (78, 'VAR'): 's27',
+    (78, 'WHILE'): 's26',
+    (79, '$'): 'r1',
+    (80, 'ECHO'): 'r9',
+    (80, 'FUNCTION'): 'r9',
+    (80, 'IF'): 'r9',
+    (80, 'VAR'): 'r9',
+    (80, 'WHILE'): 'r9',
+    (81, 'ABRE_C'): 's96',
+    (82, 'ABRE_C'): 'r12',
+    (83, 'FECHA_P'): 'r15',
+    (84, 'PV'): 'r56',
+    (85, 'FECHA_P'): 'r59',
+    (86, 'PHP_EOL'): 's110',
+    (87, 'FECHA_P'): 's98',
+    (88, 'FECHA_P'): 's99',
+    (89, 'ECHO'): 'r28',
+    (89, 'FECHA_C'): 'r28',
+    (89, 'IDENT'): 'r28',
+    (89, 'IF'): 'r28',
+    (89, 'PHP_CLOSE'): 'r28',
+    (89, 'VAR'): 'r28',
+    (89, 'WHILE'): 'r28',
+    (90, 'FECHA_P'): 'r33',
+    (91, 'DIFERENTE'): 'r46',
+    (91, 'FECHA_P'): 'r46',
+    (91, 'IGUAL'): 'r46',
+    (91, 'MAIOR'): 'r46',
+    (91, 'MAIOR_IGUAL'): 'r46',
+    (91, 'MENOR'): 'r46',
+    (91, 'MENOR_IGUAL'): 'r46',
+    (91, 'PV'): 'r46',
+    (91, 'SOMA'): 'r46',
+    (91, 'SUB'): 'r46',
+    (91, 'VIRG'): 'r46',
+    (92, 'DIFERENTE'): 'r55',
+    (92, 'DIV'): 'r55',
+    (92, 'FECHA_P'): 'r55',
+    (92, 'IGUAL'): 'r55',
+    (92, 'MAIOR'): 'r55',
+    (92, 'MAIOR_IGUAL'): 'r55',
+    (92, 'MENOR'): 'r55',
+    (92, 'MENOR_IGUAL'): 'r55',
+    (92, 'MULT'): 'r55',
+    (92, 'PV'): 'r55',
+    (92, 'SOMA'): 'r55',
+    (92, 'SUB'): 'r55',
+    (92, 'VIRG'): 'r55',
+    (93, 'DIFERENTE'): 'r42',
+    (93, 'FECHA_P'): 'r42',
+    (93, 'IGUAL'): 'r42',
+    (93, 'MAIOR'): 'r42',
+    (93, 'MAIOR_IGUAL'): 'r42',
+    (93, 'MENOR'): 'r42',
+    (93, 'MENOR_IGUAL'): 'r42',
+    (93, 'PV'): 'r42',
+    (93, 'VIRG'): 'r42',
+    (94, 'DIFERENTE'): 'r49',
+    (94, 'FECHA_P'): 'r49',
+    (94, 'IGUAL'): 'r49',
+    (94, 'MAIOR'): 'r49',
+    (94, 'MAIOR_IGUAL'): 'r49',
+    (94, 'MENOR'): 'r49',
+    (94, 'MENOR_IGUAL'): 'r49',
+    (94, 'PV'): 'r49',
+    (94, 'SOMA'): 'r49',
+    (94, 'SUB'): 'r49',
+    (94, 'VIRG'): 'r49',
+    (95, 'FECHA_C'): 's100',
+    (96, 'ECHO'): 'r19',
+    (96, 'IF'): 'r19',
+    (96, 'VAR'): 's7',
+    (96, 'WHILE'): 'r19',
+    (97, 'ECHO'): 'r25',
+    (97, 'FECHA_C'): 'r25',
+    (97, 'IF'): 'r25',
+    (97, 'PHP_CLOSE'): 'r25',
+    (97, 'VAR'): 'r25',
+    (97, 'WHILE'): 'r25',
+    (98, 'ABRE_C'): 's102',
+    (99, 'ABRE_C'): 's103',
+    (100, 'ECHO'): 'r31',
+    (100, 'FECHA_C'): 'r31',
+    (100, 'IF'): 'r31',
+    (100, 'PHP_CLOSE'): 'r31',
+    (100, 'VAR'): 'r31',
+    (100, 'WHILE'): 'r31',
+    (101, 'FECHA_C'): 's104',
+    (102, 'ECHO'): 's24',
+    (102, 'FECHA_C'): 'r24',
+    (102, 'IDENT'): 's112',
+    (102, 'IF'): 's25',
+    (102, 'VAR'): 's27',
+    (102, 'WHILE'): 's26',
+    (103, 'ECHO'): 's24',
+    (103, 'FECHA_C'): 'r24',
+    (103, 'IDENT'): 's112',
+    (103, 'IF'): 's25',
+    (103, 'VAR'): 's27',
+    (103, 'WHILE'): 's26',
+    (104, 'ECHO'): 'r11',
+    (104, 'FUNCTION'): 'r11',
+    (104, 'IF'): 'r11',
+    (104, 'VAR'): 'r11',
+    (104, 'WHILE'): 'r11',
+    (105, 'FECHA_C'): 's107',
+    (106, 'FECHA_C'): 's108',
+    (107, 'ECHO'): 'r32',
+    (107, 'ELSE'): 's50',
+    (107, 'FECHA_C'): 'r32',
+    (107, 'IF'): 'r32',
+    (107, 'PHP_CLOSE'): 'r32',
+    (107, 'VAR'): 'r32',
+    (107, 'WHILE'): 'r32',
+    (108, 'ECHO'): 'r27',
+    (108, 'FECHA_C'): 'r27',
+    (108, 'IF'): 'r27',
+    (108, 'PHP_CLOSE'): 'r27',
+    (108, 'VAR'): 'r27',
+    (108, 'WHILE'): 'r27',
+    (109, 'ECHO'): 'r26',
+    (109, 'FECHA_C'): 'r26',
+    (109, 'IF'): 'r26',
+    (109, 'PHP_CLOSE'): 'r26',
+    (109, 'VAR'): 'r26',
+    (109, 'WHILE'): 'r26',
+    (110, 'PV'): 's111',
+    (111, 'ECHO'): 'r25',
+    (111, 'FECHA_C'): 'r25',
+    (111, 'IF'): 'r25',
+    (111, 'PHP_CLOSE'): 'r25',
+    (111, 'VAR'): 'r25',
+    (111, 'WHILE'): 'r25',
+    (112, 'ABRE_P'): 's18',
+    (113, 'PV'): 's114',
+    (114, 'ECHO'): 'r62',
+    (114, 'FECHA_C'): 'r62',
+    (114, 'IDENT'): 'r62',
+    (114, 'IF'): 'r62',
+    (114, 'PHP_CLOSE'): 'r62',
+    (114, 'VAR'): 'r62',
+    (114, 'WHILE'): 'r62',
+}
+
+TABELA_GOTO = {
+    (0, 'programa'): 1,
+    (2, 'corpo'): 51,
+    (2, 'dc'): 3,
+    (2, 'dc_f'): 5,
+    (2, 'dc_v'): 4,
+    (3, 'comando'): 22,
+    (3, 'comandos'): 52,
+    (3, 'dc'): 6,
+    (3, 'dc_f'): 5,
+    (3, 'dc_v'): 4,
+    (3, 'mais_dc'): 53,
+    (4, 'dc'): 6,
+    (4, 'dc_f'): 5,
+    (4, 'dc_v'): 4,
+    (4, 'mais_dc'): 53,
+    (7, 'atribuicao_opcional'): 54,
+    (8, 'expressao'): 55,
+    (8, 'op_un'): 39,
+    (8, 'termo'): 37,
+    (11, 'lista_par'): 57,
+    (12, 'lista_par'): 57,
+    (13, 'mais_par'): 59,
+    (15, 'comando'): 22,
+    (15, 'comandos'): 61,
+    (16, 'dc_loc'): 17,
+    (16, 'dc_v'): 16,
+    (16, 'mais_dcloc'): 62,
+    (18, 'argumentos'): 63,
+    (18, 'expressao'): 20,
+    (18, 'op_un'): 39,
+    (18, 'termo'): 37,
+    (20, 'mais_ident'): 64,
+    (21, 'expressao'): 65,
+    (21, 'op_un'): 39,
+    (21, 'termo'): 37,
+    (22, 'comando'): 22,
+    (22, 'comandos'): 23,
+    (22, 'mais_comandos'): 66,
+    (27, 'lista_arg'): 29,
+    (27, 'restoIdent'): 70,
+    (28, 'expressao'): 71,
+    (28, 'op_un'): 39,
+    (28, 'termo'): 37,
+    (30, 'relacao'): 72,
+    (31, 'expressao'): 90,
+    (31, 'op_un'): 39,
+    (31, 'termo'): 37,
+    (32, 'expressao'): 90,
+    (32, 'op_un'): 39,
+    (32, 'termo'): 37,
+    (33, 'expressao'): 90,
+    (33, 'op_un'): 39,
+    (33, 'termo'): 37,
+    (34, 'expressao'): 90,
+    (34, 'op_un'): 39,
+    (34, 'termo'): 37,
+    (35, 'expressao'): 90,
+    (35, 'op_un'): 39,
+    (35, 'termo'): 37,
+    (36, 'expressao'): 90,
+    (36, 'op_un'): 39,
+    (36, 'termo'): 37,
+    (37, 'op_ad'): 44,
+    (37, 'outros_termos'): 73,
+    (39, 'fator'): 74,
+    (43, 'expressao'): 75,
+    (43, 'op_un'): 39,
+    (43, 'termo'): 37,
+    (44, 'op_un'): 39,
+    (44, 'termo'): 76,
+    (47, 'fator'): 77,
+    (56, 'parametros'): 81,
+    (60, 'mais_par'): 83,
+    (65, 'mais_ident'): 85,
+    (68, 'condicao'): 87,
+    (68, 'expressao'): 30,
+    (68, 'op_un'): 39,
+    (68, 'termo'): 37,
+    (69, 'condicao'): 88,
+    (69, 'expressao'): 30,
+    (69, 'op_un'): 39,
+    (69, 'termo'): 37,
+    (72, 'expressao'): 90,
+    (72, 'op_un'): 39,
+    (72, 'termo'): 37,
+    (74, 'mais_fatores'): 91,
+    (74, 'op_mul'): 47,
+    (76, 'op_ad'): 44,
+    (76, 'outros_termos'): 93,
+    (77, 'mais_fatores'): 94,
+    (77, 'op_mul'): 47,
+    (78, 'comando'): 22,
+    (78, 'comandos'): 95,
+    (96, 'corpo_f'): 101,
+    (96, 'dc_loc'): 15,
+    (96, 'dc_v'): 16,
+    (102, 'comando'): 22,
+    (102, 'comandos'): 105,
+    (103, 'comando'): 22,
+    (103, 'comandos'): 106,
+    (107, 'pfalsa'): 109,
+    (112, 'lista_arg'): 113,
+}
+
+REGRAS_GRAMATICA = {
+    'r0': ("S'", 1),
+    'r1': ('programa', 3),
+    'r2': ('corpo', 2),
+    'r3': ('dc', 2),
+    'r4': ('dc', 1),
+    'r5': ('dc', 0),
+    'r6': ('mais_dc', 1),
+    'r7': ('mais_dc', 0),
+    'r8': ('dc_v', 2),
+    'r9': ('atribuicao_opcional', 3),
+    'r10': ('atribuicao_opcional', 1),
+    'r11': ('dc_f', 6),
+    'r12': ('parametros', 3),
+    'r13': ('parametros', 2),
+    'r14': ('lista_par', 2),
+    'r15': ('mais_par', 3),
+    'r16': ('mais_par', 0),
+    'r17': ('corpo_f', 2),
+    'r18': ('dc_loc', 2),
+    'r19': ('dc_loc', 0),
+    'r20': ('mais_dcloc', 1),
+    'r21': ('mais_dcloc', 0),
+    'r22': ('comandos', 2),
+    'r23': ('mais_comandos', 1),
+    'r24': ('mais_comandos', 0),
+    'r25': ('comando', 5),
+    'r26': ('comando', 8),
+    'r27': ('comando', 7),
+    'r28': ('comando', 3),
+    'r29': ('restoIdent', 2),
+    'r30': ('restoIdent', 1),
+    'r31': ('pfalsa', 4),
+    'r32': ('pfalsa', 0),
+    'r33': ('condicao', 3),
+    'r34': ('relacao', 1),
+    'r35': ('relacao', 1),
+    'r36': ('relacao', 1),
+    'r37': ('relacao', 1),
+    'r38': ('relacao', 1),
+    'r39': ('relacao', 1),
+    'r40': ('expressao', 6),
+    'r41': ('expressao', 2),
+    'r42': ('outros_termos', 3),
+    'r43': ('outros_termos', 0),
+    'r44': ('op_ad', 1),
+    'r45': ('op_ad', 1),
+    'r46': ('termo', 3),
+    'r47': ('op_un', 1),
+    'r48': ('op_un', 0),
+    'r49': ('mais_fatores', 3),
+    'r50': ('mais_fatores', 0),
+    'r51': ('op_mul', 1),
+    'r52': ('op_mul', 1),
+    'r53': ('fator', 1),
+    'r54': ('fator', 1),
+    'r55': ('fator', 3),
+    'r56': ('lista_arg', 3),
+    'r57': ('lista_arg', 2),
+    'r58': ('argumentos', 2),
+    'r59': ('mais_ident', 3),
+    'r60': ('mais_ident', 0),
+    'r61': ('expressao', 1),
+    'r62': ('comando', 3),
+}
@@ -0,0 +1,23 @@
+import os
+import sys
+
+import pytest
+
+# Os módulos do compilador ficam na raiz do repositório
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+
+@pytest.fixture
+def run_main(monkeypatch):
+    """Executa main.py com os argumentos dados e devolve o código de saída"""
+    import main
+
+    def run(*argv):
+        monkeypatch.setattr(sys, 'argv', ['main.py', *map(str, argv)])
+        with pytest.raises(SystemExit) as exit_info:
+            main.main()
+        return exit_info.value.code
+
+    return run
@@ -0,0 +1,57 @@
+import pytest
+
+from closure_compiler import compile_ast
+from farm import input_feeder
+from lexer import Lexer
+from parser import Parser
+from pipeline import compile_source
+from register_vm import RegisterVirtualMachine
+from semantic_analyzer import SemanticAnalyzer
+from vm import VirtualMachine, parse_program
+
+
+def run_stack(code, inputs=()):
+    outputs = []
+    vm = VirtualMachine(input_func=input_feeder(inputs), output_func=outputs.append,
+                        verbose=False)
+    vm.instructions = parse_program(compile_source(code, 'pilha').instructions)
+    vm.execute()
+    return outputs
+
+
+def run_registers(code, inputs=()):
+    outputs = []
+    vm = RegisterVirtualMachine(input_func=input_feeder(inputs), output_func=outputs.append,
+                                verbose=False)
+    vm.load_instructions(parse_program(compile_source(code, 'registradores').instructions))
+    vm.execute()
+    return outputs
+
+
+def run_closures(code, inputs=()):
+    ast = Parser(Lexer(code).tokenize()).parse()
+    SemanticAnalyzer().analyze(ast)
+    outputs = []
+    compile_ast(ast).run(input_feeder(inputs), outputs.append)
+    return outputs
+
+
+PROGRAMS = {
+    'menos_unario': ("<?php\n$a = 5;\n$d = -$a;\necho $d;\n$e = -($a * 2);\necho $e;\n?>\n", ()),
+    'menos_unario_leitura': ("<?php\n$a = floatval(readline());\necho -$a;\n?>\n", ('2.5',)),
+    'laco': ("<?php\n$i = 1;\nwhile ($i <= 4) {\n    echo $i * 3;\n    $i = $i + 1;\n}\n?>\n", ()),
+    'funcao': ("<?php\nfunction f($x, $y) {\n    $z = $x * $y;\n    echo $z;\n}\n"
+               "$a = 3;\nf($a, 4);\n?>\n", ()),
+}
+
+
+@pytest.mark.parametrize('name', sorted(PROGRAMS))
+def test_backends_agree(name):
+    code, inputs = PROGRAMS[name]
+    expected = run_stack(code, inputs)
+    assert run_registers(code, inputs) == expected
+    assert run_closures(code, inputs) == expected
+
+
+def test_unary_minus_on_stack_machine():
+    assert run_stack(PROGRAMS['menos_unario'][0]) == [-5.0, -10.0]
@@ -0,0 +1,56 @@
+import pytest
+
+from batch import compile_batch, compile_one
+from test_linker import LIBRARY, MAIN
+
+
+ENDLESS = """<?php
+$i = 1;
+while ($i > 0) {
+    $i = $i + 1;
+}
+?>
+"""
+
+
+def test_batch_execute_fails_on_timeout(tmp_path):
+    endless = tmp_path / 'sem_fim.php'
+    endless.write_text(ENDLESS, encoding='utf-8')
+    ok = tmp_path / 'ok.php'
+    ok.write_text("<?php\necho 7;\n?>\n", encoding='utf-8')
+
+    for backend in ('pilha', 'registradores'):
+        results = compile_batch([str(endless), str(ok)], backend, str(tmp_path / backend),
+                                execute=True, workers=1, budget=3000)
+        assert results[0].failed and results[0].run.timed_out
+        assert not results[1].failed and results[1].run.outputs == [7.0]
+
+
+def test_batch_without_execute_has_no_run(tmp_path):
+    source = tmp_path / 'sem_fim.php'
+    source.write_text(ENDLESS, encoding='utf-8')
+    result = compile_one(str(source), output=str(tmp_path / 'sem_fim.asm'))
+    assert result.run is None and not result.failed
+
+
+@pytest.mark.parametrize('backend', ['pilha', 'registradores'])
+def test_batch_links_included_units(tmp_path, backend):
+    (tmp_path / 'biblioteca.php').write_text(LIBRARY, encoding='utf-8')
+    (tmp_path / 'programa.php').write_text(MAIN.replace("floatval(readline())", "7"),
+                                           encoding='utf-8')
+    results = compile_batch([str(tmp_path / 'biblioteca.php'), str(tmp_path / 'programa.php')],
+                            backend, str(tmp_path / 'saida'), execute=True, workers=1)
+    assert all(result.ok for result in results), [result.diagnostics for result in results]
+    assert results[1].run.outputs == [14.0, 108.0, 100.0]
+
+
+def test_batch_cache_with_includes(tmp_path):
+    (tmp_path / 'biblioteca.php').write_text(LIBRARY, encoding='utf-8')
+    (tmp_path / 'programa.php').write_text(MAIN, encoding='utf-8')
+    source = str(tmp_path / 'programa.php')
+    cache_dir = str(tmp_path / 'cache')
+    first = compile_one(source, output=str(tmp_path / 'a.asm'), cache_dir=cache_dir)
+    second = compile_one(source, output=str(tmp_path / 'b.asm'), cache_dir=cache_dir)
+    assert first.ok and not first.cached
+    assert second.ok and second.cached
+    assert (tmp_path / 'a.asm').read_text() == (tmp_path / 'b.asm').read_text()
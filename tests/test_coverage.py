@@ -0,0 +1,66 @@
+import pytest
+
+from farm import input_feeder
+from pipeline import compile_source
+from vm import VirtualMachine, parse_program
+from vm_coverage import Coverage, CoverageError
+
+
+PROGRAM = ("<?php\n$n = floatval(readline());\nif ($n > 0) {\n    echo 1;\n} else {\n"
+           "    echo 2;\n}\n?>\n")
+
+
+def covered_run(instructions, value):
+    coverage = Coverage()
+    vm = VirtualMachine(input_func=input_feeder([value]), output_func=lambda value: None,
+                        verbose=False, coverage=coverage)
+    vm.instructions = instructions
+    vm.execute()
+    return coverage
+
+
+def test_coverage_round_trip_merges(tmp_path):
+    instructions = parse_program(compile_source(PROGRAM).instructions)
+    positive = covered_run(instructions, '5')
+    negative = covered_run(instructions, '-5')
+    assert positive.covered() < len(instructions)
+
+    path = tmp_path / 'programa.cov'
+    positive.save(path)
+    assert path.read_bytes()[:4] == b'LVMC'
+    expected = bytearray(a | b for a, b in zip(positive.bitmap, negative.bitmap))
+    negative.load_into(path)
+    assert negative.bitmap == expected
+    assert negative.covered() > positive.covered()
+
+
+def test_coverage_of_other_program_rejected(tmp_path):
+    path = tmp_path / 'programa.cov'
+    covered_run(parse_program(compile_source(PROGRAM).instructions), '1').save(path)
+    other = covered_run(parse_program(compile_source("<?php\necho 3;\n?>\n").instructions), '1')
+    with pytest.raises(CoverageError):
+        other.load_into(path)
+
+
+def test_coverage_accumulates_from_command_line(run_main, monkeypatch, tmp_path):
+    source = tmp_path / 'programa.php'
+    source.write_text(PROGRAM, encoding='utf-8')
+    path = tmp_path / 'programa.cov'
+    for value in ('5', '-5'):
+        monkeypatch.setattr('builtins.input', lambda prompt='', value=value: value)
+        assert run_main(source, '-q', '--cobertura', path) == 0
+
+    coverage = Coverage(parse_program(compile_source(PROGRAM).instructions))
+    coverage.load_into(path)
+    assert not coverage.uncovered_instructions()
+
+
+@pytest.mark.parametrize('extra', [
+    ['--perfil', 'r.txt'], ['--gravar-pgo', 'p.json'], ['--rastro', '8'],
+    ['--backend', 'registradores'],
+])
+def test_coverage_rejected_with_other_loops(run_main, capsys, tmp_path, extra):
+    source = tmp_path / 'programa.php'
+    source.write_text(PROGRAM, encoding='utf-8')
+    assert run_main(source, '--cobertura', tmp_path / 'c.cov', *extra) == 2
+    assert not (tmp_path / 'c.cov').exists()
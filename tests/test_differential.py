@@ -0,0 +1,76 @@
+import itertools
+
+import pytest
+
+from bench_vm import ENGINES, INPUTS, KERNELS, new_vm, prepare
+from closure_compiler import compile_ast
+from lexer import Lexer
+from parser import Parser
+from pipeline import compile_source
+from program_generator import generate_program
+from register_vm import RegisterVirtualMachine
+from semantic_analyzer import SemanticAnalyzer
+from vm import VirtualMachine, parse_program
+
+
+SEEDS = range(16)
+BUDGET = 100_000
+
+
+def program(seed):
+    return generate_program(functions=3, statements=5, depth=2, nesting=1, variables=4,
+                            reads=2, seed=seed)
+
+
+def shown(outputs):
+    """Saídas comparáveis: repr distingue int de float e iguala nan a nan"""
+    return [repr(value) for value in outputs]
+
+
+def run_closures(code):
+    ast = Parser(Lexer(code).tokenize()).parse()
+    SemanticAnalyzer().analyze(ast)
+    feed = itertools.cycle(INPUTS)
+    outputs = []
+    compile_ast(ast).run(lambda prompt='': next(feed), outputs.append)
+    return outputs
+
+
+def run_registers(code):
+    feed = itertools.cycle(INPUTS)
+    outputs = []
+    vm = RegisterVirtualMachine(input_func=lambda prompt='': next(feed),
+                                output_func=outputs.append, verbose=False)
+    vm.load_instructions(parse_program(compile_source(code, 'registradores').instructions))
+    vm.execute()
+    return outputs
+
+
+@pytest.mark.parametrize('seed', SEEDS)
+def test_engines_agree_on_generated_programs(seed):
+    code = program(seed)
+    result = compile_source(code)
+    assert result.ok, result.diagnostics
+    instructions = parse_program(result.instructions)
+
+    # As locais de toda função começam no mesmo endereço: uma função chamada
+    # dentro de um while pode sobrescrever o contador e o programa não termina
+    vm = new_vm(VirtualMachine, instructions, [])
+    vm.run_slice(BUDGET)
+    if not vm.finished:
+        pytest.skip(f"programa da semente {seed} passa de {BUDGET} instruções")
+
+    expected = shown(prepare('interpretador', instructions)())
+    for engine in ENGINES[1:]:
+        assert shown(prepare(engine, instructions)()) == expected, engine
+    assert shown(run_closures(code)) == expected, 'closures'
+    assert shown(run_registers(code)) == expected, 'registradores'
+
+
+@pytest.mark.parametrize('name', [name for name, kernel in KERNELS.items() if kernel[0] == 'micro'])
+def test_engines_agree_on_micro_kernels(name):
+    instructions = KERNELS[name][2](20)
+    expected = shown(prepare('interpretador', instructions)())
+    assert len(expected) == 4  # as posições de memória impressas no fim
+    for engine in ENGINES[1:]:
+        assert shown(prepare(engine, instructions)()) == expected, engine
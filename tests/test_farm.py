@@ -0,0 +1,40 @@
+from farm import VMFarm, run_once
+from pipeline import compile_source
+from vm import parse_program
+
+
+ENDLESS = """<?php
+$i = 1;
+while ($i > 0) {
+    $i = $i + 1;
+}
+?>
+"""
+
+DOUBLE = """<?php
+$x = floatval(readline());
+echo $x * 2;
+?>
+"""
+
+
+def program(code):
+    return parse_program(compile_source(code, 'pilha').instructions)
+
+
+def test_run_once_stops_endless_program_at_budget():
+    result = run_once(program(ENDLESS), [], budget=5000)
+    assert result.timed_out
+    assert "orçamento de 5000 instruções esgotado" in result.error
+
+
+def test_run_once_within_budget():
+    result = run_once(program(DOUBLE), ['21'], budget=5000)
+    assert result.outputs == [42.0]
+    assert result.error is None and not result.timed_out
+
+
+def test_farm_workers_report_timeout():
+    farm = VMFarm(program(ENDLESS), workers=2, budget=2000)
+    results = farm.run([[], []])
+    assert all(result.timed_out for result in results)
@@ -0,0 +1,76 @@
+import pytest
+
+from incremental import IncrementalCompiler
+from pipeline import compile_source
+
+
+BASE = """<?php
+$g = 3;
+$h = floatval(readline());
+function dobro($x) {
+    $y = $x * 2;
+    echo $y;
+}
+function soma($a, $b) {
+    $c = $a + $b;
+    echo $c;
+    dobro($c);
+}
+$i = 0;
+while ($i < $g) {
+    soma($i, $h);
+    $i = $i + 1;
+}
+?>
+"""
+
+EDITS = [
+    # corpo de uma função alterado
+    BASE.replace("$y = $x * 2;", "$y = $x * 3 + 1;"),
+    # assinatura alterada, junto com a chamada
+    BASE.replace("function soma($a, $b) {", "function soma($a, $b, $d) {")
+        .replace("$c = $a + $b;", "$c = $a + $b + $d;")
+        .replace("soma($i, $h);", "soma($i, $h, 7);"),
+    # global removida
+    BASE.replace("$g = 3;\n", "").replace("$i < $g", "$i < 4"),
+    # funções em outra ordem: soma chama dobro declarada mais abaixo
+    BASE.replace("""function dobro($x) {
+    $y = $x * 2;
+    echo $y;
+}
+""", "").replace("$i = 0;\n", """function dobro($x) {
+    $y = $x * 2;
+    echo $y;
+}
+$i = 0;
+"""),
+    # linhas inseridas antes das funções deslocam todas as linhas
+    BASE.replace("$g = 3;\n", "$g = 3;\n$k = 1;\necho $k;\n"),
+    # erro semântico e erro de sintaxe, depois o texto original de volta
+    BASE.replace("dobro($c);", "triplo($c);"),
+    BASE.replace("echo $c;", "echo $c"),
+    BASE,
+]
+
+
+@pytest.mark.parametrize('backend', ['pilha', 'registradores'])
+def test_edits_match_full_compilation(backend):
+    compiler = IncrementalCompiler(backend)
+    for version, code in enumerate([BASE] + EDITS):
+        incremental = compiler.compile(code)
+        full = compile_source(code, backend)
+        assert incremental.ok == full.ok, version
+        if full.ok:
+            assert incremental.instructions == full.instructions, version
+            assert incremental.line_table == full.line_table, version
+        else:
+            assert [str(d) for d in incremental.diagnostics] == \
+                [str(d) for d in full.diagnostics], version
+
+
+def test_body_edit_regenerates_only_that_function():
+    compiler = IncrementalCompiler()
+    compiler.compile(BASE)
+    compiler.compile(EDITS[0])
+    assert compiler.last_build['funcoes_reaproveitadas'] == 1
+    assert compiler.last_build['funcoes_geradas'] == 1
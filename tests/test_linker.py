@@ -0,0 +1,81 @@
+import pytest
+
+from farm import input_feeder
+from linker import ObjectFile, ObjectFileError, build_program, compile_unit, link
+from pipeline import compile_source
+from register_vm import RegisterVirtualMachine
+from vm import VirtualMachine, parse_program
+
+
+LIBRARY = ("<?php\n$base = 100;\nfunction dobro($x) {\n    $y = $x * 2;\n    echo $y;\n}\n"
+           "function soma($a, $b) {\n    $c = $a + $b + $base;\n    echo $c;\n}\n?>\n")
+MAIN = ("<?php\ninclude 'biblioteca.php';\n$n = floatval(readline());\ndobro($n);\n"
+        "soma($n, 1);\necho $base;\n?>\n")
+SINGLE = ("<?php\nfunction f($x) {\n    $z = $x + 1;\n    echo $z;\n}\n$a = 2;\n"
+          "while ($a < 5) {\n    f($a);\n    $a = $a + 1;\n}\n?>\n")
+
+
+def run(result, inputs=(), backend='pilha'):
+    assert result.ok, result.diagnostics
+    outputs = []
+    machine = VirtualMachine if backend == 'pilha' else RegisterVirtualMachine
+    vm = machine(input_func=input_feeder(inputs), output_func=outputs.append, verbose=False)
+    if backend == 'pilha':
+        vm.instructions = parse_program(result.instructions)
+    else:
+        vm.load_instructions(parse_program(result.instructions))
+    vm.execute()
+    return outputs
+
+
+@pytest.fixture
+def program(tmp_path):
+    (tmp_path / 'biblioteca.php').write_text(LIBRARY, encoding='utf-8')
+    entry = tmp_path / 'programa.php'
+    entry.write_text(MAIN, encoding='utf-8')
+    return str(entry)
+
+
+def test_single_unit_links_like_normal_compilation():
+    result = link([('programa.php', compile_unit(SINGLE))])
+    assert result.instructions == compile_source(SINGLE).instructions
+    assert result.line_table == compile_source(SINGLE).line_table
+
+
+@pytest.mark.parametrize('backend', ['pilha', 'registradores'])
+def test_included_units_run(program, backend):
+    result, build = build_program(program, backend)
+    assert len(build.objects) == 2
+    assert run(result, ['7'], backend) == [14.0, 108.0, 100.0]
+
+
+def test_object_file_round_trip(tmp_path):
+    obj = compile_unit(LIBRARY)
+    path = tmp_path / 'biblioteca.lo'
+    obj.save(path)
+    loaded = ObjectFile.load(path)
+    assert loaded.encode() == obj.encode()
+    assert [function.name for function in loaded.functions] == ['dobro', 'soma']
+
+    main = compile_unit(MAIN)
+    assert link([('b', loaded), ('p', main)]).instructions == \
+        link([('b', obj), ('p', main)]).instructions
+
+
+def test_invalid_object_file_rejected(tmp_path):
+    path = tmp_path / 'programa.lo'
+    path.write_text('{"formato": "outro"}', encoding='utf-8')
+    with pytest.raises(ObjectFileError):
+        ObjectFile.load(path)
+
+
+@pytest.mark.parametrize('units, message', [
+    ([LIBRARY, LIBRARY], "já foi declarado"),
+    (["<?php\nx(1);\n?>\n"], "não foi declarada"),
+    ([LIBRARY, "<?php\ndobro(1, 2);\n?>\n"], "espera 1 argumento"),
+    (["<?php\necho $ninguem;\n?>\n"], "Variável '$ninguem' não foi declarada"),
+])
+def test_link_errors(units, message):
+    result = link([(f"u{index}.php", compile_unit(code)) for index, code in enumerate(units)])
+    assert not result.ok
+    assert any(message in diagnostic.message for diagnostic in result.diagnostics)
@@ -0,0 +1,117 @@
+import pytest
+
+import main
+
+
+PROGRAM = "<?php\n$a = 5;\n$b = -$a;\necho $b;\n?>\n"
+
+
+@pytest.fixture
+def program(tmp_path):
+    path = tmp_path / 'programa.php'
+    path.write_text(PROGRAM, encoding='utf-8')
+    return path
+
+
+def test_direct_runs(run_main, capsys, program):
+    assert run_main(program, '--direto') == 0
+    assert capsys.readouterr().out.split() == ['-5.0']
+
+
+@pytest.mark.parametrize('extra', [
+    ['--backend', 'registradores'], ['--perfil', 'r.txt'], ['--gravar', 'g.rec'],
+    ['--watch'], ['saida.asm'],
+])
+def test_direct_rejects_other_options(run_main, capsys, program, extra):
+    assert run_main(program, '--direto', *extra) == 2
+    assert "--direto não aceita" in capsys.readouterr().err
+
+
+def test_direct_fails_on_runtime_error(run_main, tmp_path):
+    path = tmp_path / 'divisao.php'
+    path.write_text("<?php\n$a = 1;\n$b = 0;\necho $a / $b;\n?>\n", encoding='utf-8')
+    assert run_main(path, '--direto') == 1
+
+
+def test_direct_rejects_includes(run_main, capsys, tmp_path):
+    (tmp_path / 'biblioteca.php').write_text("<?php\n$a = 5;\n?>\n", encoding='utf-8')
+    path = tmp_path / 'programa.php'
+    path.write_text("<?php\ninclude 'biblioteca.php';\necho $a;\n?>\n", encoding='utf-8')
+    assert run_main(path, '--direto') == 2
+    assert "--direto não suporta programas com include" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize('extra', [['--perfil', 'r.txt'], ['--gravar-pgo', 'p.json']])
+def test_stack_only_options_rejected_on_registers(run_main, capsys, program, extra):
+    assert run_main(program, '--backend', 'registradores', *extra) == 2
+    assert "só funciona com --backend pilha" in capsys.readouterr().err
+
+
+def test_verify_rejected_on_registers(run_main, capsys, program):
+    assert run_main(program, '--backend', 'registradores', '--verificar') == 2
+    assert "--verificar só funciona com --backend pilha" in capsys.readouterr().err
+
+
+def test_verify_runs_on_stack(run_main, capsys, program, tmp_path):
+    assert run_main(program, tmp_path / 'p.asm', '--verificar') == 0
+    assert "Bytecode verificado" in capsys.readouterr().out
+
+
+def test_trace_dumped_on_runtime_error(run_main, capsys, tmp_path):
+    path = tmp_path / 'divisao.php'
+    path.write_text("<?php\n$a = 1;\n$b = 0;\necho $a / $b;\n?>\n", encoding='utf-8')
+    assert run_main(path, '-q', '--rastro', 8) == 1
+    assert "RASTRO: últimas 8 de" in capsys.readouterr().err
+
+
+def test_trace_rejected_on_registers(run_main, capsys, program):
+    assert run_main(program, '--backend', 'registradores', '--rastro', 8) == 2
+    assert "--rastro só funciona com --backend pilha" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize('extra', [['--perfil', 'r.txt'], ['--gravar-pgo', 'p.json']])
+def test_trace_rejected_with_profiler(run_main, capsys, program, extra):
+    assert run_main(program, '--rastro', 8, *extra) == 2
+    assert "não podem ser usadas juntas" in capsys.readouterr().err
+
+
+def test_options_reach_compile_file(run_main, monkeypatch, program, tmp_path):
+    received = {}
+
+    def compile_file(*args, **kwargs):
+        received.update(kwargs, args=args)
+        return True
+
+    monkeypatch.setattr(main, 'compile_file', compile_file)
+    assert run_main(program, '--stats', 'json', '--cache', tmp_path / 'cache',
+                    '--rastro', 8, '-q') == 0
+    assert received['args'] == (str(program), None)
+    assert received['stats'] == 'json'
+    assert received['cache_dir'] == str(tmp_path / 'cache')
+    assert received['trace_size'] == 8
+    assert received['quiet'] is True
+    assert received['profile_file'] is None
+
+
+@pytest.mark.parametrize('extra', [
+    ['--perfil', 'r.txt'], ['--gravar', 'g.rec'], ['--cache', 'cache'], ['-q'], ['--stats', 'json'],
+])
+def test_watch_rejects_other_options(run_main, capsys, program, extra):
+    assert run_main(program, '--watch', *extra) == 2
+    assert "--watch não aceita" in capsys.readouterr().err
+
+
+def test_watch_keeps_output_and_backend(run_main, monkeypatch, program, tmp_path):
+    received = []
+    monkeypatch.setattr('watch.watch', lambda *args: received.append(args))
+    output = tmp_path / 'saida.rasm'
+    assert run_main(program, output, '--watch', '--backend', 'registradores') == 0
+    assert received == [(str(program), str(output), 'registradores')]
+
+
+@pytest.mark.parametrize('extra', [
+    ['--perfil', 'r.txt'], ['--gravar-pgo', 'p.json'], ['--rastro', '8'], ['--cobertura', 'c.cov'],
+])
+def test_verify_rejected_with_instrumented_loops(run_main, capsys, program, extra):
+    assert run_main(program, '--verificar', *extra) == 2
+    assert "não podem ser usadas juntas" in capsys.readouterr().err
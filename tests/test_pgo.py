@@ -0,0 +1,44 @@
+import pytest
+
+from pgo import PGOProfile
+
+
+LOOP = ("<?php\n$i = 0;\nwhile ($i < 20) {\n    echo $i;\n    $i = $i + 1;\n}\n?>\n")
+
+
+def test_profile_round_trip(tmp_path):
+    profile = PGOProfile({3: [21, 1], 9: [4, 4]}, {12: 7})
+    path = tmp_path / 'perfil.pgo'
+    profile.save(path)
+    loaded = PGOProfile.load(path)
+    assert loaded.branches == profile.branches
+    assert loaded.calls == profile.calls
+
+
+def test_profile_rejects_other_version(tmp_path):
+    path = tmp_path / 'perfil.pgo'
+    path.write_text('{"versao": 99}', encoding='utf-8')
+    with pytest.raises(ValueError):
+        PGOProfile.load(path)
+
+
+def test_recorded_profile_guides_compilation(run_main, capsys, tmp_path):
+    source = tmp_path / 'laco.php'
+    source.write_text(LOOP, encoding='utf-8')
+    profile = tmp_path / 'laco.pgo'
+
+    assert run_main(source, tmp_path / 'a.asm', '-q', '--gravar-pgo', profile) == 0
+    plain = capsys.readouterr().out.split()
+    assert PGOProfile.load(profile).loop_iterations(3) == (20, 1)
+
+    assert run_main(source, tmp_path / 'b.asm', '-q', '--pgo', profile) == 0
+    assert capsys.readouterr().out.split() == plain == [f"{i}.0" for i in range(20)]
+
+
+def test_pgo_rejected_on_registers(run_main, capsys, tmp_path):
+    source = tmp_path / 'laco.php'
+    source.write_text(LOOP, encoding='utf-8')
+    profile = tmp_path / 'laco.pgo'
+    PGOProfile().save(profile)
+    assert run_main(source, '--backend', 'registradores', '--pgo', profile) == 2
+    assert "--pgo só funciona com --backend pilha" in capsys.readouterr().err
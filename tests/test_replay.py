@@ -0,0 +1,65 @@
+import builtins
+
+import pytest
+
+from replay import Recording, RecordingError
+
+
+PROGRAM = ("<?php\n$a = floatval(readline());\n$b = floatval(readline());\n"
+           "echo $a + $b;\necho $a / $b;\n?>\n")
+
+
+@pytest.fixture
+def program(tmp_path):
+    path = tmp_path / 'conta.php'
+    path.write_text(PROGRAM, encoding='utf-8')
+    return path
+
+
+def test_recording_round_trip(tmp_path):
+    recording = Recording(['3', ' 2.5', 'não'], [1.5, 7, -0.0, 1e300])
+    path = tmp_path / 'gravacao.rec'
+    recording.save(path)
+    assert path.read_bytes()[:4] == b'LVMR'
+    loaded = Recording.load(path)
+    assert loaded.inputs == recording.inputs
+    assert loaded.outputs == recording.outputs
+    assert [type(value) for value in loaded.outputs] == [float, int, float, float]
+
+
+@pytest.mark.parametrize('data', [b'LVM', b'XXXX' + bytes(10), Recording(['1'], [2.0]).encode()[:-3]])
+def test_bad_recordings_are_rejected(data):
+    with pytest.raises(RecordingError):
+        Recording.decode(data)
+
+
+def test_record_then_replay(run_main, monkeypatch, capsys, program, tmp_path):
+    typed = iter(['6', '3'])
+    monkeypatch.setattr(builtins, 'input', lambda prompt='': next(typed))
+    recording = tmp_path / 'conta.rec'
+    assert run_main(program, '-q', '--gravar', recording) == 0
+    assert Recording.load(recording).inputs == ['6', '3']
+    assert Recording.load(recording).outputs == [9.0, 2.0]
+    capsys.readouterr()
+
+    assert run_main(program, '-q', '--reproduzir', recording) == 0
+    assert capsys.readouterr().out.split() == ['9.0', '2.0']
+
+
+def test_replay_with_different_outputs_fails(run_main, capsys, program, tmp_path):
+    recording = tmp_path / 'conta.rec'
+    Recording(['6', '3'], [9.0, 5.0]).save(recording)
+    assert run_main(program, '-q', '--reproduzir', recording) == 1
+    assert "Saídas diferentes da gravação" in capsys.readouterr().out
+
+
+def test_replay_with_runtime_error_fails(run_main, capsys, program, tmp_path):
+    recording = tmp_path / 'conta.rec'
+    Recording(['6', '0'], [6.0]).save(recording)
+    assert run_main(program, '-q', '--reproduzir', recording) == 1
+    assert "Erro ao executar na VM" in capsys.readouterr().out
+
+
+def test_record_and_replay_together_rejected(run_main, capsys, program, tmp_path):
+    assert run_main(program, '--gravar', 'a.rec', '--reproduzir', 'b.rec') == 2
+    assert "não podem ser usadas juntas" in capsys.readouterr().err
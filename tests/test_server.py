@@ -0,0 +1,102 @@
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+import client
+
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, 'AF_UNIX') or not hasattr(os, 'fork'),
+                                reason="o servidor precisa de fork e socket unix")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def server(tmp_path):
+    path = str(tmp_path / 'servidor.sock')
+    process = subprocess.Popen([sys.executable, os.path.join(ROOT, 'server.py'), '--socket', path,
+                                '--espera', '0.5'], stdout=subprocess.DEVNULL)
+    deadline = time.monotonic() + 30
+    while not os.path.exists(path):
+        assert process.poll() is None and time.monotonic() < deadline, "servidor não subiu"
+        time.sleep(0.05)
+    yield path
+    subprocess.run([sys.executable, os.path.join(ROOT, 'server.py'), '--socket', path, '--parar'],
+                   stdout=subprocess.DEVNULL)
+    process.wait(timeout=30)
+
+
+def raw_request(path, message, fds):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        connection.connect(path)
+        socket.send_fds(connection, [message], fds)
+        return connection.makefile('rb').readline()
+
+
+def test_request_runs_in_server(server, tmp_path, capfd):
+    source = tmp_path / 'programa.php'
+    source.write_text("<?php\n$a = 2;\necho $a * 21;\n?>\n", encoding='utf-8')
+    assert client.request([str(source), '--direto'], server) == 0
+    assert capfd.readouterr().out.split() == ['42.0']
+
+
+@pytest.mark.parametrize('fds', [[], [1], [0, 1]])
+def test_request_without_three_fds_gets_error(server, fds):
+    reply = raw_request(server, b'{"argv": [], "cwd": "/"}\n', fds)
+    assert reply.startswith(client.ERROR_PREFIX)
+    assert b'chegaram' in reply
+
+
+def test_malformed_request_gets_error(server):
+    reply = raw_request(server, b'[1, 2]\n', [0, 1, 2])
+    assert reply.startswith(client.ERROR_PREFIX + 'pedido inválido'.encode('utf-8'))
+
+
+def test_client_reports_server_error(tmp_path):
+    path = str(tmp_path / 'falso.sock')
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(path)
+    listener.listen(1)
+
+    def answer():
+        connection, _ = listener.accept()
+        with connection:
+            _, fds, _, _ = socket.recv_fds(connection, 1 << 16, 3)
+            for fd in fds:
+                os.close(fd)
+            connection.sendall(client.ERROR_PREFIX + b'sem descritores\n')
+
+    thread = threading.Thread(target=answer)
+    thread.start()
+    try:
+        with pytest.raises(client.ServerError, match='sem descritores'):
+            client.request(['programa.php'], path)
+    finally:
+        thread.join()
+        listener.close()
+
+
+def test_client_disconnecting_does_not_kill_socket(server, tmp_path, capfd):
+    # O filho falha ao mandar o pid para um cliente que já saiu
+    for _ in range(5):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+            connection.connect(server)
+            socket.send_fds(connection, [b'{"argv": ["--help"], "cwd": "/"}\n'], [0, 1, 2])
+    time.sleep(0.5)
+    assert os.path.exists(server)
+    test_request_runs_in_server(server, tmp_path, capfd)
+
+
+def test_silent_client_does_not_stall_server(server, tmp_path, capfd):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as silent:
+        silent.connect(server)
+        start = time.monotonic()
+        test_request_runs_in_server(server, tmp_path, capfd)
+        assert time.monotonic() - start < 10
+        silent.settimeout(10)
+        assert silent.makefile('rb').readline().startswith(client.ERROR_PREFIX)
@@ -0,0 +1,68 @@
+import pytest
+
+from farm import input_feeder
+from pipeline import compile_source
+from snapshot import SnapshotError, checkpoint, restore_snapshot, take_snapshot
+from vm import VirtualMachine, parse_program
+
+
+PROGRAM = ("<?php\n$n = floatval(readline());\n$i = 0;\nwhile ($i < $n) {\n"
+           "    echo $i * $n;\n    $i = $i + 1;\n}\n?>\n")
+
+
+def new_vm(instructions, inputs=(), outputs=None):
+    vm = VirtualMachine(input_func=input_feeder(inputs),
+                        output_func=(outputs if outputs is not None else []).append,
+                        verbose=False)
+    vm.instructions = instructions
+    return vm
+
+
+def test_snapshot_resumes_where_it_stopped():
+    instructions = parse_program(compile_source(PROGRAM).instructions)
+    expected = []
+    new_vm(instructions, ['4'], expected).execute()
+
+    before = []
+    vm = new_vm(instructions, ['4'], before)
+    stop_pc = next(index for index, instruction in enumerate(instructions)
+                   if instruction.startswith('IMPR'))
+    data = checkpoint(vm, stop_pc)
+    assert data[:4] == b'LVMS'
+
+    after = []
+    resumed = new_vm(instructions, outputs=after)
+    restore_snapshot(resumed, data)
+    assert (resumed.pc, resumed.stack, resumed.memory) == (vm.pc, vm.stack, vm.memory)
+    resumed.execute()
+    assert before + after == expected == [0.0, 4.0, 8.0, 12.0]
+
+
+def test_snapshot_keeps_value_types():
+    instructions = parse_program(["INPP", "PARA"])
+    vm = new_vm(instructions)
+    vm.stack[:] = [3, -0.0, 2.5]
+    vm.memory[7] = 11
+    vm.call_stack[:] = [1, 5]
+    restored = new_vm(instructions)
+    restore_snapshot(restored, take_snapshot(vm))
+    assert restored.stack == [3, -0.0, 2.5]
+    assert [type(value) for value in restored.stack] == [int, float, float]
+    assert restored.memory[7] == 11 and type(restored.memory[7]) is int
+    assert restored.call_stack == [1, 5]
+
+
+def test_snapshot_of_other_program_rejected():
+    data = take_snapshot(new_vm(parse_program(["INPP", "PARA"])))
+    with pytest.raises(SnapshotError, match="outro programa"):
+        restore_snapshot(new_vm(parse_program(["INPP", "CRCT 1", "PARA"])), data)
+
+
+def test_truncated_snapshot_rejected():
+    instructions = parse_program(["INPP", "PARA"])
+    vm = new_vm(instructions)
+    vm.stack[:] = [1.0, 2.0]
+    data = take_snapshot(vm)
+    for cut in (10, len(data) - 4):
+        with pytest.raises(SnapshotError):
+            restore_snapshot(new_vm(instructions), data[:cut])
@@ -0,0 +1,59 @@
+import pytest
+
+from pipeline import compile_source
+from source_map import SourceMap, map_filename
+from vm import VMRuntimeError, VirtualMachine
+
+
+def test_source_map_round_trip(tmp_path):
+    lines = [0, 3, 3, 3, 4, 7, 7, 0]
+    source_map = SourceMap.from_lines(lines)
+    assert source_map.runs == [[0, 1], [3, 3], [4, 1], [7, 2], [0, 1]]
+
+    path = tmp_path / 'programa.asm.map'
+    source_map.save(path)
+    loaded = SourceMap.load(path)
+    assert loaded.lines() == lines
+    assert [loaded.line_for(index) for index in range(-1, 9)] == [0] + lines + [0]
+
+
+def test_file_without_header_rejected(tmp_path):
+    path = tmp_path / 'programa.asm.map'
+    path.write_text("3*1 4*2\n", encoding='utf-8')
+    with pytest.raises(ValueError):
+        SourceMap.load(path)
+
+
+DIVISION = "<?php\n$a = 1;\n$b = 0;\n$c = $a + 1;\necho $c / $b;\n?>\n"
+
+
+def run_division(program):
+    vm = VirtualMachine(output_func=lambda value: None, verbose=False)
+    vm.load_program(program)
+    with pytest.raises(VMRuntimeError) as error:
+        vm.execute()
+    return error.value
+
+
+def test_runtime_error_points_to_source_line(tmp_path):
+    result = compile_source(DIVISION)
+    program = str(tmp_path / 'programa.asm')
+    result.save(program)
+    assert SourceMap.load(map_filename(program)).size == len(result.instructions)
+
+    error = run_division(program)
+    assert error.line == 5
+    assert "linha 5 do fonte" in str(error)
+
+
+@pytest.mark.parametrize('body', ["3*x 4*2\n", "5*1\n"])
+def test_bad_or_stale_map_is_ignored(tmp_path, body):
+    program = str(tmp_path / 'programa.asm')
+    compile_source(DIVISION).save(program)
+    with open(map_filename(program), 'w', encoding='utf-8') as f:
+        f.write(SourceMap().encode().splitlines()[0] + "\n" + body)
+
+    assert SourceMap.load_for(program, len(compile_source(DIVISION).instructions)) is None
+    error = run_division(program)
+    assert error.line == 0
+    assert "do fonte" not in str(error)
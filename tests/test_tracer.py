@@ -0,0 +1,57 @@
+import io
+from array import array
+
+import pytest
+
+from pipeline import compile_source
+from tracer import Tracer
+from vm import VirtualMachine, parse_program
+
+
+PROGRAM = ("<?php\nfunction f($x) {\n    $y = $x * 2;\n    echo $y;\n}\n$i = 0;\n"
+           "while ($i < 6) {\n    f($i);\n    $i = $i + 1;\n}\n$z = 0;\necho $i / $z;\n?>\n")
+
+
+def executed_pcs(instructions):
+    """pc de cada instrução executada, passo a passo no interpretador"""
+    vm = VirtualMachine(output_func=lambda value: None, verbose=False)
+    vm.instructions = instructions
+    pcs = []
+    try:
+        while vm.running and vm.pc < len(instructions):
+            pcs.append(vm.pc)
+            vm.execute_instruction(instructions[vm.pc])
+            vm.pc += 1
+    except ZeroDivisionError:
+        pass
+    return pcs
+
+
+@pytest.mark.parametrize('size', [1, 4, 16, 1024])
+def test_trace_matches_executed_instructions(size):
+    instructions = parse_program(compile_source(PROGRAM).instructions)
+    output = io.StringIO()
+    tracer = Tracer(size, output)
+    vm = VirtualMachine(output_func=lambda value: None, verbose=False, tracer=tracer)
+    vm.instructions = instructions
+    with pytest.raises(Exception):
+        vm.execute()
+
+    expected = executed_pcs(instructions)
+    records = list(tracer.records())
+    assert tracer.executed == len(expected)
+    assert [pc for _, pc, _, _ in records] == expected[-tracer.size:]
+    assert [sequence for sequence, _, _, _ in records] == \
+        list(range(len(expected) - len(records) + 1, len(expected) + 1))
+    assert instructions[records[-1][1]].startswith('DIVI')
+    assert "RASTRO: últimas" in output.getvalue()
+
+
+def test_block_entries_keep_stack_state():
+    instructions = parse_program(["INPP", "CRCT 2", "CRCT 5", "DSVI 5", "IMPR", "PARA"])
+    tracer = Tracer(8)
+    vm = VirtualMachine(output_func=lambda value: None, verbose=False, tracer=tracer)
+    vm.instructions = instructions
+    vm.execute()
+    assert [record[1:] for record in tracer.records()][-2:] == [(4, 2, 5.0), (5, None, None)]
+    assert isinstance(tracer.pcs, array) and isinstance(tracer.tops, array)
@@ -0,0 +1,48 @@
+import pytest
+
+from farm import input_feeder
+from pipeline import compile_source
+from verifier import VerificationError, verify_program
+from vm import VirtualMachine, parse_program
+
+
+PROGRAM = ("<?php\nfunction soma($x, $y) {\n    $z = $x + $y;\n    echo $z;\n}\n"
+           "$i = 0;\nwhile ($i < 5) {\n    soma($i, 10);\n    $i = $i + 1;\n}\n"
+           "$n = floatval(readline());\nif ($n > 2) {\n    echo $n;\n} else {\n    echo 0;\n}\n?>\n")
+
+
+def run(instructions, verify):
+    outputs = []
+    vm = VirtualMachine(input_func=input_feeder(['7']), output_func=outputs.append, verbose=False)
+    vm.instructions = instructions
+    if verify:
+        vm.verify()
+    vm.execute()
+    return outputs
+
+
+def test_compiled_program_is_accepted():
+    instructions = parse_program(compile_source(PROGRAM).instructions)
+    program = verify_program(instructions)
+    assert program.reachable() == len(instructions)
+    assert program.max_depth >= 2
+
+
+def test_verified_loop_matches_interpreter():
+    instructions = parse_program(compile_source(PROGRAM).instructions)
+    expected = run(instructions, verify=False)
+    assert expected == [10.0, 11.0, 12.0, 13.0, 14.0, 7.0]
+    assert run(instructions, verify=True) == expected
+
+
+@pytest.mark.parametrize('program, message', [
+    (["INPP", "FOO", "PARA"], "opcode desconhecido"),
+    (["INPP", "DSVI 99", "PARA"], "fora do programa"),
+    (["INPP", "CRCT 1", "ARMZ 500", "PARA"], "fora da memória"),
+    (["INPP", "SOMA", "PARA"], "precisa de 2 operandos"),
+    (["INPP", "CRCT 1", "DSVF 5", "CRCT 2", "CRCT 3", "IMPR", "PARA"], "conforme o caminho"),
+])
+def test_bad_programs_are_rejected(program, message):
+    with pytest.raises(VerificationError) as error:
+        verify_program(parse_program(program))
+    assert any(message in problem for problem in error.value.problems)
@@ -0,0 +1,139 @@
+import random
+
+import pytest
+
+from linker import build_program
+from pipeline import compile_source
+from test_linker import LIBRARY, MAIN
+from watch import IncrementalBuild, watch
+
+
+SOURCE = """<?php
+$total = 0;
+$n = floatval(readline());
+function quadrado($x) {
+    $q = $x * $x;
+    echo $q;
+}
+function acumula($a, $b) {
+    if ($a > $b) {
+        $s = $a - $b;
+    } else {
+        $s = $b - $a;
+    }
+    quadrado($s);
+}
+$i = 0;
+while ($i < $n) {
+    acumula($i, 3);
+    $total = $total + $i;
+    $i = $i + 1;
+}
+echo $total;
+?>
+"""
+
+# Caracteres que as edições inserem: quebram e recompõem a sintaxe
+ALPHABET = "$abixn0123456789 \n;(){}+-*/<>=,"
+
+
+def random_edit(rng, code):
+    """Insere, apaga ou troca um trecho curto em posição aleatória"""
+    position = rng.randrange(len(code) + 1)
+    length = rng.randint(1, 3)
+    text = "".join(rng.choice(ALPHABET) for _ in range(length))
+    kind = rng.randrange(3)
+    if kind == 0:
+        return code[:position] + text + code[position:]
+    if kind == 1:
+        return code[:position] + code[position + length:]
+    return code[:position] + text + code[position + length:]
+
+
+def edit_sequence(seed, steps=60):
+    """Edições aleatórias; a cada poucas o texto volta a uma versão válida"""
+    rng = random.Random(seed)
+    valid = [SOURCE]
+    code = SOURCE
+    versions = []
+    for step in range(steps):
+        if step % 4 == 3:
+            code = rng.choice(valid)
+        else:
+            code = random_edit(rng, code)
+            if compile_source(code).ok:
+                valid.append(code)
+        versions.append(code)
+    return versions
+
+
+def assert_same_result(incremental, full, label):
+    assert incremental.ok == full.ok, label
+    if full.ok:
+        assert incremental.instructions == full.instructions, label
+        assert incremental.line_table == full.line_table, label
+
+
+@pytest.mark.parametrize('backend', ['pilha', 'registradores'])
+@pytest.mark.parametrize('seed', range(5))
+def test_random_edits_match_full_compilation(backend, seed):
+    build = IncrementalBuild(backend)
+    assert_same_result(build.compile(SOURCE), compile_source(SOURCE, backend), "inicial")
+    for step, code in enumerate(edit_sequence(seed)):
+        assert_same_result(build.compile(code), compile_source(code, backend),
+                           f"semente {seed}, edição {step}:\n{code}")
+
+
+def test_broken_then_restored_source():
+    build = IncrementalBuild()
+    broken = SOURCE.replace("$q = $x * $x;", "$q = $x * ;")
+    assert not build.compile(broken).ok
+    restored = build.compile(SOURCE)
+    assert restored.ok
+    assert restored.instructions == compile_source(SOURCE).instructions
+
+
+def test_includes_are_linked_and_watched(tmp_path):
+    library = tmp_path / 'biblioteca.php'
+    library.write_text(LIBRARY, encoding='utf-8')
+    entry = tmp_path / 'programa.php'
+    entry.write_text(MAIN, encoding='utf-8')
+
+    build = IncrementalBuild()
+    result = build.compile_file(str(entry), MAIN)
+    assert result.ok
+    assert result.instructions == build_program(str(entry))[0].instructions
+    assert build.watched_files(str(entry)) == [str(entry), str(library)]
+
+    # Sem include, volta à compilação incremental e só o fonte é observado
+    result = build.compile_file(str(entry), SOURCE)
+    assert result.instructions == compile_source(SOURCE).instructions
+    assert build.watched_files(str(entry)) == [str(entry)]
+
+
+def test_library_change_recompiles(tmp_path, monkeypatch):
+    library = tmp_path / 'biblioteca.php'
+    library.write_text(LIBRARY, encoding='utf-8')
+    entry = tmp_path / 'programa.php'
+    entry.write_text(MAIN, encoding='utf-8')
+    output = tmp_path / 'programa.asm'
+
+    sleeps = []
+
+    def sleep(interval):
+        sleeps.append(interval)
+        if len(sleeps) == 1:
+            library.write_text(LIBRARY.replace("$base = 100;", "$base = 100;\n$extra = 1;"),
+                               encoding='utf-8')
+        elif len(sleeps) == 3:
+            raise KeyboardInterrupt
+
+    messages = []
+    monkeypatch.setattr('watch.time.sleep', sleep)
+    with pytest.raises(KeyboardInterrupt):
+        watch(str(entry), str(output), say=messages.append)
+    compiled = [message for message in messages if "unidades ligadas" in message]
+    assert len(compiled) == 2
+    expected = tmp_path / 'esperado.asm'
+    build_program(str(entry))[0].save(str(expected))
+    assert output.read_text(encoding='utf-8') == expected.read_text(encoding='utf-8')
@@ -0,0 +1,92 @@
+"""
+Medição por Fase do Compilador
+
+PhaseTimer mede cada fase (léxico, sintático, semântico, geração de
+código, VM): tempo de relógio, pico de memória alocada durante a fase
+(tracemalloc, só quando pedido, porque deixa a execução mais lenta) e
+contagens informadas pela própria fase (tokens, nós, instruções).
+
+    timer = PhaseTimer(track_memory=True)
+    with timer.phase('lexico') as phase:
+        tokens = Lexer(code).tokenize()
+        phase.count('tokens', len(tokens))
+    print(timer.to_json())
+"""
+
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+
+class PhaseStats:
+
+    def __init__(self, name):
+        self.name = name
+        self.wall_time = 0.0
+        self.peak_memory = None   # bytes; None quando a memória não é medida
+        self.counts = {}
+
+    def count(self, name, value):
+        self.counts[name] = value
+
+    def as_dict(self):
+        data = {'fase': self.name, 'tempo_s': round(self.wall_time, 6)}
+        if self.peak_memory is not None:
+            data['memoria_pico_bytes'] = self.peak_memory
+        data.update(self.counts)
+        return data
+
+
+class PhaseTimer:
+
+    def __init__(self, track_memory=False):
+        self.track_memory = track_memory
+        self.phases = []
+        self._started_tracing = False
+
+    @contextmanager
+    def phase(self, name):
+        stats = PhaseStats(name)
+        self.phases.append(stats)
+
+        if self.track_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracing = True
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+
+        start = time.perf_counter()
+        try:
+            yield stats
+        finally:
+            stats.wall_time = time.perf_counter() - start
+            if self.track_memory:
+                stats.peak_memory = max(0, tracemalloc.get_traced_memory()[1] - baseline)
+
+    def close(self):
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def total_time(self):
+        return sum(stats.wall_time for stats in self.phases)
+
+    def as_dict(self):
+        return {
+            'fases': [stats.as_dict() for stats in self.phases],
+            'tempo_total_s': round(self.total_time(), 6),
+        }
+
+    def to_json(self):
+        return json.dumps(self.as_dict(), ensure_ascii=False)
+
+    def report(self):
+        lines = [f"  {'fase':12} {'tempo (ms)':>11} {'pico (KiB)':>11}  contagens"]
+        for stats in self.phases:
+            memory = f"{stats.peak_memory / 1024:11.1f}" if stats.peak_memory is not None else f"{'-':>11}"
+            counts = ", ".join(f"{name}={value}" for name, value in stats.counts.items())
+            lines.append(f"  {stats.name:12} {stats.wall_time * 1000:11.3f} {memory}  {counts}")
+        lines.append(f"  {'total':12} {self.total_time() * 1000:11.3f}")
+        return "\n".join(lines) + "\n"
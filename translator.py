@@ -0,0 +1,341 @@
+"""
+Tradutor Antecipado (AOT) de programas da VM para Python
+
+Transforma um programa carregado em código fonte Python:
+- cada bloco básico vira código em linha reta, com a pilha da VM
+  representada por variáveis locais dentro do bloco;
+- DSVI/DSVF/CHPR/RTPR viram atribuições ao número do próximo bloco,
+  escolhido por um laço de despacho (árvore de comparações).
+
+O fonte é compilado com compile() em uma única função que produz a mesma
+entrada e saída observáveis de VirtualMachine.execute.
+"""
+
+import argparse
+import math
+import sys
+
+from vm import VirtualMachine, decode_instruction
+
+
+class TranslationError(Exception):
+    pass
+
+
+# Instruções que encerram um bloco básico
+TERMINATORS = {'DSVI', 'DSVF', 'CHPR', 'RTPR', 'PARA'}
+
+# Operações binárias: opcode -> formato da expressão Python
+BINARY_OPS = {
+    'SOMA': '{a} + {b}',
+    'SUBT': '{a} - {b}',
+    'MULT': '{a} * {b}',
+    'DIVI': '{a} / {b}',
+    'CMAI': '1 if {a} >= {b} else 0',
+    'CPMI': '1 if {a} <= {b} else 0',
+    'CMAG': '1 if {a} > {b} else 0',
+    'CPME': '1 if {a} < {b} else 0',
+    'CMIG': '1 if {a} == {b} else 0',
+    'CMDG': '1 if {a} != {b} else 0',
+}
+
+INPUT_PROMPT = "Digite um valor: "
+
+
+def float_literal(value):
+    if math.isfinite(value):
+        return repr(value)
+    return f"float('{value}')"
+
+
+class BlockEmitter:
+    """
+    Gera as linhas Python de uma sequência de instruções sem desvios.
+    Os valores empilhados dentro do bloco ficam em 'sym' (expressões) e só
+    vão para a pilha real em flush(); desempilhar além deles lê 'stack'.
+    """
+
+    def __init__(self, indent):
+        self.lines = []
+        self.indent = indent
+        self.sym = []
+        self.temp = 0
+
+    def line(self, text):
+        self.lines.append('    ' * self.indent + text)
+
+    def fresh(self):
+        name = f"t{self.temp}"
+        self.temp += 1
+        return name
+
+    def push(self, expr):
+        self.sym.append(expr)
+
+    def pop(self):
+        if self.sym:
+            return self.sym.pop()
+        name = self.fresh()
+        self.line(f"{name} = stack.pop()")
+        return name
+
+    def flush(self):
+        if len(self.sym) == 1:
+            self.line(f"stack.append({self.sym[0]})")
+        elif self.sym:
+            self.line(f"stack.extend(({', '.join(self.sym)},))")
+        self.sym = []
+
+    def emit(self, index, opcode, arg):
+        """Gera uma instrução que não desvia; retorna False se não souber"""
+        if opcode == 'INPP':
+            pass
+
+        elif opcode == 'CRCT':
+            self.push(float_literal(arg))
+
+        elif opcode in ('CRVL', 'PARAM'):
+            name = self.fresh()
+            self.line(f"{name} = mem[{arg}]")
+            self.push(name)
+
+        elif opcode == 'ARMZ':
+            value = self.pop()
+            self.line(f"mem[{arg}] = {value}")
+
+        elif opcode in BINARY_OPS:
+            b = self.pop()
+            a = self.pop()
+            name = self.fresh()
+            self.line(f"{name} = " + BINARY_OPS[opcode].format(a=a, b=b))
+            self.push(name)
+
+        elif opcode == 'LEIT':
+            name = self.fresh()
+            self.line(f"{name} = float(read({INPUT_PROMPT!r}))")
+            self.push(name)
+
+        elif opcode == 'IMPR':
+            value = self.pop()
+            self.line(f"write({value})")
+
+        elif opcode == 'ALME':
+            # ALME retira da base da pilha, então tudo precisa estar em 'stack'
+            self.flush()
+            for _ in range(arg):
+                self.line("if stack:")
+                self.line("    mem[mp] = stack.pop(0)")
+                self.line("mp += 1")
+
+        elif opcode == 'DESM':
+            self.flush()
+            if arg > 0:
+                self.line(f"del stack[-{arg}:]")
+
+        elif opcode == 'PUSHER':
+            return_line = arg if arg is not None else index + 2
+            self.line(f"call_stack.append({return_line})")
+
+        elif opcode in TERMINATORS:
+            return False
+
+        else:
+            message = f"Instrução não implementada: {opcode}"
+            self.line(f"print({message!r})")
+
+        return True
+
+
+def decode_program(instructions):
+    code = []
+    for number, instruction in enumerate(instructions, 1):
+        try:
+            code.append(decode_instruction(instruction))
+        except (IndexError, ValueError):
+            raise TranslationError(f"Instrução inválida na linha {number}: '{instruction}'")
+    return code
+
+
+def find_leaders(code):
+    """Índices onde começam blocos básicos"""
+    size = len(code)
+    leaders = {0}
+
+    for index, (opcode, arg) in enumerate(code):
+        if opcode in ('DSVI', 'DSVF', 'CHPR'):
+            target = arg - 1
+            if target < 0:
+                raise TranslationError(
+                    f"Desvio para a linha {arg} fora do programa (linha {index + 1})")
+            leaders.add(target)
+            leaders.add(index + 1)
+        elif opcode in ('RTPR', 'PARA'):
+            leaders.add(index + 1)
+        elif opcode == 'PUSHER':
+            # RTPR retoma a execução na linha empilhada
+            leaders.add(arg - 1 if arg is not None else index + 1)
+
+    return sorted(leader for leader in leaders if 0 <= leader < size)
+
+
+class Translator:
+
+    def __init__(self, instructions):
+        self.instructions = list(instructions)
+        self.code = decode_program(self.instructions)
+        self.size = len(self.code)
+        self.leaders = find_leaders(self.code)
+        self.lines = []
+
+    def translate(self):
+        self.lines = [
+            "def _programa(vm):",
+            "    stack = vm.stack",
+            "    call_stack = vm.call_stack",
+            "    mem = vm.memory",
+            "    read = vm.input_func",
+            "    write = vm.output_func",
+            "    mp = vm.memory_pointer",
+            "    b = vm.pc",
+            "    if not vm.running:",
+            "        return",
+            "    try:",
+            "        while True:",
+        ]
+        self.generate_dispatch(self.leaders, 3)
+        self.lines += [
+            "    finally:",
+            "        vm.memory_pointer = mp",
+            "        vm.pc = b",
+        ]
+        return "\n".join(self.lines) + "\n"
+
+    def generate_dispatch(self, block_ids, indent):
+        """Árvore de comparações sobre o número do bloco (profundidade log n)"""
+        pad = '    ' * indent
+
+        if len(block_ids) <= 3:
+            for position, block_id in enumerate(block_ids):
+                keyword = "if" if position == 0 else "elif"
+                self.lines.append(f"{pad}{keyword} b == {block_id}:")
+                self.generate_block(block_id, indent + 1)
+            self.lines.append(f"{pad}else:" if block_ids else f"{pad}if True:")
+            self.lines.append(f"{pad}    if b >= {self.size}:")
+            self.lines.append(f"{pad}        break")
+            self.lines.append(f"{pad}    raise RuntimeError(f'Desvio para instrução sem bloco: {{b}}')")
+            return
+
+        middle = len(block_ids) // 2
+        self.lines.append(f"{pad}if b < {block_ids[middle]}:")
+        self.generate_dispatch(block_ids[:middle], indent + 1)
+        self.lines.append(f"{pad}else:")
+        self.generate_dispatch(block_ids[middle:], indent + 1)
+
+    def block_end(self, start):
+        position = self.leaders.index(start)
+        if position + 1 < len(self.leaders):
+            return self.leaders[position + 1]
+        return self.size
+
+    def generate_block(self, start, indent):
+        emitter = BlockEmitter(indent)
+        end = self.block_end(start)
+
+        for index in range(start, end):
+            opcode, arg = self.code[index]
+            if emitter.emit(index, opcode, arg):
+                continue
+            self.generate_terminator(emitter, index, opcode, arg)
+            break
+        else:
+            emitter.flush()
+            emitter.line(f"b = {end}")
+
+        self.lines.extend(emitter.lines)
+
+    def generate_terminator(self, emitter, index, opcode, arg):
+        if opcode == 'DSVI':
+            emitter.flush()
+            emitter.line(f"b = {arg - 1}")
+
+        elif opcode == 'DSVF':
+            condition = emitter.pop()
+            emitter.flush()
+            emitter.line(f"b = {arg - 1} if {condition} == 0 else {index + 1}")
+
+        elif opcode == 'CHPR':
+            emitter.flush()
+            emitter.line("mp = 8")
+            emitter.line(f"b = {arg - 1}")
+
+        elif opcode == 'RTPR':
+            emitter.flush()
+            emitter.line("if call_stack:")
+            emitter.line("    b = call_stack.pop() - 1")
+            emitter.line("else:")
+            emitter.line("    vm.running = False")
+            emitter.line(f"    b = {index + 1}")
+            emitter.line("    break")
+
+        elif opcode == 'PARA':
+            emitter.flush()
+            emitter.line("vm.running = False")
+            emitter.line(f"b = {index + 1}")
+            emitter.line("break")
+
+
+class TranslatedProgram:
+    """Programa traduzido: fonte Python e a função compilada"""
+
+    def __init__(self, source, function):
+        self.source = source
+        self.function = function
+
+    def run(self, vm):
+        self.function(vm)
+
+    def execute(self, vm):
+        """Equivalente a vm.execute(), usando o código traduzido"""
+        if vm.verbose:
+            print("\nIniciando execução\n")
+
+        self.function(vm)
+
+        if vm.verbose:
+            print("\nExecução finalizada")
+
+
+def translate(instructions):
+    source = Translator(instructions).translate()
+    namespace = {}
+    exec(compile(source, '<lalg-aot>', 'exec'), namespace)
+    return TranslatedProgram(source, namespace['_programa'])
+
+
+def main():
+    """Função principal"""
+    arg_parser = argparse.ArgumentParser(
+        description="Traduz um programa .asm para Python e o executa")
+    arg_parser.add_argument('programa', help="arquivo .asm gerado pelo compilador")
+    arg_parser.add_argument('--fonte', action='store_true',
+                            help="mostra o código Python gerado em vez de executar")
+    args = arg_parser.parse_args()
+
+    vm = VirtualMachine()
+    vm.load_program(args.programa)
+
+    try:
+        program = translate(vm.instructions)
+    except TranslationError as e:
+        print(f"ERRO DE TRADUÇÃO: {e}")
+        sys.exit(1)
+
+    if args.fonte:
+        print(program.source)
+        return
+
+    program.execute(vm)
+
+
+if __name__ == "__main__":
+    main()
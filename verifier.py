@@ -0,0 +1,326 @@
+"""
+Verificador de Bytecode da Máquina Virtual
+
+Confere um programa .asm antes da execução:
+  - todo opcode é conhecido e o operando é válido;
+  - todo desvio (DSVI, DSVF, CHPR, PUSHER) aponta para uma instrução
+    do programa;
+  - todo endereço de memória (CRVL, ARMZ, PARAM, ALME) cabe na memória;
+  - a profundidade da pilha em cada instrução é a mesma por qualquer
+    caminho e nunca falta operando.
+
+A profundidade é calculada por interpretação abstrata sobre o grafo de
+fluxo: cada procedimento (alvo de CHPR) é analisado com a profundidade
+de entrada das chamadas, e o RTPR dele devolve a profundidade de saída
+para a instrução de retorno empilhada pelo PUSHER.
+
+Um programa verificado pode rodar no laço rápido da VM
+(VirtualMachine.run_verified), que não confere limites, operandos nem
+pilha vazia em tempo de execução.
+"""
+
+import argparse
+
+from vm import decode_instruction, parse_program
+
+
+# Opcode -> (desempilha, empilha); ALME, DESM, CHPR e RTPR são tratados à parte
+STACK_EFFECTS = {
+    'INPP': (0, 0),
+    'CRCT': (0, 1),
+    'CRVL': (0, 1),
+    'PARAM': (0, 1),
+    'ARMZ': (1, 0),
+    'SOMA': (2, 1),
+    'SUBT': (2, 1),
+    'MULT': (2, 1),
+    'DIVI': (2, 1),
+    'CMAI': (2, 1),
+    'CPMI': (2, 1),
+    'CMAG': (2, 1),
+    'CPME': (2, 1),
+    'CMIG': (2, 1),
+    'CMDG': (2, 1),
+    'LEIT': (0, 1),
+    'IMPR': (1, 0),
+    'DSVI': (0, 0),
+    'DSVF': (1, 0),
+    'PUSHER': (0, 0),
+    'PARA': (0, 0),
+}
+
+KNOWN_OPCODES = set(STACK_EFFECTS) | {'ALME', 'DESM', 'CHPR', 'RTPR'}
+JUMP_OPCODES = {'DSVI', 'DSVF', 'CHPR'}
+MEMORY_OPCODES = {'CRVL', 'ARMZ', 'PARAM'}
+
+# Instrução sentinela no fim do código do laço rápido
+END = 'FIM'
+
+
+class VerificationError(Exception):
+
+    def __init__(self, problems):
+        self.problems = problems
+        super().__init__("\n".join(problems))
+
+
+class State:
+    """Estado abstrato antes de uma instrução"""
+
+    __slots__ = ('depth', 'pointer', 'ret', 'proc')
+
+    def __init__(self, depth, pointer, ret, proc):
+        self.depth = depth      # itens na pilha de operandos
+        self.pointer = pointer  # memory_pointer (None = desconhecido)
+        self.ret = ret          # linha de retorno do último PUSHER (None = nenhum)
+        self.proc = proc        # índice de entrada do procedimento (0 = principal)
+
+
+class VerifiedProgram:
+    """
+    Programa aceito pelo verificador, já decodificado para o laço rápido.
+    Cada instrução vira (opcode, operando, quantidade): desvios guardam o
+    índice de destino, e ALME/DESM guardam quantos valores realmente saem
+    da pilha naquele ponto.
+    """
+
+    def __init__(self, instructions, code, depths, max_depth):
+        self.instructions = instructions
+        self.code = code
+        self.depths = depths        # profundidade antes de cada instrução (None = inalcançável)
+        self.max_depth = max_depth
+
+    def reachable(self):
+        return sum(1 for depth in self.depths if depth is not None)
+
+    def __repr__(self):
+        return (f"VerifiedProgram(instructions={len(self.instructions)}, "
+                f"reachable={self.reachable()}, max_depth={self.max_depth})")
+
+
+class Verifier:
+
+    def __init__(self, instructions, memory_size=100):
+        self.instructions = instructions
+        self.memory_size = memory_size
+        self.decoded = []
+        self.problems = []
+        self.states = [None] * len(instructions)
+        self.summaries = {}   # entrada do procedimento -> State no RTPR
+        self.call_sites = {}  # entrada do procedimento -> [(linha de retorno, proc)]
+        self.worklist = []
+
+    def problem(self, index, message):
+        self.problems.append(f"linha {index + 1} ({self.instructions[index]}): {message}")
+
+    def verify(self):
+        self.decode_all()
+        if not self.problems and self.instructions:
+            self.propagate(0, State(0, 0, None, 0))
+            self.analyze()
+        if self.problems:
+            raise VerificationError(self.problems)
+        return self.build()
+
+    def decode_all(self):
+        size = len(self.instructions)
+        for index, instruction in enumerate(self.instructions):
+            try:
+                opcode, arg = decode_instruction(instruction)
+            except (IndexError, ValueError):
+                self.decoded.append((instruction.split()[0], None))
+                self.problem(index, "operando ausente ou inválido")
+                continue
+            self.decoded.append((opcode, arg))
+
+            if opcode not in KNOWN_OPCODES:
+                self.problem(index, f"opcode desconhecido '{opcode}'")
+            elif opcode in JUMP_OPCODES or (opcode == 'PUSHER' and arg is not None):
+                if not 1 <= arg <= size:
+                    self.problem(index, f"desvio para linha {arg} fora do programa (1..{size})")
+            elif opcode in MEMORY_OPCODES:
+                if not 0 <= arg < self.memory_size:
+                    self.problem(index, f"endereço {arg} fora da memória (0..{self.memory_size - 1})")
+            elif opcode in ('ALME', 'DESM') and arg < 0:
+                self.problem(index, "quantidade negativa")
+
+    def propagate(self, index, state):
+        if index >= len(self.instructions):
+            return  # cair no fim encerra o programa
+        current = self.states[index]
+        if current is None:
+            self.states[index] = state
+            self.worklist.append(index)
+            return
+
+        changed = False
+        if current.depth != state.depth:
+            self.problem(index, f"pilha com {current.depth} e {state.depth} itens "
+                                f"conforme o caminho")
+            return
+        if current.proc != state.proc:
+            self.problem(index, "instrução compartilhada por dois procedimentos")
+            return
+        if current.pointer is not None and current.pointer != state.pointer:
+            current.pointer = None
+            changed = True
+        if current.ret is not None and current.ret != state.ret:
+            current.ret = None
+            changed = True
+        if changed:
+            self.worklist.append(index)
+
+    def analyze(self):
+        while self.worklist and len(self.problems) < 50:
+            index = self.worklist.pop()
+            self.step(index, self.states[index])
+
+    def step(self, index, state):
+        opcode, arg = self.decoded[index]
+        depth = state.depth
+        following = index + 1
+
+        if opcode == 'ALME':
+            if state.pointer is None:
+                self.problem(index, "memory_pointer desconhecido neste ponto")
+                return
+            if state.pointer + arg > self.memory_size:
+                self.problem(index, f"aloca até o endereço {state.pointer + arg - 1}, "
+                                    f"fora da memória")
+                return
+            self.propagate(following, State(depth - min(depth, arg), state.pointer + arg,
+                                            state.ret, state.proc))
+            return
+
+        if opcode == 'DESM':
+            self.propagate(following, State(depth - min(depth, arg), state.pointer,
+                                            state.ret, state.proc))
+            return
+
+        if opcode == 'CHPR':
+            self.call(index, arg - 1, state)
+            return
+
+        if opcode == 'RTPR':
+            if state.proc != 0:
+                self.leave(index, state)
+            return  # no programa principal, RTPR sem chamada encerra
+
+        pops, pushes = STACK_EFFECTS[opcode]
+        if depth < pops:
+            self.problem(index, f"precisa de {pops} operandos e a pilha tem {depth}")
+            return
+        after = State(depth - pops + pushes, state.pointer, state.ret, state.proc)
+
+        if opcode == 'PARA':
+            return
+        if opcode == 'PUSHER':
+            after.ret = arg if arg is not None else index + 2
+            self.propagate(following, after)
+        elif opcode == 'DSVI':
+            self.propagate(arg - 1, after)
+        elif opcode == 'DSVF':
+            self.propagate(following, after)
+            self.propagate(arg - 1, State(after.depth, after.pointer, after.ret, after.proc))
+        else:
+            self.propagate(following, after)
+
+    def call(self, index, entry, state):
+        if state.ret is None:
+            self.problem(index, "chamada sem endereço de retorno (PUSHER) conhecido")
+            return
+        target = self.states[entry]
+        if target is not None and target.proc != entry:
+            self.problem(index, "chamada para o meio de outro procedimento")
+            return
+
+        # O procedimento começa com os argumentos na pilha e memory_pointer = 8
+        self.propagate(entry, State(state.depth, 8, None, entry))
+        site = (state.ret, state.proc)
+        sites = self.call_sites.setdefault(entry, [])
+        if site not in sites:
+            sites.append(site)
+        summary = self.summaries.get(entry)
+        if summary is not None:
+            self.propagate(state.ret - 1, State(summary.depth, summary.pointer,
+                                                None, state.proc))
+
+    def leave(self, index, state):
+        summary = self.summaries.get(state.proc)
+        if summary is None:
+            summary = State(state.depth, state.pointer, None, state.proc)
+            self.summaries[state.proc] = summary
+        elif summary.depth != state.depth:
+            self.problem(index, f"procedimento retorna com {summary.depth} e "
+                                f"{state.depth} itens na pilha")
+            return
+        elif summary.pointer is not None and summary.pointer != state.pointer:
+            summary.pointer = None
+        else:
+            return
+
+        for ret, proc in self.call_sites.get(state.proc, []):
+            self.propagate(ret - 1, State(summary.depth, summary.pointer, None, proc))
+
+    def build(self):
+        depths = [state.depth if state is not None else None for state in self.states]
+        code = []
+        for index, (opcode, arg) in enumerate(self.decoded):
+            count = 0
+            if opcode in JUMP_OPCODES:
+                arg -= 1
+            elif opcode == 'PUSHER' and arg is None:
+                arg = index + 2
+            elif opcode in ('ALME', 'DESM'):
+                count = min(depths[index] or 0, arg)
+            code.append((opcode, arg, count))
+        code.append((END, None, 0))
+
+        max_depth = 0
+        for index, depth in enumerate(depths):
+            if depth is not None:
+                pops, pushes = STACK_EFFECTS.get(self.decoded[index][0], (0, 0))
+                max_depth = max(max_depth, depth - pops + pushes, depth)
+        return VerifiedProgram(self.instructions, code, depths, max_depth)
+
+
+def verify_program(instructions, memory_size=100):
+    """Verifica as instruções e devolve um VerifiedProgram (ou VerificationError)"""
+    return Verifier(instructions, memory_size).verify()
+
+
+def verify_file(filename, memory_size=100):
+    with open(filename, 'r', encoding='utf-8') as f:
+        instructions = parse_program(f.readlines())
+    return verify_program(instructions, memory_size)
+
+
+def main():
+    """Função principal"""
+    arg_parser = argparse.ArgumentParser(description="Verifica um programa .asm da VM")
+    arg_parser.add_argument('programa', help="arquivo .asm gerado pelo compilador")
+    arg_parser.add_argument('--executar', action='store_true',
+                            help="executa no laço rápido se a verificação passar")
+    args = arg_parser.parse_args()
+
+    try:
+        program = verify_file(args.programa)
+    except VerificationError as e:
+        print(f"Programa rejeitado ({len(e.problems)} problema(s)):")
+        for problem in e.problems:
+            print(f"  {problem}")
+        raise SystemExit(1)
+
+    print(f"Programa verificado: {len(program.instructions)} instruções, "
+          f"{program.reachable()} alcançáveis, pilha máxima {program.max_depth}")
+
+    if args.executar:
+        from vm import VirtualMachine
+        vm = VirtualMachine()
+        vm.load_program(args.programa)
+        vm.verified = program
+        vm.execute()
+
+
+if __name__ == "__main__":
+    main()
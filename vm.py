@@ -1,177 +1,449 @@
-class VirtualMachine:
-    
-    def __init__(self):
-        self.stack = []
-        self.memory = [0.0] * 100
-        self.pc = 0
-        self.instructions = []
-        self.call_stack = []
-        self.running = True
-        self.memory_pointer = 0  # Rastreia o próximo endereço de memória disponível
-        
-    def load_program(self, filename):
-        with open(filename, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-            
-            for line in lines:
-                line = line.strip()
-                
-                if not line:
-                    continue
-
-                if '#' in line:
-                    line = line.split('#')[0].strip()
-                    
-                if line:
-                    self.instructions.append(line)
-        
-        print(f"Programa carregado: {len(self.instructions)} instruções")
-
-    def execute(self):
-        print("\nIniciando execução\n")
-        
-        while self.running and self.pc < len(self.instructions):
-            instruction = self.instructions[self.pc]
-            self.execute_instruction(instruction)
-            self.pc += 1
-        
-        print("\nExecução finalizada")
-
-    def execute_instruction(self, instruction):
-        parts = instruction.split()
-        opcode = parts[0]
-        
-        # INPP - Inicializar Programa
-        if opcode == 'INPP':
-            pass
-        
-        # ALME - Alocar Memória (e desempilhar parâmetros se houver)
-        elif opcode == 'ALME':
-            n = int(parts[1])
-            # Cada ALME é executado separadamente para cada parâmetro
-            # Precisamos desempilhar na ordem FIFO (primeiro a entrar, primeiro a sair)
-            # porque os argumentos foram empilhados na ordem: arg1, arg2, arg3, arg4
-            for i in range(n):
-                if self.stack:
-                    value = self.stack.pop(0)  # FIFO - remove do início
-                    self.memory[self.memory_pointer] = value
-                self.memory_pointer += 1
-        
-        # CRCT - Carregar Constante
-        elif opcode == 'CRCT':
-            value = float(parts[1])
-            self.stack.append(value)
-        
-        # CRVL - Carregar Valor de Variável
-        elif opcode == 'CRVL':
-            address = int(parts[1])
-            value = self.memory[address]
-            self.stack.append(value)
-        
-        # ARMZ - Armazenar em Memória
-        elif opcode == 'ARMZ':
-            address = int(parts[1])
-            value = self.stack.pop()
-            self.memory[address] = value
-
-        # SOMA - Adição
-        elif opcode == 'SOMA':
-            b = self.stack.pop()
-            a = self.stack.pop()
-            self.stack.append(a + b)
-        
-        # SUBT - Subtração
-        elif opcode == 'SUBT':
-            b = self.stack.pop()
-            a = self.stack.pop()
-            self.stack.append(a - b)
-        
-        # MULT - Multiplicação
-        elif opcode == 'MULT':
-            b = self.stack.pop()
-            a = self.stack.pop()
-            self.stack.append(a * b)
-        
-        # DIVI - Divisão
-        elif opcode == 'DIVI':
-            b = self.stack.pop()
-            a = self.stack.pop()
-            self.stack.append(a / b)
-        
-        # LEIT - Ler entrada do usuário
-        elif opcode == 'LEIT':
-            value = float(input("Digite um valor: "))
-            self.stack.append(value)
-        
-        # IMPR - Imprimir valor
-        elif opcode == 'IMPR':
-            value = self.stack.pop()
-            print(value)
-        
-        # DSVI - Desvio Incondicional
-        elif opcode == 'DSVI':
-            line = int(parts[1])
-            self.pc = line - 2
-        
-        # DSVF - Desvio se Falso
-        elif opcode == 'DSVF':
-            line = int(parts[1])
-            condition = self.stack.pop()
-            if condition == 0:
-                self.pc = line - 2
-        
-        # CMAI - Comparar Maior ou Igual (>=)
-        elif opcode == 'CMAI':
-            b = self.stack.pop()
-            a = self.stack.pop()
-            result = 1 if a >= b else 0
-            self.stack.append(result)
-        
-        # CPMI - Comparar Menor ou Igual (<=)
-        elif opcode == 'CPMI':
-            b = self.stack.pop()
-            a = self.stack.pop()
-            result = 1 if a <= b else 0
-            self.stack.append(result)
-        
-        # PUSHER - Empilhar Endereço de Retorno
-        elif opcode == 'PUSHER':
-            if len(parts) > 1 and parts[1].isdigit():
-                return_address = int(parts[1])
-            else:
-                return_address = self.pc + 1
-            self.call_stack.append(return_address)
-        
-        # PARAM - Passar Parâmetro
-        elif opcode == 'PARAM':
-            address = int(parts[1])
-            value = self.memory[address]
-            self.stack.append(value)
-        
-        # CHPR - Chamar Procedimento
-        elif opcode == 'CHPR':
-            line = int(parts[1])
-            self.memory_pointer = 8  # Reset para início das variáveis locais
-            self.pc = line - 2
-        
-        # RTPR - Retornar de Procedimento
-        elif opcode == 'RTPR':
-            if self.call_stack:
-                return_address = self.call_stack.pop()
-                self.pc = return_address - 1
-            else:
-                self.running = False
-        
-        # DESM - Desempilhar (limpa n valores da pilha)
-        elif opcode == 'DESM':
-            n = int(parts[1])
-            for _ in range(n):
-                if self.stack:
-                    self.stack.pop()
-        
-        # PARA - Parar Execução
-        elif opcode == 'PARA':
-            self.running = False
-        
-        else:
-            print(f"Instrução não implementada: {opcode}")
+def parse_program(lines):
+    """Remove linhas vazias e comentários das linhas de um programa .asm"""
+    instructions = []
+    for line in lines:
+        line = line.strip()
+
+        if not line:
+            continue
+
+        if '#' in line:
+            line = line.split('#')[0].strip()
+
+        if line:
+            instructions.append(line)
+    return instructions
+
+
+class VMRuntimeError(Exception):
+
+    def __init__(self, message, pc=0, line=0):
+        self.message = message
+        self.pc = pc
+        self.line = line
+        super().__init__(message)
+
+
+# Instruções cujo operando é um endereço, uma linha ou uma quantidade
+INT_ARG_OPCODES = {'ALME', 'CRVL', 'ARMZ', 'DSVI', 'DSVF', 'PARAM', 'CHPR', 'DESM'}
+
+
+def decode_instruction(instruction):
+    """
+    Separa uma instrução em (opcode, operando) já convertido.
+    O operando é None quando a instrução não usa argumento
+    (PUSHER sem número também retorna None).
+    """
+    parts = instruction.split()
+    opcode = parts[0]
+
+    if opcode == 'CRCT':
+        return opcode, float(parts[1])
+    if opcode in INT_ARG_OPCODES:
+        return opcode, int(parts[1])
+    if opcode == 'PUSHER':
+        if len(parts) > 1 and parts[1].isdigit():
+            return opcode, int(parts[1])
+        return opcode, None
+    return opcode, None
+
+
+class VirtualMachine:
+    
+    def __init__(self, input_func=None, output_func=None, verbose=True, profiler=None,
+                 tracer=None, coverage=None):
+        self.stack = []
+        self.memory = [0.0] * 100
+        self.pc = 0
+        self.instructions = []
+        self.call_stack = []
+        self.running = True
+        self.memory_pointer = 0  # Rastreia o próximo endereço de memória disponível
+        # Entrada (LEIT) e saída (IMPR) podem ser trocadas para execução sem terminal
+        self.input_func = input_func if input_func is not None else input
+        self.output_func = output_func if output_func is not None else print
+        self.verbose = verbose
+        # Com um profiler, execute() usa o laço instrumentado dele
+        self.profiler = profiler
+        # Com um tracer, execute() guarda as últimas instruções num buffer circular
+        self.tracer = tracer
+        # Com uma Coverage, execute() marca cada instrução executada
+        self.coverage = coverage
+        # Mapa de fonte: carregado só quando alguém precisa (profiler, erro)
+        self.program_file = None
+        self._source_map = None
+        self._source_map_loaded = False
+        # Programa aceito pelo verificador: habilita o laço rápido
+        self.verified = None
+        
+    def load_program(self, filename):
+        with open(filename, 'r', encoding='utf-8') as f:
+            self.instructions.extend(parse_program(f.readlines()))
+        self.program_file = filename
+        
+        if self.verbose:
+            print(f"Programa carregado: {len(self.instructions)} instruções")
+
+    def execute(self):
+        if self.verbose:
+            print("\nIniciando execução\n")
+        
+        # O laço é escolhido uma vez: sem profiler não há custo por instrução
+        try:
+            if self.profiler is not None:
+                self.profiler.run(self)
+            elif self.tracer is not None:
+                self.tracer.run(self)
+            elif self.coverage is not None:
+                self.coverage.run(self)
+            elif self.verified is not None and self.at_start():
+                self.run_verified()
+            else:
+                self.run()
+        except VMRuntimeError:
+            raise
+        except Exception as e:
+            raise self.runtime_error(e) from e
+        
+        if self.verbose:
+            print("\nExecução finalizada")
+
+    @property
+    def source_map(self):
+        if not self._source_map_loaded:
+            self._source_map_loaded = True
+            if self.program_file:
+                from source_map import SourceMap
+                self._source_map = SourceMap.load_for(self.program_file,
+                                                      len(self.instructions))
+        return self._source_map
+
+    @source_map.setter
+    def source_map(self, value):
+        self._source_map = value
+        self._source_map_loaded = True
+
+    def source_line(self, pc):
+        """Linha do fonte da instrução pc (0 se não houver mapa)"""
+        source_map = self.source_map
+        return source_map.line_for(pc) if source_map is not None else 0
+
+    def runtime_error(self, error):
+        """Erro de execução apontando a instrução e a linha do fonte"""
+        pc = self.pc
+        instruction = self.instructions[pc] if 0 <= pc < len(self.instructions) else "?"
+        line = self.source_line(pc)
+        location = f"instrução {pc + 1} ({instruction})"
+        if line:
+            location += f", linha {line} do fonte"
+        return VMRuntimeError(f"{error} [{location}]", pc, line)
+
+    def verify(self):
+        """Verifica o programa carregado; se passar, execute() usa o laço rápido"""
+        from verifier import verify_program
+        self.verified = verify_program(self.instructions, len(self.memory))
+        return self.verified
+
+    def at_start(self):
+        """O laço rápido assume o estado inicial que o verificador analisou"""
+        return (self.pc == 0 and not self.stack and not self.call_stack
+                and self.memory_pointer == 0)
+
+    def run_verified(self):
+        """
+        Laço sem verificações: as instruções já vêm decodificadas, os
+        desvios apontam para índices válidos, a pilha tem sempre os
+        operandos necessários e o fim do código tem uma sentinela (FIM),
+        então não há teste de limite, de pilha vazia nem conversão de texto.
+        """
+        code = self.verified.code
+        stack = self.stack
+        push = stack.append
+        pop = stack.pop
+        memory = self.memory
+        call_stack = self.call_stack
+        read = self.input_func
+        write = self.output_func
+        pc = self.pc
+        pointer = self.memory_pointer
+
+        try:
+            while True:
+                opcode, arg, count = code[pc]
+
+                if opcode == 'CRVL' or opcode == 'PARAM':
+                    push(memory[arg])
+                elif opcode == 'CRCT':
+                    push(arg)
+                elif opcode == 'ARMZ':
+                    memory[arg] = pop()
+                elif opcode == 'DSVF':
+                    if pop() == 0:
+                        pc = arg
+                        continue
+                elif opcode == 'DSVI':
+                    pc = arg
+                    continue
+                elif opcode == 'SOMA':
+                    b = pop()
+                    stack[-1] = stack[-1] + b
+                elif opcode == 'SUBT':
+                    b = pop()
+                    stack[-1] = stack[-1] - b
+                elif opcode == 'MULT':
+                    b = pop()
+                    stack[-1] = stack[-1] * b
+                elif opcode == 'DIVI':
+                    b = pop()
+                    stack[-1] = stack[-1] / b
+                elif opcode == 'CMAI':
+                    b = pop()
+                    stack[-1] = 1 if stack[-1] >= b else 0
+                elif opcode == 'CPMI':
+                    b = pop()
+                    stack[-1] = 1 if stack[-1] <= b else 0
+                elif opcode == 'CMAG':
+                    b = pop()
+                    stack[-1] = 1 if stack[-1] > b else 0
+                elif opcode == 'CPME':
+                    b = pop()
+                    stack[-1] = 1 if stack[-1] < b else 0
+                elif opcode == 'CMIG':
+                    b = pop()
+                    stack[-1] = 1 if stack[-1] == b else 0
+                elif opcode == 'CMDG':
+                    b = pop()
+                    stack[-1] = 1 if stack[-1] != b else 0
+                elif opcode == 'LEIT':
+                    push(float(read("Digite um valor: ")))
+                elif opcode == 'IMPR':
+                    write(pop())
+                elif opcode == 'PUSHER':
+                    call_stack.append(arg)
+                elif opcode == 'CHPR':
+                    pointer = 8
+                    pc = arg
+                    continue
+                elif opcode == 'ALME':
+                    # 'count' argumentos saem da base da pilha (FIFO)
+                    if count:
+                        memory[pointer:pointer + count] = stack[:count]
+                        del stack[:count]
+                    pointer += arg
+                elif opcode == 'RTPR':
+                    if call_stack:
+                        pc = call_stack.pop() - 1
+                        continue
+                    self.running = False
+                    pc += 1
+                    break
+                elif opcode == 'DESM':
+                    if count:
+                        del stack[-count:]
+                elif opcode == 'PARA':
+                    self.running = False
+                    pc += 1
+                    break
+                elif opcode == 'FIM':
+                    break
+                pc += 1
+        finally:
+            self.pc = pc
+            self.memory_pointer = pointer
+
+    def run(self):
+        while self.running and self.pc < len(self.instructions):
+            instruction = self.instructions[self.pc]
+            self.execute_instruction(instruction)
+            self.pc += 1
+
+    def run_slice(self, budget):
+        """Executa no máximo 'budget' instruções e devolve quantas executou"""
+        instructions = self.instructions
+        size = len(instructions)
+        executed = 0
+        while executed < budget and self.running and self.pc < size:
+            self.execute_instruction(instructions[self.pc])
+            self.pc += 1
+            executed += 1
+        return executed
+
+    @property
+    def finished(self):
+        return not self.running or self.pc >= len(self.instructions)
+
+    def run_until(self, stop_pc):
+        """Executa até a instrução stop_pc (sem executá-la); False se o programa terminou antes"""
+        while self.running and self.pc < len(self.instructions):
+            if self.pc == stop_pc:
+                return True
+            self.execute_instruction(self.instructions[self.pc])
+            self.pc += 1
+        return False
+
+    def execute_instruction(self, instruction):
+        parts = instruction.split()
+        opcode = parts[0]
+        
+        # INPP - Inicializar Programa
+        if opcode == 'INPP':
+            pass
+        
+        # ALME - Alocar Memória (e desempilhar parâmetros se houver)
+        elif opcode == 'ALME':
+            n = int(parts[1])
+            # Cada ALME é executado separadamente para cada parâmetro
+            # Precisamos desempilhar na ordem FIFO (primeiro a entrar, primeiro a sair)
+            # porque os argumentos foram empilhados na ordem: arg1, arg2, arg3, arg4
+            for i in range(n):
+                if self.stack:
+                    value = self.stack.pop(0)  # FIFO - remove do início
+                    self.memory[self.memory_pointer] = value
+                self.memory_pointer += 1
+        
+        # CRCT - Carregar Constante
+        elif opcode == 'CRCT':
+            value = float(parts[1])
+            self.stack.append(value)
+        
+        # CRVL - Carregar Valor de Variável
+        elif opcode == 'CRVL':
+            address = int(parts[1])
+            value = self.memory[address]
+            self.stack.append(value)
+        
+        # ARMZ - Armazenar em Memória
+        elif opcode == 'ARMZ':
+            address = int(parts[1])
+            value = self.stack.pop()
+            self.memory[address] = value
+
+        # SOMA - Adição
+        elif opcode == 'SOMA':
+            b = self.stack.pop()
+            a = self.stack.pop()
+            self.stack.append(a + b)
+        
+        # SUBT - Subtração
+        elif opcode == 'SUBT':
+            b = self.stack.pop()
+            a = self.stack.pop()
+            self.stack.append(a - b)
+        
+        # MULT - Multiplicação
+        elif opcode == 'MULT':
+            b = self.stack.pop()
+            a = self.stack.pop()
+            self.stack.append(a * b)
+        
+        # DIVI - Divisão
+        elif opcode == 'DIVI':
+            b = self.stack.pop()
+            a = self.stack.pop()
+            self.stack.append(a / b)
+        
+        # LEIT - Ler entrada do usuário
+        elif opcode == 'LEIT':
+            value = float(self.input_func("Digite um valor: "))
+            self.stack.append(value)
+        
+        # IMPR - Imprimir valor
+        elif opcode == 'IMPR':
+            value = self.stack.pop()
+            self.output_func(value)
+        
+        # DSVI - Desvio Incondicional
+        elif opcode == 'DSVI':
+            line = int(parts[1])
+            self.pc = line - 2
+        
+        # DSVF - Desvio se Falso
+        elif opcode == 'DSVF':
+            line = int(parts[1])
+            condition = self.stack.pop()
+            if condition == 0:
+                self.pc = line - 2
+        
+        # CMAI - Comparar Maior ou Igual (>=)
+        elif opcode == 'CMAI':
+            b = self.stack.pop()
+            a = self.stack.pop()
+            result = 1 if a >= b else 0
+            self.stack.append(result)
+        
+        # CPMI - Comparar Menor ou Igual (<=)
+        elif opcode == 'CPMI':
+            b = self.stack.pop()
+            a = self.stack.pop()
+            result = 1 if a <= b else 0
+            self.stack.append(result)
+        
+        # CMAG - Comparar Maior (>)
+        elif opcode == 'CMAG':
+            b = self.stack.pop()
+            a = self.stack.pop()
+            result = 1 if a > b else 0
+            self.stack.append(result)
+        
+        # CPME - Comparar Menor (<)
+        elif opcode == 'CPME':
+            b = self.stack.pop()
+            a = self.stack.pop()
+            result = 1 if a < b else 0
+            self.stack.append(result)
+        
+        # CMIG - Comparar Igual (==)
+        elif opcode == 'CMIG':
+            b = self.stack.pop()
+            a = self.stack.pop()
+            result = 1 if a == b else 0
+            self.stack.append(result)
+        
+        # CMDG - Comparar Diferente (!=)
+        elif opcode == 'CMDG':
+            b = self.stack.pop()
+            a = self.stack.pop()
+            result = 1 if a != b else 0
+            self.stack.append(result)
+        
+        # PUSHER - Empilhar Endereço de Retorno
+        elif opcode == 'PUSHER':
+            if len(parts) > 1 and parts[1].isdigit():
+                return_address = int(parts[1])
+            else:
+                return_address = self.pc + 2  # linha seguinte
+            self.call_stack.append(return_address)
+        
+        # PARAM - Passar Parâmetro
+        elif opcode == 'PARAM':
+            address = int(parts[1])
+            value = self.memory[address]
+            self.stack.append(value)
+        
+        # CHPR - Chamar Procedimento
+        elif opcode == 'CHPR':
+            line = int(parts[1])
+            self.memory_pointer = 8  # Reset para início das variáveis locais
+            self.pc = line - 2
+        
+        # RTPR - Retornar de Procedimento
+        elif opcode == 'RTPR':
+            if self.call_stack:
+                return_address = self.call_stack.pop()
+                self.pc = return_address - 2
+            else:
+                self.running = False
+        
+        # DESM - Desempilhar (limpa n valores da pilha)
+        elif opcode == 'DESM':
+            n = int(parts[1])
+            for _ in range(n):
+                if self.stack:
+                    self.stack.pop()
+        
+        # PARA - Parar Execução
+        elif opcode == 'PARA':
+            self.running = False
+        
+        else:
+            print(f"Instrução não implementada: {opcode}")
@@ -0,0 +1,221 @@
+"""
+Cobertura de Instruções da Máquina Virtual
+
+Marca num bytearray (um byte por instrução) cada instrução executada:
+o custo por passo é uma única escrita de byte. Os mapas de várias
+execuções, inclusive de processos diferentes, são somados com OU, e o
+relatório usa o mapa de fonte para apontar as linhas do programa
+LALG-PHP que nenhuma entrada exercitou.
+
+Formato do arquivo (.cov):
+    'LVMC', versão, SHA-1 do programa, quantidade de instruções, mapa
+"""
+
+import argparse
+import os
+import struct
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from farm import input_feeder, read_input_sets
+from snapshot import program_hash
+from vm import VirtualMachine, parse_program
+
+
+MAGIC = b'LVMC'
+COVERAGE_VERSION = 1
+HEADER = struct.Struct('<4sH20sI')
+
+
+class CoverageError(Exception):
+    pass
+
+
+class Coverage:
+
+    def __init__(self, instructions=None):
+        self.instructions = list(instructions or [])
+        self.bitmap = bytearray(len(self.instructions))
+        self.vm = None
+
+    def run(self, vm):
+        """Laço de execução que marca as instruções (substitui VirtualMachine.run)"""
+        self.vm = vm
+        instructions = vm.instructions
+        size = len(instructions)
+        if self.instructions != instructions:
+            if any(self.bitmap):
+                raise CoverageError("mapa de cobertura de outro programa")
+            self.instructions = list(instructions)
+            self.bitmap = bytearray(size)
+
+        bitmap = self.bitmap
+        execute_instruction = vm.execute_instruction
+        while vm.running and vm.pc < size:
+            pc = vm.pc
+            bitmap[pc] = 1
+            execute_instruction(instructions[pc])
+            vm.pc += 1
+
+    def merge(self, other):
+        """Soma (OU) outro mapa do mesmo programa a este"""
+        other_bitmap = other.bitmap if isinstance(other, Coverage) else other
+        if len(other_bitmap) != len(self.bitmap):
+            raise CoverageError("mapas de cobertura de tamanhos diferentes")
+        merged = int.from_bytes(self.bitmap, 'little') | int.from_bytes(other_bitmap, 'little')
+        self.bitmap[:] = merged.to_bytes(len(self.bitmap), 'little')
+
+    def covered(self):
+        return sum(1 for hit in self.bitmap if hit)
+
+    def uncovered_instructions(self):
+        return [index for index, hit in enumerate(self.bitmap) if not hit]
+
+    def line_coverage(self, source_map):
+        """linha do fonte -> (instruções executadas, instruções geradas)"""
+        lines = {}
+        for index, hit in enumerate(self.bitmap):
+            line = source_map.line_for(index)
+            if not line:
+                continue
+            executed, total = lines.get(line, (0, 0))
+            lines[line] = (executed + (1 if hit else 0), total + 1)
+        return lines
+
+    def report(self, source_map=None):
+        total = len(self.bitmap)
+        covered = self.covered()
+        lines = [
+            "COBERTURA DE INSTRUÇÕES",
+            "=" * 70,
+            f"Instruções executadas: {covered} de {total} "
+            f"({covered * 100.0 / max(total, 1):.1f}%)",
+        ]
+
+        if source_map is None:
+            uncovered = self.uncovered_instructions()
+            if uncovered:
+                lines.append("Instruções nunca executadas: " +
+                             " ".join(str(index + 1) for index in uncovered))
+            return "\n".join(lines) + "\n"
+
+        per_line = self.line_coverage(source_map)
+        missing = sorted(line for line, (executed, _) in per_line.items() if not executed)
+        partial = sorted(line for line, (executed, total) in per_line.items()
+                         if 0 < executed < total)
+        lines.append(f"Linhas do fonte cobertas: {len(per_line) - len(missing)} de {len(per_line)}")
+        lines.append("Linhas nunca executadas: " + (" ".join(map(str, missing)) or "nenhuma"))
+        if partial:
+            lines.append("Linhas executadas em parte: " + " ".join(map(str, partial)))
+        return "\n".join(lines) + "\n"
+
+    def encode(self):
+        return HEADER.pack(MAGIC, COVERAGE_VERSION, program_hash(self.instructions),
+                           len(self.bitmap)) + bytes(self.bitmap)
+
+    def save(self, filename):
+        with open(filename, 'wb') as f:
+            f.write(self.encode())
+
+    def load_into(self, filename):
+        """Soma ao mapa atual o mapa salvo em 'filename' (mesmo programa)"""
+        with open(filename, 'rb') as f:
+            data = f.read()
+        if len(data) < HEADER.size:
+            raise CoverageError(f"'{filename}' truncado")
+        magic, version, digest, size = HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != COVERAGE_VERSION:
+            raise CoverageError(f"'{filename}' não é um mapa de cobertura")
+        if digest != program_hash(self.instructions):
+            raise CoverageError(f"'{filename}' foi gravado com outro programa")
+        bitmap = data[HEADER.size:HEADER.size + size]
+        if len(bitmap) != size:
+            raise CoverageError(f"'{filename}' truncado")
+        self.merge(bitmap)
+
+    def __repr__(self):
+        return f"Coverage(instructions={len(self.bitmap)}, covered={self.covered()})"
+
+
+# Programa compartilhado pelo worker (definido por _init_worker)
+_program = None
+
+
+def _init_worker(instructions):
+    global _program
+    _program = instructions
+
+
+def cover_once(instructions, inputs):
+    """Executa uma vez com as entradas e devolve o mapa (bytes)"""
+    coverage = Coverage(instructions)
+    vm = VirtualMachine(input_func=input_feeder(inputs), output_func=lambda value: None,
+                        verbose=False, coverage=coverage)
+    vm.instructions = instructions
+    try:
+        vm.execute()
+    except Exception:
+        pass  # instruções executadas até o erro continuam marcadas
+    return bytes(coverage.bitmap)
+
+
+def _cover_in_worker(inputs):
+    return cover_once(_program, inputs)
+
+
+def cover_input_sets(instructions, input_sets, workers=1):
+    """Cobertura somada de uma execução por conjunto de entradas"""
+    coverage = Coverage(instructions)
+    if workers == 1:
+        bitmaps = (cover_once(instructions, inputs) for inputs in input_sets)
+        for bitmap in bitmaps:
+            coverage.merge(bitmap)
+        return coverage
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(instructions,)) as executor:
+        for bitmap in executor.map(_cover_in_worker, input_sets):
+            coverage.merge(bitmap)
+    return coverage
+
+
+def main():
+    """Função principal"""
+    arg_parser = argparse.ArgumentParser(
+        description="Mede quais instruções e linhas do fonte as entradas exercitam")
+    arg_parser.add_argument('programa', help="arquivo .asm gerado pelo compilador")
+    arg_parser.add_argument('entradas', nargs='?', default=None,
+                            help="arquivo com uma execução por linha")
+    arg_parser.add_argument('-j', '--workers', type=int, default=1,
+                            help="número de processos")
+    arg_parser.add_argument('-o', '--saida', default=None,
+                            help="arquivo .cov onde a cobertura é somada (padrão: programa + .cov)")
+    arg_parser.add_argument('--juntar', nargs='*', default=[], metavar='COV',
+                            help="soma mapas .cov gravados por outras execuções")
+    args = arg_parser.parse_args()
+
+    with open(args.programa, 'r', encoding='utf-8') as f:
+        instructions = parse_program(f.readlines())
+
+    output = args.saida or args.programa + '.cov'
+    try:
+        if args.entradas:
+            coverage = cover_input_sets(instructions, read_input_sets(args.entradas),
+                                        args.workers)
+        else:
+            coverage = Coverage(instructions)
+        for filename in args.juntar + ([output] if os.path.exists(output) else []):
+            coverage.load_into(filename)
+    except CoverageError as e:
+        print(f"ERRO: {e}")
+        sys.exit(1)
+
+    coverage.save(output)
+
+    from source_map import SourceMap
+    print(coverage.report(SourceMap.load_for(args.programa, len(instructions))), end="")
+    print(f"Cobertura salva em: {output}")
+
+
+if __name__ == "__main__":
+    main()
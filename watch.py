@@ -0,0 +1,136 @@
+"""
+Modo de Observação (main.py --watch)
+
+Observa o arquivo fonte e recompila a cada alteração, aproveitando o
+trabalho da versão anterior em todas as fases:
+
+- léxico: IncrementalLexer relexa só o trecho editado;
+- sintático: IncrementalParser reanalisa só os comandos de nível
+  superior que tocam os tokens trocados;
+- semântico e geração: IncrementalCompiler refaz só as funções
+  alteradas e religa o programa.
+
+Assim uma edição do tamanho de uma tecla custa quase o mesmo num arquivo
+pequeno e num grande. A mudança é percebida consultando a data de
+modificação do arquivo a cada INTERVAL segundos (sem dependências).
+
+Um fonte com include é compilado pelo ligador (linker.py), como em
+main.py, e os arquivos incluídos passam a ser observados também:
+alterar uma biblioteca recompila o programa.
+"""
+
+import os
+import time
+
+from incremental import IncrementalCompiler, statement_keys
+from lexer import IncrementalLexer
+from linker import build_program, has_includes
+from parser import IncrementalParser
+from pipeline import CompileResult, Diagnostic, decode_source, output_filename
+
+
+INTERVAL = 0.2
+
+
+class IncrementalBuild:
+    """Compila versões sucessivas do mesmo fonte"""
+
+    def __init__(self, backend='pilha'):
+        self.lexer = None
+        self.parser = None
+        self.compiler = IncrementalCompiler(backend)
+        self.backend = backend
+        self.linked = None      # linker.Build da última versão com include
+
+    def compile_file(self, input_file, code):
+        """Como compile, mas um programa com include passa pelo ligador"""
+        if not has_includes(code):
+            self.linked = None
+            return self.compile(code)
+        result, self.linked = build_program(input_file, self.backend)
+        return result
+
+    def watched_files(self, input_file):
+        """O fonte e as unidades que a última compilação incluiu"""
+        files = [os.path.normpath(input_file)]
+        if self.linked is not None:
+            for path, includes in self.linked.includes.items():
+                files += [include for include in [path] + includes if include not in files]
+        return files
+
+    def compile(self, code):
+        try:
+            if self.lexer is None:
+                lexer = IncrementalLexer(code)
+                parser = IncrementalParser(lexer.tokens)
+                self.lexer, self.parser = lexer, parser
+            else:
+                first, old_stop, new_stop = self.lexer.update(code)
+                self.parser.update(first, old_stop, new_stop, self.lexer.last_shift)
+            program = self.parser.program
+            return self.compiler.compile_ast(program, statement_keys(code, program.statements),
+                                             self.parser.materialize)
+        except Exception as e:
+            return CompileResult(diagnostics=[Diagnostic.from_exception(e)])
+
+    def summary(self):
+        if self.linked is not None:
+            return f"{len(self.linked.objects)} unidades ligadas"
+        build = self.compiler.last_build
+        return (f"{self.parser.reparsed} comandos reanalisados, "
+                f"{build.get('funcoes_geradas', 0)} funções geradas, "
+                f"{build.get('funcoes_reaproveitadas', 0)} reaproveitadas")
+
+
+def file_stamp(path):
+    """(data de modificação, tamanho) do arquivo, ou None se ele não existir"""
+    try:
+        info = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (info.st_mtime_ns, info.st_size)
+
+
+def watch(input_file, output_file=None, backend='pilha', interval=INTERVAL, say=print):
+    """Recompila 'input_file' sempre que ele mudar (até Ctrl+C)"""
+    if output_file is None:
+        output_file = output_filename(input_file, backend)
+
+    build = IncrementalBuild(backend)
+    watched = [os.path.normpath(input_file)]
+    last_stamps = None
+    last_code = None
+    say(f"Observando {input_file} (Ctrl+C para sair)")
+    while True:
+        stamps = [file_stamp(path) for path in watched]
+        if stamps[0] is not None and stamps != last_stamps:
+            # Uma unidade incluída mudou: recompila mesmo com o fonte igual
+            units_changed = last_stamps is not None and stamps[1:] != last_stamps[1:]
+            last_stamps = stamps
+            try:
+                with open(input_file, 'rb') as f:
+                    code = decode_source(f.read())
+            except (OSError, UnicodeDecodeError) as e:
+                say(f"ERRO: {e}")
+                code = last_code
+
+            if code != last_code or units_changed:
+                last_code = code
+                start = time.perf_counter()
+                result = build.compile_file(input_file, code)
+                elapsed = (time.perf_counter() - start) * 1000
+                moment = time.strftime('%H:%M:%S')
+                if result.ok:
+                    result.save(output_file)
+                    say(f"[{moment}] {output_file}: {len(result.instructions)} instruções "
+                        f"em {elapsed:.1f} ms ({build.summary()})")
+                else:
+                    for diagnostic in result.diagnostics:
+                        say(f"[{moment}] {input_file}: {diagnostic}")
+
+                files = build.watched_files(input_file)
+                if files != watched:
+                    watched = files
+                    last_stamps = [stamps[0]] + [file_stamp(path) for path in watched[1:]]
+
+        time.sleep(interval)